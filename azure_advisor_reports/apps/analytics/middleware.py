@@ -5,6 +5,7 @@ Activity tracking middleware for automatic user activity logging.
 import re
 from django.utils.deprecation import MiddlewareMixin
 from apps.analytics.models import UserActivity
+from apps.core.tracking import collect_changes
 
 
 class UserActivityTrackingMiddleware(MiddlewareMixin):
@@ -16,6 +17,10 @@ class UserActivityTrackingMiddleware(MiddlewareMixin):
     - Client creation, update, deletion
     - CSV uploads
     - Login/logout events
+
+    Field changes of the tracked models (Client, Report, User) saved during
+    the request are stored in metadata['changes'], taken from the in-memory
+    snapshots of the saved instances (see apps/core/tracking.py).
     """
 
     # URL patterns to track (compiled for performance)
@@ -35,12 +40,13 @@ class UserActivityTrackingMiddleware(MiddlewareMixin):
         super().__init__(get_response)
 
     def __call__(self, request):
-        # Process request
-        response = self.get_response(request)
+        # Process request, collecting the changes of tracked models
+        with collect_changes() as changes:
+            response = self.get_response(request)
 
         # Track activity after response
         if self._should_track(request, response):
-            self._track_activity(request, response)
+            self._track_activity(request, response, changes)
 
         return response
 
@@ -69,7 +75,7 @@ class UserActivityTrackingMiddleware(MiddlewareMixin):
 
         return False
 
-    def _track_activity(self, request, response):
+    def _track_activity(self, request, response, changes=()):
         """Track the activity based on request path and method."""
         try:
             path = request.path
@@ -89,6 +95,8 @@ class UserActivityTrackingMiddleware(MiddlewareMixin):
                 'path': path,
                 'method': method,
             }
+            if changes:
+                metadata['changes'] = [change.as_dict() for change in changes]
             client = None
             report = None
 
@@ -139,12 +147,14 @@ class UserActivityTrackingMiddleware(MiddlewareMixin):
                     action = 'update_client'
                     description = f"Updated client {client_id}"
                     metadata['client_id'] = client_id
-                    # Try to get client object
-                    try:
-                        from apps.clients.models import Client
-                        client = Client.objects.filter(id=client_id).first()
-                    except Exception:
-                        pass
+                    # The saved instance, if the update changed anything; otherwise load it
+                    client = self._saved_instance(changes, 'clients.Client', client_id)
+                    if client is None:
+                        try:
+                            from apps.clients.models import Client
+                            client = Client.objects.filter(id=client_id).first()
+                        except Exception:
+                            pass
 
             elif method == 'DELETE' and self.PATTERNS['delete_client'].match(path):
                 match = self.PATTERNS['delete_client'].match(path)
@@ -205,6 +215,14 @@ class UserActivityTrackingMiddleware(MiddlewareMixin):
             logger = logging.getLogger('analytics')
             logger.error(f"Failed to track user activity: {str(e)}")
 
+    @staticmethod
+    def _saved_instance(changes, label, pk):
+        """Return the instance saved during the request with this model label and pk."""
+        for change in changes:
+            if change.instance._meta.label == label and str(change.instance.pk) == pk:
+                return change.instance
+        return None
+
     def _get_client_ip(self, request):
         """
         Get client IP address from request.
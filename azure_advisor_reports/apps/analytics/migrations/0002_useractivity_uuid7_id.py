@@ -0,0 +1,25 @@
+# Generated manually: time-ordered UUIDv7 keys for new user activities
+
+import apps.core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Switch the default of UserActivity.id to UUIDv7.
+
+    The default is applied in Python, so no SQL runs and existing rows keep
+    their version 4 ids (see apps/core/ids.py).
+    """
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='useractivity',
+            name='id',
+            field=models.UUIDField(default=apps.core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
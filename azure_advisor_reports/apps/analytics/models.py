@@ -9,6 +9,8 @@ from django.utils import timezone
 from datetime import timedelta
 
 from apps.clients.models import Client
+from apps.core.db_routing import use_replica
+from apps.core.ids import uuid7
 from apps.reports.models import Report
 
 
@@ -73,9 +75,13 @@ class DashboardMetrics(models.Model):
         return f"Dashboard Metrics - {self.date} ({self.period_type})"
 
     @classmethod
+    @use_replica()
     def calculate_for_date(cls, target_date=None, period_type='daily'):
         """
         Calculate and store dashboard metrics for a specific date.
+
+        The aggregates are read from the read replica when one is configured;
+        the metrics row is written to the primary.
         """
         if target_date is None:
             target_date = timezone.now().date()
@@ -218,7 +224,8 @@ class UserActivity(models.Model):
         ('other', 'Other'),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Time-ordered keys keep inserts at the end of the primary key index
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey('authentication.User', on_delete=models.CASCADE, related_name='activities')
     action = models.CharField(max_length=30, choices=ACTION_CHOICES)
     description = models.CharField(max_length=255, help_text="Brief description of the action")
@@ -10,17 +10,35 @@ from django.utils import timezone
 from django.core.cache import cache
 
 from apps.clients.models import Client
+from apps.core.db_routing import use_replica
 from apps.reports.models import Report, Recommendation
+from apps.reports.services.deletion import DELETING
 from apps.analytics.models import UserActivity
 
 
 class AnalyticsService:
-    """Service class for analytics calculations and data aggregation."""
+    """
+    Service class for analytics calculations and data aggregation.
+
+    The read-only aggregates run on the read replica when one is configured
+    (see apps.core.db_routing).
+    """
 
     # Cache TTL (15 minutes)
     CACHE_TTL = 900
 
+    @staticmethod
+    def _reports():
+        """Reports counted by the analytics; those being deleted are already gone."""
+        return Report.objects.exclude(status=DELETING)
+
+    @staticmethod
+    def _recommendations():
+        """Recommendations of the reports counted by the analytics."""
+        return Recommendation.objects.exclude(report__status=DELETING)
+
     @classmethod
+    @use_replica()
     def get_dashboard_metrics(cls) -> Dict[str, Any]:
         """
         Calculate all dashboard metrics including trends.
@@ -51,8 +69,8 @@ class AnalyticsService:
         last_month_end = current_month_start
 
         # Total reports (all time)
-        total_reports = Report.objects.count()
-        total_reports_last_month = Report.objects.filter(
+        total_reports = cls._reports().count()
+        total_reports_last_month = cls._reports().filter(
             created_at__lt=last_month_end
         ).count()
 
@@ -66,12 +84,12 @@ class AnalyticsService:
         ).distinct().count()
 
         # Total cost analyzed (sum of all potential savings * multiplier)
-        total_savings = Recommendation.objects.aggregate(
+        total_savings = cls._recommendations().aggregate(
             total=Sum('potential_savings')
         )['total'] or Decimal('0')
         total_cost_analyzed = float(total_savings) * 5  # Assuming 20% savings rate
 
-        total_savings_last_month = Recommendation.objects.filter(
+        total_savings_last_month = cls._recommendations().filter(
             report__created_at__lt=last_month_end
         ).aggregate(
             total=Sum('potential_savings')
@@ -79,7 +97,7 @@ class AnalyticsService:
         total_cost_analyzed_last_month = float(total_savings_last_month) * 5
 
         # Average generation time (seconds)
-        completed_reports = Report.objects.filter(
+        completed_reports = cls._reports().filter(
             status='completed',
             processing_started_at__isnull=False,
             processing_completed_at__isnull=False
@@ -95,7 +113,7 @@ class AnalyticsService:
                 avg_generation_time = sum(processing_times) / len(processing_times)
 
         # For change calculation, get last month's avg
-        completed_reports_last_month = Report.objects.filter(
+        completed_reports_last_month = cls._reports().filter(
             status='completed',
             processing_started_at__isnull=False,
             processing_completed_at__isnull=False,
@@ -137,7 +155,7 @@ class AnalyticsService:
             storage_used_formatted = "0 MB"
 
         # Success rate
-        completed_count = Report.objects.filter(status='completed').count()
+        completed_count = cls._reports().filter(status='completed').count()
         success_rate = (completed_count / total_reports * 100) if total_reports > 0 else 0.0
 
         # Calculate percentage changes
@@ -174,6 +192,7 @@ class AnalyticsService:
         return result
 
     @classmethod
+    @use_replica()
     def _calculate_period_metrics(cls, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """Calculate metrics for a specific period."""
 
@@ -181,20 +200,20 @@ class AnalyticsService:
         active_clients = Client.objects.filter(status='active').count()
 
         # Reports generated in period
-        reports_in_period = Report.objects.filter(
+        reports_in_period = cls._reports().filter(
             created_at__gte=start_date,
             created_at__lt=end_date
         )
         reports_generated = reports_in_period.count()
 
         # Total recommendations across all reports
-        total_recommendations = Recommendation.objects.filter(
+        total_recommendations = cls._recommendations().filter(
             report__created_at__gte=start_date,
             report__created_at__lt=end_date
         ).count()
 
         # Total potential savings
-        total_savings = Recommendation.objects.filter(
+        total_savings = cls._recommendations().filter(
             report__created_at__gte=start_date,
             report__created_at__lt=end_date
         ).aggregate(
@@ -218,6 +237,7 @@ class AnalyticsService:
         return round(change, 1)
 
     @classmethod
+    @use_replica()
     def get_category_distribution(cls) -> Dict[str, Any]:
         """
         Get recommendation distribution by category.
@@ -230,7 +250,7 @@ class AnalyticsService:
             return cached_data
 
         # Get category counts from all recommendations
-        category_counts = Recommendation.objects.values('category').annotate(
+        category_counts = cls._recommendations().values('category').annotate(
             count=Count('id')
         ).order_by('-count')
 
@@ -277,6 +297,7 @@ class AnalyticsService:
         return result
 
     @classmethod
+    @use_replica()
     def get_trend_data(cls, days: int = 30) -> Dict[str, Any]:
         """
         Get trend data for reports generated over time.
@@ -298,7 +319,7 @@ class AnalyticsService:
         start_date = end_date - timedelta(days=days)
 
         # Get reports grouped by date and report type
-        reports_by_date_type = Report.objects.filter(
+        reports_by_date_type = cls._reports().filter(
             created_at__gte=start_date,
             created_at__lte=end_date
         ).extra(
@@ -373,6 +394,7 @@ class AnalyticsService:
         return result
 
     @classmethod
+    @use_replica()
     def get_recent_activity(cls, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get recent report activity with client information.
@@ -390,7 +412,7 @@ class AnalyticsService:
             return cached_data
 
         # Get recent reports with related client data
-        recent_reports = Report.objects.select_related('client', 'created_by').order_by(
+        recent_reports = cls._reports().select_related('client', 'created_by').order_by(
             '-created_at'
         )[:limit]
 
@@ -436,6 +458,7 @@ class AnalyticsService:
         return activities
 
     @classmethod
+    @use_replica()
     def get_client_performance(cls, client_id: str = None) -> Dict[str, Any]:
         """
         Get performance metrics for a specific client or all clients.
@@ -453,7 +476,7 @@ class AnalyticsService:
             return cached_data
 
         # Base queryset
-        reports_query = Report.objects.all()
+        reports_query = cls._reports()
 
         if client_id:
             reports_query = reports_query.filter(client_id=client_id)
@@ -532,6 +555,7 @@ class AnalyticsService:
         # This is a limitation, consider using cache patterns or tags
 
     @classmethod
+    @use_replica()
     def get_business_impact_distribution(cls) -> Dict[str, Any]:
         """Get distribution of recommendations by business impact level."""
         cache_key = 'business_impact_distribution'
@@ -540,7 +564,7 @@ class AnalyticsService:
         if cached_data:
             return cached_data
 
-        impact_counts = Recommendation.objects.values('business_impact').annotate(
+        impact_counts = cls._recommendations().values('business_impact').annotate(
             count=Count('id')
         ).order_by('-count')
 
@@ -567,6 +591,7 @@ class AnalyticsService:
         return result
 
     @classmethod
+    @use_replica()
     def get_activity_history(
         cls,
         start_date: Optional[datetime] = None,
@@ -658,6 +683,7 @@ class AnalyticsService:
         }
 
     @classmethod
+    @use_replica()
     def get_entity_history(
         cls,
         entity_type: str,
@@ -749,6 +775,7 @@ class AnalyticsService:
         return activity
 
     @classmethod
+    @use_replica()
     def get_activity_summary(cls, days: int = 7) -> Dict[str, Any]:
         """
         Get summary statistics of activities for the last N days.
@@ -808,6 +835,7 @@ class AnalyticsService:
         return result
 
     @classmethod
+    @use_replica()
     def get_user_activity_detailed(
         cls,
         user_id: Optional[str] = None,
@@ -883,6 +911,7 @@ class AnalyticsService:
         }
 
     @classmethod
+    @use_replica()
     def get_activity_summary_aggregated(
         cls,
         date_from: Optional[datetime] = None,
@@ -984,6 +1013,7 @@ class AnalyticsService:
         return result
 
     @classmethod
+    @use_replica()
     def get_cost_insights(cls, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Get cost insights including total cost analyzed, potential savings, and trends.
@@ -1005,7 +1035,7 @@ class AnalyticsService:
         from decimal import Decimal
 
         # Build base query for recommendations
-        recommendations_query = Recommendation.objects.all()
+        recommendations_query = cls._recommendations()
 
         # Apply filters if provided
         if filters:
@@ -1092,6 +1122,7 @@ class AnalyticsService:
         return result
 
     @classmethod
+    @use_replica()
     def get_system_health(cls) -> Dict[str, Any]:
         """
         Get current system health metrics.
@@ -1099,7 +1130,6 @@ class AnalyticsService:
         Returns:
             Dictionary with comprehensive system health information
         """
-        from apps.reports.models import Report
         from django.db import connection
         import os
         import psutil
@@ -1128,7 +1158,7 @@ class AnalyticsService:
             db_size_formatted = f"{db_size_mb:.2f} MB"
 
         # Total reports
-        total_reports = Report.objects.count()
+        total_reports = cls._reports().count()
 
         # Active users today and this week
         now = timezone.now()
@@ -1146,7 +1176,7 @@ class AnalyticsService:
         ).values('user').distinct().count()
 
         # Average report generation time
-        completed_reports = Report.objects.filter(
+        completed_reports = cls._reports().filter(
             status='completed',
             processing_started_at__isnull=False,
             processing_completed_at__isnull=False
@@ -1163,7 +1193,7 @@ class AnalyticsService:
 
         # Error rate (last 24 hours)
         last_24h_start = now - timedelta(hours=24)
-        reports_last_24h = Report.objects.filter(created_at__gte=last_24h_start)
+        reports_last_24h = cls._reports().filter(created_at__gte=last_24h_start)
         failed_reports_24h = reports_last_24h.filter(status='failed').count()
         total_reports_24h = reports_last_24h.count()
 
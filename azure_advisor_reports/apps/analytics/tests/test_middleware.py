@@ -252,3 +252,38 @@ class UserActivityTrackingMiddlewareTestCase(TestCase):
         self.assertIn('path', activity.metadata)
         self.assertIn('method', activity.metadata)
         self.assertEqual(activity.metadata['method'], 'POST')
+
+    def test_track_client_update_changes(self):
+        """Test the field diff of a client update is stored without re-reading the client."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def update_client(request):
+            client = Client.objects.get(pk=self.test_client.pk)
+            client.status = 'inactive'
+            client.notes = 'Untracked field'
+            client.save()
+            return HttpResponse(status=200)
+
+        middleware = UserActivityTrackingMiddleware(update_client)
+        request = self.factory.patch(f'/api/v1/clients/{self.test_client.id}/')
+        request.user = self.user
+        request.META['REMOTE_ADDR'] = '127.0.0.1'
+
+        with CaptureQueriesContext(connection) as queries:
+            middleware(request)
+
+        activity = UserActivity.objects.get(user=self.user)
+        self.assertEqual(activity.action, 'update_client')
+        self.assertEqual(activity.client_id, self.test_client.id)
+        self.assertEqual(activity.metadata['changes'], [{
+            'model': 'clients.Client',
+            'id': str(self.test_client.id),
+            'created': False,
+            'fields': {'status': ['active', 'inactive']},
+        }])
+        # Load and save of the view, then the activity insert
+        self.assertEqual(
+            [q['sql'].split()[0] for q in queries],
+            ['SELECT', 'UPDATE', 'INSERT'],
+        )
@@ -8,6 +8,7 @@ from django.contrib.auth.models import Group
 from django.utils.html import format_html
 from django.contrib import messages
 
+from .cache import invalidate_users_cache
 from .models import User, UserSession
 
 
@@ -179,6 +180,7 @@ class UserAdmin(BaseUserAdmin):
     def activate_users(self, request, queryset):
         """Activate user accounts."""
         updated = queryset.update(is_active=True)
+        invalidate_users_cache(queryset.values_list('pk', flat=True))
         self.message_user(
             request,
             f'Successfully activated {updated} user(s).',
@@ -189,6 +191,7 @@ class UserAdmin(BaseUserAdmin):
     def deactivate_users(self, request, queryset):
         """Deactivate user accounts."""
         updated = queryset.update(is_active=False)
+        invalidate_users_cache(queryset.values_list('pk', flat=True))
         self.message_user(
             request,
             f'Successfully deactivated {updated} user(s).',
@@ -199,6 +202,7 @@ class UserAdmin(BaseUserAdmin):
     def grant_staff_access(self, request, queryset):
         """Grant staff access for Django admin."""
         updated = queryset.update(is_staff=True)
+        invalidate_users_cache(queryset.values_list('pk', flat=True))
         self.message_user(
             request,
             f'Successfully granted staff access to {updated} user(s).',
@@ -211,6 +215,7 @@ class UserAdmin(BaseUserAdmin):
         # Don't revoke from superusers
         queryset = queryset.filter(is_superuser=False)
         updated = queryset.update(is_staff=False)
+        invalidate_users_cache(queryset.values_list('pk', flat=True))
         self.message_user(
             request,
             f'Successfully revoked staff access from {updated} user(s).',
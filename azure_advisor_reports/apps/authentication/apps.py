@@ -11,5 +11,5 @@ class AuthenticationConfig(AppConfig):
     verbose_name = 'Authentication & User Management'
 
     def ready(self):
-        # Import signal handlers if any
-        pass
\ No newline at end of file
+        # Import signal handlers
+        from . import signals  # noqa: F401
\ No newline at end of file
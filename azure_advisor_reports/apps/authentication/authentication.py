@@ -14,12 +14,10 @@ from rest_framework import authentication
 from rest_framework import exceptions
 import logging
 
-logger = logging.getLogger(__name__)
+from .cache import get_request_user
+from .jwks import ENDPOINT_V1, ENDPOINT_V2, JWKSKeyNotFoundError, jwks_cache
 
-# Module-level logging to verify this file is being loaded by Django
-logger.critical("=" * 80)
-logger.critical("AUTHENTICATION MODULE LOADED: apps.authentication.authentication")
-logger.critical("=" * 80)
+logger = logging.getLogger(__name__)
 
 
 class JWTAuthentication(authentication.BaseAuthentication):
@@ -30,44 +28,29 @@ class JWTAuthentication(authentication.BaseAuthentication):
     These tokens are used for subsequent API requests after successful Azure AD login.
     """
 
-    def __init__(self):
-        super().__init__()
-        logger.critical("JWTAuthentication.__init__() called - Class instance created")
-
     def authenticate(self, request):
         """
         Authenticate the request using backend-generated JWT token.
         """
-        logger.info("=== JWTAuthentication.authenticate() called ===")
         auth_header = request.META.get('HTTP_AUTHORIZATION')
 
-        if not auth_header:
-            logger.info("JWTAuthentication: No auth header, returning None")
-            return None
-
-        if not auth_header.startswith('Bearer '):
-            logger.info(f"JWTAuthentication: Auth header doesn't start with 'Bearer ', returning None. Header: {auth_header[:50]}")
+        if not auth_header or not auth_header.startswith('Bearer '):
             return None
 
         token = auth_header.split(' ')[1]
-        logger.info(f"JWTAuthentication: Got token, length: {len(token)}, first 20 chars: {token[:20]}...")
 
         try:
             # Decode and verify the JWT token using our SECRET_KEY
-            logger.info("JWTAuthentication: Attempting to decode token with SECRET_KEY")
             payload = jwt.decode(
                 token,
                 settings.SECRET_KEY,
                 algorithms=['HS256']
             )
-            logger.info(f"JWTAuthentication: Successfully decoded token, payload keys: {list(payload.keys())}")
 
             # Verify token type (should be 'access')
             token_type = payload.get('type')
-            logger.info(f"JWTAuthentication: Token type is '{token_type}'")
-
             if token_type != 'access':
-                logger.info(f"JWTAuthentication: Not an access token, passing to next auth class")
+                logger.debug("JWTAuthentication: token type %r is not 'access', passing to next auth class", token_type)
                 return None  # Not our token, let other auth classes try
 
             # Get user from token payload
@@ -78,11 +61,11 @@ class JWTAuthentication(authentication.BaseAuthentication):
 
             try:
                 User = get_user_model()
-                user = User.objects.get(id=user_id)
-                logger.info(f"JWTAuthentication: Successfully authenticated user {user.email}")
+                user = get_request_user(request, user_id)
+                logger.debug("JWTAuthentication: authenticated user %s", user.pk)
                 return (user, token)
             except User.DoesNotExist:
-                logger.error(f"JWTAuthentication: User not found for ID {user_id}")
+                logger.error("JWTAuthentication: User not found for ID %s", user_id)
                 raise exceptions.AuthenticationFailed('User not found')
 
         except jwt.ExpiredSignatureError:
@@ -90,12 +73,10 @@ class JWTAuthentication(authentication.BaseAuthentication):
             raise exceptions.AuthenticationFailed('Token has expired')
         except jwt.InvalidTokenError as e:
             # Not our JWT token, return None to let other auth classes try
-            logger.info(f"JWTAuthentication: Not a backend JWT token (InvalidTokenError), passing to next auth class: {str(e)}")
+            logger.debug("JWTAuthentication: not a backend JWT token, passing to next auth class: %s", e)
             return None
         except Exception as e:
-            logger.error(f"JWTAuthentication: Unexpected error: {str(e)}")
-            import traceback
-            logger.error(f"JWTAuthentication: Traceback: {traceback.format_exc()}")
+            logger.error("JWTAuthentication: Unexpected error: %s", e, exc_info=True)
             return None
 
     def authenticate_header(self, request):
@@ -127,7 +108,7 @@ class AzureADAuthentication(authentication.BaseAuthentication):
             user = self._get_or_create_user(user_info)
             return (user, token)
         except Exception as e:
-            logger.error(f"Azure AD authentication failed: {str(e)}")
+            logger.error("Azure AD authentication failed: %s", e)
             raise exceptions.AuthenticationFailed('Invalid token')
 
     def _verify_token(self, token):
@@ -147,9 +128,10 @@ class AzureADAuthentication(authentication.BaseAuthentication):
             token_issuer = unverified_payload.get('iss')
             token_audience = unverified_payload.get('aud')
 
-            logger.info(f"Token issuer: {token_issuer}")
-            logger.info(f"Token audience: {token_audience}")
-            logger.info(f"Token type (nonce present): {'nonce' in unverified_payload}")
+            logger.debug(
+                "Token issuer: %s, audience: %s, nonce present: %s",
+                token_issuer, token_audience, 'nonce' in unverified_payload,
+            )
 
             # Determine the correct JWKS URL based on the token issuer
             tenant_id = settings.AZURE_AD['TENANT_ID']
@@ -161,56 +143,19 @@ class AzureADAuthentication(authentication.BaseAuthentication):
 
             if 'sts.windows.net' in token_issuer:
                 # v1.0 endpoint token
-                jwks_url = f"https://login.microsoftonline.com/{tenant_id}/discovery/keys"
+                jwks_version = ENDPOINT_V1
             else:
                 # v2.0 endpoint token
-                jwks_url = f"https://login.microsoftonline.com/{tenant_id}/discovery/v2.0/keys"
-
-            # Get public keys from Azure AD
-            logger.info(f"Fetching keys from: {jwks_url}")
-            jwks_response = requests.get(jwks_url, timeout=10)
-            jwks_response.raise_for_status()
-            jwks = jwks_response.json()
-            logger.info(f"Found {len(jwks.get('keys', []))} keys from Azure AD")
-
-            # Find the correct key
-            rsa_key = {}
-            for key in jwks['keys']:
-                if key['kid'] == unverified_header['kid']:
-                    rsa_key = {
-                        'kty': key['kty'],
-                        'kid': key['kid'],
-                        'use': key['use'],
-                        'n': key['n'],
-                        'e': key['e']
-                    }
-                    logger.info(f"Found matching key with kid: {key['kid']}")
-                    break
-
-            if not rsa_key:
-                logger.error(f"No matching key found for kid: {unverified_header['kid']}")
-                logger.error(f"Available kids: {[k['kid'] for k in jwks['keys']]}")
-                raise exceptions.AuthenticationFailed('Unable to find appropriate key')
+                jwks_version = ENDPOINT_V2
 
-            # Construct the public key from JWKS
-            from cryptography.hazmat.primitives.asymmetric import rsa
-            from cryptography.hazmat.primitives import serialization
-            import base64
-
-            def base64url_decode(inp):
-                padding = 4 - (len(inp) % 4)
-                if padding:
-                    inp += '=' * padding
-                return base64.urlsafe_b64decode(inp)
-
-            n = int.from_bytes(base64url_decode(rsa_key['n']), 'big')
-            e = int.from_bytes(base64url_decode(rsa_key['e']), 'big')
-
-            public_key = rsa.RSAPublicNumbers(e, n).public_key()
-            pem = public_key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo
-            )
+            # Get the public key from the cached Azure AD key set
+            try:
+                public_key = jwks_cache.get_signing_key(
+                    tenant_id, unverified_header['kid'], version=jwks_version
+                )
+            except JWKSKeyNotFoundError:
+                logger.error("No matching key found for kid: %s", unverified_header['kid'])
+                raise exceptions.AuthenticationFailed('Unable to find appropriate key')
 
             # Verify and decode the token with STRICT audience validation
             # Security: Only accept ID tokens issued for this application
@@ -220,7 +165,7 @@ class AzureADAuthentication(authentication.BaseAuthentication):
             # Only accept tokens issued specifically for this application
             payload = jwt.decode(
                 token,
-                pem,
+                public_key,
                 algorithms=['RS256'],
                 issuer=token_issuer,
                 audience=client_id,  # Strict validation - only accept our client_id
@@ -246,30 +191,30 @@ class AzureADAuthentication(authentication.BaseAuthentication):
             # Verify token_use claim if present (additional validation)
             token_use = payload.get('token_use')
             if token_use and token_use != 'id_token':
-                logger.error(f'Invalid token_use: {token_use}')
+                logger.error('Invalid token_use: %s', token_use)
                 raise exceptions.AuthenticationFailed(
                     f'Invalid token type: {token_use}. Expected id_token.'
                 )
 
-            logger.info(f"Token verified successfully for user: {payload.get('preferred_username', 'unknown')}")
-            logger.info(f"Token audience validated: {payload.get('aud')}")
+            logger.debug(
+                "Token verified for user %s (audience %s)",
+                payload.get('preferred_username', 'unknown'), payload.get('aud'),
+            )
             return payload
 
         except jwt.ExpiredSignatureError as e:
-            logger.error(f"Token expired: {str(e)}")
+            logger.warning("Token expired: %s", e)
             raise exceptions.AuthenticationFailed('Token has expired')
         except jwt.InvalidTokenError as e:
-            logger.error(f"Invalid token details: {type(e).__name__} - {str(e)}")
-            logger.error(f"Token header: {jwt.get_unverified_header(token)}")
-            logger.error(f"Token payload (unverified): {jwt.decode(token, options={'verify_signature': False})}")
+            logger.error("Invalid token details: %s - %s", type(e).__name__, e)
             raise exceptions.AuthenticationFailed(f'Invalid token: {str(e)}')
         except requests.RequestException as e:
-            logger.error(f"Failed to get Azure AD keys: {str(e)}")
+            logger.error("Failed to get Azure AD keys: %s", e)
             raise exceptions.AuthenticationFailed('Unable to verify token')
         except Exception as e:
-            logger.error(f"Unexpected error during token verification: {type(e).__name__} - {str(e)}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.error(
+                "Unexpected error during token verification: %s - %s", type(e).__name__, e, exc_info=True
+            )
             raise exceptions.AuthenticationFailed(f'Token verification failed: {str(e)}')
 
     def _get_or_create_user(self, user_info):
@@ -0,0 +1,162 @@
+"""
+Redis caching for JWT authentication.
+
+Keeps token revocation state and authenticated users out of the database on
+the request path:
+
+- Token state index: one cache key per JWT ID holding 'active' or 'revoked',
+  expiring together with the token. It is written when tokens are issued
+  and revoked (see signals.py and TokenBlacklist.revoke_user_tokens), and
+  backfilled from TokenBlacklist on a miss, so the database stays the
+  source of truth when the cache is cold or flushed.
+- User cache: authenticated users are cached for a short TTL and
+  invalidated by User save/delete signals. Within one request the user is
+  additionally memoized on the request object, so the JWT middleware and
+  the DRF authentication class share a single lookup.
+"""
+
+import logging
+from datetime import datetime, timezone as dt_timezone
+from typing import Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+TOKEN_STATE_ACTIVE = 'active'
+TOKEN_STATE_REVOKED = 'revoked'
+
+# Short TTL bounds staleness for user changes made via QuerySet.update()
+USER_CACHE_TTL = getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+
+REQUEST_USER_ATTR = '_jwt_authenticated_user'
+
+
+# ============================================================================
+# Token State Index
+# ============================================================================
+
+def get_token_state_key(jti):
+    """Get cache key for a token's revocation state."""
+    return f"jwt_token_state:{jti}"
+
+
+def _seconds_until(expires_at):
+    """Return whole seconds until ``expires_at`` (datetime or epoch), or 0."""
+    if isinstance(expires_at, datetime):
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=dt_timezone.utc)
+        remaining = (expires_at - datetime.now(dt_timezone.utc)).total_seconds()
+    else:
+        remaining = float(expires_at) - datetime.now(dt_timezone.utc).timestamp()
+    return max(int(remaining) + 1, 0)
+
+
+def get_token_state(jti) -> Optional[str]:
+    """
+    Look up a token's state in the index.
+
+    Returns:
+        str: TOKEN_STATE_ACTIVE, TOKEN_STATE_REVOKED, or None on a cache miss
+    """
+    return cache.get(get_token_state_key(jti))
+
+
+def mark_token_active(jti, expires_at):
+    """
+    Record an issued token as active.
+
+    Uses ``cache.add`` so a concurrent revocation is never overwritten.
+    """
+    timeout = _seconds_until(expires_at)
+    if timeout:
+        cache.add(get_token_state_key(jti), TOKEN_STATE_ACTIVE, timeout)
+
+
+def mark_token_revoked(jti, expires_at):
+    """Record a token as revoked until it expires."""
+    timeout = _seconds_until(expires_at)
+    if timeout:
+        cache.set(get_token_state_key(jti), TOKEN_STATE_REVOKED, timeout)
+
+
+def mark_tokens_revoked(tokens: Iterable[Tuple[str, datetime]]):
+    """
+    Record several tokens as revoked in a single round trip.
+
+    Args:
+        tokens: Iterable of (jti, expires_at) pairs
+    """
+    entries = {}
+    timeout = 0
+    for jti, expires_at in tokens:
+        remaining = _seconds_until(expires_at)
+        if remaining:
+            entries[get_token_state_key(jti)] = TOKEN_STATE_REVOKED
+            timeout = max(timeout, remaining)
+
+    if entries:
+        cache.set_many(entries, timeout)
+
+
+# ============================================================================
+# User Cache
+# ============================================================================
+
+def get_user_cache_key(user_id):
+    """Get cache key for an authenticated user."""
+    return f"auth_user:{user_id}"
+
+
+def get_cached_user(user_id):
+    """
+    Return the user for ``user_id``, loading it from the database on a miss.
+
+    Raises:
+        User.DoesNotExist: If the user does not exist
+    """
+    key = get_user_cache_key(user_id)
+    user = cache.get(key)
+
+    if user is None:
+        User = get_user_model()
+        user = User.objects.get(id=user_id)
+        cache.set(key, user, USER_CACHE_TTL)
+
+    return user
+
+
+def get_request_user(request, user_id):
+    """
+    Return the user for ``user_id``, loading it at most once per request.
+
+    Accepts either a Django ``HttpRequest`` or a DRF ``Request``; the memo is
+    stored on the underlying ``HttpRequest`` so middleware and DRF share it.
+
+    Raises:
+        User.DoesNotExist: If the user does not exist
+    """
+    http_request = getattr(request, '_request', request)
+    memo = getattr(http_request, REQUEST_USER_ATTR, None)
+
+    if memo is not None and str(memo.pk) == str(user_id):
+        return memo
+
+    user = get_cached_user(user_id)
+    setattr(http_request, REQUEST_USER_ATTR, user)
+    return user
+
+
+def invalidate_user_cache(user_id):
+    """Invalidate the cached user for ``user_id``."""
+    cache.delete(get_user_cache_key(user_id))
+    logger.debug("Invalidated user cache for %s", user_id)
+
+
+def invalidate_users_cache(user_ids: Iterable):
+    """Invalidate cached users after a bulk ``QuerySet.update()``."""
+    keys = [get_user_cache_key(user_id) for user_id in user_ids]
+    if keys:
+        cache.delete_many(keys)
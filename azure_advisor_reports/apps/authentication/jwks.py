@@ -0,0 +1,295 @@
+"""
+Azure AD signing key (JWKS) cache.
+
+Verifying an Azure AD token needs the tenant's public signing keys. Fetching
+them from login.microsoftonline.com on every request adds an outbound HTTPS
+round trip to each authenticated call, so keys are cached at two levels:
+
+- An in-process cache of already parsed public key objects. The hot path does
+  no network, cache or key parsing work.
+- The shared Django cache (Redis in production), so a fresh worker process can
+  warm itself without calling Azure AD.
+
+Entries are keyed by tenant and endpoint version (v1.0 / v2.0) and refreshed
+once they are older than ``AZURE_AD_JWKS_CACHE_TTL`` seconds. A token signed
+with an unknown ``kid`` (Azure AD rotated its keys) forces a refresh, but at
+most once per ``AZURE_AD_JWKS_REFRESH_INTERVAL`` seconds per key set and
+across all workers, so forged kids cannot be used to hammer Azure AD.
+
+Once the TTL has passed, a single worker refreshes the keys (a lock in the
+shared cache) while the others keep serving the expired ones. If a refresh
+fails, the previous keys keep being served, without any further attempt in
+any worker for ``AZURE_AD_JWKS_RETRY_AFTER`` seconds, until they are older
+than ``AZURE_AD_JWKS_MAX_STALE`` seconds. Requests therefore never wait on
+an unreachable Azure AD while usable keys are cached.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from jwt.algorithms import RSAAlgorithm
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOGIN_BASE_URL = 'https://login.microsoftonline.com'
+DEFAULT_JWKS_CACHE_TTL = 60 * 60 * 6  # 6 hours
+DEFAULT_JWKS_REFRESH_INTERVAL = 60  # 1 minute between forced refreshes
+DEFAULT_JWKS_MAX_STALE = 60 * 60 * 24  # Serve stale keys for up to 24 hours
+DEFAULT_JWKS_RETRY_AFTER = 60  # Pause after a failed refresh
+JWKS_FETCH_TIMEOUT = 10
+
+ENDPOINT_V1 = 'v1.0'
+ENDPOINT_V2 = 'v2.0'
+
+
+class JWKSError(Exception):
+    """Base exception for JWKS cache errors."""
+    pass
+
+
+class JWKSKeyNotFoundError(JWKSError):
+    """Raised when no signing key matches the token's ``kid``."""
+    pass
+
+
+class _KeySet:
+    """Parsed signing keys for one tenant and endpoint version."""
+
+    __slots__ = ('keys', 'fetched_at')
+
+    def __init__(self, keys: Dict[str, object], fetched_at: float):
+        self.keys = keys
+        self.fetched_at = fetched_at
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class JWKSCache:
+    """
+    Two-level cache of Azure AD signing keys.
+
+    Use the module-level ``jwks_cache`` instance rather than creating new
+    instances, otherwise the in-process level is lost.
+    """
+
+    def __init__(self):
+        self._local: Dict[Tuple[str, str], _KeySet] = {}
+        self._last_forced_refresh: Dict[Tuple[str, str], float] = {}
+        self._retry_after: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Configuration (read lazily so settings overrides apply)
+    # ------------------------------------------------------------------
+
+    @property
+    def ttl(self) -> int:
+        return getattr(settings, 'AZURE_AD_JWKS_CACHE_TTL', DEFAULT_JWKS_CACHE_TTL)
+
+    @property
+    def refresh_interval(self) -> int:
+        return getattr(settings, 'AZURE_AD_JWKS_REFRESH_INTERVAL', DEFAULT_JWKS_REFRESH_INTERVAL)
+
+    @property
+    def max_stale(self) -> int:
+        return max(getattr(settings, 'AZURE_AD_JWKS_MAX_STALE', DEFAULT_JWKS_MAX_STALE), self.ttl)
+
+    @property
+    def retry_after(self) -> int:
+        return getattr(settings, 'AZURE_AD_JWKS_RETRY_AFTER', DEFAULT_JWKS_RETRY_AFTER)
+
+    @property
+    def base_url(self) -> str:
+        azure_ad = getattr(settings, 'AZURE_AD', {}) or {}
+        return azure_ad.get('LOGIN_BASE_URL', DEFAULT_LOGIN_BASE_URL).rstrip('/')
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_jwks_url(self, tenant_id: str, version: str = ENDPOINT_V2) -> str:
+        """Return the discovery keys URL for a tenant and endpoint version."""
+        if version == ENDPOINT_V1:
+            return f"{self.base_url}/{tenant_id}/discovery/keys"
+        return f"{self.base_url}/{tenant_id}/discovery/v2.0/keys"
+
+    def get_signing_key(self, tenant_id: str, kid: str, version: str = ENDPOINT_V2):
+        """
+        Return the parsed public key for ``kid``.
+
+        Args:
+            tenant_id: Azure AD tenant ID
+            kid: Key ID from the token header
+            version: Token endpoint version, 'v1.0' or 'v2.0'
+
+        Returns:
+            RSA public key object usable with ``jwt.decode``
+
+        Raises:
+            JWKSKeyNotFoundError: If no key matches ``kid``, even after a refresh
+            requests.RequestException: If keys cannot be fetched and nothing is cached
+        """
+        cache_id = (tenant_id, version)
+        keyset = self._get_keyset(cache_id)
+
+        key = keyset.keys.get(kid)
+        if key is not None:
+            return key
+
+        # Unknown kid: Azure AD may have rotated its keys since we cached them.
+        keyset = self._refresh_for_unknown_kid(cache_id, keyset)
+        key = keyset.keys.get(kid)
+        if key is None:
+            logger.warning(
+                "No JWKS key found for kid %s (tenant %s, %s); available kids: %s",
+                kid, tenant_id, version, sorted(keyset.keys),
+            )
+            raise JWKSKeyNotFoundError(f"Unable to find signing key for kid: {kid}")
+        return key
+
+    def clear(self):
+        """Drop the in-process level (the shared cache is left untouched)."""
+        with self._lock:
+            self._local.clear()
+            self._last_forced_refresh.clear()
+            self._retry_after.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _shared_cache_key(cache_id: Tuple[str, str]) -> str:
+        tenant_id, version = cache_id
+        return f"azure_ad_jwks:{tenant_id}:{version}"
+
+    @staticmethod
+    def _retry_key(cache_id: Tuple[str, str]) -> str:
+        return f"{JWKSCache._shared_cache_key(cache_id)}:retry_after"
+
+    def _get_keyset(self, cache_id: Tuple[str, str]) -> _KeySet:
+        keyset = self._local.get(cache_id)
+        if keyset is not None and keyset.age() < self.ttl:
+            return keyset
+
+        # A refresh failed or is running elsewhere: no cache round trip either
+        if keyset is not None and self._retry_after.get(cache_id, 0.0) > time.time():
+            return keyset
+
+        shared = self._load_shared(cache_id)
+        if shared is not None and shared.age() < self.ttl:
+            self._local[cache_id] = shared
+            return shared
+
+        stale = keyset if keyset is not None else shared
+        if shared is not None and keyset is not None and shared.fetched_at > keyset.fetched_at:
+            stale = shared
+        if stale is None or stale.age() >= self.max_stale:
+            return self._fetch(cache_id, stale=stale)
+
+        # Expired but still usable: one worker refreshes, the others serve the
+        # stale keys meanwhile
+        retry_until = cache.get(self._retry_key(cache_id))
+        if retry_until:
+            return self._defer(cache_id, stale, retry_until)
+        lock_key = f"{self._shared_cache_key(cache_id)}:refresh"
+        if not cache.add(lock_key, time.time(), JWKS_FETCH_TIMEOUT + 5):
+            return self._defer(cache_id, stale, time.time() + JWKS_FETCH_TIMEOUT)
+        try:
+            return self._fetch(cache_id, stale=stale)
+        finally:
+            cache.delete(lock_key)
+
+    def _defer(self, cache_id: Tuple[str, str], stale: _KeySet, until: float) -> _KeySet:
+        self._retry_after[cache_id] = until
+        self._local[cache_id] = stale
+        return stale
+
+    def _refresh_for_unknown_kid(self, cache_id: Tuple[str, str], keyset: _KeySet) -> _KeySet:
+        # Another worker may already have picked up the rotated keys.
+        shared = self._load_shared(cache_id)
+        if shared is not None and shared.fetched_at > keyset.fetched_at:
+            self._local[cache_id] = shared
+            keyset = shared
+
+        now = time.time()
+        with self._lock:
+            last = self._last_forced_refresh.get(cache_id, 0.0)
+            if now - last < self.refresh_interval:
+                return keyset
+            self._last_forced_refresh[cache_id] = now
+
+        # Rate limit across workers as well
+        lock_key = f"{self._shared_cache_key(cache_id)}:forced_refresh"
+        if not cache.add(lock_key, now, self.refresh_interval):
+            logger.debug("Forced JWKS refresh for %s skipped: rate limited", cache_id)
+            return keyset
+
+        logger.info("Unknown kid for %s, forcing JWKS refresh", cache_id)
+        return self._fetch(cache_id, stale=keyset)
+
+    def _fetch(self, cache_id: Tuple[str, str], stale: Optional[_KeySet] = None) -> _KeySet:
+        tenant_id, version = cache_id
+        url = self.get_jwks_url(tenant_id, version)
+
+        try:
+            response = requests.get(url, timeout=JWKS_FETCH_TIMEOUT)
+            response.raise_for_status()
+            jwks = response.json()
+        except (requests.RequestException, ValueError) as e:
+            if stale is not None and stale.age() < self.max_stale:
+                logger.warning(
+                    "JWKS fetch from %s failed, serving cached keys for %ds: %s",
+                    url, self.retry_after, e,
+                )
+                retry_until = time.time() + self.retry_after
+                cache.add(self._retry_key(cache_id), retry_until, self.retry_after)
+                return self._defer(cache_id, stale, retry_until)
+            logger.error("JWKS fetch from %s failed: %s", url, e)
+            if isinstance(e, requests.RequestException):
+                raise
+            raise requests.RequestException(f"Invalid JWKS response from {url}") from e
+
+        fetched_at = time.time()
+        keyset = _KeySet(self._parse_keys(jwks), fetched_at)
+        self._local[cache_id] = keyset
+        self._retry_after.pop(cache_id, None)
+        cache.delete(self._retry_key(cache_id))
+        cache.set(
+            self._shared_cache_key(cache_id),
+            {'jwks': jwks, 'fetched_at': fetched_at},
+            self.max_stale,
+        )
+        logger.info("Fetched %d JWKS keys from %s", len(keyset.keys), url)
+        return keyset
+
+    def _load_shared(self, cache_id: Tuple[str, str]) -> Optional[_KeySet]:
+        entry = cache.get(self._shared_cache_key(cache_id))
+        if not entry:
+            return None
+        try:
+            return _KeySet(self._parse_keys(entry['jwks']), entry['fetched_at'])
+        except (KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _parse_keys(jwks: Dict) -> Dict[str, object]:
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            kid = jwk.get('kid')
+            if not kid or jwk.get('kty') != 'RSA':
+                continue
+            try:
+                keys[kid] = RSAAlgorithm.from_jwk(jwk)
+            except Exception as e:
+                logger.warning("Skipping unparseable JWKS key %s: %s", kid, e)
+        return keys
+
+
+jwks_cache = JWKSCache()
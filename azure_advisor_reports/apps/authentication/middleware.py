@@ -7,6 +7,7 @@ from django.contrib.auth import get_user_model
 from django.utils.deprecation import MiddlewareMixin
 from rest_framework.exceptions import AuthenticationFailed
 
+from .cache import get_request_user
 from .services import JWTService
 
 User = get_user_model()
@@ -54,10 +55,10 @@ class JWTAuthenticationMiddleware(MiddlewareMixin):
             is_valid, payload = JWTService.validate_token(token, token_type='access')
 
             if is_valid and payload:
-                # Get user from database
+                # Get user (cached, loaded at most once per request)
                 user_id = payload.get('user_id')
                 try:
-                    user = User.objects.get(id=user_id)
+                    user = get_request_user(request, user_id)
 
                     # Attach user to request
                     request.user = user
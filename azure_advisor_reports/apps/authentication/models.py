@@ -6,8 +6,10 @@ import uuid
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from apps.core.tracking import TrackedFieldsMixin
 
-class User(AbstractUser):
+
+class User(TrackedFieldsMixin, AbstractUser):
     """
     Extended user model with Azure AD integration and role-based access control.
     """
@@ -18,6 +20,9 @@ class User(AbstractUser):
         ('viewer', 'Viewer'),
     ]
 
+    # Changes of these fields are recorded with the user activity (apps/core/tracking.py)
+    TRACKED_FIELDS = ('email', 'first_name', 'last_name', 'role', 'is_active', 'is_staff', 'is_superuser')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     azure_object_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
     tenant_id = models.CharField(max_length=255, null=True, blank=True)
@@ -187,14 +192,23 @@ class TokenBlacklist(models.Model):
             int: Number of tokens revoked
         """
         from django.utils import timezone
+        from .cache import mark_tokens_revoked
+
+        revoked_at = timezone.now()
         count = cls.objects.filter(
             user=user,
             is_revoked=False
         ).update(
             is_revoked=True,
-            revoked_at=timezone.now(),
+            revoked_at=revoked_at,
             revoked_reason=reason
         )
+
+        # Bulk update bypasses post_save, so update the token state index here
+        if count:
+            mark_tokens_revoked(
+                cls.objects.filter(user=user, revoked_at=revoked_at).values_list('jti', 'expires_at')
+            )
         return count
 
     def revoke(self, reason='manual'):
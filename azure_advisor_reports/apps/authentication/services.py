@@ -15,11 +15,18 @@ from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
 from django.utils import timezone
 from msal import ConfidentialClientApplication, PublicClientApplication
 import requests
 
+from .cache import (
+    TOKEN_STATE_REVOKED,
+    get_token_state,
+    mark_token_active,
+    mark_token_revoked,
+)
+from .jwks import JWKSKeyNotFoundError, jwks_cache
+
 User = get_user_model()
 logger = logging.getLogger(__name__)
 security_logger = logging.getLogger('security')
@@ -61,20 +68,6 @@ class AzureADService:
             Tuple of (is_valid, user_info_dict or None)
         """
         try:
-            # Get Microsoft's public signing keys (JWKS)
-            jwks_uri = f"https://login.microsoftonline.com/{self.tenant_id}/discovery/v2.0/keys"
-
-            # Check cache first
-            cache_key = f"azure_ad_jwks_{self.tenant_id}"
-            jwks = cache.get(cache_key)
-
-            if not jwks:
-                logger.info("Fetching Azure AD JWKS keys...")
-                response = requests.get(jwks_uri, timeout=10)
-                response.raise_for_status()
-                jwks = response.json()
-                cache.set(cache_key, jwks, 3600)  # Cache for 1 hour
-
             # Get the key ID from token header
             unverified_header = jwt.get_unverified_header(access_token)
             kid = unverified_header.get('kid')
@@ -83,23 +76,13 @@ class AzureADService:
                 logger.error("Token missing 'kid' (key ID) in header")
                 return False, None
 
-            # Find the matching public key from JWKS
-            rsa_key = None
-            for key in jwks.get('keys', []):
-                if key.get('kid') == kid:
-                    rsa_key = key
-                    break
-
-            if not rsa_key:
+            # Find the matching public key in the cached Azure AD key set
+            try:
+                public_key = jwks_cache.get_signing_key(self.tenant_id, kid)
+            except JWKSKeyNotFoundError:
                 logger.error(f"Unable to find matching public key for kid: {kid}")
                 return False, None
 
-            # Convert JWK to PEM format for PyJWT
-            from jwt.algorithms import RSAAlgorithm
-            import json
-
-            public_key = RSAAlgorithm.from_jwk(json.dumps(rsa_key))
-
             # Decode and validate the token with full signature verification
             # Note: audience validation for idToken uses the client_id
             decoded_token = jwt.decode(
@@ -346,6 +329,9 @@ class JWTService:
         3. Verifies token has not been revoked (blacklist check)
         4. Ensures token exists in database (prevents forged tokens with valid JTI)
 
+        Steps 3 and 4 are answered from the Redis token state index; the
+        database is only queried when the index has no entry for the token.
+
         Args:
             token: JWT token string
             token_type: Type of token ('access' or 'refresh')
@@ -369,27 +355,41 @@ class JWTService:
             # Check if token is blacklisted
             jti = payload.get('jti')
             if jti:
-                from .models import TokenBlacklist
+                # Fast path: token state index in Redis, no database query
+                state = get_token_state(jti)
 
-                try:
-                    token_record = TokenBlacklist.objects.get(jti=jti)
+                if state == TOKEN_STATE_REVOKED:
+                    security_logger.warning(
+                        f"Rejected revoked token {jti[:8]}... for user {payload.get('email')}"
+                    )
+                    return False, None
+
+                if state is None:
+                    # Cache miss: fall back to the database and backfill the index
+                    from .models import TokenBlacklist
+
+                    try:
+                        token_record = TokenBlacklist.objects.get(jti=jti)
+
+                        # Check if token has been revoked
+                        if token_record.is_revoked:
+                            mark_token_revoked(jti, token_record.expires_at)
+                            security_logger.warning(
+                                f"Rejected revoked token {jti[:8]}... for user {payload.get('email')} "
+                                f"(reason: {token_record.revoked_reason})"
+                            )
+                            return False, None
 
-                    # Check if token has been revoked
-                    if token_record.is_revoked:
-                        security_logger.warning(
-                            f"Rejected revoked token {jti[:8]}... for user {payload.get('email')} "
-                            f"(reason: {token_record.revoked_reason})"
+                        mark_token_active(jti, token_record.expires_at)
+
+                    except TokenBlacklist.DoesNotExist:
+                        # Token not found in database - could be forged or database issue
+                        security_logger.error(
+                            f"Token {jti[:8]}... not found in database - potential forgery attempt"
                         )
                         return False, None
 
-                    logger.debug(f"Token {jti[:8]}... validated successfully")
-
-                except TokenBlacklist.DoesNotExist:
-                    # Token not found in database - could be forged or database issue
-                    security_logger.error(
-                        f"Token {jti[:8]}... not found in database - potential forgery attempt"
-                    )
-                    return False, None
+                logger.debug(f"Token {jti[:8]}... validated successfully")
             else:
                 # No JTI in token - old format or invalid
                 logger.warning("Token missing JTI claim - rejecting for security")
@@ -0,0 +1,31 @@
+"""
+Signal handlers for the authentication app.
+
+Keep the JWT token state index and the authenticated-user cache in
+apps/authentication/cache.py consistent with the database.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_user_cache, mark_token_active, mark_token_revoked
+from .models import TokenBlacklist
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=TokenBlacklist)
+def index_token_state(sender, instance, **kwargs):
+    """Record issued and revoked tokens in the token state index."""
+    if instance.is_revoked:
+        mark_token_revoked(instance.jti, instance.expires_at)
+    else:
+        mark_token_active(instance.jti, instance.expires_at)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the cached copy of a user whenever it changes."""
+    invalidate_user_cache(instance.pk)
@@ -0,0 +1,179 @@
+"""
+Test cases for JWT authentication caching
+Tests the token state index and user cache in apps.authentication.cache
+"""
+
+import jwt
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework.test import APIRequestFactory
+
+from apps.authentication.authentication import JWTAuthentication
+from apps.authentication.cache import (
+    TOKEN_STATE_ACTIVE,
+    TOKEN_STATE_REVOKED,
+    get_cached_user,
+    get_token_state,
+    get_token_state_key,
+    get_user_cache_key,
+)
+from apps.authentication.middleware import JWTAuthenticationMiddleware
+from apps.authentication.models import TokenBlacklist
+from apps.authentication.services import JWTService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def cache_user(db):
+    cache.clear()
+    user = User.objects.create_user(
+        username='cacheuser',
+        email='cacheuser@example.com',
+        password='testpass123',
+        role='analyst',
+    )
+    yield user
+    cache.clear()
+
+
+def _jti(token):
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])['jti']
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.jwt
+class TestTokenStateIndex:
+    """Tests for the Redis token state index"""
+
+    def test_issued_tokens_are_indexed_as_active(self, cache_user):
+        """Test generate_token records both tokens as active"""
+        tokens = JWTService.generate_token(cache_user)
+
+        assert get_token_state(_jti(tokens['access_token'])) == TOKEN_STATE_ACTIVE
+        assert get_token_state(_jti(tokens['refresh_token'])) == TOKEN_STATE_ACTIVE
+
+    def test_validate_token_needs_no_queries(self, cache_user, django_assert_num_queries):
+        """Test validation of an indexed token does not touch the database"""
+        tokens = JWTService.generate_token(cache_user)
+
+        with django_assert_num_queries(0):
+            is_valid, payload = JWTService.validate_token(tokens['access_token'])
+
+        assert is_valid
+        assert payload['user_id'] == str(cache_user.id)
+
+    def test_revoked_token_is_rejected_without_queries(self, cache_user, django_assert_num_queries):
+        """Test revoke_token updates the index and validation rejects it"""
+        tokens = JWTService.generate_token(cache_user)
+        jti = _jti(tokens['access_token'])
+
+        assert JWTService.revoke_token(jti, reason='logout')
+        assert get_token_state(jti) == TOKEN_STATE_REVOKED
+
+        with django_assert_num_queries(0):
+            is_valid, payload = JWTService.validate_token(tokens['access_token'])
+
+        assert not is_valid
+        assert payload is None
+
+    def test_revoke_all_user_tokens_updates_index(self, cache_user):
+        """Test bulk revocation is reflected in the index"""
+        first = JWTService.generate_token(cache_user)
+        second = JWTService.generate_token(cache_user)
+
+        assert JWTService.revoke_all_user_tokens(cache_user) == 4
+
+        for tokens in (first, second):
+            for token_type in ('access_token', 'refresh_token'):
+                assert get_token_state(_jti(tokens[token_type])) == TOKEN_STATE_REVOKED
+
+        assert not JWTService.validate_token(first['access_token'])[0]
+
+    def test_cache_miss_falls_back_to_database(self, cache_user):
+        """Test a cold index is backfilled from TokenBlacklist"""
+        tokens = JWTService.generate_token(cache_user)
+        jti = _jti(tokens['access_token'])
+        cache.delete(get_token_state_key(jti))
+
+        assert JWTService.validate_token(tokens['access_token'])[0]
+        assert get_token_state(jti) == TOKEN_STATE_ACTIVE
+
+    def test_cache_miss_respects_database_revocation(self, cache_user):
+        """Test a revoked token stays rejected when the index was flushed"""
+        tokens = JWTService.generate_token(cache_user)
+        jti = _jti(tokens['access_token'])
+        TokenBlacklist.objects.get(jti=jti).revoke(reason='test')
+        cache.clear()
+
+        assert not JWTService.validate_token(tokens['access_token'])[0]
+        assert get_token_state(jti) == TOKEN_STATE_REVOKED
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.jwt
+class TestUserCache:
+    """Tests for the authenticated user cache"""
+
+    def test_cached_user_is_loaded_once(self, cache_user, django_assert_num_queries):
+        """Test the second lookup is served from the cache"""
+        get_cached_user(cache_user.id)
+
+        with django_assert_num_queries(0):
+            user = get_cached_user(cache_user.id)
+
+        assert user.pk == cache_user.pk
+
+    def test_user_save_invalidates_cache(self, cache_user):
+        """Test saving a user drops the cached copy"""
+        get_cached_user(cache_user.id)
+        cache_user.role = 'manager'
+        cache_user.save()
+
+        assert cache.get(get_user_cache_key(cache_user.id)) is None
+        assert get_cached_user(cache_user.id).role == 'manager'
+
+    def test_user_delete_invalidates_cache(self, cache_user):
+        """Test deleting a user drops the cached copy"""
+        user_id = cache_user.id
+        get_cached_user(user_id)
+        cache_user.delete()
+
+        with pytest.raises(User.DoesNotExist):
+            get_cached_user(user_id)
+
+    def test_middleware_and_drf_share_one_lookup(self, cache_user, django_assert_num_queries):
+        """Test a request authenticated twice loads the user at most once"""
+        tokens = JWTService.generate_token(cache_user)
+        cache.delete(get_user_cache_key(cache_user.id))
+
+        request = RequestFactory().get('/api/v1/reports/')
+        request.META['HTTP_AUTHORIZATION'] = f"Bearer {tokens['access_token']}"
+        middleware = JWTAuthenticationMiddleware(get_response=lambda r: HttpResponse())
+
+        with django_assert_num_queries(1):
+            middleware.process_request(request)
+            user, _ = JWTAuthentication().authenticate(request)
+
+        assert user is request.user
+
+    def test_warm_request_needs_no_queries(self, cache_user, django_assert_num_queries):
+        """Test JWT authentication is query-free once caches are warm"""
+        tokens = JWTService.generate_token(cache_user)
+        get_cached_user(cache_user.id)
+
+        request = APIRequestFactory().get('/api/v1/reports/')
+        request.META['HTTP_AUTHORIZATION'] = f"Bearer {tokens['access_token']}"
+        middleware = JWTAuthenticationMiddleware(get_response=lambda r: HttpResponse())
+
+        with django_assert_num_queries(0):
+            middleware.process_request(request)
+            user, _ = JWTAuthentication().authenticate(request)
+
+        assert user.pk == cache_user.pk
@@ -0,0 +1,276 @@
+"""
+Test cases for the Azure AD JWKS cache
+Tests apps.authentication.jwks against a local JWKS stand-in server
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import jwt
+import pytest
+import requests
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.cache import cache
+from django.test import override_settings
+from jwt.algorithms import RSAAlgorithm
+from rest_framework import exceptions
+from rest_framework.test import APIRequestFactory
+
+from apps.authentication.authentication import AzureADAuthentication
+from apps.authentication.jwks import (
+    ENDPOINT_V1,
+    ENDPOINT_V2,
+    JWKSKeyNotFoundError,
+    jwks_cache,
+)
+
+TENANT_ID = 'test-tenant'
+CLIENT_ID = 'test-client-id'
+
+
+def _generate_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({'kid': kid, 'use': 'sig'})
+    return private_key, jwk
+
+
+class _JWKSServer:
+    """Minimal stand-in for login.microsoftonline.com/{tenant}/discovery/keys."""
+
+    def __init__(self):
+        self.keys = []
+        self.requests = []
+        self.fail = False
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                if server.fail:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps({'keys': server.keys}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = HTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def jwks_server():
+    server = _JWKSServer()
+    azure_ad = {
+        'TENANT_ID': TENANT_ID,
+        'CLIENT_ID': CLIENT_ID,
+        'LOGIN_BASE_URL': server.url,
+    }
+    cache.clear()
+    jwks_cache.clear()
+    with override_settings(
+        AZURE_AD=azure_ad,
+        AZURE_AD_JWKS_CACHE_TTL=3600,
+        AZURE_AD_JWKS_REFRESH_INTERVAL=60,
+        AZURE_AD_JWKS_MAX_STALE=86400,
+    ):
+        yield server
+    server.stop()
+    cache.clear()
+    jwks_cache.clear()
+
+
+def _make_token(private_key, kid, issuer=f"https://login.microsoftonline.com/{TENANT_ID}/v2.0"):
+    now = datetime.utcnow()
+    payload = {
+        'iss': issuer,
+        'aud': CLIENT_ID,
+        'oid': 'azure-object-id-123',
+        'preferred_username': 'jwks@example.com',
+        'nonce': 'nonce',
+        'iat': now,
+        'exp': now + timedelta(minutes=5),
+    }
+    return jwt.encode(payload, private_key, algorithm='RS256', headers={'kid': kid})
+
+
+@pytest.mark.unit
+@pytest.mark.azure_ad
+class TestJWKSCache:
+    """Tests for JWKSCache"""
+
+    def test_keys_are_fetched_once_and_served_from_memory(self, jwks_server):
+        """Test repeated lookups do not hit the JWKS endpoint again"""
+        _, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+
+        first = jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+        for _ in range(10):
+            assert jwks_cache.get_signing_key(TENANT_ID, 'key-1') is first
+
+        assert jwks_server.requests == [f"/{TENANT_ID}/discovery/v2.0/keys"]
+        assert isinstance(first, rsa.RSAPublicKey)
+
+    def test_endpoint_versions_are_cached_separately(self, jwks_server):
+        """Test v1.0 and v2.0 key sets use their own URLs and entries"""
+        _, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+
+        jwks_cache.get_signing_key(TENANT_ID, 'key-1', version=ENDPOINT_V1)
+        jwks_cache.get_signing_key(TENANT_ID, 'key-1', version=ENDPOINT_V2)
+
+        assert jwks_server.requests == [
+            f"/{TENANT_ID}/discovery/keys",
+            f"/{TENANT_ID}/discovery/v2.0/keys",
+        ]
+
+    def test_new_process_warms_from_shared_cache(self, jwks_server):
+        """Test a cleared in-process cache is refilled from the shared cache"""
+        _, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+
+        jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+        jwks_cache.clear()
+        jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+
+        assert len(jwks_server.requests) == 1
+
+    def test_expired_entry_is_refreshed(self, jwks_server):
+        """Test keys older than the TTL are fetched again"""
+        _, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+
+        with override_settings(AZURE_AD_JWKS_CACHE_TTL=0):
+            jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+            jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+
+        assert len(jwks_server.requests) == 2
+
+    def test_unknown_kid_forces_refresh_after_rotation(self, jwks_server):
+        """Test a rotated key is picked up on the first token that uses it"""
+        _, old_jwk = _generate_key('old-key')
+        _, new_jwk = _generate_key('new-key')
+        jwks_server.keys = [old_jwk]
+        jwks_cache.get_signing_key(TENANT_ID, 'old-key')
+
+        jwks_server.keys = [old_jwk, new_jwk]
+        assert jwks_cache.get_signing_key(TENANT_ID, 'new-key') is not None
+        assert len(jwks_server.requests) == 2
+
+    def test_forced_refresh_is_rate_limited(self, jwks_server):
+        """Test unknown kids cannot trigger more than one refresh per interval"""
+        _, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+        jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+
+        for i in range(5):
+            with pytest.raises(JWKSKeyNotFoundError):
+                jwks_cache.get_signing_key(TENANT_ID, f'forged-{i}')
+
+        # One initial fetch plus a single forced refresh
+        assert len(jwks_server.requests) == 2
+
+    def test_stale_keys_served_when_endpoint_fails(self, jwks_server):
+        """Test a network failure during refresh falls back to cached keys"""
+        _, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+        key = jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+
+        jwks_server.fail = True
+        with override_settings(AZURE_AD_JWKS_CACHE_TTL=0):
+            assert jwks_cache.get_signing_key(TENANT_ID, 'key-1') is key
+
+    def test_failed_refresh_is_not_retried_per_request(self, jwks_server):
+        """Test a failed refresh pauses further attempts in every worker"""
+        _, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+        key = jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+
+        jwks_server.fail = True
+        with override_settings(AZURE_AD_JWKS_CACHE_TTL=0):
+            for _ in range(5):
+                assert jwks_cache.get_signing_key(TENANT_ID, 'key-1') is key
+            assert len(jwks_server.requests) == 2
+
+            # A second worker sees the shared retry-after as well
+            jwks_cache._local.clear()
+            jwks_cache._retry_after.clear()
+            assert jwks_cache.get_signing_key(TENANT_ID, 'key-1') is not None
+        assert len(jwks_server.requests) == 2
+
+    def test_expired_keys_served_while_another_worker_refreshes(self, jwks_server):
+        """Test only the worker holding the refresh lock fetches expired keys"""
+        _, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+        key = jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+        cache.add(f"azure_ad_jwks:{TENANT_ID}:{ENDPOINT_V2}:refresh", time.time(), 60)
+
+        with override_settings(AZURE_AD_JWKS_CACHE_TTL=0):
+            assert jwks_cache.get_signing_key(TENANT_ID, 'key-1') is key
+        assert len(jwks_server.requests) == 1
+
+    def test_endpoint_failure_without_cached_keys_raises(self, jwks_server):
+        """Test a failed first fetch surfaces the request error"""
+        jwks_server.fail = True
+
+        with pytest.raises(requests.RequestException):
+            jwks_cache.get_signing_key(TENANT_ID, 'key-1')
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+@pytest.mark.azure_ad
+class TestAzureADAuthenticationWithJWKSCache:
+    """End-to-end token verification against the JWKS stand-in server"""
+
+    def test_verify_token_uses_cached_keys(self, jwks_server):
+        """Test signed tokens verify with a single JWKS fetch"""
+        private_key, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+        backend = AzureADAuthentication()
+        token = _make_token(private_key, 'key-1')
+
+        for _ in range(3):
+            payload = backend._verify_token(token)
+            assert payload['oid'] == 'azure-object-id-123'
+
+        assert len(jwks_server.requests) == 1
+
+    def test_authenticate_creates_user(self, jwks_server):
+        """Test full authentication flow with a real signature"""
+        private_key, jwk = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+        token = _make_token(private_key, 'key-1')
+
+        request = APIRequestFactory().get('/api/clients/')
+        request.META['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        user, returned_token = AzureADAuthentication().authenticate(request)
+
+        assert user.email == 'jwks@example.com'
+        assert returned_token == token
+
+    def test_verify_token_with_wrong_signing_key_fails(self, jwks_server):
+        """Test a token signed by a key not matching the JWKS entry is rejected"""
+        _, jwk = _generate_key('key-1')
+        other_private_key, _ = _generate_key('key-1')
+        jwks_server.keys = [jwk]
+        token = _make_token(other_private_key, 'key-1')
+
+        with pytest.raises(exceptions.AuthenticationFailed):
+            AzureADAuthentication()._verify_token(token)
@@ -7,7 +7,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.forms.widgets import PasswordInput
 
-from .models import AzureSubscription
+from .models import AdvisorRecommendationState, AzureSubscription
 
 
 class AzureSubscriptionAdminForm(forms.ModelForm):
@@ -99,6 +99,7 @@ class AzureSubscriptionAdmin(admin.ModelAdmin):
         'created_at',
         'updated_at',
         'last_sync_at',
+        'state_synced_at',
         'sync_status',
         'sync_error_message',
         'created_by',
@@ -125,6 +126,7 @@ class AzureSubscriptionAdmin(admin.ModelAdmin):
             'fields': (
                 'sync_status',
                 'last_sync_at',
+                'state_synced_at',
                 'sync_error_message',
             ),
             'classes': ('collapse',)
@@ -200,3 +202,23 @@ class AzureSubscriptionAdmin(admin.ModelAdmin):
         count = queryset.update(is_active=False)
         self.message_user(request, f"Marked {count} subscription(s) as inactive.")
     mark_as_inactive.short_description = "Mark selected subscriptions as inactive"
+
+
+@admin.register(AdvisorRecommendationState)
+class AdvisorRecommendationStateAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for the delta-synced recommendation state.
+
+    Rows are written by delta syncs only.
+    """
+
+    list_display = ['azure_id', 'subscription', 'category', 'impact', 'status', 'changed_at']
+    list_filter = ['status', 'category', 'impact']
+    search_fields = ['azure_id', 'resource_group', 'subscription__name']
+    list_select_related = ['subscription']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -16,5 +16,4 @@ class AzureIntegrationConfig(AppConfig):
         """
         Import signal handlers when the app is ready.
         """
-        # Import signals here when needed
-        pass
+        from . import signals  # noqa: F401
@@ -51,6 +51,26 @@ class AzureAPIError(AzureIntegrationError):
     pass
 
 
+class AzureRateLimitError(AzureAPIError):
+    """
+    Azure API rate limit reached.
+
+    Raised when:
+    - ARM answered 429 Too Many Requests
+    - The shared rate limiter has no budget left for the next few seconds
+
+    Attributes:
+        retry_after: Seconds to wait before calling the API again
+
+    Examples:
+        >>> raise AzureRateLimitError("Throttled by ARM", retry_after=20)
+    """
+
+    def __init__(self, message: str = '', retry_after: float = 0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class AzureConnectionError(AzureIntegrationError):
     """
     Cannot connect to Azure.
@@ -0,0 +1,59 @@
+# Generated manually for azure_integration
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('azure_integration', '0002_add_client_to_azure_subscription'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='azuresubscription',
+            name='state_synced_at',
+            field=models.DateTimeField(
+                blank=True,
+                help_text='Timestamp of last complete delta sync of the recommendation state',
+                null=True
+            ),
+        ),
+        migrations.CreateModel(
+            name='AdvisorRecommendationState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('azure_id', models.CharField(help_text='Azure resource ID of the recommendation', max_length=1024)),
+                ('last_updated', models.CharField(blank=True, help_text='Azure lastUpdated timestamp, as returned by the API', max_length=64)),
+                ('category', models.CharField(blank=True, max_length=50)),
+                ('impact', models.CharField(blank=True, max_length=20)),
+                ('resource_group', models.CharField(blank=True, max_length=255)),
+                ('data', models.JSONField(help_text='Recommendation in AzureAdvisorService internal format')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('resolved', 'Resolved')], default='active', max_length=20)),
+                ('first_seen_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('subscription', models.ForeignKey(
+                    help_text='Subscription the recommendation belongs to',
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='recommendation_states',
+                    to='azure_integration.azuresubscription'
+                )),
+            ],
+            options={
+                'verbose_name': 'Advisor Recommendation State',
+                'verbose_name_plural': 'Advisor Recommendation States',
+                'db_table': 'azure_recommendation_states',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='advisorrecommendationstate',
+            constraint=models.UniqueConstraint(fields=('subscription', 'azure_id'), name='uniq_recommendation_state_azure_id'),
+        ),
+        migrations.AddIndex(
+            model_name='advisorrecommendationstate',
+            index=models.Index(fields=['subscription', 'status'], name='idx_rec_state_sub_status'),
+        ),
+    ]
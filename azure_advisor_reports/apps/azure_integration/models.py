@@ -2,7 +2,9 @@
 Models for Azure Integration app.
 
 This module defines the AzureSubscription model for securely storing
-Azure credentials and tracking synchronization status.
+Azure credentials and tracking synchronization status, and the
+AdvisorRecommendationState model holding the current Advisor
+recommendations of each subscription for delta syncs.
 """
 
 import uuid
@@ -109,6 +111,12 @@ class AzureSubscription(models.Model):
         help_text="Timestamp of last successful API sync"
     )
 
+    state_synced_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Timestamp of last complete delta sync of the recommendation state"
+    )
+
     # Audit fields
     created_by = models.ForeignKey(
         'authentication.User',
@@ -220,3 +228,116 @@ class AzureSubscription(models.Model):
             self.sync_error_message = error_message or 'Unknown error'
 
         self.save(update_fields=['sync_status', 'last_sync_at', 'sync_error_message'])
+
+    @classmethod
+    def bulk_update_sync_status(cls, outcomes):
+        """
+        Update the synchronization status of many subscriptions at once.
+
+        Same semantics as update_sync_status, written with one bulk UPDATE
+        instead of one save per subscription.
+
+        Args:
+            outcomes (dict): Maps subscription id to None if the sync succeeded,
+                or to the error message if it failed
+
+        Returns:
+            int: Number of subscriptions updated
+
+        Example:
+            >>> AzureSubscription.bulk_update_sync_status({
+            ...     'abc-123': None,
+            ...     'def-456': 'Connection timeout',
+            ... })
+        """
+        outcomes = {str(pk): error_message for pk, error_message in outcomes.items()}
+        now = timezone.now()
+        subscriptions = list(cls.objects.filter(pk__in=outcomes))
+
+        for subscription in subscriptions:
+            error_message = outcomes[str(subscription.pk)]
+            if error_message is None:
+                subscription.sync_status = 'success'
+                subscription.last_sync_at = now
+                subscription.sync_error_message = ''
+            else:
+                subscription.sync_status = 'failed'
+                subscription.sync_error_message = error_message or 'Unknown error'
+
+        return cls.objects.bulk_update(
+            subscriptions, ['sync_status', 'last_sync_at', 'sync_error_message']
+        )
+
+
+class AdvisorRecommendationState(models.Model):
+    """
+    Current state of one Azure Advisor recommendation of a subscription.
+
+    Maintained by delta syncs (apps.azure_integration.services.delta_sync):
+    a sync only writes recommendations whose Azure ``id`` is new or whose
+    ``last_updated`` changed, and marks recommendations that disappeared from
+    Advisor as resolved. Reports are produced as snapshots of the active rows.
+
+    Status:
+        - active: Returned by the last complete sync
+        - resolved: No longer returned by Advisor (fixed or dismissed)
+    """
+
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('resolved', 'Resolved'),
+    ]
+
+    subscription = models.ForeignKey(
+        AzureSubscription,
+        on_delete=models.CASCADE,
+        related_name='recommendation_states',
+        help_text="Subscription the recommendation belongs to"
+    )
+
+    azure_id = models.CharField(
+        max_length=1024,
+        help_text="Azure resource ID of the recommendation"
+    )
+
+    last_updated = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Azure lastUpdated timestamp, as returned by the API"
+    )
+
+    # Filterable copies of fields in data
+    category = models.CharField(max_length=50, blank=True)
+    impact = models.CharField(max_length=20, blank=True)
+    resource_group = models.CharField(max_length=255, blank=True)
+
+    data = models.JSONField(
+        help_text="Recommendation in AzureAdvisorService internal format"
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='active'
+    )
+
+    first_seen_at = models.DateTimeField(default=timezone.now)
+    changed_at = models.DateTimeField(default=timezone.now)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'azure_recommendation_states'
+        verbose_name = 'Advisor Recommendation State'
+        verbose_name_plural = 'Advisor Recommendation States'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['subscription', 'azure_id'],
+                name='uniq_recommendation_state_azure_id',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['subscription', 'status'], name='idx_rec_state_sub_status'),
+        ]
+
+    def __str__(self):
+        return f"{self.azure_id} ({self.status})"
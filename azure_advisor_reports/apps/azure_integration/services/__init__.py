@@ -2,6 +2,14 @@
 Services for Azure API integration.
 """
 
-from .azure_advisor_service import AzureAdvisorService
+from .azure_advisor_service import AzureAdvisorService, invalidate_recommendations_cache
+from .multi_subscription import MultiSubscriptionFetcher
+from .delta_sync import iter_state_pages, sync_recommendation_state
 
-__all__ = ['AzureAdvisorService']
+__all__ = [
+    'AzureAdvisorService',
+    'invalidate_recommendations_cache',
+    'MultiSubscriptionFetcher',
+    'iter_state_pages',
+    'sync_recommendation_state',
+]
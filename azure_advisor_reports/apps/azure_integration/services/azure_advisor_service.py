@@ -8,15 +8,44 @@ This module provides the AzureAdvisorService class that handles:
 - Caching for performance optimization
 - Retry logic for resilience
 - Comprehensive error handling and logging
+
+Advisor pages are fetched one at a time and every page request takes a slot
+from a process-wide semaphore (AZURE_ADVISOR_MAX_CONCURRENT_REQUESTS), so
+concurrent fetches across many subscriptions stay under a global cap, and
+a token from the tenant and subscription buckets shared by all workers
+(AzureRateLimiter). ARM throttling headers of every response feed back into
+those buckets; a 429 raises AzureRateLimitError instead of being retried.
+
+Credentials, Advisor clients and rate limiters are kept per worker process in
+a registry keyed by subscription and credential fingerprint, so consecutive
+tasks for a subscription reuse the decrypted secret, the cached AAD token and
+the HTTP connection pool. Changing the subscription's credentials changes
+the fingerprint and replaces the entry.
+
+iter_recommendation_pages() streams transformed pages to the caller instead
+of accumulating the whole listing.
+
+Each subscription has a single cache entry holding its full, transformed
+listing (zlib-compressed JSON) together with precomputed statistics and a
+format version. Filtered views and statistics are derived from that entry,
+so different filter combinations never trigger extra API calls or extra
+cached copies.
 """
 
 import hashlib
 import json
 import logging
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 
+from django.conf import settings
 from django.core.cache import cache
+from django.utils import timezone
 from azure.identity import ClientSecretCredential
 from azure.mgmt.advisor import AdvisorManagementClient
 from azure.core.exceptions import (
@@ -37,10 +66,178 @@ from apps.azure_integration.exceptions import (
     AzureAuthenticationError,
     AzureAPIError,
     AzureConnectionError,
+    AzureRateLimitError,
 )
+from apps.azure_integration.services.rate_limiter import AzureRateLimiter, get_retry_after
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+
+_request_slots = None
+_request_slots_lock = threading.Lock()
+
+
+def get_request_slots() -> threading.BoundedSemaphore:
+    """Return the process-wide semaphore capping concurrent Advisor API requests."""
+    global _request_slots
+    with _request_slots_lock:
+        if _request_slots is None:
+            _request_slots = threading.BoundedSemaphore(getattr(
+                settings, 'AZURE_ADVISOR_MAX_CONCURRENT_REQUESTS', DEFAULT_MAX_CONCURRENT_REQUESTS
+            ))
+    return _request_slots
+
+
+# Transient API errors (5xx, network) are retried with backoff; throttling is
+# left to the rate limiter
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_exception_type((HttpResponseError, ServiceRequestError)),
+    reraise=True
+)
+
+
+@contextmanager
+def request_slot():
+    """Hold one Advisor API request slot for the duration of the block."""
+    slots = get_request_slots()
+    with slots:
+        yield
+
+
+def get_recommendations_cache_key(subscription_id: str) -> str:
+    """Cache key of a subscription's full recommendation listing."""
+    return f"azure_advisor:{subscription_id}:recommendations"
+
+
+def invalidate_recommendations_cache(subscription_id: str) -> None:
+    """Drop a subscription's cached listing so the next read goes to Azure."""
+    cache.delete(get_recommendations_cache_key(subscription_id))
+
+
+def _cache_compresses() -> bool:
+    """Whether the default cache backend compresses values itself (django-redis COMPRESSOR)."""
+    options = settings.CACHES.get('default', {}).get('OPTIONS', {})
+    return bool(options.get('COMPRESSOR'))
+
+
+@dataclass
+class AdvisorClients:
+    """Authenticated SDK objects shared by every service of one subscription."""
+
+    fingerprint: str
+    credential: ClientSecretCredential
+    client: AdvisorManagementClient
+    rate_limiter: AzureRateLimiter
+
+
+DEFAULT_CLIENT_REGISTRY_SIZE = 256
+
+_client_registry = OrderedDict()
+_client_registry_lock = threading.Lock()
+
+
+def _credential_fingerprint(azure_subscription: AzureSubscription) -> str:
+    """Hash of everything a client is built from; changes when the secret is rotated."""
+    digest = hashlib.sha256()
+    for part in (
+        azure_subscription.tenant_id,
+        azure_subscription.azure_client_id,
+        azure_subscription.subscription_id,
+        getattr(settings, 'AZURE_ARM_ENDPOINT', None) or '',
+    ):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    # Fernet output is unique per encryption, so any new secret gives a new hash
+    digest.update(bytes(azure_subscription.client_secret_encrypted or b''))
+    return digest.hexdigest()
+
+
+def _build_clients(azure_subscription: AzureSubscription, fingerprint: str) -> AdvisorClients:
+    """Decrypt the credentials and build the credential, client and limiter."""
+    credentials = azure_subscription.get_credentials()
+    rate_limiter = AzureRateLimiter(credentials['tenant_id'], credentials['subscription_id'])
+
+    def observe_response(response):
+        # Pipeline hook: feed ARM throttling headers to the shared rate limiter
+        http_response = response.http_response
+        try:
+            rate_limiter.observe(http_response.status_code, http_response.headers)
+        except Exception as e:
+            logger.warning("Could not record Azure rate limit headers: %s", e)
+
+    credential = ClientSecretCredential(
+        tenant_id=credentials['tenant_id'],
+        client_id=credentials['client_id'],
+        client_secret=credentials['client_secret']
+    )
+
+    # AZURE_ARM_ENDPOINT overrides the public cloud endpoint. SDK retries are
+    # off: they would sleep through 429s on their own and multiply the load;
+    # _retry_transient and the rate limiter handle it.
+    client = AdvisorManagementClient(
+        credential=credential,
+        subscription_id=credentials['subscription_id'],
+        base_url=getattr(settings, 'AZURE_ARM_ENDPOINT', None),
+        retry_total=0,
+        raw_response_hook=observe_response,
+    )
+    return AdvisorClients(fingerprint, credential, client, rate_limiter)
+
+
+def get_advisor_clients(azure_subscription: AzureSubscription) -> AdvisorClients:
+    """
+    Return the worker's shared clients for a subscription, building them on first use.
+
+    Entries are keyed by subscription and checked against the credential
+    fingerprint, so a subscription whose secret changed gets new clients. The
+    registry keeps the AZURE_CLIENT_REGISTRY_SIZE most recently used entries.
+    """
+    fingerprint = _credential_fingerprint(azure_subscription)
+    key = azure_subscription.subscription_id
+
+    with _client_registry_lock:
+        entry = _client_registry.get(key)
+        if entry is not None and entry.fingerprint == fingerprint:
+            _client_registry.move_to_end(key)
+            return entry
+
+    # Built outside the lock: decryption and client setup must not serialize other subscriptions
+    entry = _build_clients(azure_subscription, fingerprint)
+
+    with _client_registry_lock:
+        current = _client_registry.get(key)
+        if current is not None and current.fingerprint == fingerprint:
+            # Another thread built it first; keep one set of clients
+            return current
+        _client_registry[key] = entry
+        _client_registry.move_to_end(key)
+        max_size = getattr(settings, 'AZURE_CLIENT_REGISTRY_SIZE', DEFAULT_CLIENT_REGISTRY_SIZE)
+        while len(_client_registry) > max_size:
+            _client_registry.popitem(last=False)
+    return entry
+
+
+def invalidate_advisor_clients(subscription_id: Optional[str] = None) -> None:
+    """Drop the shared clients of one subscription, or of all subscriptions."""
+    with _client_registry_lock:
+        if subscription_id is None:
+            _client_registry.clear()
+        else:
+            _client_registry.pop(subscription_id, None)
+
+
+def _field(obj, attr: str, key: str, default=None):
+    """Read a nested SDK model attribute, or the same field from a plain dict."""
+    if obj is None:
+        return default
+    if isinstance(obj, dict):
+        return obj.get(key, default)
+    value = getattr(obj, attr, None)
+    return default if value is None else value
+
 
 class AzureAdvisorService:
     """
@@ -53,6 +250,10 @@ class AzureAdvisorService:
         azure_subscription (AzureSubscription): The subscription to use for API calls
         credential (ClientSecretCredential): Azure authentication credential
         client (AdvisorManagementClient): Azure Advisor API client
+        rate_limiter (AzureRateLimiter): Shared tenant/subscription request budget
+
+    The credential, client and rate limiter are shared with other services of
+    the same subscription in this worker (see get_advisor_clients).
 
     Example:
         >>> subscription = AzureSubscription.objects.get(name='Production')
@@ -64,6 +265,10 @@ class AzureAdvisorService:
     # Cache TTL in seconds (1 hour)
     CACHE_TTL = 3600
 
+    # Bump when the transformed format or cache entry layout changes;
+    # entries with another version are treated as a miss
+    CACHE_VERSION = 2
+
     # Valid filter values
     VALID_CATEGORIES = [
         'Cost',
@@ -87,6 +292,7 @@ class AzureAdvisorService:
             AzureConnectionError: If cannot connect to Azure
         """
         self.azure_subscription = azure_subscription
+        self.last_page_count = 0
 
         logger.info(
             f"Initializing AzureAdvisorService for subscription: "
@@ -94,24 +300,15 @@ class AzureAdvisorService:
         )
 
         try:
-            # Get decrypted credentials
-            credentials = azure_subscription.get_credentials()
-
-            # Initialize Azure credential
-            self.credential = ClientSecretCredential(
-                tenant_id=credentials['tenant_id'],
-                client_id=credentials['client_id'],
-                client_secret=credentials['client_secret']
-            )
-
-            # Initialize Advisor client
-            self.client = AdvisorManagementClient(
-                credential=self.credential,
-                subscription_id=credentials['subscription_id']
-            )
+            # Shared per worker: credentials are only decrypted, and the
+            # credential and client only built, the first time
+            clients = get_advisor_clients(azure_subscription)
+            self.credential = clients.credential
+            self.client = clients.client
+            self.rate_limiter = clients.rate_limiter
 
-            logger.info(
-                f"Successfully initialized Azure Advisor client for "
+            logger.debug(
+                f"Using Azure Advisor client for "
                 f"subscription {azure_subscription.subscription_id}"
             )
 
@@ -125,27 +322,77 @@ class AzureAdvisorService:
             logger.error(error_msg)
             raise AzureConnectionError(error_msg) from e
 
-    def _generate_cache_key(self, filters: Optional[Dict] = None) -> str:
+    def _generate_cache_key(self) -> str:
         """
-        Generate a cache key based on subscription and filters.
+        Generate the cache key of this subscription's full listing.
 
-        Args:
-            filters (dict, optional): Filter dictionary
+        Filters are not part of the key: filtered views are derived from the
+        one cached listing.
 
         Returns:
             str: Cache key for storing/retrieving cached data
         """
-        subscription_id = self.azure_subscription.subscription_id
+        return get_recommendations_cache_key(self.azure_subscription.subscription_id)
 
-        # Create a stable hash of filters
-        if filters:
-            # Sort keys to ensure consistent hashing
-            filter_str = json.dumps(filters, sort_keys=True)
-            filter_hash = hashlib.md5(filter_str.encode()).hexdigest()
-        else:
-            filter_hash = 'no_filters'
+    def _load_cache_entry(self) -> Optional[Dict]:
+        """
+        Return the cached entry of this subscription, or None on a miss.
+
+        Returns:
+            dict: Entry with version, fetched_at, count, statistics and the
+                JSON recommendations (payload), zlib-compressed if flagged
+                by compressed
+        """
+        entry = cache.get(self._generate_cache_key())
+        if entry is None:
+            return None
+        if not isinstance(entry, dict) or entry.get('version') != self.CACHE_VERSION:
+            logger.info("Ignoring cached recommendations with an outdated format")
+            return None
+        return entry
+
+    def _load_cached_recommendations(self) -> Optional[List[Dict]]:
+        """Return the cached full listing, decompressed, or None on a miss."""
+        entry = self._load_cache_entry()
+        if entry is None:
+            return None
+        payload = entry['payload']
+        if entry['compressed']:
+            payload = zlib.decompress(payload)
+        return json.loads(payload)
+
+    def _store_cache_entry(self, recommendations: List[Dict]) -> Dict:
+        """
+        Cache the full transformed listing with its statistics.
+
+        The JSON payload is compressed here unless the cache backend already
+        compresses values (production's django-redis ZlibCompressor), so it
+        is never compressed twice.
 
-        return f"azure_advisor:{subscription_id}:recommendations:{filter_hash}"
+        Args:
+            recommendations (list): All recommendations in internal format
+
+        Returns:
+            dict: The cached entry
+        """
+        payload = json.dumps(recommendations, default=str).encode()
+        compressed = not _cache_compresses()
+        if compressed:
+            payload = zlib.compress(payload)
+        entry = {
+            'version': self.CACHE_VERSION,
+            'fetched_at': timezone.now().isoformat(),
+            'count': len(recommendations),
+            'statistics': self._calculate_statistics(recommendations),
+            'payload': payload,
+            'compressed': compressed,
+        }
+        cache.set(self._generate_cache_key(), entry, self.CACHE_TTL)
+        logger.info(
+            f"Cached {len(recommendations)} recommendations "
+            f"({len(payload)} bytes, compressed={compressed}) with TTL {self.CACHE_TTL}s"
+        )
+        return entry
 
     def _validate_filters(self, filters: Optional[Dict]) -> None:
         """
@@ -176,46 +423,11 @@ class AzureAdvisorService:
                     f"Must be one of: {', '.join(self.VALID_IMPACTS)}"
                 )
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((HttpResponseError, ServiceRequestError)),
-        reraise=True
-    )
-    def _fetch_recommendations_from_api(self) -> List:
-        """
-        Fetch recommendations from Azure API with retry logic.
-
-        Returns:
-            List: Raw recommendation objects from Azure API
-
-        Raises:
-            HttpResponseError: If API returns an error (retriable)
-            ServiceRequestError: If network error occurs (retriable)
-            ClientAuthenticationError: If authentication fails (not retriable)
-            ResourceNotFoundError: If subscription not found (not retriable)
-        """
-        logger.info(
-            f"Fetching recommendations from Azure Advisor API for "
-            f"subscription {self.azure_subscription.subscription_id}"
-        )
-
+    @contextmanager
+    def _non_retriable_errors(self):
+        """Convert errors that retrying cannot fix into our exceptions."""
         try:
-            recommendations = []
-
-            # Azure SDK returns paged results
-            paged_results = self.client.recommendations.list()
-
-            # Iterate through all pages
-            for recommendation in paged_results:
-                recommendations.append(recommendation)
-
-            logger.info(
-                f"Successfully fetched {len(recommendations)} recommendations "
-                f"from Azure Advisor API"
-            )
-
-            return recommendations
+            yield
 
         except ClientAuthenticationError as e:
             # Not retriable - convert immediately
@@ -232,8 +444,97 @@ class AzureAdvisorService:
             logger.error(error_msg)
             raise AzureAPIError(error_msg) from e
 
+        except HttpResponseError as e:
+            if e.status_code != 429:
+                raise
+            # Throttled - retrying now would only add load; the task re-queues
+            retry_after = get_retry_after(e.response.headers if e.response is not None else {})
+            error_msg = f"Azure API throttled the request, retry after {retry_after:.0f}s"
+            logger.warning(error_msg)
+            raise AzureRateLimitError(error_msg, retry_after=retry_after) from e
+
         # Let HttpResponseError and ServiceRequestError bubble up for retry decorator
-        # They will be caught and converted in fetch_recommendations after retries exhausted
+        # They will be caught and converted in the public methods after retries exhausted
+
+    @_retry_transient
+    def _open_pages(self) -> Iterator:
+        """
+        Start the paged list call and return an iterator over its pages.
+
+        No HTTP request is sent until the first page is requested.
+        """
+        with self._non_retriable_errors():
+            paged_results = self.client.recommendations.list()
+            by_page = getattr(paged_results, 'by_page', None)
+            return iter(by_page() if by_page else [paged_results])
+
+    @_retry_transient
+    def _next_page(self, pages: Iterator) -> Optional[List]:
+        """
+        Fetch the next page under a rate limiter token and a global request slot.
+
+        A failed page is retried with the same continuation token, so a
+        transient error does not restart the listing.
+
+        Returns:
+            list: Raw recommendation objects of the page, or None after the last page
+
+        Raises:
+            AzureRateLimitError: If throttled, or the limiter has no budget left
+        """
+        self.rate_limiter.acquire()
+        with self._non_retriable_errors(), request_slot():
+            page = next(pages, None)
+            return None if page is None else list(page)
+
+    def _iter_api_pages(self) -> Iterator[List]:
+        """
+        Yield raw recommendation pages, requesting each only when the previous one was consumed.
+
+        Raises:
+            HttpResponseError: If API returns an error after retries
+            ServiceRequestError: If network error occurs after retries
+            AzureAuthenticationError: If authentication fails
+            AzureAPIError: If subscription not found
+        """
+        logger.info(
+            f"Fetching recommendations from Azure Advisor API for "
+            f"subscription {self.azure_subscription.subscription_id}"
+        )
+
+        self.last_page_count = 0
+        pages = self._open_pages()
+
+        while True:
+            page = self._next_page(pages)
+            if page is None:
+                return
+            self.last_page_count += 1
+            yield page
+
+    def _fetch_recommendations_from_api(self) -> List:
+        """
+        Fetch all recommendations from Azure API with retry logic.
+
+        Returns:
+            List: Raw recommendation objects from Azure API
+
+        Raises:
+            HttpResponseError: If API returns an error (after retries)
+            ServiceRequestError: If network error occurs (after retries)
+            AzureAuthenticationError: If authentication fails (not retried)
+            AzureAPIError: If subscription not found (not retried)
+        """
+        recommendations = []
+        for page in self._iter_api_pages():
+            recommendations.extend(page)
+
+        logger.info(
+            f"Successfully fetched {len(recommendations)} recommendations "
+            f"in {self.last_page_count} pages from Azure Advisor API"
+        )
+
+        return recommendations
 
     def _transform_recommendation(self, recommendation) -> Dict:
         """
@@ -263,9 +564,9 @@ class AzureAdvisorService:
         risk = risk_mapping.get(impact, 'None')
 
         # Extract short description (from short_description if available)
-        short_desc = ''
-        if hasattr(recommendation, 'short_description') and recommendation.short_description:
-            short_desc = recommendation.short_description.get('problem', '')
+        short_desc = _field(
+            getattr(recommendation, 'short_description', None), 'problem', 'problem', ''
+        )
 
         # Extract detailed description (from extended_properties if available)
         description = ''
@@ -277,8 +578,9 @@ class AzureAdvisorService:
             description = short_desc
 
         # Extract resource information
-        resource_metadata = recommendation.resource_metadata or {}
-        resource_id = resource_metadata.get('resourceId', impacted_value)
+        resource_id = _field(
+            recommendation.resource_metadata, 'resource_id', 'resourceId', impacted_value
+        )
 
         # Parse resource ID to extract resource group and resource name
         resource_group = ''
@@ -324,7 +626,6 @@ class AzureAdvisorService:
             currency = extended_props.get('savingsCurrency', 'USD')
 
         # Extract last updated timestamp
-        from django.utils import timezone
         last_updated = timezone.now().isoformat()
         if hasattr(recommendation, 'last_updated') and recommendation.last_updated:
             try:
@@ -406,11 +707,11 @@ class AzureAdvisorService:
 
         This method:
         1. Validates filters
-        2. Checks cache for existing results
+        2. Checks the subscription's cached full listing
         3. Fetches from API if not cached
         4. Transforms data to internal format
-        5. Applies filters
-        6. Caches results
+        5. Caches the full listing
+        6. Applies filters
 
         Args:
             filters (dict, optional): Dictionary with filter options:
@@ -442,22 +743,36 @@ class AzureAdvisorService:
         # Validate filters
         self._validate_filters(filters)
 
-        # Generate cache key
-        cache_key = self._generate_cache_key(filters)
+        recommendations = self._load_cached_recommendations()
+        if recommendations is not None:
+            logger.info(f"Cache hit: {len(recommendations)} cached recommendations")
+        else:
+            logger.info("Cache miss: fetching from API")
+            recommendations = self._fetch_and_cache()['recommendations']
 
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            logger.info(
-                f"Cache hit for key {cache_key}: returning {len(cached_data)} "
-                f"cached recommendations"
-            )
-            return cached_data
+        # Apply filters
+        filtered = self._apply_filters(recommendations, filters)
+
+        logger.info(
+            f"Filtered results: {len(filtered)} recommendations "
+            f"(from {len(recommendations)} total)"
+        )
 
-        logger.info(f"Cache miss for key {cache_key}: fetching from API")
+        return filtered
 
-        # Fetch from API with retry logic
-        try:
+    def _fetch_and_cache(self) -> Dict:
+        """
+        Fetch and transform the full listing, then cache it.
+
+        Returns:
+            dict: recommendations (full listing) and statistics
+
+        Raises:
+            AzureAuthenticationError: If authentication fails
+            AzureAPIError: If API call fails
+            AzureConnectionError: If network error occurs
+        """
+        with self._fetch_errors():
             raw_recommendations = self._fetch_recommendations_from_api()
 
             # Transform to internal format
@@ -468,19 +783,66 @@ class AzureAdvisorService:
 
             logger.info(f"Transformed {len(transformed)} recommendations to internal format")
 
-            # Apply filters
-            filtered = self._apply_filters(transformed, filters)
+            entry = self._store_cache_entry(transformed)
 
-            logger.info(
-                f"Filtered results: {len(filtered)} recommendations "
-                f"(from {len(transformed)} total)"
-            )
+        return {'recommendations': transformed, 'statistics': entry['statistics']}
+
+    def iter_recommendation_pages(self, filters: Optional[Dict] = None) -> Iterator[List[Dict]]:
+        """
+        Stream recommendations from Azure Advisor API one page at a time.
+
+        Each API page is transformed and filtered, then handed to the caller;
+        the next page is only requested once the caller asks for it. Memory is
+        bounded by the page size, and callers can persist a page while the
+        listing is still running. Results are not cached, but a listing
+        already cached by fetch_recommendations is filtered and served as a
+        single page.
+
+        Args:
+            filters (dict, optional): Same filters as fetch_recommendations
+
+        Yields:
+            list: Recommendations of one page in internal format (may be empty
+                once filtered)
+
+        Raises:
+            ValueError: If filter values are invalid
+            AzureAuthenticationError: If authentication fails
+            AzureAPIError: If API call fails
+            AzureConnectionError: If network error occurs
+
+        Example:
+            >>> for page in service.iter_recommendation_pages({'category': 'Cost'}):
+            ...     save(page)
+        """
+        self._validate_filters(filters)
+
+        cached_data = self._load_cached_recommendations()
+        if cached_data is not None:
+            logger.info(f"Cache hit: streaming {len(cached_data)} cached recommendations")
+            yield self._apply_filters(cached_data, filters)
+            return
+
+        total = 0
+        with self._fetch_errors():
+            for raw_page in self._iter_api_pages():
+                page = self._apply_filters(
+                    [self._transform_recommendation(rec) for rec in raw_page],
+                    filters
+                )
+                total += len(page)
+                yield page
 
-            # Cache the results
-            cache.set(cache_key, filtered, self.CACHE_TTL)
-            logger.info(f"Cached {len(filtered)} recommendations with TTL {self.CACHE_TTL}s")
+        logger.info(
+            f"Streamed {total} recommendations in {self.last_page_count} pages "
+            f"from Azure Advisor API"
+        )
 
-            return filtered
+    @contextmanager
+    def _fetch_errors(self):
+        """Convert SDK errors left after retries into our exceptions."""
+        try:
+            yield
 
         except (AzureAuthenticationError, AzureAPIError, AzureConnectionError):
             # Re-raise our custom exceptions
@@ -499,7 +861,7 @@ class AzureAdvisorService:
             raise AzureConnectionError(error_msg) from e
 
         except Exception as e:
-            error_msg = f"Unexpected error in fetch_recommendations: {str(e)}"
+            error_msg = f"Unexpected error fetching recommendations: {str(e)}"
             logger.error(error_msg, exc_info=True)
             raise AzureAPIError(error_msg) from e
 
@@ -595,8 +957,8 @@ class AzureAdvisorService:
         """
         Get summary statistics of recommendations.
 
-        This method fetches all recommendations (using cache if available)
-        and calculates statistics by category, impact, and potential savings.
+        Statistics are computed when the full listing is cached and stored in
+        the same entry, so they never trigger a separate API call or cache key.
 
         Returns:
             dict: Statistics dictionary with keys:
@@ -615,62 +977,63 @@ class AzureAdvisorService:
             ...     print(f"Potential savings: {stats['total_potential_savings']} "
             ...           f"{stats['currency']}")
         """
-        # Generate cache key for statistics
-        cache_key = f"azure_advisor:{self.azure_subscription.subscription_id}:statistics"
-
-        # Try to get from cache
-        cached_stats = cache.get(cache_key)
-        if cached_stats is not None:
+        entry = self._load_cache_entry()
+        if entry is not None:
             logger.info("Cache hit for statistics")
-            return cached_stats
+            return entry['statistics']
 
-        logger.info("Cache miss for statistics: calculating from recommendations")
+        logger.info("Cache miss for statistics: fetching recommendations")
 
-        # Fetch all recommendations (this will use recommendation cache if available)
         try:
-            recommendations = self.fetch_recommendations()
-
-            # Initialize counters
-            by_category = {cat: 0 for cat in self.VALID_CATEGORIES}
-            by_impact = {imp: 0 for imp in self.VALID_IMPACTS}
-            total_savings = 0.0
-            currency = None
-
-            # Calculate statistics
-            for rec in recommendations:
-                # Count by category
-                category = rec.get('category')
-                if category in by_category:
-                    by_category[category] += 1
-
-                # Count by impact
-                impact = rec.get('impact')
-                if impact in by_impact:
-                    by_impact[impact] += 1
-
-                # Sum potential savings
-                savings = rec.get('potential_savings')
-                if savings is not None:
-                    total_savings += savings
-                    if currency is None:
-                        currency = rec.get('currency', 'USD')
-
-            # Build statistics dictionary
-            stats = {
-                'total_recommendations': len(recommendations),
-                'by_category': by_category,
-                'by_impact': by_impact,
-                'total_potential_savings': total_savings if total_savings > 0 else None,
-                'currency': currency,
-            }
-
-            # Cache the statistics
-            cache.set(cache_key, stats, self.CACHE_TTL)
-            logger.info(f"Cached statistics with TTL {self.CACHE_TTL}s")
+            return self._fetch_and_cache()['statistics']
 
-            return stats
+        except AzureRateLimitError:
+            raise
 
         except Exception as e:
             error_msg = f"Error calculating statistics: {str(e)}"
             logger.error(error_msg, exc_info=True)
             raise AzureAPIError(error_msg) from e
+
+    def _calculate_statistics(self, recommendations: List[Dict]) -> Dict:
+        """
+        Calculate summary statistics of a recommendation listing.
+
+        Args:
+            recommendations (list): Recommendations in internal format
+
+        Returns:
+            dict: Statistics dictionary (see get_statistics)
+        """
+        # Initialize counters
+        by_category = {cat: 0 for cat in self.VALID_CATEGORIES}
+        by_impact = {imp: 0 for imp in self.VALID_IMPACTS}
+        total_savings = 0.0
+        currency = None
+
+        # Calculate statistics
+        for rec in recommendations:
+            # Count by category
+            category = rec.get('category')
+            if category in by_category:
+                by_category[category] += 1
+
+            # Count by impact
+            impact = rec.get('impact')
+            if impact in by_impact:
+                by_impact[impact] += 1
+
+            # Sum potential savings
+            savings = rec.get('potential_savings')
+            if savings is not None:
+                total_savings += savings
+                if currency is None:
+                    currency = rec.get('currency', 'USD')
+
+        return {
+            'total_recommendations': len(recommendations),
+            'by_category': by_category,
+            'by_impact': by_impact,
+            'total_potential_savings': total_savings if total_savings > 0 else None,
+            'currency': currency,
+        }
@@ -0,0 +1,192 @@
+"""
+Incremental (delta) sync of Azure Advisor recommendations.
+
+Full syncs re-insert every recommendation into a new report. Delta syncs
+instead keep the current recommendations of each subscription in
+AdvisorRecommendationState, keyed on the Azure recommendation ``id``:
+
+- recommendations whose id is new are inserted,
+- recommendations whose ``last_updated`` changed (or that came back after
+  being resolved) are updated,
+- unchanged recommendations are not written at all,
+- active recommendations that Advisor no longer returns are marked resolved.
+
+Advisor has no change feed, so the listing itself is still complete, but it
+is streamed page by page and database writes are proportional to the churn
+since the last sync. Reports are then built as snapshots of the active state
+(iter_state_pages) without calling Azure again while the state is fresh.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.azure_integration.models import AdvisorRecommendationState, AzureSubscription
+from apps.azure_integration.services.azure_advisor_service import AzureAdvisorService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_MAX_AGE = 60 * 60  # 1 hour
+
+STATE_UPDATE_FIELDS = [
+    'last_updated', 'category', 'impact', 'resource_group', 'data',
+    'status', 'changed_at', 'resolved_at',
+]
+
+
+def is_state_fresh(subscription: AzureSubscription) -> bool:
+    """Check whether the subscription's state was synced within AZURE_ADVISOR_STATE_MAX_AGE."""
+    if subscription.state_synced_at is None:
+        return False
+    max_age = getattr(settings, 'AZURE_ADVISOR_STATE_MAX_AGE', DEFAULT_STATE_MAX_AGE)
+    return timezone.now() - subscription.state_synced_at < timedelta(seconds=max_age)
+
+
+def _apply(state: AdvisorRecommendationState, rec: Dict, now) -> AdvisorRecommendationState:
+    """Copy a transformed recommendation onto a state row."""
+    state.last_updated = rec.get('last_updated') or ''
+    state.category = rec.get('category') or ''
+    state.impact = rec.get('impact') or ''
+    state.resource_group = (rec.get('resource_group') or '')[:255]
+    state.data = rec
+    state.status = 'active'
+    state.changed_at = now
+    state.resolved_at = None
+    return state
+
+
+def _sync_page(subscription: AzureSubscription, page: List[Dict], now, counts: Dict) -> List[str]:
+    """Upsert one page of recommendations; returns the Azure ids seen."""
+    by_id = {rec['id']: rec for rec in page if rec.get('id')}
+    if len(by_id) < len(page):
+        logger.warning("Skipped %d recommendations without an id", len(page) - len(by_id))
+
+    existing = AdvisorRecommendationState.objects.filter(
+        subscription=subscription, azure_id__in=list(by_id)
+    ).only('id', 'azure_id', 'last_updated', 'status')
+    existing = {state.azure_id: state for state in existing}
+
+    to_create = []
+    to_update = []
+    for azure_id, rec in by_id.items():
+        state = existing.get(azure_id)
+        if state is None:
+            to_create.append(_apply(
+                AdvisorRecommendationState(
+                    subscription=subscription, azure_id=azure_id, first_seen_at=now
+                ),
+                rec, now,
+            ))
+        elif state.last_updated != (rec.get('last_updated') or '') or state.status != 'active':
+            to_update.append(_apply(state, rec, now))
+
+    if to_create or to_update:
+        with transaction.atomic():
+            AdvisorRecommendationState.objects.bulk_create(to_create, batch_size=1000)
+            AdvisorRecommendationState.objects.bulk_update(
+                to_update, STATE_UPDATE_FIELDS, batch_size=500
+            )
+
+    counts['created'] += len(to_create)
+    counts['updated'] += len(to_update)
+    counts['unchanged'] += len(by_id) - len(to_create) - len(to_update)
+    return list(by_id)
+
+
+def sync_recommendation_state(
+    subscription: AzureSubscription,
+    service: Optional[AzureAdvisorService] = None,
+) -> Dict:
+    """
+    Bring a subscription's recommendation state up to date with Advisor.
+
+    Pages are upserted as they are streamed. Resolution only runs after the
+    listing completed, so a sync that fails half way never resolves
+    recommendations it simply did not get to.
+
+    Args:
+        subscription: Subscription to sync
+        service: AzureAdvisorService to reuse (created if omitted)
+
+    Returns:
+        dict: created, updated, unchanged and resolved counts, and pages fetched
+
+    Raises:
+        AzureAuthenticationError, AzureAPIError, AzureConnectionError: From the service
+    """
+    service = service or AzureAdvisorService(subscription)
+    now = timezone.now()
+    counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'resolved': 0}
+    seen = set()
+
+    for page in service.iter_recommendation_pages():
+        seen.update(_sync_page(subscription, page, now, counts))
+
+    active = AdvisorRecommendationState.objects.filter(
+        subscription=subscription, status='active'
+    ).values_list('id', 'azure_id')
+    gone = [pk for pk, azure_id in active.iterator(chunk_size=5000) if azure_id not in seen]
+    for start in range(0, len(gone), 1000):
+        counts['resolved'] += AdvisorRecommendationState.objects.filter(
+            id__in=gone[start:start + 1000]
+        ).update(status='resolved', resolved_at=now, changed_at=now)
+
+    subscription.state_synced_at = now
+    subscription.save(update_fields=['state_synced_at'])
+
+    counts['pages'] = service.last_page_count
+    logger.info(
+        "Delta sync of subscription %s: %d created, %d updated, %d resolved, %d unchanged",
+        subscription.subscription_id, counts['created'], counts['updated'],
+        counts['resolved'], counts['unchanged'],
+    )
+    return counts
+
+
+def iter_state_pages(
+    subscriptions: Iterable[AzureSubscription],
+    filters: Optional[Dict] = None,
+    page_size: int = 1000,
+) -> Iterator[List[Dict]]:
+    """
+    Yield the active recommendations of the subscriptions, page by page.
+
+    Recommendations are in AzureAdvisorService internal format, tagged with
+    subscription_id and subscription_name, ready for _save_recommendations_to_db.
+
+    Args:
+        subscriptions: Subscriptions to snapshot
+        filters: Same filters as AzureAdvisorService.fetch_recommendations
+        page_size: Recommendations per yielded page
+    """
+    filters = filters or {}
+    queryset = AdvisorRecommendationState.objects.filter(
+        subscription__in=list(subscriptions), status='active'
+    )
+    if filters.get('category'):
+        queryset = queryset.filter(category=filters['category'])
+    if filters.get('impact'):
+        queryset = queryset.filter(impact=filters['impact'])
+    if filters.get('resource_group'):
+        queryset = queryset.filter(resource_group__iexact=filters['resource_group'])
+
+    rows = queryset.order_by('subscription_id', 'id').values_list(
+        'data', 'subscription__subscription_id', 'subscription__name'
+    )
+
+    page = []
+    for data, subscription_id, subscription_name in rows.iterator(chunk_size=page_size):
+        page.append({
+            **data,
+            'subscription_id': subscription_id,
+            'subscription_name': subscription_name,
+        })
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page:
+        yield page
@@ -0,0 +1,198 @@
+"""
+Concurrent Azure Advisor fetch across several subscriptions.
+
+Clients with many subscriptions used to be synced one subscription after
+another, so a consolidated report took the sum of every subscription's page
+latency. MultiSubscriptionFetcher fans the subscriptions out over a thread
+pool and merges the results (fan-in), either as one list (fetch) or as a
+stream of pages (iter_pages):
+
+- Every page request still takes a slot from the global Advisor request
+  semaphore (AZURE_ADVISOR_MAX_CONCURRENT_REQUESTS), so the number of
+  in-flight ARM calls per worker process is capped however many
+  subscriptions are fetched.
+- A failing subscription does not fail the others; its error is recorded in
+  the per-subscription results and the remaining recommendations are kept.
+- Threads only talk to Azure. Database writes (sync status, recommendations)
+  are left to the caller, on the calling thread; with iter_pages the caller
+  can insert each page while the other subscriptions are still fetching.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from apps.azure_integration.exceptions import AzureIntegrationError
+from apps.azure_integration.services.azure_advisor_service import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    AzureAdvisorService,
+)
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of one subscription on the page queue
+_DONE = object()
+
+
+class _ConsumerStopped(Exception):
+    """The consumer of iter_pages() went away; abandon the fetch."""
+
+
+class MultiSubscriptionFetcher:
+    """
+    Fetch Advisor recommendations for several subscriptions concurrently.
+
+    Example:
+        >>> subscriptions = client.azure_subscriptions.filter(is_active=True)
+        >>> result = MultiSubscriptionFetcher(subscriptions, {'category': 'Cost'}).fetch()
+        >>> result['subscriptions']['<subscription-id>']['status']
+        'success'
+    """
+
+    def __init__(self, subscriptions: Iterable, filters: Optional[Dict] = None):
+        """
+        Args:
+            subscriptions: AzureSubscription instances to fetch
+            filters: Filters passed to AzureAdvisorService.fetch_recommendations
+        """
+        self.subscriptions = list(subscriptions)
+        self.filters = filters or {}
+        self.results = {}
+
+    @property
+    def max_workers(self) -> int:
+        cap = getattr(
+            settings, 'AZURE_ADVISOR_MAX_CONCURRENT_REQUESTS', DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
+        return max(1, min(len(self.subscriptions), cap))
+
+    def _fetch_one(self, subscription, emit: Callable[[List[Dict]], None]) -> Dict:
+        """Stream one subscription's pages to ``emit``; never raises for Azure or filter errors."""
+        started = time.monotonic()
+        result = {
+            'subscription_id': subscription.subscription_id,
+            'subscription_name': subscription.name,
+            'status': 'success',
+            'recommendations_count': 0,
+            'pages': 0,
+            'error_message': None,
+            'retry_after': None,
+        }
+
+        service = None
+        try:
+            service = AzureAdvisorService(subscription)
+            for page in service.iter_recommendation_pages(filters=self.filters):
+                # Tag with the owning subscription; cached lists are shared, so copy
+                emit([
+                    {
+                        **rec,
+                        'subscription_id': subscription.subscription_id,
+                        'subscription_name': subscription.name,
+                    }
+                    for rec in page
+                ])
+                result['recommendations_count'] += len(page)
+        except (AzureIntegrationError, ValueError) as e:
+            logger.warning(
+                "Advisor fetch failed for subscription %s: %s", subscription.subscription_id, e
+            )
+            result['status'] = 'failed'
+            result['error_message'] = str(e)
+            result['retry_after'] = getattr(e, 'retry_after', None)
+
+        result['pages'] = service.last_page_count if service else 0
+        result['duration_seconds'] = round(time.monotonic() - started, 2)
+        return result
+
+    def iter_pages(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Yield (subscription_id, recommendations) pages as they arrive.
+
+        Pages pass through a queue bounded to a few pages per worker, so a
+        slow consumer (e.g. bulk inserts) throttles the fetch instead of
+        letting pages pile up in memory. The per-subscription results are
+        available in ``self.results`` once the generator is exhausted. A
+        subscription that failed may already have yielded some pages.
+        """
+        self.results = {}
+        if not self.subscriptions:
+            return
+
+        pages = queue.Queue(maxsize=self.max_workers * 2)
+        stopped = threading.Event()
+
+        def put(item) -> bool:
+            # Give up instead of blocking forever once the consumer is gone
+            while not stopped.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def run(subscription):
+            def emit(page):
+                if not put((subscription.subscription_id, page)):
+                    raise _ConsumerStopped()
+
+            try:
+                return self._fetch_one(subscription, emit)
+            except _ConsumerStopped:
+                return None
+            finally:
+                put(_DONE)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='advisor-fetch')
+        futures = [pool.submit(run, subscription) for subscription in self.subscriptions]
+        try:
+            remaining = len(futures)
+            while remaining:
+                item = pages.get()
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            stopped.set()
+            pool.shutdown(wait=True)
+
+        for future in futures:
+            result = future.result()
+            self.results[result.pop('subscription_id')] = result
+
+        succeeded = sum(1 for r in self.results.values() if r['status'] == 'success')
+        logger.info(
+            "Fetched %d recommendations from %d/%d subscriptions",
+            sum(r['recommendations_count'] for r in self.results.values()),
+            succeeded, len(self.results),
+        )
+
+    def fetch(self) -> Dict:
+        """
+        Fetch all subscriptions and merge the results.
+
+        Returns:
+            dict: With keys:
+                - recommendations: merged list, in subscription order
+                - subscriptions: {subscription_id: {status, recommendations_count,
+                  pages, error_message, retry_after, duration_seconds}}
+                - succeeded / failed: number of subscriptions in each state
+        """
+        by_subscription = {subscription.subscription_id: [] for subscription in self.subscriptions}
+        for subscription_id, page in self.iter_pages():
+            by_subscription[subscription_id].extend(page)
+
+        succeeded = sum(1 for r in self.results.values() if r['status'] == 'success')
+        return {
+            'recommendations': [rec for page in by_subscription.values() for rec in page],
+            'subscriptions': self.results,
+            'succeeded': succeeded,
+            'failed': len(self.results) - succeeded,
+        }
@@ -0,0 +1,329 @@
+"""
+Distributed rate limiting of Azure Resource Manager calls.
+
+Every ``azure_api`` worker used to retry throttled calls on its own, so when
+Beat started many subscription syncs at once the workers collectively kept
+ARM throttled and the retries multiplied the load. AzureRateLimiter shares
+token buckets between all workers through Redis:
+
+- One bucket per tenant and one per subscription. A request takes a token
+  from both, atomically (Lua script), or none.
+- Response headers feed back into the buckets: ``Retry-After`` on a 429
+  blocks the bucket until it expires, and a low
+  ``x-ms-ratelimit-remaining-{subscription,tenant}-reads`` drains it, so
+  every worker slows down before ARM starts rejecting requests.
+- Short waits (up to AZURE_RATELIMIT_MAX_WAIT seconds) are waited out in
+  process. Longer ones raise AzureRateLimitError with ``retry_after`` so the
+  task can be re-queued with a countdown instead of holding a worker.
+
+Without a django-redis cache (tests, local development) the buckets live in
+the Django cache behind a process-local lock.
+"""
+
+import logging
+import math
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Mapping, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.azure_integration.exceptions import AzureRateLimitError
+
+logger = logging.getLogger(__name__)
+
+# ARM answers throttled requests with 429 and usually a Retry-After header
+DEFAULT_RETRY_AFTER = 30
+
+# Our share of ARM's read limits, as (burst, tokens per second)
+DEFAULT_TENANT_LIMIT = (100, 10)
+DEFAULT_SUBSCRIPTION_LIMIT = (50, 5)
+DEFAULT_MAX_WAIT = 2.0
+DEFAULT_RESERVE = 10
+
+REMAINING_READS_HEADERS = {
+    'tenant': 'x-ms-ratelimit-remaining-tenant-reads',
+    'subscription': 'x-ms-ratelimit-remaining-subscription-reads',
+}
+
+# KEYS: bucket hashes. ARGV: now, cost, then capacity and refill rate per key.
+# Takes ``cost`` tokens from every bucket if all of them have enough and none
+# is blocked; returns the seconds to wait (0 when the tokens were taken).
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local wait = 0
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + i * 2])
+    local rate = tonumber(ARGV[2 + i * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'ts', 'blocked_until')
+    local available = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    local blocked_until = tonumber(state[3]) or 0
+    available = math.min(capacity, available + math.max(0, now - ts) * rate)
+    tokens[i] = available
+    if blocked_until > now then
+        wait = math.max(wait, blocked_until - now)
+    end
+    if available < cost then
+        wait = math.max(wait, (cost - available) / rate)
+    end
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + i * 2])
+    local rate = tonumber(ARGV[2 + i * 2])
+    local available = tokens[i]
+    if wait == 0 then
+        available = available - cost
+    end
+    redis.call('HSET', key, 'tokens', tostring(available), 'ts', tostring(now))
+    local blocked_until = tonumber(redis.call('HGET', key, 'blocked_until')) or 0
+    redis.call('EXPIRE', key, math.ceil(math.max(capacity / rate, blocked_until - now)) + 60)
+end
+return tostring(wait)
+"""
+
+# KEYS[1]: bucket hash. ARGV: now, capacity, rate, max tokens (-1: keep),
+# blocked until (0: keep). Caps the tokens and extends the block.
+_ADJUST_SCRIPT = """
+local now = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local max_tokens = tonumber(ARGV[4])
+local block = tonumber(ARGV[5])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'blocked_until')
+local available = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+local blocked_until = tonumber(state[3]) or 0
+available = math.min(capacity, available + math.max(0, now - ts) * rate)
+if max_tokens >= 0 then
+    available = math.min(available, max_tokens)
+end
+blocked_until = math.max(blocked_until, block)
+redis.call('HSET', KEYS[1], 'tokens', tostring(available), 'ts', tostring(now),
+           'blocked_until', tostring(blocked_until))
+redis.call('EXPIRE', KEYS[1], math.ceil(math.max(capacity / rate, blocked_until - now)) + 60)
+return 1
+"""
+
+
+def get_retry_after(headers: Mapping[str, str]) -> float:
+    """Seconds to wait after a 429, from Retry-After (seconds or HTTP date)."""
+    value = headers.get('Retry-After')
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            logger.warning("Ignoring unparsable Retry-After header: %s", value)
+    return DEFAULT_RETRY_AFTER
+
+
+# ============================================================================
+# Bucket storage
+# ============================================================================
+
+def _refill(state: Optional[Dict], capacity: float, rate: float, now: float) -> Dict:
+    state = dict(state or {})
+    tokens = state.get('tokens', capacity)
+    elapsed = max(0.0, now - state.get('ts', now))
+    state['tokens'] = min(capacity, tokens + elapsed * rate)
+    state['ts'] = now
+    state.setdefault('blocked_until', 0.0)
+    return state
+
+
+def _state_ttl(state: Dict, capacity: float, rate: float, now: float) -> int:
+    return math.ceil(max(capacity / rate, state['blocked_until'] - now)) + 60
+
+
+class _RedisBuckets:
+    """Buckets in Redis, updated atomically by Lua scripts."""
+
+    def __init__(self, connection):
+        self.acquire_script = connection.register_script(_ACQUIRE_SCRIPT)
+        self.adjust_script = connection.register_script(_ADJUST_SCRIPT)
+
+    def acquire(self, buckets: List['Bucket'], now: float, cost: float) -> float:
+        args = [now, cost]
+        for bucket in buckets:
+            args.extend([bucket.capacity, bucket.rate])
+        keys = [cache.make_key(bucket.key) for bucket in buckets]
+        return float(self.acquire_script(keys=keys, args=args))
+
+    def adjust(self, bucket: 'Bucket', now: float, max_tokens: Optional[float],
+               blocked_until: float):
+        self.adjust_script(
+            keys=[cache.make_key(bucket.key)],
+            args=[
+                now, bucket.capacity, bucket.rate,
+                -1 if max_tokens is None else max_tokens,
+                blocked_until,
+            ],
+        )
+
+
+class _CacheBuckets:
+    """Buckets in the Django cache; atomic within one process only."""
+
+    lock = threading.Lock()
+
+    def acquire(self, buckets: List['Bucket'], now: float, cost: float) -> float:
+        with self.lock:
+            states = cache.get_many([b.key for b in buckets])
+            wait = 0.0
+            refilled = {}
+            for bucket in buckets:
+                state = _refill(states.get(bucket.key), bucket.capacity, bucket.rate, now)
+                refilled[bucket.key] = state
+                wait = max(wait, state['blocked_until'] - now)
+                if state['tokens'] < cost:
+                    wait = max(wait, (cost - state['tokens']) / bucket.rate)
+            for bucket in buckets:
+                state = refilled[bucket.key]
+                if wait <= 0:
+                    state['tokens'] -= cost
+                cache.set(bucket.key, state, _state_ttl(state, bucket.capacity, bucket.rate, now))
+            return max(0.0, wait)
+
+    def adjust(self, bucket: 'Bucket', now: float, max_tokens: Optional[float],
+               blocked_until: float):
+        with self.lock:
+            state = _refill(cache.get(bucket.key), bucket.capacity, bucket.rate, now)
+            if max_tokens is not None:
+                state['tokens'] = min(state['tokens'], max_tokens)
+            state['blocked_until'] = max(state['blocked_until'], blocked_until)
+            cache.set(bucket.key, state, _state_ttl(state, bucket.capacity, bucket.rate, now))
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_bucket_storage():
+    """Return the Redis bucket storage, or the cache fallback without django-redis."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            try:
+                from django_redis import get_redis_connection
+                _storage = _RedisBuckets(get_redis_connection('default'))
+            except (ImportError, NotImplementedError):
+                logger.info("Cache is not django-redis: Azure rate limits are enforced per process")
+                _storage = _CacheBuckets()
+    return _storage
+
+
+# ============================================================================
+# Limiter
+# ============================================================================
+
+class Bucket:
+    """One token bucket: ``capacity`` tokens refilled at ``rate`` per second."""
+
+    def __init__(self, scope: str, identifier: str, capacity: float, rate: float):
+        self.scope = scope
+        self.key = f"azure_ratelimit:{scope}:{identifier}"
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+
+
+class AzureRateLimiter:
+    """
+    Shared request budget of one subscription and its tenant.
+
+    Example:
+        >>> limiter = AzureRateLimiter(subscription.tenant_id, subscription.subscription_id)
+        >>> limiter.acquire()          # before each ARM request
+        >>> limiter.observe(429, {'Retry-After': '20'})  # after each response
+    """
+
+    def __init__(self, tenant_id: str, subscription_id: str):
+        self.subscription_id = subscription_id
+        self.buckets = {
+            'tenant': Bucket(
+                'tenant', tenant_id,
+                getattr(settings, 'AZURE_RATELIMIT_TENANT_BURST', DEFAULT_TENANT_LIMIT[0]),
+                getattr(settings, 'AZURE_RATELIMIT_TENANT_RATE', DEFAULT_TENANT_LIMIT[1]),
+            ),
+            'subscription': Bucket(
+                'subscription', subscription_id,
+                getattr(settings, 'AZURE_RATELIMIT_SUBSCRIPTION_BURST',
+                        DEFAULT_SUBSCRIPTION_LIMIT[0]),
+                getattr(settings, 'AZURE_RATELIMIT_SUBSCRIPTION_RATE',
+                        DEFAULT_SUBSCRIPTION_LIMIT[1]),
+            ),
+        }
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        """
+        Take one request token from the tenant and subscription buckets.
+
+        Waits in process while the wait is at most ``max_wait`` seconds
+        (AZURE_RATELIMIT_MAX_WAIT by default).
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            AzureRateLimitError: If the wait would be longer than ``max_wait``
+        """
+        if max_wait is None:
+            max_wait = getattr(settings, 'AZURE_RATELIMIT_MAX_WAIT', DEFAULT_MAX_WAIT)
+        storage = get_bucket_storage()
+        buckets = list(self.buckets.values())
+        waited = 0.0
+
+        while True:
+            wait = storage.acquire(buckets, time.time(), 1)
+            if wait <= 0:
+                return waited
+            if waited + wait > max_wait:
+                raise AzureRateLimitError(
+                    f"Azure API rate limit reached for subscription {self.subscription_id}, "
+                    f"retry after {wait:.1f}s",
+                    retry_after=wait,
+                )
+            time.sleep(wait)
+            waited += wait
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Feed ARM throttling headers of a response back into the buckets.
+
+        A low remaining-reads header caps the bucket at what is left above
+        AZURE_RATELIMIT_RESERVE. A 429 blocks the subscription (and the tenant
+        when its reads are exhausted too) until Retry-After has passed.
+        """
+        now = time.time()
+        storage = get_bucket_storage()
+        reserve = getattr(settings, 'AZURE_RATELIMIT_RESERVE', DEFAULT_RESERVE)
+
+        remaining = {}
+        for scope, header in REMAINING_READS_HEADERS.items():
+            try:
+                remaining[scope] = int(headers.get(header))
+            except (TypeError, ValueError):
+                continue
+
+        blocked_until = 0.0
+        if status_code == 429:
+            blocked_until = now + get_retry_after(headers)
+            logger.warning(
+                "Azure throttled subscription %s, blocking requests for %.1fs",
+                self.subscription_id, blocked_until - now,
+            )
+
+        for scope, bucket in self.buckets.items():
+            max_tokens = None
+            if scope in remaining and remaining[scope] < bucket.capacity + reserve:
+                max_tokens = max(0, remaining[scope] - reserve)
+            block = blocked_until if scope == 'subscription' or remaining.get(scope) == 0 else 0.0
+            if max_tokens is not None or block:
+                storage.adjust(bucket, now, max_tokens, block)
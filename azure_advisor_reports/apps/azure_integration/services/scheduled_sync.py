@@ -0,0 +1,127 @@
+"""
+Planning for the scheduled bulk sync of all subscriptions.
+
+Celery Beat runs schedule_subscription_sync (see tasks.py), which selects the
+active subscriptions due for refresh and syncs them in waves:
+
+- a wave is a chord of at most AZURE_SYNC_WAVE_SIZE sync tasks, and its
+  callback records the outcomes in bulk and starts the next wave, so no more
+  than one wave is ever in flight;
+- subscriptions are interleaved round-robin by tenant, so each wave spreads
+  over as many tenants as possible;
+- subscriptions of one tenant inside a wave start AZURE_SYNC_TENANT_STAGGER
+  seconds apart, since ARM throttles per tenant.
+
+The run time is therefore bounded by the number of waves times the slowest
+sync of a wave. Only one run is active at a time (a lease in the cache); a
+run that dies leaves its remaining subscriptions due for the next one.
+"""
+
+import logging
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.azure_integration.models import AzureSubscription
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_MAX_AGE = 20 * 60 * 60  # 20 hours, so a nightly run catches every subscription
+DEFAULT_SYNC_WAVE_SIZE = 20
+DEFAULT_SYNC_TENANT_STAGGER = 5  # seconds
+DEFAULT_SYNC_RUN_TIMEOUT = 6 * 60 * 60  # 6 hours
+
+RUN_LEASE_KEY = 'azure_sync:schedule:lease'
+
+# One wave: (subscription id, countdown in seconds) pairs
+Wave = List[Tuple[str, int]]
+
+
+def get_due_subscriptions(now=None) -> List[AzureSubscription]:
+    """
+    Active subscriptions not synced successfully within AZURE_SYNC_MAX_AGE.
+
+    Returns:
+        list: Never-synced subscriptions first, then the stalest ones
+    """
+    now = now or timezone.now()
+    max_age = getattr(settings, 'AZURE_SYNC_MAX_AGE', DEFAULT_SYNC_MAX_AGE)
+    cutoff = now - timedelta(seconds=max_age)
+
+    return list(
+        AzureSubscription.objects
+        .filter(is_active=True)
+        .filter(Q(last_sync_at__isnull=True) | Q(last_sync_at__lt=cutoff))
+        .only('id', 'tenant_id', 'last_sync_at')
+        .order_by(F('last_sync_at').asc(nulls_first=True), 'created_at')
+    )
+
+
+def _interleave_tenants(subscriptions: Iterable[AzureSubscription]) -> List[AzureSubscription]:
+    """Round-robin over tenants, keeping each tenant's order."""
+    by_tenant = OrderedDict()
+    for subscription in subscriptions:
+        by_tenant.setdefault(subscription.tenant_id, []).append(subscription)
+
+    interleaved = []
+    queues = list(by_tenant.values())
+    while queues:
+        interleaved.extend(queue.pop(0) for queue in queues)
+        queues = [queue for queue in queues if queue]
+    return interleaved
+
+
+def plan_sync_waves(
+    subscriptions: Iterable[AzureSubscription],
+    wave_size: Optional[int] = None,
+    stagger: Optional[int] = None,
+) -> List[Wave]:
+    """
+    Split subscriptions into concurrency-limited waves with per-tenant staggering.
+
+    Args:
+        subscriptions: Subscriptions to sync, most urgent first
+        wave_size: Syncs per wave (default AZURE_SYNC_WAVE_SIZE)
+        stagger: Seconds between syncs of one tenant in a wave (default AZURE_SYNC_TENANT_STAGGER)
+
+    Returns:
+        list: Waves of (subscription id, countdown) pairs
+    """
+    if wave_size is None:
+        wave_size = getattr(settings, 'AZURE_SYNC_WAVE_SIZE', DEFAULT_SYNC_WAVE_SIZE)
+    if stagger is None:
+        stagger = getattr(settings, 'AZURE_SYNC_TENANT_STAGGER', DEFAULT_SYNC_TENANT_STAGGER)
+    wave_size = max(1, wave_size)
+
+    ordered = _interleave_tenants(subscriptions)
+    waves = []
+    for start in range(0, len(ordered), wave_size):
+        started_per_tenant = {}
+        wave = []
+        for subscription in ordered[start:start + wave_size]:
+            position = started_per_tenant.get(subscription.tenant_id, 0)
+            started_per_tenant[subscription.tenant_id] = position + 1
+            wave.append((str(subscription.id), position * stagger))
+        waves.append(wave)
+    return waves
+
+
+# ============================================================================
+# Run lease
+# ============================================================================
+
+def acquire_sync_run(run_id: str) -> bool:
+    """Take the lease of the scheduled sync; False if another run holds it."""
+    timeout = getattr(settings, 'AZURE_SYNC_RUN_TIMEOUT', DEFAULT_SYNC_RUN_TIMEOUT)
+    return cache.add(RUN_LEASE_KEY, run_id, timeout)
+
+
+def release_sync_run(run_id: str) -> None:
+    """Release the lease if this run still holds it."""
+    if cache.get(RUN_LEASE_KEY) == run_id:
+        cache.delete(RUN_LEASE_KEY)
@@ -0,0 +1,26 @@
+"""
+Signal handlers for the azure_integration app.
+
+Drop the shared Advisor clients of a subscription (see
+apps/azure_integration/services/azure_advisor_service.py) once it is
+deactivated or deleted, so its credentials are not kept in memory.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import AzureSubscription
+from .services.azure_advisor_service import invalidate_advisor_clients
+
+
+@receiver(post_save, sender=AzureSubscription)
+def release_inactive_subscription_clients(sender, instance, **kwargs):
+    """Drop the clients of a subscription that has been deactivated."""
+    if not instance.is_active:
+        invalidate_advisor_clients(instance.subscription_id)
+
+
+@receiver(post_delete, sender=AzureSubscription)
+def release_deleted_subscription_clients(sender, instance, **kwargs):
+    """Drop the clients of a deleted subscription."""
+    invalidate_advisor_clients(instance.subscription_id)
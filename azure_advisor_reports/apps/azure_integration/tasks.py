@@ -3,42 +3,100 @@ Celery tasks for asynchronous Azure API data fetching and processing.
 
 This module provides Celery tasks that handle:
 - Fetching recommendations from Azure Advisor API
+- Delta-syncing the per-subscription recommendation state
 - Generating reports from Azure API data
 - Testing Azure credentials and connectivity
 - Syncing Azure statistics for dashboards
 
 All tasks include comprehensive error handling, retry logic, and monitoring.
+Tasks throttled by Azure (AzureRateLimitError) are re-queued with a countdown
+taken from the shared rate limiter instead of sleeping in the worker.
 """
 
 import logging
+import math
+import random
 import time
+from contextlib import closing
 from typing import Dict, List
 from datetime import datetime
 
-from celery import shared_task, chain
+from celery import shared_task, chain, chord, group
+from celery.utils import uuid
 from celery.exceptions import Ignore, SoftTimeLimitExceeded, Retry
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 from django.core.cache import cache
 
-from apps.reports.models import Report, Recommendation
+from apps.core.db_routing import pin_primary_reads
+from apps.reports.models import Report
+from apps.reports.services.bulk_loader import load_recommendations
+from apps.reports.services.normalization import api_batch, normalize_batch
 from apps.azure_integration.models import AzureSubscription
 from apps.azure_integration.services.azure_advisor_service import AzureAdvisorService
+from apps.azure_integration.services.delta_sync import (
+    is_state_fresh,
+    iter_state_pages,
+    sync_recommendation_state,
+)
+from apps.azure_integration.services.multi_subscription import MultiSubscriptionFetcher
+from apps.azure_integration.services.scheduled_sync import (
+    acquire_sync_run,
+    get_due_subscriptions,
+    plan_sync_waves,
+    release_sync_run,
+)
 from apps.azure_integration.exceptions import (
     AzureAuthenticationError,
     AzureAPIError,
     AzureConnectionError,
+    AzureRateLimitError,
 )
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_THROTTLE_MAX_RESCHEDULES = 10
+
+
+def _reschedule_throttled(task, exc: AzureRateLimitError) -> None:
+    """
+    Re-queue a task that Azure throttled, once the rate limit allows.
+
+    The countdown is the limiter's wait plus jitter, so tasks throttled
+    together do not all come back at the same moment. Returns without
+    re-queueing once AZURE_THROTTLE_MAX_RESCHEDULES is reached; the caller
+    then fails the task as for any other API error.
+
+    Raises:
+        Retry: The task was re-queued
+    """
+    max_reschedules = getattr(
+        settings, 'AZURE_THROTTLE_MAX_RESCHEDULES', DEFAULT_THROTTLE_MAX_RESCHEDULES
+    )
+    if task.request.retries >= max_reschedules:
+        logger.error(f"Task {task.name} still throttled after {task.request.retries} re-queues")
+        return
+
+    countdown = math.ceil(exc.retry_after) + random.randint(1, 5)
+    logger.info(f"Task {task.name} throttled by Azure, re-queued in {countdown}s")
+    raise task.retry(exc=exc, countdown=countdown, max_retries=max_reschedules)
+
+
+def _update_sync_status(subscription, record_status: bool, status: str, error_message=None) -> None:
+    """Record a sync outcome on the subscription unless the caller records it in bulk."""
+    if record_status:
+        subscription.update_sync_status(status, error_message)
+
 
 def _save_recommendations_to_db(report: Report, recommendations: List[dict]) -> int:
     """
     Save Azure recommendations to database.
 
-    Bulk create Recommendation objects from Azure API response.
+    Bulk insert Recommendation rows from Azure API response, normalized by
+    the stage shared with CSV ingest (apps.reports.services.normalization).
     Uses transaction.atomic() to ensure all-or-nothing behavior.
+    The fetch tasks call it once per API page while the listing streams.
 
     Args:
         report: Report instance to associate recommendations with
@@ -56,91 +114,19 @@ def _save_recommendations_to_db(report: Report, recommendations: List[dict]) ->
         >>> count = _save_recommendations_to_db(report, recommendations)
         >>> print(f"Saved {count} recommendations")
     """
-    logger.info(f"Preparing to save {len(recommendations)} recommendations for report {report.id}")
-
-    # Map Azure category names to internal format
-    category_mapping = {
-        'Cost': 'cost',
-        'HighAvailability': 'reliability',
-        'Performance': 'performance',
-        'Security': 'security',
-        'OperationalExcellence': 'operational_excellence',
-    }
-
-    # Map Azure impact to business_impact
-    impact_mapping = {
-        'High': 'high',
-        'Medium': 'medium',
-        'Low': 'low',
-    }
+    logger.debug(f"Preparing to save {len(recommendations)} recommendations for report {report.id}")
 
-    recommendation_objects = []
-
-    for rec_data in recommendations:
-        # Map category
-        azure_category = rec_data.get('category', 'Unknown')
-        category = category_mapping.get(azure_category, 'cost')
-
-        # Map impact
-        azure_impact = rec_data.get('impact', 'Low')
-        business_impact = impact_mapping.get(azure_impact, 'low')
-
-        # Extract resource information
-        resource_name = rec_data.get('impacted_resource', '')
-        resource_type = rec_data.get('resource_type', '')
-        resource_group = rec_data.get('resource_group', '')
-
-        # Get recommendation text
-        recommendation_text = rec_data.get('recommendation', '')
-        if not recommendation_text:
-            recommendation_text = rec_data.get('description', 'No description available')
-
-        # Get description
-        description = rec_data.get('description', '')
-
-        # Get financial information
-        potential_savings = rec_data.get('potential_savings', 0)
-        if potential_savings is None:
-            potential_savings = 0
-
-        currency = rec_data.get('currency', 'USD')
-
-        # Get metadata
-        metadata = rec_data.get('metadata', {})
-
-        # Extract subscription info from metadata if available
-        extended_props = metadata.get('extended_properties', {})
-        subscription_id = extended_props.get('subscriptionId', '')
-        subscription_name = extended_props.get('subscriptionName', '')
-
-        # Create Recommendation object
-        recommendation_obj = Recommendation(
-            report=report,
-            category=category,
-            business_impact=business_impact,
-            recommendation=recommendation_text[:5000] if recommendation_text else '',
-            subscription_id=str(subscription_id)[:255],
-            subscription_name=str(subscription_name)[:255],
-            resource_group=str(resource_group)[:255],
-            resource_name=str(resource_name)[:255],
-            resource_type=str(resource_type)[:255],
-            potential_savings=potential_savings,
-            currency=str(currency)[:3],
-            potential_benefits=str(description)[:5000],
-            advisor_score_impact=0,  # Azure API doesn't provide this directly
-        )
-
-        recommendation_objects.append(recommendation_obj)
+    columns = normalize_batch(api_batch(recommendations), source='azure_api')
 
-    # Bulk create with transaction
+    # COPY on PostgreSQL, bulk_create elsewhere
     with transaction.atomic():
-        Recommendation.objects.bulk_create(recommendation_objects, batch_size=1000)
-        logger.info(
-            f"Successfully saved {len(recommendation_objects)} recommendations "
+        saved = load_recommendations(report, columns)
+        logger.debug(
+            f"Successfully saved {saved} recommendations "
             f"to database for report {report.id}"
         )
 
-    return len(recommendation_objects)
+    return saved
 
 
 @shared_task(
@@ -159,8 +145,11 @@ def fetch_azure_recommendations(self, report_id: str) -> dict:
     1. Retrieves the Report and AzureSubscription from database
     2. Updates report status to 'processing'
     3. Initializes AzureAdvisorService with encrypted credentials
-    4. Fetches recommendations using filters from api_sync_metadata
-    5. Saves recommendations to database (creates Recommendation objects)
+    4. Streams recommendations page by page using filters from api_sync_metadata
+       (with sync_mode 'delta': delta-syncs the subscription state if it is
+       stale and streams a snapshot of the state instead)
+    5. Saves each page to database (creates Recommendation objects) before
+       the next page is requested
     6. Updates report status and sync metadata
     7. Chains to generate_azure_report task for PDF/Excel generation
 
@@ -227,10 +216,12 @@ def fetch_azure_recommendations(self, report_id: str) -> dict:
         report.processing_started_at = timezone.now()
         report.save(update_fields=['status', 'processing_started_at'])
 
-        # Extract filters from api_sync_metadata
+        # Extract filters and sync mode from api_sync_metadata
         filters = {}
+        sync_mode = 'full'
         if report.api_sync_metadata and isinstance(report.api_sync_metadata, dict):
             filters = report.api_sync_metadata.get('filters', {})
+            sync_mode = report.api_sync_metadata.get('sync_mode', 'full')
 
         logger.info(f"Applying filters: {filters}")
 
@@ -238,38 +229,46 @@ def fetch_azure_recommendations(self, report_id: str) -> dict:
         logger.info("Initializing AzureAdvisorService")
         service = AzureAdvisorService(subscription)
 
-        # Fetch recommendations from Azure API
-        api_call_count = 0
         requested_at = timezone.now().isoformat()
 
-        try:
-            recommendations = service.fetch_recommendations(filters=filters)
-            api_call_count = 1  # Simple count, could be enhanced to track pagination
+        # Rows saved by an earlier, interrupted attempt of this task
+        report.delete_recommendations()
 
-            logger.info(
-                f"Fetched {len(recommendations)} recommendations from Azure API "
-                f"in {time.time() - start_time:.2f} seconds"
-            )
-        except Exception as e:
-            # Log the error but let it propagate for error handling below
-            logger.error(f"Error fetching recommendations from Azure API: {e}")
-            raise
+        if sync_mode == 'delta':
+            # Bring the subscription's state up to date (unless synced
+            # recently), then snapshot it without another Azure call
+            delta = None
+            if not is_state_fresh(subscription):
+                delta = sync_recommendation_state(subscription, service)
+            pages = iter_state_pages([subscription], filters)
+        else:
+            # Stream recommendations from Azure API: each page is saved before
+            # the next one is requested, so memory is bounded by the page size
+            pages = service.iter_recommendation_pages(filters=filters)
+
+        saved_count = 0
+        with closing(pages):
+            for page in pages:
+                try:
+                    saved_count += _save_recommendations_to_db(report, page)
+                except Exception as e:
+                    error_msg = f"Failed to save recommendations to database: {str(e)}"
+                    logger.error(error_msg, exc_info=True)
+                    report.status = 'failed'
+                    report.error_message = error_msg
+                    report.processing_completed_at = timezone.now()
+                    report.save(update_fields=[
+                        'status', 'error_message', 'processing_completed_at'
+                    ])
+                    subscription.update_sync_status('failed', error_msg)
+                    raise Ignore()
+
+        api_call_count = service.last_page_count
 
-        # Save recommendations to database
-        try:
-            saved_count = _save_recommendations_to_db(report, recommendations)
-            logger.info(f"Saved {saved_count} recommendations to database")
-        except Exception as e:
-            error_msg = f"Failed to save recommendations to database: {str(e)}"
-            logger.error(error_msg, exc_info=True)
-            report.status = 'failed'
-            report.error_message = error_msg
-            report.processing_completed_at = timezone.now()
-            report.save(update_fields=[
-                'status', 'error_message', 'processing_completed_at'
-            ])
-            subscription.update_sync_status('failed', error_msg)
-            raise Ignore()
+        logger.info(
+            f"Saved {saved_count} recommendations from {api_call_count} API pages "
+            f"in {time.time() - start_time:.2f} seconds"
+        )
 
         # Calculate duration
         fetch_duration = time.time() - start_time
@@ -278,15 +277,19 @@ def fetch_azure_recommendations(self, report_id: str) -> dict:
         # Update api_sync_metadata
         sync_metadata = {
             'filters': filters,
+            'sync_mode': sync_mode,
             'requested_at': requested_at,
             'fetched_at': fetched_at,
             'recommendations_count': saved_count,
             'fetch_duration_seconds': round(fetch_duration, 2),
             'azure_api_calls': api_call_count,
         }
+        if sync_mode == 'delta':
+            sync_metadata['delta'] = delta
 
-        # Update report with success status and metadata
+        # Update report with success status, metadata and summary
         with transaction.atomic():
+            report.refresh_summary(save=False)
             report.api_sync_metadata = sync_metadata
             report.status = 'completed'
             report.processing_completed_at = timezone.now()
@@ -295,9 +298,13 @@ def fetch_azure_recommendations(self, report_id: str) -> dict:
                 'api_sync_metadata',
                 'status',
                 'processing_completed_at',
-                'error_message'
+                'error_message',
+                *Report.SUMMARY_FIELDS,
             ])
 
+        # Until the replica has the new rows, the user reads from the primary
+        pin_primary_reads(report.created_by_id)
+
         # Update subscription sync status
         subscription.update_sync_status('success')
 
@@ -347,6 +354,24 @@ def fetch_azure_recommendations(self, report_id: str) -> dict:
         # Don't retry authentication errors - they need manual intervention
         raise Ignore()
 
+    except AzureRateLimitError as e:
+        error_msg = f"Azure API throttled: {str(e)}"
+        logger.warning(error_msg)
+
+        if report:
+            report.error_message = error_msg
+            report.save(update_fields=['error_message'])
+
+        _reschedule_throttled(self, e)
+
+        if report:
+            report.status = 'failed'
+            report.processing_completed_at = timezone.now()
+            report.save(update_fields=['status', 'processing_completed_at'])
+        if subscription:
+            subscription.update_sync_status('failed', error_msg)
+        raise Ignore()
+
     except (AzureAPIError, AzureConnectionError) as e:
         error_msg = f"Azure API/Connection error: {str(e)}"
         logger.warning(f"{error_msg} - will retry")
@@ -403,6 +428,194 @@ def fetch_azure_recommendations(self, report_id: str) -> dict:
         raise Ignore()
 
 
+@shared_task(
+    bind=True,
+    soft_time_limit=900,  # 15 minutes
+    time_limit=960,
+    queue='azure_api'
+)
+def fetch_multi_subscription_recommendations(self, report_id: str) -> dict:
+    """
+    Fetch recommendations for several subscriptions into one report.
+
+    Fan-out/fan-in variant of fetch_azure_recommendations for reports whose
+    api_sync_metadata lists 'subscription_ids' (AzureSubscription pks).
+    Subscriptions are fetched concurrently by MultiSubscriptionFetcher under
+    the global Advisor request cap; database writes stay on this thread and
+    happen page by page as pages arrive.
+
+    A subscription that fails (bad credentials, API error) is recorded in
+    api_sync_metadata['subscriptions'] and the report is completed with the
+    recommendations of the others ('partial': True). The report only fails
+    when no subscription could be fetched. Failed subscriptions are not
+    retried here: retrying the task would refetch the healthy ones too.
+
+    Args:
+        report_id: UUID string of the Report instance
+
+    Returns:
+        dict: Task result with keys:
+            - status: 'success', 'partial' or 'failed'
+            - report_id: UUID string
+            - recommendations_count: Number of recommendations saved
+            - subscriptions: Per-subscription results
+
+    Raises:
+        Ignore: If the report doesn't exist or has no subscriptions
+
+    Example:
+        >>> fetch_multi_subscription_recommendations.delay('abc-123-def-456')
+    """
+    logger.info(f"Starting multi-subscription Azure fetch for report {report_id}")
+
+    start_time = time.time()
+
+    try:
+        report = Report.objects.get(id=report_id)
+    except Report.DoesNotExist:
+        logger.error(f"Report {report_id} not found - it may have been deleted")
+        raise Ignore()
+
+    sync_metadata = dict(report.api_sync_metadata or {})
+    filters = sync_metadata.get('filters', {})
+    subscriptions = list(
+        AzureSubscription.objects.filter(
+            id__in=sync_metadata.get('subscription_ids', []),
+            is_active=True,
+        ).order_by('name')
+    )
+
+    if not subscriptions:
+        error_msg = "Report has no active Azure subscriptions configured"
+        logger.error(f"{error_msg} for report {report_id}")
+        report.status = 'failed'
+        report.error_message = error_msg
+        report.save(update_fields=['status', 'error_message'])
+        raise Ignore()
+
+    report.status = 'processing'
+    report.processing_started_at = timezone.now()
+    report.save(update_fields=['status', 'processing_started_at'])
+
+    # Rows saved by an earlier, interrupted attempt of this task
+    report.delete_recommendations()
+
+    # Pages are saved here, on the task thread, as they arrive from any subscription
+    fetcher = MultiSubscriptionFetcher(subscriptions, filters)
+    saved_count = 0
+    try:
+        with closing(fetcher.iter_pages()) as pages:
+            for _, page in pages:
+                saved_count += _save_recommendations_to_db(report, page)
+    except SoftTimeLimitExceeded:
+        error_msg = "Task timed out after 15 minutes"
+        logger.error(f"Multi-subscription fetch timed out for report {report_id}")
+        report.status = 'failed'
+        report.error_message = error_msg
+        report.processing_completed_at = timezone.now()
+        report.save(update_fields=['status', 'error_message', 'processing_completed_at'])
+        raise Ignore()
+    except Exception as e:
+        error_msg = f"Failed to save recommendations to database: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        report.status = 'failed'
+        report.error_message = error_msg
+        report.processing_completed_at = timezone.now()
+        report.save(update_fields=['status', 'error_message', 'processing_completed_at'])
+        raise Ignore()
+
+    results = fetcher.results
+    succeeded = sum(1 for r in results.values() if r['status'] == 'success')
+
+    # Sync status is written here rather than in the fetcher threads
+    for subscription in subscriptions:
+        sub_result = results[subscription.subscription_id]
+        subscription.update_sync_status(sub_result['status'], sub_result['error_message'])
+
+        # Keep the report all-or-nothing per subscription
+        if sub_result['status'] == 'failed' and sub_result['recommendations_count']:
+            deleted, _ = report.recommendations.filter(
+                subscription_id=subscription.subscription_id
+            ).delete()
+            saved_count -= deleted
+            sub_result['recommendations_count'] = 0
+
+    fetch_duration = time.time() - start_time
+    sync_metadata.update({
+        'fetched_at': timezone.now().isoformat(),
+        'fetch_duration_seconds': round(fetch_duration, 2),
+        'azure_api_calls': sum(r['pages'] for r in results.values()),
+        'subscriptions': results,
+        'partial': succeeded < len(results),
+    })
+
+    throttled = [r['retry_after'] for r in results.values() if r.get('retry_after') is not None]
+    if not succeeded and throttled:
+        # Nothing to keep and at least one subscription only needs to wait
+        exc = AzureRateLimitError(
+            "All subscriptions failed, some throttled", retry_after=max(throttled)
+        )
+        _reschedule_throttled(self, exc)
+
+    if not succeeded:
+        error_msg = "Failed to fetch recommendations for all subscriptions: " + "; ".join(
+            f"{r['subscription_name']}: {r['error_message']}" for r in results.values()
+        )
+        logger.error(f"{error_msg} (report {report_id})")
+        report.api_sync_metadata = sync_metadata
+        report.status = 'failed'
+        report.error_message = error_msg[:5000]
+        report.processing_completed_at = timezone.now()
+        report.save(update_fields=[
+            'api_sync_metadata', 'status', 'error_message', 'processing_completed_at'
+        ])
+        return {
+            'status': 'failed',
+            'report_id': str(report_id),
+            'recommendations_count': 0,
+            'subscriptions': results,
+        }
+
+    sync_metadata['recommendations_count'] = saved_count
+
+    with transaction.atomic():
+        report.refresh_summary(save=False)
+        report.api_sync_metadata = sync_metadata
+        report.status = 'completed'
+        report.processing_completed_at = timezone.now()
+        report.error_message = ''
+        report.save(update_fields=[
+            'api_sync_metadata',
+            'status',
+            'processing_completed_at',
+            'error_message',
+            *Report.SUMMARY_FIELDS,
+        ])
+    pin_primary_reads(report.created_by_id)
+
+    logger.info(
+        f"Completed multi-subscription fetch for report {report_id}: "
+        f"{saved_count} recommendations from {succeeded}/{len(subscriptions)} "
+        f"subscriptions in {fetch_duration:.2f}s"
+    )
+
+    try:
+        generate_azure_report.delay(str(report_id), format_type='both')
+    except Exception as e:
+        logger.error(
+            f"Failed to trigger report generation for {report_id}: {str(e)}",
+            exc_info=True
+        )
+
+    return {
+        'status': 'partial' if succeeded < len(results) else 'success',
+        'report_id': str(report_id),
+        'recommendations_count': saved_count,
+        'fetch_duration_seconds': round(fetch_duration, 2),
+        'subscriptions': results,
+    }
+
+
 @shared_task(
     bind=True,
     max_retries=3,
@@ -467,7 +680,7 @@ def generate_azure_report(self, report_id: str, format_type: str = 'both') -> di
             return {'status': 'error', 'error': error_msg, 'report_id': str(report_id)}
 
         # Check if we have recommendations
-        recommendations_count = report.recommendations.count()
+        recommendations_count = report.recommendation_count
         if recommendations_count == 0:
             error_msg = 'Report has no recommendations to include'
             logger.error(error_msg)
@@ -684,7 +897,7 @@ def test_azure_connection(self, subscription_id: str) -> dict:
     time_limit=150,
     queue='azure_api'
 )
-def sync_azure_statistics(self, subscription_id: str) -> dict:
+def sync_azure_statistics(self, subscription_id: str, record_status: bool = True) -> dict:
     """
     Fetch and cache Azure Advisor statistics for a subscription.
 
@@ -702,6 +915,8 @@ def sync_azure_statistics(self, subscription_id: str) -> dict:
 
     Args:
         subscription_id: UUID string of AzureSubscription
+        record_status: Update the subscription's sync_status; the scheduled
+            sync passes False and records a whole wave in bulk
 
     Returns:
         dict: Statistics with keys:
@@ -714,7 +929,8 @@ def sync_azure_statistics(self, subscription_id: str) -> dict:
             - error_message: Error details if failed
 
     Raises:
-        Ignore: If subscription doesn't exist
+        Ignore: If subscription doesn't exist (a failure result is returned
+            instead when record_status is False)
 
     Example:
         >>> result = sync_azure_statistics.delay('abc-123-def')
@@ -729,6 +945,17 @@ def sync_azure_statistics(self, subscription_id: str) -> dict:
         except AzureSubscription.DoesNotExist:
             error_msg = f"AzureSubscription {subscription_id} not found"
             logger.error(error_msg)
+            if not record_status:
+                # Part of a scheduled sync chord, which an ignored task never completes
+                return {
+                    'success': False,
+                    'error_message': error_msg,
+                    'total_recommendations': 0,
+                    'by_category': {},
+                    'by_impact': {},
+                    'total_potential_savings': None,
+                    'currency': None,
+                }
             raise Ignore()
 
         logger.info(
@@ -747,7 +974,7 @@ def sync_azure_statistics(self, subscription_id: str) -> dict:
             )
 
             # Update subscription sync status
-            subscription.update_sync_status('success')
+            _update_sync_status(subscription, record_status, 'success')
 
             # Add success flag to response
             stats['success'] = True
@@ -755,10 +982,24 @@ def sync_azure_statistics(self, subscription_id: str) -> dict:
 
             return stats
 
+        except AzureRateLimitError as e:
+            _reschedule_throttled(self, e)
+            error_msg = str(e)
+            _update_sync_status(subscription, record_status, 'failed', error_msg)
+            return {
+                'success': False,
+                'error_message': error_msg,
+                'total_recommendations': 0,
+                'by_category': {},
+                'by_impact': {},
+                'total_potential_savings': None,
+                'currency': None,
+            }
+
         except AzureAuthenticationError as e:
             error_msg = str(e)
             logger.error(f"Authentication error: {error_msg}")
-            subscription.update_sync_status('failed', error_msg)
+            _update_sync_status(subscription, record_status, 'failed', error_msg)
             return {
                 'success': False,
                 'error_message': error_msg,
@@ -772,7 +1013,7 @@ def sync_azure_statistics(self, subscription_id: str) -> dict:
         except (AzureAPIError, AzureConnectionError) as e:
             error_msg = str(e)
             logger.error(f"Error fetching statistics: {error_msg}")
-            subscription.update_sync_status('failed', error_msg)
+            _update_sync_status(subscription, record_status, 'failed', error_msg)
             return {
                 'success': False,
                 'error_message': error_msg,
@@ -786,7 +1027,7 @@ def sync_azure_statistics(self, subscription_id: str) -> dict:
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
             logger.exception(error_msg)
-            subscription.update_sync_status('failed', error_msg)
+            _update_sync_status(subscription, record_status, 'failed', error_msg)
             return {
                 'success': False,
                 'error_message': error_msg,
@@ -799,3 +1040,221 @@ def sync_azure_statistics(self, subscription_id: str) -> dict:
 
     except Ignore:
         raise
+
+
+@shared_task(
+    bind=True,
+    soft_time_limit=600,  # 10 minutes
+    time_limit=660,
+    queue='azure_api'
+)
+def sync_subscription_state(self, subscription_id: str, record_status: bool = True) -> dict:
+    """
+    Delta-sync the Advisor recommendation state of a subscription.
+
+    Meant to run periodically (e.g. hourly from Celery Beat) so that reports
+    with sync_mode 'delta' are snapshots of a fresh state. Only new, changed
+    and resolved recommendations are written.
+
+    Args:
+        subscription_id: UUID string of AzureSubscription
+        record_status: Update the subscription's sync_status; the scheduled
+            sync passes False and records a whole wave in bulk
+
+    Returns:
+        dict: Sync counts with keys created, updated, unchanged, resolved and
+            pages, plus success and error_message
+
+    Raises:
+        Ignore: If subscription doesn't exist (a failure result is returned
+            instead when record_status is False)
+
+    Example:
+        >>> result = sync_subscription_state.delay('abc-123-def')
+    """
+    logger.info(f"Delta-syncing recommendation state for subscription {subscription_id}")
+
+    try:
+        subscription = AzureSubscription.objects.get(id=subscription_id)
+    except AzureSubscription.DoesNotExist:
+        error_msg = f"AzureSubscription {subscription_id} not found"
+        logger.error(error_msg)
+        if not record_status:
+            # Part of a scheduled sync chord, which an ignored task never completes
+            return {'success': False, 'error_message': error_msg}
+        raise Ignore()
+
+    try:
+        counts = sync_recommendation_state(subscription)
+    except (AzureAuthenticationError, AzureAPIError, AzureConnectionError) as e:
+        if isinstance(e, AzureRateLimitError):
+            _reschedule_throttled(self, e)
+        error_msg = str(e)
+        logger.error(f"Delta sync failed for {subscription.name}: {error_msg}")
+        _update_sync_status(subscription, record_status, 'failed', error_msg)
+        return {'success': False, 'error_message': error_msg}
+    except Exception as e:
+        error_msg = f"Unexpected error: {str(e)}"
+        logger.exception(error_msg)
+        _update_sync_status(subscription, record_status, 'failed', error_msg)
+        return {'success': False, 'error_message': error_msg}
+
+    _update_sync_status(subscription, record_status, 'success')
+
+    counts['success'] = True
+    counts['error_message'] = None
+    return counts
+
+
+# ============================================================================
+# Scheduled bulk sync (see services/scheduled_sync.py)
+# ============================================================================
+
+def _start_sync_wave(waves: list, mode: str, summary: dict) -> None:
+    """
+    Dispatch the first wave as a chord whose callback starts the next one.
+
+    The callback's error callback does the same when a sync task of the wave
+    fails outright, so a failed wave neither stalls the run nor holds its
+    lease until it expires.
+    """
+    sync_task = sync_subscription_state if mode == 'state' else sync_azure_statistics
+    wave, remaining = waves[0], waves[1:]
+
+    header = group(
+        sync_task.signature((subscription_id,), {'record_status': False}, countdown=countdown)
+        for subscription_id, countdown in wave
+    )
+    callback = record_subscription_sync_wave.s(wave, remaining, mode, summary)
+    callback.link_error(fail_subscription_sync_wave.s(wave, remaining, mode, summary))
+    chord(header)(callback)
+
+
+@shared_task(queue='azure_api')
+def schedule_subscription_sync(mode: str = 'state') -> dict:
+    """
+    Sync every active subscription due for refresh (Celery Beat entry point).
+
+    Subscriptions are synced in concurrency-limited waves, one chord per
+    wave; each wave's callback records its outcomes in bulk and starts the
+    next wave. A run is skipped while the previous one is still going.
+
+    Args:
+        mode: 'state' to delta-sync recommendation state (sync_subscription_state)
+            or 'statistics' to refresh the cached statistics (sync_azure_statistics)
+
+    Returns:
+        dict: Run summary with keys run_id, mode, subscriptions, waves and status
+
+    Example:
+        >>> schedule_subscription_sync.delay(mode='statistics')
+    """
+    if mode not in ('state', 'statistics'):
+        raise ValueError(f"Invalid mode: {mode}. Must be 'state' or 'statistics'")
+
+    run_id = uuid()
+    if not acquire_sync_run(run_id):
+        logger.info("Scheduled Azure sync skipped: previous run still in progress")
+        return {'run_id': run_id, 'mode': mode, 'status': 'skipped'}
+
+    waves = plan_sync_waves(get_due_subscriptions())
+    subscriptions = sum(len(wave) for wave in waves)
+    summary = {
+        'run_id': run_id,
+        'mode': mode,
+        'started_at': timezone.now().isoformat(),
+        'subscriptions': subscriptions,
+        'waves': len(waves),
+        'succeeded': 0,
+        'failed': 0,
+        'status': 'running',
+    }
+
+    if not waves:
+        release_sync_run(run_id)
+        logger.info("Scheduled Azure sync: no subscription due for refresh")
+        summary['status'] = 'completed'
+        return summary
+
+    logger.info(
+        f"Scheduled Azure sync {run_id}: {subscriptions} subscriptions "
+        f"in {len(waves)} waves (mode={mode})"
+    )
+    _start_sync_wave(waves, mode, summary)
+    return summary
+
+
+@shared_task(queue='azure_api')
+def record_subscription_sync_wave(results: list, wave: list, remaining: list, mode: str,
+                                  summary: dict) -> dict:
+    """
+    Chord callback of a scheduled sync wave.
+
+    Records the sync status of the wave's subscriptions with one bulk update,
+    adds the outcomes to the run summary and starts the next wave.
+
+    Args:
+        results: Results of the wave's sync tasks, in wave order
+        wave: (subscription id, countdown) pairs of the finished wave
+        remaining: Waves still to run
+        mode: Sync mode of the run
+        summary: Run summary so far
+
+    Returns:
+        dict: Updated run summary
+    """
+    outcomes = {}
+    for (subscription_id, _), result in zip(wave, results):
+        result = result or {}
+        if result.get('success'):
+            outcomes[subscription_id] = None
+        else:
+            outcomes[subscription_id] = result.get('error_message') or 'Unknown error'
+
+    AzureSubscription.bulk_update_sync_status(outcomes)
+
+    failed = sum(1 for error_message in outcomes.values() if error_message is not None)
+    summary['succeeded'] += len(outcomes) - failed
+    summary['failed'] += failed
+
+    if remaining:
+        _start_sync_wave(remaining, mode, summary)
+        return summary
+
+    release_sync_run(summary['run_id'])
+    summary['status'] = 'completed'
+    summary['finished_at'] = timezone.now().isoformat()
+    logger.info(
+        f"Scheduled Azure sync {summary['run_id']} finished: "
+        f"{summary['succeeded']} succeeded, {summary['failed']} failed in {summary['waves']} waves"
+    )
+    return summary
+
+
+@shared_task(queue='azure_api')
+def fail_subscription_sync_wave(request, exc, traceback, wave: list, remaining: list, mode: str,
+                                summary: dict) -> dict:
+    """
+    Error callback of a scheduled sync wave.
+
+    Celery calls it instead of record_subscription_sync_wave when a sync task
+    of the wave raised (e.g. it was killed at its time limit). The results
+    of the other tasks are not available here, so the whole wave is recorded
+    as failed; its subscriptions stay due for the next run.
+
+    Args:
+        request: Request of the failed chord callback
+        exc: Exception the chord failed with
+        traceback: Traceback of the exception, if any
+        wave: (subscription id, countdown) pairs of the failed wave
+        remaining: Waves still to run
+        mode: Sync mode of the run
+        summary: Run summary so far
+
+    Returns:
+        dict: Updated run summary
+    """
+    error_message = f"Sync wave failed: {exc}"
+    logger.error(f"Scheduled Azure sync {summary['run_id']}: {error_message}")
+    results = [{'success': False, 'error_message': error_message} for _ in wave]
+    return record_subscription_sync_wave(results, wave, remaining, mode, summary)
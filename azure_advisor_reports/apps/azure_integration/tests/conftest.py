@@ -0,0 +1,73 @@
+"""
+Shared fixtures for azure_integration tests.
+"""
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.azure_integration.models import AzureSubscription
+from apps.azure_integration.services import azure_advisor_service
+from apps.azure_integration.tests.fake_advisor import FakeAdvisorServer, FakeTokenCredential
+from apps.azure_integration.tests.load_harness import make_load_report, run_fetch
+from apps.clients.models import Client
+
+
+@pytest.fixture
+def user(db):
+    """Create a user owning the test subscriptions."""
+    from django.contrib.auth import get_user_model
+    return get_user_model().objects.create_user(
+        username='azureuser', email='azureuser@example.com', password='testpass123'
+    )
+
+
+@pytest.fixture
+def client_obj(db):
+    """Create the client owning the test subscriptions."""
+    return Client.objects.create(company_name='Azure Integration Corp', contact_email='ops@example.com')
+
+
+@pytest.fixture
+def make_subscription(db, client_obj, user):
+    """Factory for active subscriptions with random Azure ids."""
+    def make(name, tenant_id=None):
+        subscription = AzureSubscription(
+            client=client_obj,
+            name=name,
+            subscription_id=str(uuid.uuid4()),
+            tenant_id=tenant_id or str(uuid.uuid4()),
+            azure_client_id=str(uuid.uuid4()),
+            created_by=user,
+        )
+        subscription.client_secret = 'test-secret'
+        subscription.save()
+        return subscription
+    return make
+
+
+@pytest.fixture
+def fake_advisor(settings, monkeypatch):
+    """Start a fake Advisor endpoint and point the SDK at it."""
+    cache.clear()
+    azure_advisor_service.invalidate_advisor_clients()
+    server = FakeAdvisorServer({}).start()
+    settings.AZURE_ARM_ENDPOINT = server.url
+    monkeypatch.setenv('REQUESTS_CA_BUNDLE', server.ca_bundle)
+    monkeypatch.setattr(azure_advisor_service, '_request_slots', None)
+    with patch.object(azure_advisor_service, 'ClientSecretCredential', return_value=FakeTokenCredential()):
+        yield server
+    server.stop()
+    cache.clear()
+    azure_advisor_service.invalidate_advisor_clients()
+
+
+@pytest.fixture
+def advisor_load(fake_advisor, client_obj, user):
+    """Run fetch_azure_recommendations end to end against the fake endpoint and measure it."""
+    def run(records, **options):
+        report = make_load_report(fake_advisor, client_obj, user, records, **options)
+        return run_fetch(report, fake_advisor)
+    return run
@@ -0,0 +1,261 @@
+"""
+Local fake of the Azure Resource Manager Advisor recommendations API.
+
+Serves ``GET /subscriptions/{id}/providers/Microsoft.Advisor/recommendations``
+over HTTPS (the SDK refuses to send bearer tokens over plain HTTP) with
+``nextLink`` paging, so AzureAdvisorService can be exercised end to end
+through the real SDK pipeline by pointing AZURE_ARM_ENDPOINT at it. Page
+size, latency, failures, throttling (429 with Retry-After) and the number
+of recommendations are set per subscription; load_harness.py runs
+fetch_azure_recommendations against it for benchmarks.
+
+Example:
+    >>> with FakeAdvisorServer({'sub-a': FakeSubscription(records=120)}) as server:
+    ...     settings.AZURE_ARM_ENDPOINT = server.url
+    ...     os.environ['REQUESTS_CA_BUNDLE'] = server.ca_bundle
+"""
+
+import datetime
+import ipaddress
+import json
+import os
+import ssl
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from azure.core.credentials import AccessToken
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+CATEGORIES = ['Cost', 'Security', 'HighAvailability', 'Performance', 'OperationalExcellence']
+IMPACTS = ['High', 'Medium', 'Low']
+
+
+@dataclass
+class FakeSubscription:
+    """Behaviour of one subscription on the fake endpoint."""
+
+    records: int = 10
+    page_size: int = 25
+    offset: int = 0  # Index of the first recommendation served
+    touched: Tuple[int, ...] = ()  # Indices served with a later lastUpdated
+    latency: float = 0.0  # Seconds per page request
+    fail_status: Optional[int] = None  # Answer requests with this status...
+    fail_after: int = 0  # ...once this many pages were served
+    retry_after: Optional[int] = None  # Retry-After header sent with failures
+    remaining_reads: Optional[int] = None  # x-ms-ratelimit-remaining-subscription-reads
+    throttle_requests: Tuple[int, ...] = ()  # 1-based request numbers answered with 429
+    requests: int = 0  # Page requests received for this subscription
+
+
+class FakeTokenCredential:
+    """Token credential that never talks to Azure AD."""
+
+    def get_token(self, *scopes, **kwargs):
+        return AccessToken('fake-token', int(time.time()) + 3600)
+
+    def close(self):
+        pass
+
+
+def make_recommendation(subscription_id: str, index: int, last_updated: str = '2024-01-15T10:30:00Z') -> Dict:
+    """ARM JSON for one recommendation."""
+    resource_id = (
+        f'/subscriptions/{subscription_id}/resourceGroups/rg-{index % 3}'
+        f'/providers/Microsoft.Compute/virtualMachines/vm-{index}'
+    )
+    return {
+        'id': f'{resource_id}/providers/Microsoft.Advisor/recommendations/rec-{index}',
+        'name': f'rec-{index}',
+        'type': 'Microsoft.Advisor/recommendations',
+        'properties': {
+            'category': CATEGORIES[index % len(CATEGORIES)],
+            'impact': IMPACTS[index % len(IMPACTS)],
+            'impactedField': 'Microsoft.Compute/virtualMachines',
+            'impactedValue': f'vm-{index}',
+            'lastUpdated': last_updated,
+            'recommendationTypeId': 'e10b1381-5f0a-47ff-8c7b-37bd13d7c974',
+            'shortDescription': {
+                'problem': f'Right-size or shutdown underutilized virtual machine vm-{index}',
+                'solution': 'Right-size or shutdown underutilized virtual machines',
+            },
+            'extendedProperties': {
+                'annualSavingsAmount': str(100 + index),
+                'savingsCurrency': 'USD',
+            },
+            'resourceMetadata': {'resourceId': resource_id},
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'FakeAdvisor/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        fake = self.server.fake
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+
+        if len(parts) != 5 or parts[0] != 'subscriptions' or parts[2:] != [
+            'providers', 'Microsoft.Advisor', 'recommendations'
+        ]:
+            self._send_json(404, {'error': {'code': 'NotFound', 'message': url.path}})
+            return
+
+        subscription_id = parts[1]
+        config = fake.subscriptions.get(subscription_id)
+
+        with fake.lock:
+            fake.requests += 1
+            fake.in_flight += 1
+            fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+        try:
+            if config is None:
+                self._send_json(404, {'error': {
+                    'code': 'SubscriptionNotFound',
+                    'message': f"The subscription '{subscription_id}' could not be found.",
+                }})
+                return
+
+            with fake.lock:
+                config.requests += 1
+                request_number = config.requests
+
+            time.sleep(config.latency)
+
+            headers = {}
+            if config.remaining_reads is not None:
+                headers['x-ms-ratelimit-remaining-subscription-reads'] = config.remaining_reads
+
+            if request_number in config.throttle_requests:
+                with fake.lock:
+                    fake.throttled += 1
+                headers['Retry-After'] = config.retry_after if config.retry_after is not None else 1
+                self._send_json(429, {'error': {
+                    'code': 'TooManyRequests',
+                    'message': f'Injected throttling for {subscription_id}',
+                }}, headers)
+                return
+
+            skip = int(parse_qs(url.query).get('$skiptoken', ['0'])[0])
+            if config.fail_status and skip >= config.fail_after * config.page_size:
+                if config.retry_after is not None:
+                    headers['Retry-After'] = config.retry_after
+                self._send_json(config.fail_status, {'error': {
+                    'code': 'FakeFailure',
+                    'message': f'Configured failure for {subscription_id}',
+                }}, headers)
+                return
+
+            end = min(skip + config.page_size, config.records)
+            body = {'value': [
+                make_recommendation(
+                    subscription_id, config.offset + i,
+                    '2024-02-01T08:00:00Z' if config.offset + i in config.touched else '2024-01-15T10:30:00Z',
+                )
+                for i in range(skip, end)
+            ]}
+            if end < config.records:
+                body['nextLink'] = (
+                    f'{fake.url}{url.path}?api-version=2023-01-01&$skiptoken={end}'
+                )
+            self._send_json(200, body, headers)
+        finally:
+            with fake.lock:
+                fake.in_flight -= 1
+
+
+class FakeAdvisorServer:
+    """
+    Threaded HTTPS server faking ARM Advisor, with a self-signed certificate.
+
+    Attributes:
+        url: Base URL to use as AZURE_ARM_ENDPOINT
+        ca_bundle: Path of the certificate, for REQUESTS_CA_BUNDLE
+        requests: Number of page requests served
+        throttled: Number of requests answered with an injected 429
+        max_in_flight: Highest number of concurrent requests seen
+    """
+
+    def __init__(self, subscriptions: Dict[str, FakeSubscription]):
+        self.subscriptions = subscriptions
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.ca_bundle, key_file = self._write_certificate(self._tmpdir.name)
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.ca_bundle, key_file)
+        self._httpd.socket = context.wrap_socket(self._httpd.socket, server_side=True)
+        self.url = f'https://127.0.0.1:{self._httpd.server_address[1]}'
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @staticmethod
+    def _write_certificate(directory):
+        key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, '127.0.0.1')])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(minutes=5))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address('127.0.0.1'))]), False)
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), True)
+            .sign(key, hashes.SHA256())
+        )
+        cert_file = os.path.join(directory, 'cert.pem')
+        key_file = os.path.join(directory, 'key.pem')
+        with open(cert_file, 'wb') as f:
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        with open(key_file, 'wb') as f:
+            f.write(key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ))
+        return cert_file, key_file
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._tmpdir.cleanup()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,143 @@
+"""
+Load-test harness for the Azure sync pipeline.
+
+Runs fetch_azure_recommendations end to end (SDK paging, rate limiter,
+normalization, bulk inserts) against FakeAdvisorServer and measures
+throughput, peak Python memory and the database insert rate. Used by the
+``advisor_load`` fixture (conftest.py) and scripts/benchmark_advisor_sync.py.
+
+Report generation is not part of the measurement: generate_azure_report is
+not dispatched.
+"""
+
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from unittest.mock import patch
+
+from apps.azure_integration import tasks
+from apps.azure_integration.models import AzureSubscription
+from apps.azure_integration.tests.fake_advisor import FakeAdvisorServer, FakeSubscription
+from apps.reports.models import Report
+
+
+@dataclass
+class SyncRunMetrics:
+    """Measurements of one fetch_azure_recommendations run."""
+
+    recommendations: int
+    pages: int
+    throttled: int
+    elapsed: float  # Seconds for the whole task, retries included
+    insert_seconds: float  # Seconds spent in _save_recommendations_to_db
+    peak_memory: int  # Bytes, Python allocations traced by tracemalloc
+
+    @property
+    def throughput(self) -> float:
+        """Recommendations per second, end to end."""
+        return self.recommendations / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def insert_rate(self) -> float:
+        """Rows inserted per second of database time."""
+        return self.recommendations / self.insert_seconds if self.insert_seconds else 0.0
+
+    def format(self, label: str = '') -> str:
+        return (
+            f"{label:<8} {self.recommendations:>7} recs  {self.pages:>5} pages  "
+            f"{self.throttled:>3} throttled  {self.elapsed:7.2f}s  "
+            f"{self.throughput:9.0f} recs/s  insert {self.insert_rate:9.0f} rows/s  "
+            f"peak {self.peak_memory / 2**20:7.1f} MiB"
+        )
+
+
+def make_load_report(server: FakeAdvisorServer, client, user, records: int, **options) -> Report:
+    """
+    Create a subscription served by the fake endpoint and an azure_api report for it.
+
+    Args:
+        server: Running FakeAdvisorServer
+        client: Client owning the subscription and report
+        user: User creating them
+        records: Recommendations the subscription returns
+        **options: Other FakeSubscription settings (page_size, latency, throttle_requests...)
+
+    Returns:
+        Report: Pending report, ready for run_fetch
+    """
+    subscription = AzureSubscription(
+        client=client,
+        name=f'Load test {records}',
+        subscription_id=str(uuid.uuid4()),
+        tenant_id=str(uuid.uuid4()),
+        azure_client_id=str(uuid.uuid4()),
+        created_by=user,
+    )
+    subscription.client_secret = 'load-test-secret'
+    subscription.save()
+    server.subscriptions[subscription.subscription_id] = FakeSubscription(records=records, **options)
+
+    return Report.objects.create(
+        client=client,
+        created_by=user,
+        data_source='azure_api',
+        azure_subscription=subscription,
+        api_sync_metadata={'filters': {}},
+    )
+
+
+def run_fetch(report: Report, server: FakeAdvisorServer) -> SyncRunMetrics:
+    """
+    Run fetch_azure_recommendations for an azure_api report and measure it.
+
+    The task runs through apply(), so a throttled attempt is retried in
+    process at once; the shared rate limiter then waits out Retry-After
+    (up to AZURE_RATELIMIT_MAX_WAIT) before the next request.
+
+    Args:
+        report: Report whose subscription is configured on the server
+        server: Running FakeAdvisorServer the SDK points at
+
+    Returns:
+        SyncRunMetrics: Measurements of the run
+
+    Raises:
+        Exception: Whatever the task raised after its retries
+    """
+    insert_seconds = 0.0
+    save = tasks._save_recommendations_to_db
+
+    def timed_save(*args, **kwargs):
+        nonlocal insert_seconds
+        started = time.perf_counter()
+        try:
+            return save(*args, **kwargs)
+        finally:
+            insert_seconds += time.perf_counter() - started
+
+    requests_before, throttled_before = server.requests, server.throttled
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    started = time.perf_counter()
+    try:
+        with patch.object(tasks, '_save_recommendations_to_db', side_effect=timed_save), \
+                patch.object(tasks.generate_azure_report, 'delay'):
+            result = tasks.fetch_azure_recommendations.apply(args=(str(report.id),), throw=False).get()
+        elapsed = time.perf_counter() - started
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    return SyncRunMetrics(
+        recommendations=result['recommendations_count'],
+        pages=server.requests - requests_before,
+        throttled=server.throttled - throttled_before,
+        elapsed=elapsed,
+        insert_seconds=insert_seconds,
+        peak_memory=peak_memory,
+    )
@@ -0,0 +1,95 @@
+"""
+Test cases for the per-worker Advisor client registry
+Tests that services of a subscription share credentials and clients until
+the subscription's credentials change (fixtures in conftest.py)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from apps.azure_integration.services.azure_advisor_service import (
+    AzureAdvisorService,
+    get_advisor_clients,
+    invalidate_advisor_clients,
+)
+from apps.azure_integration.tests.fake_advisor import FakeSubscription
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestAdvisorClientRegistry:
+    """Tests for client reuse across services"""
+
+    def test_services_share_clients(self, make_subscription, fake_advisor):
+        """Test a second service reuses the client without decrypting again"""
+        subscription = make_subscription('Production')
+        fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(records=3)
+        first = AzureAdvisorService(subscription)
+
+        with patch('apps.azure_integration.models.decrypt_credential') as mock_decrypt:
+            second = AzureAdvisorService(subscription)
+
+        mock_decrypt.assert_not_called()
+        assert second.client is first.client
+        assert second.credential is first.credential
+        assert second.rate_limiter is first.rate_limiter
+        assert len(second.fetch_recommendations()) == 3
+
+    def test_rotated_secret_replaces_clients(self, make_subscription, fake_advisor):
+        """Test changing the secret builds new clients"""
+        subscription = make_subscription('Production')
+        first = get_advisor_clients(subscription)
+
+        subscription.client_secret = 'rotated-secret'
+        subscription.save()
+
+        assert get_advisor_clients(subscription) is not first
+
+    def test_subscriptions_have_own_clients(self, make_subscription, fake_advisor):
+        """Test clients are not shared between subscriptions"""
+        first, second = make_subscription('First'), make_subscription('Second')
+
+        assert get_advisor_clients(first).client is not get_advisor_clients(second).client
+
+    def test_registry_is_bounded(self, make_subscription, fake_advisor, settings):
+        """Test least recently used entries are evicted"""
+        settings.AZURE_CLIENT_REGISTRY_SIZE = 2
+        first, second, third = (make_subscription(f'Sub {i}') for i in range(3))
+        clients = get_advisor_clients(first)
+        get_advisor_clients(second)
+        get_advisor_clients(third)
+
+        assert get_advisor_clients(first) is not clients
+
+    def test_invalidate(self, make_subscription, fake_advisor):
+        """Test invalidation forces new clients"""
+        subscription = make_subscription('Production')
+        clients = get_advisor_clients(subscription)
+
+        invalidate_advisor_clients(subscription.subscription_id)
+
+        assert get_advisor_clients(subscription) is not clients
+
+    def test_deactivation_releases_clients(self, make_subscription, fake_advisor):
+        """Test deactivating a subscription drops its clients"""
+        subscription = make_subscription('Production')
+        clients = get_advisor_clients(subscription)
+
+        subscription.is_active = False
+        subscription.save()
+
+        assert get_advisor_clients(subscription) is not clients
+
+    def test_deletion_releases_clients(self, make_subscription, fake_advisor):
+        """Test deleting a subscription drops its clients"""
+        subscription = make_subscription('Production')
+        get_advisor_clients(subscription)
+
+        with patch(
+            'apps.azure_integration.signals.invalidate_advisor_clients',
+            wraps=invalidate_advisor_clients,
+        ) as mock_invalidate:
+            subscription.delete()
+
+        mock_invalidate.assert_called_once_with(subscription.subscription_id)
@@ -0,0 +1,192 @@
+"""
+Test cases for incremental (delta) Advisor sync
+Tests sync_recommendation_state, iter_state_pages and delta-mode reports
+against a local fake ARM Advisor endpoint (fixtures in conftest.py)
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.azure_integration.exceptions import AzureAPIError
+from apps.azure_integration.models import AdvisorRecommendationState
+from apps.azure_integration.services.delta_sync import (
+    is_state_fresh,
+    iter_state_pages,
+    sync_recommendation_state,
+)
+from apps.azure_integration.tasks import fetch_azure_recommendations, sync_subscription_state
+from apps.azure_integration.tests.fake_advisor import FakeSubscription
+from apps.reports.models import Report
+
+
+def _state_writes(queries):
+    """INSERT/UPDATE statements against the recommendation state table."""
+    return [
+        q['sql'] for q in queries
+        if 'azure_recommendation_states' in q['sql'] and q['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE'))
+    ]
+
+
+@pytest.fixture
+def subscription(make_subscription, fake_advisor):
+    subscription = make_subscription('Production')
+    fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(records=40, page_size=15)
+    return subscription
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestSyncRecommendationState:
+    """Tests for upserting the per-subscription state"""
+
+    def test_first_sync_creates_state(self, subscription):
+        """Test every recommendation is inserted on the first sync"""
+        counts = sync_recommendation_state(subscription)
+
+        assert counts == {'created': 40, 'updated': 0, 'unchanged': 0, 'resolved': 0, 'pages': 3}
+        assert subscription.recommendation_states.filter(status='active').count() == 40
+        assert is_state_fresh(subscription)
+
+    def test_unchanged_sync_writes_nothing(self, subscription):
+        """Test a sync without churn does not write state rows"""
+        sync_recommendation_state(subscription)
+
+        with CaptureQueriesContext(connection) as queries:
+            counts = sync_recommendation_state(subscription)
+
+        assert counts['unchanged'] == 40
+        assert _state_writes(queries.captured_queries) == []
+
+    def test_changes_and_resolutions(self, subscription, fake_advisor):
+        """Test only changed recommendations are updated and missing ones resolved"""
+        sync_recommendation_state(subscription)
+        # Recommendations 0-4 were fixed, 5 and 6 re-evaluated, 40-41 are new
+        fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(
+            records=37, page_size=15, offset=5, touched=(5, 6)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            counts = sync_recommendation_state(subscription)
+
+        assert counts == {'created': 2, 'updated': 2, 'unchanged': 33, 'resolved': 5, 'pages': 3}
+        assert len(_state_writes(queries.captured_queries)) <= 3
+        states = subscription.recommendation_states
+        assert states.filter(status='resolved').count() == 5
+        assert states.get(azure_id__endswith='/rec-5').last_updated.startswith('2024-02-01T08:00:00')
+
+    def test_resolved_recommendation_reappears(self, subscription, fake_advisor):
+        """Test a resolved recommendation returned again is reactivated"""
+        sync_recommendation_state(subscription)
+        config = fake_advisor.subscriptions[subscription.subscription_id]
+        config.records = 39
+        sync_recommendation_state(subscription)
+        config.records = 40
+
+        counts = sync_recommendation_state(subscription)
+
+        assert counts['updated'] == 1
+        state = subscription.recommendation_states.get(azure_id__endswith='/rec-39')
+        assert state.status == 'active'
+        assert state.resolved_at is None
+
+    def test_failed_sync_resolves_nothing(self, subscription, fake_advisor):
+        """Test an interrupted listing does not resolve unseen recommendations"""
+        sync_recommendation_state(subscription)
+        config = fake_advisor.subscriptions[subscription.subscription_id]
+        config.fail_status, config.fail_after = 404, 1
+
+        with pytest.raises(AzureAPIError):
+            sync_recommendation_state(subscription)
+
+        assert not subscription.recommendation_states.filter(status='resolved').exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestStateSnapshots:
+    """Tests for reports built from the state"""
+
+    def test_iter_state_pages_filters_and_tags(self, subscription):
+        """Test snapshot pages are filtered and tagged with the subscription"""
+        sync_recommendation_state(subscription)
+
+        pages = list(iter_state_pages([subscription], {'category': 'Cost'}, page_size=3))
+
+        recommendations = [rec for page in pages for rec in page]
+        assert len(recommendations) == 8
+        assert max(len(page) for page in pages) == 3
+        assert {rec['category'] for rec in recommendations} == {'Cost'}
+        assert {rec['subscription_id'] for rec in recommendations} == {subscription.subscription_id}
+
+    @pytest.mark.celery
+    def test_delta_report_uses_fresh_state(self, subscription, fake_advisor, client_obj, user):
+        """Test a delta report is a snapshot without Azure calls while the state is fresh"""
+        sync_recommendation_state(subscription)
+        requests_before = fake_advisor.requests
+        report = Report.objects.create(
+            client=client_obj,
+            created_by=user,
+            data_source='azure_api',
+            azure_subscription=subscription,
+            api_sync_metadata={'filters': {}, 'sync_mode': 'delta'},
+        )
+
+        with patch('apps.azure_integration.tasks.generate_azure_report.delay'):
+            result = fetch_azure_recommendations(str(report.id))
+
+        report.refresh_from_db()
+        assert result['recommendations_count'] == 40
+        assert fake_advisor.requests == requests_before
+        assert report.api_sync_metadata['delta'] is None
+        assert report.recommendations.count() == 40
+
+    @pytest.mark.celery
+    def test_delta_report_syncs_stale_state(self, subscription, fake_advisor, client_obj, user):
+        """Test a delta report syncs the state first when it is stale"""
+        report = Report.objects.create(
+            client=client_obj,
+            created_by=user,
+            data_source='azure_api',
+            azure_subscription=subscription,
+            api_sync_metadata={'filters': {'impact': 'High'}, 'sync_mode': 'delta'},
+        )
+
+        with patch('apps.azure_integration.tasks.generate_azure_report.delay'):
+            fetch_azure_recommendations(str(report.id))
+
+        report.refresh_from_db()
+        assert report.api_sync_metadata['delta']['created'] == 40
+        assert report.recommendations.count() == 14
+        assert report.status == 'completed'
+
+
+@pytest.mark.django_db
+@pytest.mark.celery
+@pytest.mark.integration
+class TestSyncSubscriptionStateTask:
+    """Tests for the periodic delta sync task"""
+
+    def test_success_updates_sync_status(self, subscription):
+        """Test the task syncs and records success"""
+        result = sync_subscription_state(str(subscription.id))
+
+        subscription.refresh_from_db()
+        assert result['success'] is True
+        assert result['created'] == 40
+        assert subscription.sync_status == 'success'
+        assert subscription.state_synced_at <= timezone.now()
+
+    def test_failure_is_recorded(self, subscription, fake_advisor):
+        """Test an Azure error marks the subscription as failed"""
+        fake_advisor.subscriptions[subscription.subscription_id].fail_status = 404
+
+        result = sync_subscription_state(str(subscription.id))
+
+        subscription.refresh_from_db()
+        assert result['success'] is False
+        assert subscription.sync_status == 'failed'
+        assert not AdvisorRecommendationState.objects.filter(subscription=subscription).exists()
@@ -0,0 +1,37 @@
+"""
+Test cases for the sync pipeline load harness
+Tests fetch_azure_recommendations end to end against the fake ARM Advisor
+endpoint with throttling injected (fixtures in conftest.py)
+"""
+
+import pytest
+
+from apps.reports.models import Recommendation
+
+
+@pytest.mark.django_db
+@pytest.mark.celery
+@pytest.mark.integration
+class TestAdvisorLoad:
+    """Tests for end-to-end runs of the fetch task"""
+
+    def test_measures_a_run(self, advisor_load):
+        """Test every recommendation is saved and the run is measured"""
+        metrics = advisor_load(1000, page_size=100)
+
+        assert metrics.recommendations == 1000
+        assert metrics.pages == 10
+        assert Recommendation.objects.count() == 1000
+        assert metrics.throughput > 0
+        assert metrics.insert_rate > 0
+        assert metrics.peak_memory > 0
+
+    def test_injected_429_is_retried(self, advisor_load):
+        """Test a throttled listing is retried after Retry-After and completes"""
+        metrics = advisor_load(300, page_size=100, throttle_requests=(2,), retry_after=1)
+
+        assert metrics.throttled == 1
+        assert metrics.recommendations == 300
+        assert metrics.pages == 5
+        assert metrics.elapsed >= 1
+        assert Recommendation.objects.count() == 300
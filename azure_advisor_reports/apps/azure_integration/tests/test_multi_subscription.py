@@ -0,0 +1,191 @@
+"""
+Test cases for concurrent multi-subscription Advisor fetches
+Tests MultiSubscriptionFetcher and fetch_multi_subscription_recommendations
+against a local fake ARM Advisor endpoint (fixtures in conftest.py)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from apps.azure_integration.services.azure_advisor_service import AzureAdvisorService
+from apps.azure_integration.services.multi_subscription import MultiSubscriptionFetcher
+from apps.azure_integration.tasks import fetch_multi_subscription_recommendations
+from apps.azure_integration.tests.fake_advisor import FakeSubscription
+from apps.reports.models import Report
+from apps.reports.serializers import ReportCreateSerializer
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestAdvisorServicePaging:
+    """Tests for page-by-page fetching through the SDK"""
+
+    def test_follows_next_links(self, fake_advisor, make_subscription):
+        """Test every page is fetched and SDK models are transformed"""
+        subscription = make_subscription('Production')
+        fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(records=60, page_size=25)
+
+        service = AzureAdvisorService(subscription)
+        recommendations = service.fetch_recommendations()
+
+        assert len(recommendations) == 60
+        assert service.last_page_count == 3
+        assert fake_advisor.requests == 3
+        assert recommendations[0]['recommendation'].startswith('Right-size')
+        assert recommendations[0]['resource_group'] == 'rg-0'
+
+    def test_pages_are_streamed(self, fake_advisor, make_subscription):
+        """Test the next page is only requested once the previous one was consumed"""
+        subscription = make_subscription('Production')
+        fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(records=60, page_size=25)
+
+        pages = AzureAdvisorService(subscription).iter_recommendation_pages()
+        first = next(pages)
+
+        assert len(first) == 25
+        assert fake_advisor.requests == 1
+        assert [len(page) for page in pages] == [25, 10]
+        assert fake_advisor.requests == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestMultiSubscriptionFetcher:
+    """Tests for the fan-out/fan-in fetcher"""
+
+    def test_concurrency_is_capped(self, fake_advisor, make_subscription, settings):
+        """Test concurrent page requests never exceed the global cap"""
+        settings.AZURE_ADVISOR_MAX_CONCURRENT_REQUESTS = 2
+        subscriptions = [make_subscription(f'Sub {i}') for i in range(5)]
+        for subscription in subscriptions:
+            fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(
+                records=20, page_size=10, latency=0.05
+            )
+
+        result = MultiSubscriptionFetcher(subscriptions).fetch()
+
+        assert result['succeeded'] == 5
+        assert len(result['recommendations']) == 100
+        assert fake_advisor.max_in_flight == 2
+
+    def test_results_are_merged_and_tagged(self, fake_advisor, make_subscription):
+        """Test recommendations carry the subscription they came from"""
+        first, second = make_subscription('First'), make_subscription('Second')
+        fake_advisor.subscriptions[first.subscription_id] = FakeSubscription(records=3)
+        fake_advisor.subscriptions[second.subscription_id] = FakeSubscription(records=4)
+
+        result = MultiSubscriptionFetcher([first, second]).fetch()
+
+        tagged = [(r['subscription_id'], r['subscription_name']) for r in result['recommendations']]
+        assert tagged == [(first.subscription_id, 'First')] * 3 + [(second.subscription_id, 'Second')] * 4
+        assert result['subscriptions'][second.subscription_id]['recommendations_count'] == 4
+
+    def test_partial_failure_is_tracked(self, fake_advisor, make_subscription):
+        """Test a failing subscription does not fail the others"""
+        healthy, missing = make_subscription('Healthy'), make_subscription('Deleted')
+        fake_advisor.subscriptions[healthy.subscription_id] = FakeSubscription(records=5)
+
+        result = MultiSubscriptionFetcher([healthy, missing]).fetch()
+
+        assert result['succeeded'] == 1
+        assert result['failed'] == 1
+        assert len(result['recommendations']) == 5
+        failed = result['subscriptions'][missing.subscription_id]
+        assert failed['status'] == 'failed'
+        assert 'Subscription not found' in failed['error_message']
+
+
+@pytest.mark.django_db
+@pytest.mark.celery
+@pytest.mark.integration
+class TestFetchMultiSubscriptionTask:
+    """Tests for the consolidated report task"""
+
+    @pytest.fixture
+    def make_report(self, client_obj, user):
+        def make(subscriptions):
+            return Report.objects.create(
+                client=client_obj,
+                created_by=user,
+                data_source='azure_api',
+                azure_subscription=subscriptions[0],
+                api_sync_metadata={'filters': {}, 'subscription_ids': [str(s.id) for s in subscriptions]},
+            )
+        return make
+
+    def test_partial_report_is_completed(self, fake_advisor, make_subscription, make_report):
+        """Test recommendations of healthy subscriptions are saved"""
+        healthy, missing = make_subscription('Healthy'), make_subscription('Deleted')
+        fake_advisor.subscriptions[healthy.subscription_id] = FakeSubscription(records=7)
+        report = make_report([healthy, missing])
+
+        with patch('apps.azure_integration.tasks.generate_azure_report.delay') as mock_generate:
+            result = fetch_multi_subscription_recommendations(str(report.id))
+
+        report.refresh_from_db()
+        missing.refresh_from_db()
+        assert result['status'] == 'partial'
+        assert report.status == 'completed'
+        assert report.api_sync_metadata['partial'] is True
+        assert report.api_sync_metadata['subscriptions'][missing.subscription_id]['status'] == 'failed'
+        assert set(report.recommendations.values_list('subscription_id', flat=True)) == {healthy.subscription_id}
+        assert missing.sync_status == 'failed'
+        mock_generate.assert_called_once_with(str(report.id), format_type='both')
+
+    def test_failed_subscription_rows_are_removed(self, fake_advisor, make_subscription, make_report):
+        """Test pages streamed before a subscription failed are not kept"""
+        healthy, flaky = make_subscription('Healthy'), make_subscription('Flaky')
+        fake_advisor.subscriptions[healthy.subscription_id] = FakeSubscription(records=30, page_size=10)
+        fake_advisor.subscriptions[flaky.subscription_id] = FakeSubscription(
+            records=30, page_size=10, fail_status=404, fail_after=2
+        )
+        report = make_report([healthy, flaky])
+
+        with patch('apps.azure_integration.tasks.generate_azure_report.delay'):
+            result = fetch_multi_subscription_recommendations(str(report.id))
+
+        assert result['recommendations_count'] == 30
+        assert report.recommendations.count() == 30
+        assert not report.recommendations.filter(subscription_id=flaky.subscription_id).exists()
+        assert result['subscriptions'][flaky.subscription_id]['recommendations_count'] == 0
+
+    def test_report_fails_when_all_subscriptions_fail(self, fake_advisor, make_subscription, make_report):
+        """Test the report fails only if no subscription could be fetched"""
+        report = make_report([make_subscription('Gone'), make_subscription('Also gone')])
+
+        with patch('apps.azure_integration.tasks.generate_azure_report.delay') as mock_generate:
+            result = fetch_multi_subscription_recommendations(str(report.id))
+
+        report.refresh_from_db()
+        assert result['status'] == 'failed'
+        assert report.status == 'failed'
+        assert 'Gone' in report.error_message
+        mock_generate.assert_not_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+class TestReportCreateSerializerSubscriptions:
+    """Tests for consolidated report creation"""
+
+    def test_additional_subscriptions_are_stored(self, client_obj, make_subscription):
+        """Test the primary and additional subscriptions are recorded"""
+        primary, extra = make_subscription('Primary'), make_subscription('Extra')
+        serializer = ReportCreateSerializer(data={
+            'client_id': str(client_obj.id),
+            'data_source': 'azure_api',
+            'azure_subscription': str(primary.id),
+            'azure_subscriptions': [str(extra.id), str(primary.id)],
+        })
+
+        assert serializer.is_valid(), serializer.errors
+        report = serializer.save()
+
+        assert report.azure_subscription == primary
+        assert report.api_sync_metadata['subscription_ids'] == [str(primary.id), str(extra.id)]
+
@@ -0,0 +1,137 @@
+"""
+Test cases for the shared Azure API rate limiter
+Tests AzureRateLimiter buckets, ARM throttling headers and task re-queueing
+against a local fake ARM Advisor endpoint (fixtures in conftest.py)
+"""
+
+import time
+from email.utils import formatdate
+from unittest.mock import patch
+
+import pytest
+from celery.exceptions import Retry
+from django.core.cache import cache
+
+from apps.azure_integration.exceptions import AzureRateLimitError
+from apps.azure_integration.services.azure_advisor_service import AzureAdvisorService
+from apps.azure_integration.services.rate_limiter import AzureRateLimiter, get_retry_after
+from apps.azure_integration.tasks import fetch_azure_recommendations
+from apps.azure_integration.tests.fake_advisor import FakeSubscription
+from apps.reports.models import Report
+
+
+@pytest.fixture
+def limits(settings):
+    cache.clear()
+    settings.AZURE_RATELIMIT_TENANT_BURST = 5
+    settings.AZURE_RATELIMIT_TENANT_RATE = 1
+    settings.AZURE_RATELIMIT_SUBSCRIPTION_BURST = 3
+    settings.AZURE_RATELIMIT_SUBSCRIPTION_RATE = 1
+    settings.AZURE_RATELIMIT_RESERVE = 2
+    settings.AZURE_RATELIMIT_MAX_WAIT = 0
+    yield settings
+    cache.clear()
+
+
+@pytest.mark.unit
+class TestAzureRateLimiter:
+    """Tests for the tenant and subscription token buckets"""
+
+    def test_subscription_burst(self, limits):
+        """Test requests beyond the burst must wait for a refill"""
+        limiter = AzureRateLimiter('tenant-a', 'sub-1')
+        for _ in range(3):
+            limiter.acquire()
+
+        with pytest.raises(AzureRateLimitError) as exc_info:
+            limiter.acquire()
+
+        assert 0 < exc_info.value.retry_after <= 1
+
+    def test_tenant_bucket_is_shared(self, limits):
+        """Test subscriptions of one tenant draw from the same tenant budget"""
+        for subscription_id in ('sub-1', 'sub-2'):
+            limiter = AzureRateLimiter('tenant-a', subscription_id)
+            for _ in range(2):
+                limiter.acquire()
+        limiter = AzureRateLimiter('tenant-a', 'sub-3')
+        limiter.acquire()
+
+        with pytest.raises(AzureRateLimitError):
+            limiter.acquire()
+        AzureRateLimiter('tenant-b', 'sub-4').acquire()
+
+    def test_429_blocks_subscription(self, limits):
+        """Test Retry-After of a 429 blocks the subscription only"""
+        AzureRateLimiter('tenant-a', 'sub-1').observe(429, {'Retry-After': '120'})
+
+        with pytest.raises(AzureRateLimitError) as exc_info:
+            AzureRateLimiter('tenant-a', 'sub-1').acquire()
+
+        assert 119 < exc_info.value.retry_after <= 120
+        AzureRateLimiter('tenant-a', 'sub-2').acquire()
+
+    def test_remaining_reads_drain_bucket(self, limits):
+        """Test a low remaining-reads header slows down every worker"""
+        limiter = AzureRateLimiter('tenant-a', 'sub-1')
+        limiter.observe(200, {'x-ms-ratelimit-remaining-subscription-reads': '3'})
+
+        limiter.acquire()
+        with pytest.raises(AzureRateLimitError):
+            limiter.acquire()
+
+    def test_retry_after_formats(self):
+        """Test Retry-After in seconds, as an HTTP date, and missing"""
+        assert get_retry_after({'Retry-After': '17'}) == 17
+        in_a_minute = formatdate(time.time() + 60, usegmt=True)
+        assert 55 < get_retry_after({'Retry-After': in_a_minute}) <= 60
+        assert get_retry_after({}) == 30
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestThrottledFetch:
+    """Tests for 429 handling end to end"""
+
+    @pytest.fixture
+    def throttled(self, make_subscription, fake_advisor, limits):
+        subscription = make_subscription('Throttled')
+        fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(
+            records=20, page_size=10, fail_status=429, fail_after=1, retry_after=90
+        )
+        return subscription
+
+    def test_429_is_not_retried(self, throttled, fake_advisor, limits):
+        """Test a 429 raises at once and blocks later requests of every worker"""
+        limits.AZURE_RATELIMIT_SUBSCRIPTION_BURST = 10
+
+        with pytest.raises(AzureRateLimitError) as exc_info:
+            AzureAdvisorService(throttled).fetch_recommendations()
+
+        assert exc_info.value.retry_after == 90
+        assert fake_advisor.requests == 2
+        with pytest.raises(AzureRateLimitError):
+            AzureAdvisorService(throttled).fetch_recommendations()
+        assert fake_advisor.requests == 2
+
+    @pytest.mark.celery
+    def test_task_is_requeued(self, throttled, client_obj, user, limits):
+        """Test a throttled fetch task is re-queued after Retry-After"""
+        limits.AZURE_RATELIMIT_SUBSCRIPTION_BURST = 10
+        report = Report.objects.create(
+            client=client_obj,
+            created_by=user,
+            data_source='azure_api',
+            azure_subscription=throttled,
+            api_sync_metadata={'filters': {}},
+        )
+
+        with patch.object(fetch_azure_recommendations, 'retry', side_effect=Retry()) as mock_retry:
+            with pytest.raises(Retry):
+                fetch_azure_recommendations(str(report.id))
+
+        countdown = mock_retry.call_args.kwargs['countdown']
+        assert 91 <= countdown <= 96
+        report.refresh_from_db()
+        assert report.status == 'processing'
+        assert 'throttled' in report.error_message
@@ -0,0 +1,106 @@
+"""
+Test cases for the per-subscription recommendation cache
+Tests that filtered views and statistics are derived from one cached listing
+against a local fake ARM Advisor endpoint (fixtures in conftest.py)
+"""
+
+import pytest
+from django.core.cache import cache
+
+from apps.azure_integration.services import invalidate_recommendations_cache
+from apps.azure_integration.services.azure_advisor_service import (
+    AzureAdvisorService,
+    get_recommendations_cache_key,
+)
+from apps.azure_integration.tests.fake_advisor import FakeSubscription
+
+
+@pytest.fixture
+def service(make_subscription, fake_advisor):
+    subscription = make_subscription('Production')
+    fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(records=30, page_size=10)
+    return AzureAdvisorService(subscription)
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestRecommendationCache:
+    """Tests for the single cached listing"""
+
+    def test_filters_share_one_fetch(self, service, fake_advisor):
+        """Test filtered and unfiltered reads hit the API once"""
+        everything = service.fetch_recommendations()
+        cost = service.fetch_recommendations({'category': 'Cost'})
+        high = service.fetch_recommendations({'impact': 'High', 'resource_group': 'RG-0'})
+
+        assert fake_advisor.requests == 3
+        assert len(everything) == 30
+        assert cost == [rec for rec in everything if rec['category'] == 'Cost']
+        assert {rec['resource_group'] for rec in high} == {'rg-0'}
+
+    def test_entry_is_compressed_and_versioned(self, service):
+        """Test one compressed entry is cached per subscription"""
+        service.fetch_recommendations({'category': 'Security'})
+
+        entry = cache.get(get_recommendations_cache_key(service.azure_subscription.subscription_id))
+        assert entry['version'] == AzureAdvisorService.CACHE_VERSION
+        assert entry['count'] == 30
+        assert isinstance(entry['payload'], bytes)
+        assert entry['compressed'] is True
+
+    def test_backend_compression_is_not_repeated(self, service, fake_advisor, settings):
+        """Test the payload is stored as plain JSON when the backend compresses"""
+        settings.CACHES = {
+            'default': {
+                **settings.CACHES['default'],
+                'OPTIONS': {'COMPRESSOR': 'django_redis.compressors.zlib.ZlibCompressor'},
+            }
+        }
+        everything = service.fetch_recommendations()
+
+        entry = cache.get(get_recommendations_cache_key(service.azure_subscription.subscription_id))
+        assert entry['compressed'] is False
+        assert entry['payload'].startswith(b'[')
+        assert service.fetch_recommendations() == everything
+        assert fake_advisor.requests == 3
+
+    def test_outdated_version_is_a_miss(self, service, fake_advisor):
+        """Test entries written in another format are refetched"""
+        service.fetch_recommendations()
+        key = get_recommendations_cache_key(service.azure_subscription.subscription_id)
+        cache.set(key, {**cache.get(key), 'version': 0})
+
+        service.fetch_recommendations()
+
+        assert fake_advisor.requests == 6
+
+    def test_statistics_are_derived(self, service, fake_advisor):
+        """Test statistics come from the cached listing without extra calls"""
+        service.fetch_recommendations({'category': 'Cost'})
+
+        stats = service.get_statistics()
+
+        assert fake_advisor.requests == 3
+        assert stats['total_recommendations'] == 30
+        assert stats['by_category']['Cost'] == 6
+        assert stats['by_impact']['High'] == 10
+        assert stats['total_potential_savings'] == sum(100 + i for i in range(0, 30, 5))
+
+    def test_streaming_serves_filtered_cache(self, service, fake_advisor):
+        """Test iter_recommendation_pages filters a cached listing"""
+        service.get_statistics()
+
+        pages = list(service.iter_recommendation_pages({'category': 'Performance'}))
+
+        assert fake_advisor.requests == 3
+        assert len(pages) == 1
+        assert {rec['category'] for rec in pages[0]} == {'Performance'}
+
+    def test_invalidate(self, service, fake_advisor):
+        """Test invalidation forces a new fetch"""
+        service.get_statistics()
+
+        invalidate_recommendations_cache(service.azure_subscription.subscription_id)
+        service.get_statistics()
+
+        assert fake_advisor.requests == 6
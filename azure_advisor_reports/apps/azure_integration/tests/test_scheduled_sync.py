@@ -0,0 +1,169 @@
+"""
+Test cases for the scheduled bulk sync of subscriptions
+Tests wave planning, due-subscription selection, bulk status updates and
+schedule_subscription_sync against a local fake ARM Advisor endpoint
+"""
+
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.azure_integration.models import AzureSubscription
+from apps.azure_integration.services.scheduled_sync import (
+    RUN_LEASE_KEY,
+    get_due_subscriptions,
+    plan_sync_waves,
+)
+from apps.azure_integration.tasks import (
+    schedule_subscription_sync,
+    sync_azure_statistics,
+    sync_subscription_state,
+)
+from apps.azure_integration.tests.fake_advisor import FakeSubscription
+
+
+@pytest.mark.unit
+class TestPlanSyncWaves:
+    """Tests for splitting subscriptions into waves"""
+
+    def test_tenants_are_interleaved_and_staggered(self):
+        """Test waves mix tenants and space out syncs of one tenant"""
+        subscriptions = [SimpleNamespace(id=f'a{i}', tenant_id='tenant-a') for i in range(4)]
+        subscriptions += [SimpleNamespace(id='b0', tenant_id='tenant-b')]
+
+        waves = plan_sync_waves(subscriptions, wave_size=3, stagger=10)
+
+        assert waves == [
+            [('a0', 0), ('b0', 0), ('a1', 10)],
+            [('a2', 0), ('a3', 10)],
+        ]
+
+    def test_no_subscriptions(self):
+        """Test nothing to sync yields no waves"""
+        assert plan_sync_waves([], wave_size=5, stagger=1) == []
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+class TestSubscriptionSelection:
+    """Tests for due subscriptions and bulk status updates"""
+
+    def test_due_subscriptions(self, make_subscription, settings):
+        """Test only active subscriptions not synced recently are due, never-synced first"""
+        settings.AZURE_SYNC_MAX_AGE = 3600
+        stale, fresh, never, inactive = (
+            make_subscription(name) for name in ('Stale', 'Fresh', 'Never', 'Inactive')
+        )
+        now = timezone.now()
+        AzureSubscription.objects.filter(pk=stale.pk).update(last_sync_at=now - timedelta(hours=2))
+        AzureSubscription.objects.filter(pk=fresh.pk).update(
+            last_sync_at=now - timedelta(minutes=5)
+        )
+        AzureSubscription.objects.filter(pk=inactive.pk).update(is_active=False)
+
+        assert get_due_subscriptions() == [never, stale]
+
+    def test_bulk_update_sync_status(self, make_subscription):
+        """Test outcomes are written with one query per statement"""
+        ok, broken = make_subscription('Ok'), make_subscription('Broken')
+
+        with CaptureQueriesContext(connection) as queries:
+            updated = AzureSubscription.bulk_update_sync_status(
+                {ok.pk: None, str(broken.pk): 'Timeout'}
+            )
+
+        ok.refresh_from_db()
+        broken.refresh_from_db()
+        assert updated == 2
+        assert len(queries.captured_queries) == 2
+        assert ok.sync_status == 'success'
+        assert ok.last_sync_at is not None
+        assert broken.sync_status == 'failed'
+        assert broken.sync_error_message == 'Timeout'
+        assert broken.last_sync_at is None
+
+
+@pytest.mark.django_db
+@pytest.mark.celery
+@pytest.mark.integration
+class TestScheduleSubscriptionSync:
+    """Tests for the Beat-driven orchestrator"""
+
+    def test_all_waves_are_synced(self, make_subscription, fake_advisor, settings):
+        """Test every due subscription is synced and recorded, failures included"""
+        settings.AZURE_SYNC_WAVE_SIZE = 2
+        healthy = [make_subscription(f'Healthy {i}', tenant_id='tenant-a') for i in range(4)]
+        missing = make_subscription('Deleted', tenant_id='tenant-b')
+        for subscription in healthy:
+            fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(records=3)
+
+        summary = schedule_subscription_sync(mode='state')
+
+        assert summary['subscriptions'] == 5
+        assert summary['waves'] == 3
+        statuses = dict(AzureSubscription.objects.values_list('name', 'sync_status'))
+        assert statuses == {**{s.name: 'success' for s in healthy}, 'Deleted': 'failed'}
+        assert all(s.recommendation_states.count() == 3 for s in healthy)
+        assert get_due_subscriptions() == [missing]
+        assert cache.get(RUN_LEASE_KEY) is None
+
+    def test_statistics_mode(self, make_subscription, fake_advisor):
+        """Test the statistics refresh is fanned out the same way"""
+        subscription = make_subscription('Production')
+        fake_advisor.subscriptions[subscription.subscription_id] = FakeSubscription(records=3)
+
+        schedule_subscription_sync(mode='statistics')
+
+        subscription.refresh_from_db()
+        assert subscription.sync_status == 'success'
+        assert not subscription.recommendation_states.exists()
+
+    def test_overlapping_run_is_skipped(self, make_subscription, fake_advisor):
+        """Test a run is skipped while the previous one holds the lease"""
+        make_subscription('Production')
+        cache.add(RUN_LEASE_KEY, 'previous-run')
+
+        summary = schedule_subscription_sync()
+
+        assert summary['status'] == 'skipped'
+        assert fake_advisor.requests == 0
+
+    def test_missing_subscription_completes_wave(self):
+        """Test a subscription deleted before its wave ran fails rather than stalling the chord"""
+        missing_id = str(uuid.uuid4())
+
+        for sync_task in (sync_subscription_state, sync_azure_statistics):
+            result = sync_task(missing_id, record_status=False)
+
+            assert result['success'] is False
+            assert result['error_message'] == f"AzureSubscription {missing_id} not found"
+
+    def test_failed_wave_starts_next_and_releases_lease(self, make_subscription, settings):
+        """Test a wave whose sync task raised is recorded, and the run goes on to finish"""
+        settings.AZURE_SYNC_WAVE_SIZE = 1
+        first, second = make_subscription('First'), make_subscription('Second')
+
+        with patch('apps.azure_integration.tasks.chord') as chord:
+            schedule_subscription_sync(mode='state')
+            for _ in range(2):
+                callback = chord.return_value.call_args.args[0]
+                errback = callback.options['link_error'][0]
+                # Celery calls the error callback of a failed chord with the
+                # request, the exception and the traceback
+                summary = errback(SimpleNamespace(id=None), RuntimeError('Worker lost'), None)
+
+        assert chord.call_count == 2
+        assert summary['status'] == 'completed'
+        assert summary['failed'] == 2
+        assert cache.get(RUN_LEASE_KEY) is None
+        for subscription in (first, second):
+            subscription.refresh_from_db()
+            assert subscription.sync_status == 'failed'
+            assert subscription.sync_error_message == 'Sync wave failed: Worker lost'
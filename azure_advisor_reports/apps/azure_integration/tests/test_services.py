@@ -71,6 +71,7 @@ class AzureAdvisorServiceInitializationTests(TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.user = self._create_test_user()
+        self.client_obj = self._create_test_client()
         self.subscription = self._create_test_subscription()
 
     def _create_test_user(self):
@@ -84,13 +85,19 @@ class AzureAdvisorServiceInitializationTests(TestCase):
             last_name='User'
         )
 
+    def _create_test_client(self):
+        """Create the client owning the test subscription."""
+        from apps.clients.models import Client
+        return Client.objects.create(company_name='Test Company')
+
     def _create_test_subscription(self):
         """Create a test Azure subscription."""
         subscription = AzureSubscription.objects.create(
+            client=self.client_obj,
             name='Test Subscription',
             subscription_id='12345678-1234-1234-1234-123456789abc',
             tenant_id='87654321-4321-4321-4321-cba987654321',
-            client_id='11111111-1111-1111-1111-111111111111',
+            azure_client_id='11111111-1111-1111-1111-111111111111',
             created_by=self.user
         )
         subscription.client_secret = 'test-secret-key'
@@ -148,6 +155,7 @@ class AzureAdvisorServiceFetchTests(TestCase):
         """Set up test fixtures."""
         cache.clear()
         self.user = self._create_test_user()
+        self.client_obj = self._create_test_client()
         self.subscription = self._create_test_subscription()
 
     def tearDown(self):
@@ -165,13 +173,19 @@ class AzureAdvisorServiceFetchTests(TestCase):
             last_name='User'
         )
 
+    def _create_test_client(self):
+        """Create the client owning the test subscription."""
+        from apps.clients.models import Client
+        return Client.objects.create(company_name='Test Company')
+
     def _create_test_subscription(self):
         """Create a test Azure subscription."""
         subscription = AzureSubscription.objects.create(
+            client=self.client_obj,
             name='Test Subscription',
             subscription_id='12345678-1234-1234-1234-123456789abc',
             tenant_id='87654321-4321-4321-4321-cba987654321',
-            client_id='11111111-1111-1111-1111-111111111111',
+            azure_client_id='11111111-1111-1111-1111-111111111111',
             created_by=self.user
         )
         subscription.client_secret = 'test-secret-key'
@@ -323,6 +337,7 @@ class AzureAdvisorServiceCachingTests(TestCase):
         """Set up test fixtures."""
         cache.clear()
         self.user = self._create_test_user()
+        self.client_obj = self._create_test_client()
         self.subscription = self._create_test_subscription()
 
     def tearDown(self):
@@ -340,13 +355,19 @@ class AzureAdvisorServiceCachingTests(TestCase):
             last_name='User'
         )
 
+    def _create_test_client(self):
+        """Create the client owning the test subscription."""
+        from apps.clients.models import Client
+        return Client.objects.create(company_name='Test Company')
+
     def _create_test_subscription(self):
         """Create a test Azure subscription."""
         subscription = AzureSubscription.objects.create(
+            client=self.client_obj,
             name='Test Subscription',
             subscription_id='12345678-1234-1234-1234-123456789abc',
             tenant_id='87654321-4321-4321-4321-cba987654321',
-            client_id='11111111-1111-1111-1111-111111111111',
+            azure_client_id='11111111-1111-1111-1111-111111111111',
             created_by=self.user
         )
         subscription.client_secret = 'test-secret-key'
@@ -390,8 +411,8 @@ class AzureAdvisorServiceCachingTests(TestCase):
             # Should only call API once
             mock_fetch.assert_called_once()
 
-    def test_caching_different_filters_different_cache(self):
-        """Test that different filters create different cache entries."""
+    def test_caching_different_filters_share_cache(self):
+        """Test that different filters are derived from one cached listing."""
         # Arrange
         service = self._create_mock_service()
         mock_recommendations = [
@@ -407,8 +428,8 @@ class AzureAdvisorServiceCachingTests(TestCase):
             # Assert
             self.assertEqual(len(results1), 1)
             self.assertEqual(len(results2), 1)
-            # Should call API twice (different cache keys)
-            self.assertEqual(mock_fetch.call_count, 2)
+            # Should call API once (filtered views of the same listing)
+            mock_fetch.assert_called_once()
 
 
 class AzureAdvisorServicePaginationTests(TestCase):
@@ -418,6 +439,7 @@ class AzureAdvisorServicePaginationTests(TestCase):
         """Set up test fixtures."""
         cache.clear()
         self.user = self._create_test_user()
+        self.client_obj = self._create_test_client()
         self.subscription = self._create_test_subscription()
 
     def tearDown(self):
@@ -435,13 +457,19 @@ class AzureAdvisorServicePaginationTests(TestCase):
             last_name='User'
         )
 
+    def _create_test_client(self):
+        """Create the client owning the test subscription."""
+        from apps.clients.models import Client
+        return Client.objects.create(company_name='Test Company')
+
     def _create_test_subscription(self):
         """Create a test Azure subscription."""
         subscription = AzureSubscription.objects.create(
+            client=self.client_obj,
             name='Test Subscription',
             subscription_id='12345678-1234-1234-1234-123456789abc',
             tenant_id='87654321-4321-4321-4321-cba987654321',
-            client_id='11111111-1111-1111-1111-111111111111',
+            azure_client_id='11111111-1111-1111-1111-111111111111',
             created_by=self.user
         )
         subscription.client_secret = 'test-secret-key'
@@ -505,6 +533,7 @@ class AzureAdvisorServiceDataTransformationTests(TestCase):
         """Set up test fixtures."""
         cache.clear()
         self.user = self._create_test_user()
+        self.client_obj = self._create_test_client()
         self.subscription = self._create_test_subscription()
 
     def tearDown(self):
@@ -522,13 +551,19 @@ class AzureAdvisorServiceDataTransformationTests(TestCase):
             last_name='User'
         )
 
+    def _create_test_client(self):
+        """Create the client owning the test subscription."""
+        from apps.clients.models import Client
+        return Client.objects.create(company_name='Test Company')
+
     def _create_test_subscription(self):
         """Create a test Azure subscription."""
         subscription = AzureSubscription.objects.create(
+            client=self.client_obj,
             name='Test Subscription',
             subscription_id='12345678-1234-1234-1234-123456789abc',
             tenant_id='87654321-4321-4321-4321-cba987654321',
-            client_id='11111111-1111-1111-1111-111111111111',
+            azure_client_id='11111111-1111-1111-1111-111111111111',
             created_by=self.user
         )
         subscription.client_secret = 'test-secret-key'
@@ -649,6 +684,7 @@ class AzureAdvisorServiceRetryLogicTests(TestCase):
         """Set up test fixtures."""
         cache.clear()
         self.user = self._create_test_user()
+        self.client_obj = self._create_test_client()
         self.subscription = self._create_test_subscription()
 
     def tearDown(self):
@@ -666,13 +702,19 @@ class AzureAdvisorServiceRetryLogicTests(TestCase):
             last_name='User'
         )
 
+    def _create_test_client(self):
+        """Create the client owning the test subscription."""
+        from apps.clients.models import Client
+        return Client.objects.create(company_name='Test Company')
+
     def _create_test_subscription(self):
         """Create a test Azure subscription."""
         subscription = AzureSubscription.objects.create(
+            client=self.client_obj,
             name='Test Subscription',
             subscription_id='12345678-1234-1234-1234-123456789abc',
             tenant_id='87654321-4321-4321-4321-cba987654321',
-            client_id='11111111-1111-1111-1111-111111111111',
+            azure_client_id='11111111-1111-1111-1111-111111111111',
             created_by=self.user
         )
         subscription.client_secret = 'test-secret-key'
@@ -720,6 +762,7 @@ class AzureAdvisorServiceConnectionTestTests(TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.user = self._create_test_user()
+        self.client_obj = self._create_test_client()
         self.subscription = self._create_test_subscription()
 
     def _create_test_user(self):
@@ -733,13 +776,19 @@ class AzureAdvisorServiceConnectionTestTests(TestCase):
             last_name='User'
         )
 
+    def _create_test_client(self):
+        """Create the client owning the test subscription."""
+        from apps.clients.models import Client
+        return Client.objects.create(company_name='Test Company')
+
     def _create_test_subscription(self):
         """Create a test Azure subscription."""
         subscription = AzureSubscription.objects.create(
+            client=self.client_obj,
             name='Test Subscription',
             subscription_id='12345678-1234-1234-1234-123456789abc',
             tenant_id='87654321-4321-4321-4321-cba987654321',
-            client_id='11111111-1111-1111-1111-111111111111',
+            azure_client_id='11111111-1111-1111-1111-111111111111',
             created_by=self.user
         )
         subscription.client_secret = 'test-secret-key'
@@ -839,6 +888,7 @@ class AzureAdvisorServiceStatisticsTests(TestCase):
         """Set up test fixtures."""
         cache.clear()
         self.user = self._create_test_user()
+        self.client_obj = self._create_test_client()
         self.subscription = self._create_test_subscription()
 
     def tearDown(self):
@@ -856,13 +906,19 @@ class AzureAdvisorServiceStatisticsTests(TestCase):
             last_name='User'
         )
 
+    def _create_test_client(self):
+        """Create the client owning the test subscription."""
+        from apps.clients.models import Client
+        return Client.objects.create(company_name='Test Company')
+
     def _create_test_subscription(self):
         """Create a test Azure subscription."""
         subscription = AzureSubscription.objects.create(
+            client=self.client_obj,
             name='Test Subscription',
             subscription_id='12345678-1234-1234-1234-123456789abc',
             tenant_id='87654321-4321-4321-4321-cba987654321',
-            client_id='11111111-1111-1111-1111-111111111111',
+            azure_client_id='11111111-1111-1111-1111-111111111111',
             created_by=self.user
         )
         subscription.client_secret = 'test-secret-key'
@@ -946,6 +1002,7 @@ class AzureAdvisorServiceErrorHandlingTests(TestCase):
         """Set up test fixtures."""
         cache.clear()
         self.user = self._create_test_user()
+        self.client_obj = self._create_test_client()
         self.subscription = self._create_test_subscription()
 
     def tearDown(self):
@@ -963,13 +1020,19 @@ class AzureAdvisorServiceErrorHandlingTests(TestCase):
             last_name='User'
         )
 
+    def _create_test_client(self):
+        """Create the client owning the test subscription."""
+        from apps.clients.models import Client
+        return Client.objects.create(company_name='Test Company')
+
     def _create_test_subscription(self):
         """Create a test Azure subscription."""
         subscription = AzureSubscription.objects.create(
+            client=self.client_obj,
             name='Test Subscription',
             subscription_id='12345678-1234-1234-1234-123456789abc',
             tenant_id='87654321-4321-4321-4321-cba987654321',
-            client_id='11111111-1111-1111-1111-111111111111',
+            azure_client_id='11111111-1111-1111-1111-111111111111',
             created_by=self.user
         )
         subscription.client_secret = 'test-secret-key'
@@ -50,13 +50,14 @@ User = get_user_model()
 
 
 @pytest.fixture
-def azure_subscription(db, test_user):
+def azure_subscription(db, test_user, test_client_obj):
     """Create test Azure subscription."""
     subscription = AzureSubscription(
+        client=test_client_obj,
         name='Test Subscription',
         subscription_id='12345678-1234-1234-1234-123456789012',
         tenant_id='87654321-4321-4321-4321-210987654321',
-        client_id='11111111-1111-1111-1111-111111111111',
+        azure_client_id='11111111-1111-1111-1111-111111111111',
         created_by=test_user,
         is_active=True,
     )
@@ -135,11 +136,17 @@ def sample_azure_recommendations():
     ]
 
 
+def _pages(*pages):
+    """Generator of API pages, as returned by iter_recommendation_pages."""
+    yield from pages
+
+
 @pytest.fixture
 def mock_azure_service():
     """Mock AzureAdvisorService."""
     with patch('apps.azure_integration.tasks.AzureAdvisorService') as mock:
         service_instance = MagicMock()
+        service_instance.last_page_count = 1
         mock.return_value = service_instance
         yield service_instance
 
@@ -212,7 +219,7 @@ class TestSaveRecommendationsToDb:
         # Create many recommendations
         many_recommendations = sample_azure_recommendations * 50  # 100 total
 
-        with patch('apps.azure_integration.tasks.Recommendation.objects.bulk_create') as mock_bulk:
+        with patch('apps.reports.models.Recommendation.objects.bulk_create') as mock_bulk:
             mock_bulk.return_value = []
             count = _save_recommendations_to_db(report_azure_api, many_recommendations)
 
@@ -237,7 +244,7 @@ class TestSaveRecommendationsToDb:
         ]
 
         # Mock bulk_create to raise an error
-        with patch('apps.azure_integration.tasks.Recommendation.objects.bulk_create') as mock_bulk:
+        with patch('apps.reports.models.Recommendation.objects.bulk_create') as mock_bulk:
             mock_bulk.side_effect = Exception('Database error')
 
             # Should raise exception
@@ -260,7 +267,7 @@ class TestFetchAzureRecommendations:
     ):
         """Test successful fetch and save of recommendations."""
         # Setup mock
-        mock_azure_service.fetch_recommendations.return_value = sample_azure_recommendations
+        mock_azure_service.iter_recommendation_pages.return_value = _pages(sample_azure_recommendations)
 
         # Execute task
         result = fetch_azure_recommendations(str(report_azure_api.id))
@@ -289,13 +296,13 @@ class TestFetchAzureRecommendations:
         }
         report_azure_api.save()
 
-        mock_azure_service.fetch_recommendations.return_value = sample_azure_recommendations
+        mock_azure_service.iter_recommendation_pages.return_value = _pages(sample_azure_recommendations)
 
         # Execute
         result = fetch_azure_recommendations(str(report_azure_api.id))
 
         # Verify filters were passed to service
-        mock_azure_service.fetch_recommendations.assert_called_once_with(
+        mock_azure_service.iter_recommendation_pages.assert_called_once_with(
             filters={'category': 'Cost', 'impact': 'High'}
         )
 
@@ -344,7 +351,7 @@ class TestFetchAzureRecommendations:
     ):
         """Test handling of Azure authentication errors."""
         # Setup mock to raise authentication error
-        mock_azure_service.fetch_recommendations.side_effect = AzureAuthenticationError(
+        mock_azure_service.iter_recommendation_pages.side_effect = AzureAuthenticationError(
             'Invalid credentials'
         )
 
@@ -367,7 +374,7 @@ class TestFetchAzureRecommendations:
     ):
         """Test API error triggers retry."""
         # Setup mock to raise API error
-        mock_azure_service.fetch_recommendations.side_effect = AzureAPIError(
+        mock_azure_service.iter_recommendation_pages.side_effect = AzureAPIError(
             'Rate limit exceeded'
         )
 
@@ -385,7 +392,7 @@ class TestFetchAzureRecommendations:
         self, db, report_azure_api, mock_azure_service
     ):
         """Test connection error triggers retry."""
-        mock_azure_service.fetch_recommendations.side_effect = AzureConnectionError(
+        mock_azure_service.iter_recommendation_pages.side_effect = AzureConnectionError(
             'Connection timeout'
         )
 
@@ -402,7 +409,7 @@ class TestFetchAzureRecommendations:
     ):
         """Test handling of task timeout."""
         # Setup mock to raise timeout
-        mock_azure_service.fetch_recommendations.side_effect = SoftTimeLimitExceeded()
+        mock_azure_service.iter_recommendation_pages.side_effect = SoftTimeLimitExceeded()
 
         # Should raise Ignore
         with pytest.raises(Ignore):
@@ -417,10 +424,10 @@ class TestFetchAzureRecommendations:
         self, db, report_azure_api, sample_azure_recommendations, mock_azure_service
     ):
         """Test handling of database save errors."""
-        mock_azure_service.fetch_recommendations.return_value = sample_azure_recommendations
+        mock_azure_service.iter_recommendation_pages.return_value = _pages(sample_azure_recommendations)
 
         # Mock bulk_create to fail
-        with patch('apps.azure_integration.tasks.Recommendation.objects.bulk_create') as mock_bulk:
+        with patch('apps.reports.models.Recommendation.objects.bulk_create') as mock_bulk:
             mock_bulk.side_effect = Exception('Database error')
 
             with pytest.raises(Ignore):
@@ -435,7 +442,7 @@ class TestFetchAzureRecommendations:
         self, db, report_azure_api, sample_azure_recommendations, mock_azure_service
     ):
         """Test that sync metadata is properly stored."""
-        mock_azure_service.fetch_recommendations.return_value = sample_azure_recommendations
+        mock_azure_service.iter_recommendation_pages.return_value = _pages(sample_azure_recommendations)
 
         result = fetch_azure_recommendations(str(report_azure_api.id))
 
@@ -450,12 +457,30 @@ class TestFetchAzureRecommendations:
         assert 'fetch_duration_seconds' in metadata
         assert metadata['azure_api_calls'] == 1
 
+    def test_pages_saved_while_streaming(
+        self, db, report_azure_api, sample_azure_recommendations, mock_azure_service
+    ):
+        """Test each page is saved before the next page is requested."""
+        saved_before_page = []
+
+        def pages(filters=None):
+            for rec in sample_azure_recommendations:
+                saved_before_page.append(Recommendation.objects.filter(report=report_azure_api).count())
+                yield [rec]
+
+        mock_azure_service.iter_recommendation_pages.side_effect = pages
+
+        result = fetch_azure_recommendations(str(report_azure_api.id))
+
+        assert saved_before_page == [0, 1]
+        assert result['recommendations_count'] == 2
+
     @patch('apps.azure_integration.tasks.generate_azure_report')
     def test_chains_to_report_generation(
         self, mock_generate, db, report_azure_api, sample_azure_recommendations, mock_azure_service
     ):
         """Test that task chains to generate_azure_report on success."""
-        mock_azure_service.fetch_recommendations.return_value = sample_azure_recommendations
+        mock_azure_service.iter_recommendation_pages.return_value = _pages(sample_azure_recommendations)
 
         result = fetch_azure_recommendations(str(report_azure_api.id))
 
@@ -480,6 +505,7 @@ class TestGenerateAzureReport:
 
         # Add recommendations
         _save_recommendations_to_db(report_azure_api, sample_azure_recommendations)
+        report_azure_api.refresh_summary()
 
         return report_azure_api
 
@@ -12,7 +12,6 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
-from django.core.cache import cache
 
 from apps.azure_integration.models import AzureSubscription
 from apps.azure_integration.serializers import (
@@ -21,6 +20,7 @@ from apps.azure_integration.serializers import (
     AzureSubscriptionUpdateSerializer,
     AzureSubscriptionListSerializer,
 )
+from apps.azure_integration.services import invalidate_recommendations_cache
 from apps.azure_integration.tasks import (
     test_azure_connection,
     sync_azure_statistics,
@@ -300,10 +300,9 @@ class AzureSubscriptionViewSet(viewsets.ModelViewSet):
             f"by user {request.user.email}"
         )
 
-        # Clear cache to force fresh fetch
-        cache_key = f'azure_advisor:{subscription.subscription_id}:statistics'
-        cache.delete(cache_key)
-        logger.debug(f"Cleared cache key: {cache_key}")
+        # Clear the cached listing (statistics are derived from it) to force fresh fetch
+        invalidate_recommendations_cache(subscription.subscription_id)
+        logger.debug(f"Cleared cached recommendations of {subscription.subscription_id}")
 
         # Trigger async sync task
         task = sync_azure_statistics.delay(str(subscription.id))
@@ -6,8 +6,10 @@ import uuid
 from django.db import models
 from django.conf import settings
 
+from apps.core.tracking import TrackedFieldsMixin
 
-class Client(models.Model):
+
+class Client(TrackedFieldsMixin, models.Model):
     """
     Client represents a customer/organization that uses Azure Advisor reports.
     """
@@ -29,6 +31,13 @@ class Client(models.Model):
         ('other', 'Other'),
     ]
 
+    # Changes of these fields are recorded with the user activity (apps/core/tracking.py)
+    TRACKED_FIELDS = (
+        'company_name', 'industry', 'contact_email', 'contact_phone', 'contact_person',
+        'status', 'account_manager', 'contract_start_date', 'contract_end_date',
+        'billing_contact', 'azure_subscription_ids',
+    )
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     company_name = models.CharField(max_length=255, help_text="Client company name")
     industry = models.CharField(
@@ -9,3 +9,9 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = 'Core'
+
+    def ready(self):
+        # Import signal handlers
+        from . import signals
+
+        signals.connect_tracked_models()
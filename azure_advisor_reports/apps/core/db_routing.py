@@ -0,0 +1,243 @@
+"""
+Read-replica routing for analytics, history and export queries.
+
+Everything reads from and writes to the primary ('default') unless code
+explicitly opts in to the replica for a block of read-only work:
+
+    >>> from apps.core.db_routing import use_replica
+    >>> with use_replica(request.user):
+    ...     data = list(queryset.values('report_type').annotate(count=Count('id')))
+
+    >>> class AnalyticsService:
+    ...     @classmethod
+    ...     @use_replica()
+    ...     def get_trend_data(cls, days=30): ...
+
+Inside such a scope ``ReplicaRouter`` sends reads to DATABASE_REPLICA_ALIAS
+and writes to the primary. The scope falls back to the primary when:
+
+- no replica alias is configured in DATABASES (development, tests) or
+  DATABASE_REPLICA_ENABLED is off
+- the replica is unreachable or more than DATABASE_REPLICA_MAX_LAG seconds
+  behind (measured at most every DATABASE_REPLICA_LAG_CHECK_INTERVAL seconds)
+- the user had a report completed in the last DATABASE_REPLICA_PIN_SECONDS
+  (``pin_primary_reads``), so they see their own new report at once
+- the scope already wrote something, so later reads see that write
+
+``use_primary()`` forces the primary inside a replica scope.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLICA_ALIAS = 'replica'
+DEFAULT_REPLICA_MAX_LAG = 10.0  # seconds
+DEFAULT_REPLICA_LAG_CHECK_INTERVAL = 5  # seconds
+DEFAULT_REPLICA_PIN_SECONDS = 30
+
+LAG_CACHE_KEY = 'db_routing:replica_lag:{alias}'
+PIN_CACHE_KEY = 'db_routing:primary_pin:{user_id}'
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+# (an idle primary leaves pg_last_xact_replay_timestamp() old but nothing is missing)
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+class _ReadScope:
+    """Alias the reads of the current replica scope go to."""
+
+    __slots__ = ('alias',)
+
+    def __init__(self, alias: str):
+        self.alias = alias
+
+
+_read_scope: ContextVar[Optional[_ReadScope]] = ContextVar('db_read_scope', default=None)
+
+
+# ============================================================================
+# Replica availability
+# ============================================================================
+
+def get_replica_alias() -> Optional[str]:
+    """Return the configured replica alias, or None if reads stay on the primary."""
+    if not getattr(settings, 'DATABASE_REPLICA_ENABLED', True):
+        return None
+
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', DEFAULT_REPLICA_ALIAS)
+    if alias == DEFAULT_DB_ALIAS or alias not in settings.DATABASES:
+        return None
+    return alias
+
+
+def measure_replica_lag(alias: str) -> float:
+    """
+    Return how many seconds the replica is behind the primary.
+
+    Returns:
+        float: The lag, or infinity if the replica cannot be queried
+    """
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            return float(cursor.fetchone()[0] or 0)
+    except DatabaseError as e:
+        logger.warning("Replica %s is unavailable, reading from the primary: %s", alias, e)
+        return float('inf')
+
+
+def get_replica_lag(alias: str) -> float:
+    """Replica lag in seconds, measured at most once per check interval."""
+    key = LAG_CACHE_KEY.format(alias=alias)
+    lag = cache.get(key)
+    if lag is None:
+        lag = measure_replica_lag(alias)
+        interval = getattr(settings, 'DATABASE_REPLICA_LAG_CHECK_INTERVAL', DEFAULT_REPLICA_LAG_CHECK_INTERVAL)
+        cache.set(key, lag, interval)
+    return lag
+
+
+# ============================================================================
+# Read-your-writes
+# ============================================================================
+
+def _user_id(user) -> Optional[str]:
+    if user is None:
+        return None
+    user_id = getattr(user, 'pk', user)
+    return str(user_id) if user_id is not None else None
+
+
+def pin_primary_reads(user) -> None:
+    """
+    Keep the replica reads of a user on the primary for DATABASE_REPLICA_PIN_SECONDS.
+
+    Called when a report of the user completes, so their history and
+    analytics show it even while the replica is still catching up.
+
+    Args:
+        user: User instance or primary key (None is ignored)
+    """
+    user_id = _user_id(user)
+    if user_id is None or get_replica_alias() is None:
+        return
+
+    seconds = getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', DEFAULT_REPLICA_PIN_SECONDS)
+    cache.set(PIN_CACHE_KEY.format(user_id=user_id), True, seconds)
+
+
+def is_pinned_to_primary(user) -> bool:
+    user_id = _user_id(user)
+    return user_id is not None and bool(cache.get(PIN_CACHE_KEY.format(user_id=user_id)))
+
+
+# ============================================================================
+# Scopes
+# ============================================================================
+
+def choose_read_alias(user=None) -> str:
+    """
+    Return the alias a replica scope opened now would read from.
+
+    Args:
+        user: User the data is read for (read-your-writes), if any
+    """
+    alias = get_replica_alias()
+    if alias is None:
+        return DEFAULT_DB_ALIAS
+
+    if is_pinned_to_primary(user):
+        return DEFAULT_DB_ALIAS
+
+    max_lag = getattr(settings, 'DATABASE_REPLICA_MAX_LAG', DEFAULT_REPLICA_MAX_LAG)
+    if get_replica_lag(alias) > max_lag:
+        return DEFAULT_DB_ALIAS
+
+    return alias
+
+
+@contextmanager
+def use_replica(user=None):
+    """
+    Send the reads of the block (or decorated function) to the replica.
+
+    Nested scopes keep the decision of the outermost one.
+
+    Args:
+        user: User the data is read for; pinned users read from the primary
+    """
+    if _read_scope.get() is not None:
+        yield
+        return
+
+    token = _read_scope.set(_ReadScope(choose_read_alias(user)))
+    try:
+        yield
+    finally:
+        _read_scope.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Send the reads of the block (or decorated function) to the primary."""
+    token = _read_scope.set(_ReadScope(DEFAULT_DB_ALIAS))
+    try:
+        yield
+    finally:
+        _read_scope.reset(token)
+
+
+def current_read_alias() -> str:
+    scope = _read_scope.get()
+    return scope.alias if scope is not None else DEFAULT_DB_ALIAS
+
+
+# ============================================================================
+# Router
+# ============================================================================
+
+class ReplicaRouter:
+    """
+    Route reads inside replica scopes to the replica, everything else to the primary.
+
+    Configured in DATABASE_ROUTERS; without a replica alias it routes
+    everything to 'default', exactly as without a router.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current_read_alias()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so objects read from the replica are saved to the primary
+        scope = _read_scope.get()
+        if scope is not None:
+            scope.alias = DEFAULT_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a physical copy of the primary
+        if db != DEFAULT_DB_ALIAS and db == get_replica_alias():
+            return False
+        return None
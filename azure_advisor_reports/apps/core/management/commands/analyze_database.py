@@ -0,0 +1,85 @@
+"""
+Management command to show the sampled query statistics.
+
+Usage:
+    python manage.py analyze_database
+    python manage.py analyze_database --limit 50 --json
+    python manage.py analyze_database --reset
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.core.query_recorder import get_query_report, reset_query_stats
+
+
+class Command(BaseCommand):
+    help = 'Show the slowest query fingerprints, N+1 suspects and slow queries recorded in production'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Entries per section (default: 20)',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the report as JSON',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Clear the recorded statistics',
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_query_stats()
+            self.stdout.write(self.style.SUCCESS('Query statistics cleared'))
+            return
+
+        report = get_query_report(limit=options['limit'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write('=' * 80)
+        self.stdout.write(
+            f"QUERY STATISTICS since {report['since']} "
+            f"({report['sampled_units']} sampled requests/tasks, {report['sampled_queries']} queries, "
+            f"sample rate {report['sample_rate']})"
+        )
+        self.stdout.write('=' * 80)
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('TOP QUERIES BY TOTAL TIME:'))
+        for entry in report['top_queries']:
+            self.stdout.write(
+                f"   {entry['total_ms']:>10.1f} ms  {entry['calls']:>7} calls  "
+                f"avg {entry['avg_ms']:.2f} ms  max {entry['max_ms']:.2f} ms"
+            )
+            self.stdout.write(f"      {entry['sql'][:200]}")
+            self.stdout.write(f"      from: {', '.join(entry['origins'])}")
+
+        self.stdout.write('')
+        self.stdout.write(self.style.WARNING('N+1 SUSPECTS:'))
+        if not report['n_plus_one_suspects']:
+            self.stdout.write('   None')
+        for entry in report['n_plus_one_suspects']:
+            self.stdout.write(
+                f"   {entry['origin']}: up to {entry['max_repeats']} repeats "
+                f"in {entry['occurrences']} sampled runs"
+            )
+            self.stdout.write(f"      {entry['sql'][:200]}")
+
+        self.stdout.write('')
+        self.stdout.write(self.style.WARNING('SLOW QUERIES:'))
+        if not report['slow_queries']:
+            self.stdout.write('   None')
+        for entry in report['slow_queries']:
+            self.stdout.write(f"   {entry['duration_ms']:>10.1f} ms  {entry['origin']}  {entry['at']}")
+            self.stdout.write(f"      {entry['sql'][:200]}")
@@ -0,0 +1,304 @@
+"""
+Sampled query recording for production.
+
+``connection.queries`` is only filled with DEBUG=True, so slow queries and
+N+1 patterns of the real workload were invisible. Instead, a sample of the
+requests (``QueryRecorderMiddleware``) and Celery tasks (apps/core/signals.py)
+runs with a ``connection.execute_wrapper`` that times every query:
+
+- Each SQL statement is reduced to a fingerprint: literals and placeholders
+  become ``?`` and ``IN``/``VALUES`` lists collapse to ``(...)``, so the
+  same query with other parameters counts as one.
+- A fingerprint executed QUERY_RECORDER_N_PLUS_ONE_THRESHOLD times or more
+  in one request or task is flagged as an N+1 suspect.
+- Queries slower than QUERY_RECORDER_SLOW_MS are kept individually.
+
+When a sampled unit ends, its counts are merged into one aggregate in the
+cache, shared by web and worker processes. The merge is a read-modify-write
+without a lock, so concurrent units may occasionally lose each other's
+samples; the figures are an approximation by design.
+
+Results: ``GET /health/monitoring/queries/`` and
+``python manage.py analyze_database``.
+"""
+
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_SLOW_MS = 500.0
+DEFAULT_N_PLUS_ONE_THRESHOLD = 10
+DEFAULT_MAX_FINGERPRINTS = 500
+DEFAULT_RETENTION = 24 * 60 * 60  # seconds
+
+STATS_CACHE_KEY = 'query_recorder:stats'
+MAX_SLOW_QUERIES = 50
+MAX_ORIGINS_PER_FINGERPRINT = 10
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_LISTS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+_current_recorder: ContextVar[Optional['QueryRecorder']] = ContextVar('query_recorder', default=None)
+
+
+# ============================================================================
+# Fingerprints
+# ============================================================================
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> Tuple[str, str]:
+    """
+    Normalize a SQL statement.
+
+    Returns:
+        tuple: (fingerprint id, normalized SQL)
+    """
+    normalized = _STRING.sub('?', sql)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _LIST.sub('(...)', normalized)
+    normalized = _LISTS.sub('(...)', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip()
+    digest = hashlib.md5(normalized.encode(), usedforsecurity=False).hexdigest()[:16]
+    return digest, normalized
+
+
+# ============================================================================
+# Recording
+# ============================================================================
+
+class QueryRecorder:
+    """
+    Execute wrapper collecting the queries of one request or task.
+
+    Usage:
+        recorder = QueryRecorder('reports.tasks.process_csv_file')
+        with connection.execute_wrapper(recorder):
+            ...
+        recorder.flush()
+    """
+
+    def __init__(self, origin: str):
+        self.origin = origin
+        self.calls = Counter()
+        self.total_ms = defaultdict(float)
+        self.max_ms = defaultdict(float)
+        self.sql = {}
+        self.slow = []
+        self.slow_ms = getattr(settings, 'QUERY_RECORDER_SLOW_MS', DEFAULT_SLOW_MS)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add(sql, (time.perf_counter() - started) * 1000)
+
+    def add(self, sql: str, duration_ms: float) -> None:
+        key, normalized = fingerprint(sql)
+        self.sql[key] = normalized
+        self.calls[key] += 1
+        self.total_ms[key] += duration_ms
+        if duration_ms > self.max_ms[key]:
+            self.max_ms[key] = duration_ms
+        if duration_ms >= self.slow_ms:
+            self.slow.append((key, duration_ms))
+
+    def n_plus_one_suspects(self) -> Dict[str, int]:
+        """Fingerprints repeated at least QUERY_RECORDER_N_PLUS_ONE_THRESHOLD times."""
+        threshold = getattr(settings, 'QUERY_RECORDER_N_PLUS_ONE_THRESHOLD', DEFAULT_N_PLUS_ONE_THRESHOLD)
+        return {key: calls for key, calls in self.calls.items() if calls >= threshold}
+
+    def flush(self) -> None:
+        """Merge the recorded queries into the shared aggregate."""
+        if not self.calls:
+            return
+        try:
+            merge_into_stats(self)
+        except Exception as e:
+            # Recording must never break the request or task it observes
+            logger.warning("Could not store query statistics of %s: %s", self.origin, e)
+
+
+def should_sample(sample_rate: Optional[float] = None) -> bool:
+    if sample_rate is None:
+        sample_rate = getattr(settings, 'QUERY_RECORDER_SAMPLE_RATE', DEFAULT_SAMPLE_RATE)
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def current_recorder() -> Optional[QueryRecorder]:
+    return _current_recorder.get()
+
+
+@contextmanager
+def record_queries(origin: str, sample_rate: Optional[float] = None):
+    """
+    Record the queries of the block on all database connections, if sampled.
+
+    Nested blocks (e.g. an eager task inside a request) are part of the
+    outer recording.
+
+    Yields:
+        QueryRecorder or None when the block is not sampled
+    """
+    if _current_recorder.get() is not None or not should_sample(sample_rate):
+        yield None
+        return
+
+    recorder = QueryRecorder(origin)
+    token = _current_recorder.set(recorder)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            yield recorder
+    finally:
+        _current_recorder.reset(token)
+        recorder.flush()
+
+
+class QueryRecorderMiddleware:
+    """Record the queries of a sample of requests, attributed to their view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries(f'{request.method} (unresolved)'):
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        recorder = current_recorder()
+        if recorder is not None:
+            match = request.resolver_match
+            view_name = match.view_name if match and match.view_name else view_func.__qualname__
+            recorder.origin = f'{request.method} {view_name}'
+        return None
+
+
+# ============================================================================
+# Aggregate
+# ============================================================================
+
+def empty_stats() -> Dict[str, Any]:
+    return {
+        'since': timezone.now().isoformat(),
+        'units': 0,
+        'queries': 0,
+        'fingerprints': {},
+        'n_plus_one': {},
+        'slow_queries': [],
+    }
+
+
+def _trim(entries: Dict[str, Dict], limit: int, key: str) -> None:
+    if len(entries) > limit:
+        for name in sorted(entries, key=lambda name: entries[name][key])[:len(entries) - limit]:
+            del entries[name]
+
+
+def merge_into_stats(recorder: QueryRecorder) -> None:
+    """Add the queries of one recorded unit to the aggregate in the cache."""
+    stats = cache.get(STATS_CACHE_KEY) or empty_stats()
+    max_fingerprints = getattr(settings, 'QUERY_RECORDER_MAX_FINGERPRINTS', DEFAULT_MAX_FINGERPRINTS)
+    now = timezone.now().isoformat()
+
+    stats['units'] += 1
+    stats['queries'] += sum(recorder.calls.values())
+
+    fingerprints = stats['fingerprints']
+    for key, calls in recorder.calls.items():
+        entry = fingerprints.setdefault(key, {
+            'sql': recorder.sql[key], 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'origins': {},
+        })
+        entry['calls'] += calls
+        entry['total_ms'] = round(entry['total_ms'] + recorder.total_ms[key], 3)
+        entry['max_ms'] = round(max(entry['max_ms'], recorder.max_ms[key]), 3)
+        origins = entry['origins']
+        if recorder.origin in origins or len(origins) < MAX_ORIGINS_PER_FINGERPRINT:
+            origins[recorder.origin] = origins.get(recorder.origin, 0) + calls
+    _trim(fingerprints, max_fingerprints, 'total_ms')
+
+    suspects = stats['n_plus_one']
+    for key, calls in recorder.n_plus_one_suspects().items():
+        entry = suspects.setdefault(f'{recorder.origin}|{key}', {
+            'origin': recorder.origin, 'fingerprint': key, 'sql': recorder.sql[key],
+            'occurrences': 0, 'max_repeats': 0,
+        })
+        entry['occurrences'] += 1
+        entry['max_repeats'] = max(entry['max_repeats'], calls)
+        entry['last_seen'] = now
+    _trim(suspects, max_fingerprints, 'occurrences')
+
+    for key, duration_ms in recorder.slow:
+        stats['slow_queries'].append({
+            'fingerprint': key,
+            'sql': recorder.sql[key],
+            'duration_ms': round(duration_ms, 3),
+            'origin': recorder.origin,
+            'at': now,
+        })
+    stats['slow_queries'] = stats['slow_queries'][-MAX_SLOW_QUERIES:]
+
+    cache.set(STATS_CACHE_KEY, stats, getattr(settings, 'QUERY_RECORDER_RETENTION', DEFAULT_RETENTION))
+
+
+def get_query_report(limit: int = 20) -> Dict[str, Any]:
+    """
+    Summarize the aggregate for the monitoring endpoint and command.
+
+    Args:
+        limit: Entries per list
+
+    Returns:
+        dict: Top fingerprints by total time, N+1 suspects and slow queries
+    """
+    stats = cache.get(STATS_CACHE_KEY) or empty_stats()
+
+    top = sorted(stats['fingerprints'].items(), key=lambda item: item[1]['total_ms'], reverse=True)
+    suspects = sorted(stats['n_plus_one'].values(), key=lambda entry: entry['occurrences'], reverse=True)
+    slow = sorted(stats['slow_queries'], key=lambda entry: entry['duration_ms'], reverse=True)
+
+    return {
+        'since': stats['since'],
+        'sample_rate': getattr(settings, 'QUERY_RECORDER_SAMPLE_RATE', DEFAULT_SAMPLE_RATE),
+        'sampled_units': stats['units'],
+        'sampled_queries': stats['queries'],
+        'top_queries': [
+            {
+                'fingerprint': key,
+                'sql': entry['sql'],
+                'calls': entry['calls'],
+                'total_ms': entry['total_ms'],
+                'avg_ms': round(entry['total_ms'] / entry['calls'], 3),
+                'max_ms': entry['max_ms'],
+                'origins': entry['origins'],
+            }
+            for key, entry in top[:limit]
+        ],
+        'n_plus_one_suspects': suspects[:limit],
+        'slow_queries': slow[:limit],
+    }
+
+
+def reset_query_stats() -> None:
+    cache.delete(STATS_CACHE_KEY)
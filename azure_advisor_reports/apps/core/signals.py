@@ -0,0 +1,53 @@
+"""
+Signal handlers for the core app.
+
+- Record the queries of a sample of Celery tasks (see apps/core/query_recorder.py).
+- Collect the field changes of tracked models (see apps/core/tracking.py);
+  connected per model from CoreConfig.ready(), not for every sender.
+"""
+
+from contextlib import ExitStack
+
+from celery.signals import task_postrun, task_prerun
+from django.apps import apps
+from django.db.models.signals import post_save
+
+from .query_recorder import record_queries
+from .tracking import TrackedFieldsMixin, record_tracked_save
+
+# Recordings of the tasks running in this process, by task id
+_task_recordings = {}
+
+
+@task_prerun.connect
+def start_task_query_recording(task_id=None, task=None, **kwargs):
+    """Start recording the queries of a task, if sampled."""
+    stack = ExitStack()
+    if stack.enter_context(record_queries(task.name)) is not None:
+        _task_recordings[task_id] = stack
+    else:
+        stack.close()
+
+
+@task_postrun.connect
+def stop_task_query_recording(task_id=None, **kwargs):
+    """Store the queries of a finished task."""
+    stack = _task_recordings.pop(task_id, None)
+    if stack is not None:
+        stack.close()
+
+
+def collect_tracked_changes(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Hand the in-memory diff of a tracked model to the change collector."""
+    if not raw:
+        record_tracked_save(instance, created, update_fields)
+
+
+def connect_tracked_models():
+    """Connect collect_tracked_changes to the models using TrackedFieldsMixin only."""
+    for model in apps.get_models():
+        if issubclass(model, TrackedFieldsMixin):
+            post_save.connect(
+                collect_tracked_changes, sender=model,
+                dispatch_uid=f'collect_tracked_changes:{model._meta.label}',
+            )
@@ -0,0 +1,210 @@
+"""
+Tests for the read-replica database routing.
+
+The testing settings configure 'replica' as a test mirror of 'default', so
+reads routed to it see the same data through a second alias.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import SimpleTestCase
+from django.test.testcases import _DatabaseFailure
+from django.test.utils import CaptureQueriesContext
+
+from apps.analytics.services import AnalyticsService
+from apps.core import db_routing
+from apps.core.db_routing import (
+    ReplicaRouter,
+    choose_read_alias,
+    pin_primary_reads,
+    use_primary,
+    use_replica,
+)
+from apps.reports.models import Report
+
+
+@pytest.fixture(autouse=True)
+def clear_routing_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def replica_enabled(settings):
+    settings.DATABASE_REPLICA_ENABLED = True
+
+
+@pytest.fixture
+def replica_connection():
+    """
+    The 'replica' connection, without query guards leaked by earlier tests.
+
+    pytest-django skips tearDownClass when a test's teardown fails, which
+    leaves Django's "database not allowed" guards on the aliases that test
+    did not declare.
+    """
+    connection = connections['replica']
+    for name, _ in SimpleTestCase._disallowed_connection_methods:
+        method = getattr(connection, name)
+        # One guard per failed teardown
+        while isinstance(method, _DatabaseFailure):
+            method = method.wrapped
+            setattr(connection, name, method)
+    return connection
+
+
+@pytest.fixture
+def user(transactional_db):
+    from django.contrib.auth import get_user_model
+    return get_user_model().objects.create_user(
+        username='replica', email='replica@example.com', password='testpass123'
+    )
+
+
+@pytest.fixture
+def report(transactional_db, user):
+    from apps.clients.models import Client
+    client = Client.objects.create(company_name='Replica Corp', contact_email='replica@example.com')
+    return Report.objects.create(client=client, created_by=user, report_type='cost')
+
+
+@pytest.fixture
+def api_client(user):
+    from rest_framework.test import APIClient
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.unit
+class TestFallback:
+    """Test reads stay on the primary without a usable replica."""
+
+    def test_disabled(self, settings):
+        """Test a disabled replica is never chosen."""
+        settings.DATABASE_REPLICA_ENABLED = False
+
+        with use_replica():
+            assert Report.objects.all().db == DEFAULT_DB_ALIAS
+
+    def test_alias_not_configured(self, settings, replica_enabled):
+        """Test a replica alias missing from DATABASES is never chosen."""
+        settings.DATABASE_REPLICA_ALIAS = 'reporting'
+
+        assert choose_read_alias() == DEFAULT_DB_ALIAS
+
+    def test_lagging_replica(self, replica_enabled):
+        """Test a replica further behind than the maximum lag is skipped."""
+        with patch.object(db_routing, 'measure_replica_lag', return_value=120.0) as mock_lag:
+            assert choose_read_alias() == DEFAULT_DB_ALIAS
+            assert choose_read_alias() == DEFAULT_DB_ALIAS
+
+        # Measured once per check interval
+        mock_lag.assert_called_once_with('replica')
+
+    def test_unreachable_replica(self, replica_enabled):
+        """Test a replica that cannot be queried is skipped."""
+        with patch.object(db_routing, 'measure_replica_lag', return_value=float('inf')):
+            assert choose_read_alias() == DEFAULT_DB_ALIAS
+
+
+@pytest.mark.unit
+class TestScopes:
+    """Test the router follows the replica and primary scopes."""
+
+    def test_reads_inside_scope(self, replica_enabled):
+        """Test only reads inside a scope go to the replica."""
+        assert Report.objects.all().db == DEFAULT_DB_ALIAS
+
+        with use_replica():
+            assert Report.objects.all().db == 'replica'
+
+        assert Report.objects.all().db == DEFAULT_DB_ALIAS
+
+    def test_decorator(self, replica_enabled):
+        """Test use_replica decorates functions."""
+        @use_replica()
+        def read():
+            return Report.objects.all().db
+
+        assert read() == 'replica'
+
+    def test_use_primary(self, replica_enabled):
+        """Test use_primary wins inside a replica scope."""
+        with use_replica():
+            with use_primary():
+                assert Report.objects.all().db == DEFAULT_DB_ALIAS
+            assert Report.objects.all().db == 'replica'
+
+    def test_writes_go_to_primary(self, replica_enabled):
+        """Test writes go to the primary and later reads of the scope follow."""
+        router = ReplicaRouter()
+
+        with use_replica():
+            assert router.db_for_write(Report) == DEFAULT_DB_ALIAS
+            assert Report.objects.all().db == DEFAULT_DB_ALIAS
+
+    def test_replica_is_not_migrated(self, replica_enabled):
+        """Test migrations only run on the primary."""
+        router = ReplicaRouter()
+
+        assert router.allow_migrate('replica', 'reports') is False
+        assert router.allow_migrate(DEFAULT_DB_ALIAS, 'reports') is None
+
+
+@pytest.mark.unit
+class TestReadYourWrites:
+    """Test users whose report just completed read from the primary."""
+
+    def test_pinned_user(self, replica_enabled):
+        """Test the pin only applies to its user."""
+        pin_primary_reads('user-1')
+
+        assert choose_read_alias('user-1') == DEFAULT_DB_ALIAS
+        assert choose_read_alias('user-2') == 'replica'
+        assert choose_read_alias() == 'replica'
+
+    def test_pin_expires(self, settings, replica_enabled):
+        """Test the pin is kept for DATABASE_REPLICA_PIN_SECONDS."""
+        settings.DATABASE_REPLICA_PIN_SECONDS = 30
+
+        with patch.object(db_routing.cache, 'set') as mock_set:
+            pin_primary_reads('user-1')
+
+        mock_set.assert_called_once_with('db_routing:primary_pin:user-1', True, 30)
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+class TestReplicaQueries:
+    """Test the analytics and history endpoints query the replica alias."""
+
+    def test_history_trends(self, replica_enabled, replica_connection, api_client, report):
+        """Test the history trends are read from the replica."""
+        with CaptureQueriesContext(replica_connection) as replica_queries:
+            response = api_client.get('/api/v1/reports/history/trends/')
+
+        assert response.status_code == 200
+        assert sum(item['total'] for item in response.data['data']) == 1
+        assert any('reports' in q['sql'] for q in replica_queries)
+
+    def test_history_for_pinned_user(self, replica_enabled, replica_connection, api_client, report, user):
+        """Test a user whose report just completed reads from the primary."""
+        pin_primary_reads(user)
+
+        with CaptureQueriesContext(replica_connection) as replica_queries:
+            response = api_client.get('/api/v1/reports/history/statistics/')
+
+        assert response.status_code == 200
+        assert response.data['total_reports'] == 1
+        assert len(replica_queries) == 0
+
+    def test_analytics_service(self, replica_enabled, replica_connection, report):
+        """Test AnalyticsService aggregates are read from the replica."""
+        with CaptureQueriesContext(replica_connection) as replica_queries:
+            AnalyticsService.get_category_distribution()
+
+        assert any('recommendations' in q['sql'] for q in replica_queries)
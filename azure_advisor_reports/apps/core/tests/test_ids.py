@@ -0,0 +1,65 @@
+"""
+Tests for the time-ordered UUID generator.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from apps.core import ids
+from apps.core.ids import uuid7, uuid7_timestamp
+
+
+@pytest.mark.unit
+class TestUUID7:
+    """Test cases for uuid7."""
+
+    def test_version_and_variant(self):
+        """Test the keys are RFC 9562 version 7 UUIDs."""
+        key = uuid7()
+
+        assert key.version == 7
+        assert key.variant == uuid.RFC_4122
+
+    def test_embeds_creation_time(self):
+        """Test the timestamp of the key is the current time."""
+        before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+        key = uuid7()
+        after = datetime.now(timezone.utc)
+
+        assert before <= uuid7_timestamp(key) <= after
+
+    def test_strictly_increasing(self):
+        """Test keys of one process sort in creation order, within a millisecond too."""
+        keys = [uuid7() for _ in range(10000)]
+
+        assert keys == sorted(keys)
+        assert len(set(keys)) == len(keys)
+
+    def test_clock_going_backwards(self):
+        """Test a clock step back does not break the ordering."""
+        first = uuid7()
+        with patch.object(ids.time, 'time_ns', return_value=0):
+            second = uuid7()
+
+        assert second > first
+
+    def test_timestamp_of_other_versions(self):
+        """Test version 4 keys are rejected."""
+        with pytest.raises(ValueError):
+            uuid7_timestamp(uuid.uuid4())
+
+
+@pytest.mark.django_db
+class TestModelKeys:
+    """Test high-insert models use time-ordered keys."""
+
+    def test_recommendation_and_activity_defaults(self):
+        """Test new rows get version 7 ids."""
+        from apps.analytics.models import UserActivity
+        from apps.reports.models import Recommendation
+
+        assert Recommendation().id.version == 7
+        assert UserActivity().id.version == 7
@@ -0,0 +1,70 @@
+"""
+Tests for the hot-path logging helpers.
+"""
+
+import logging
+
+import pytest
+
+from apps.core.logging_utils import PhaseSummary, SampledLogger
+
+
+class _Unformattable:
+    """Argument that fails the test if it is ever formatted."""
+
+    def __str__(self):
+        raise AssertionError("suppressed record was formatted")
+
+    __repr__ = __str__
+
+
+@pytest.mark.unit
+class TestSampledLogger:
+    """Test cases for SampledLogger."""
+
+    def test_logs_first_then_every_nth(self, caplog):
+        """Test only the configured sample of events is emitted."""
+        logger = logging.getLogger('apps.core.tests.sampled')
+        sampled = SampledLogger(logger, first=3, every=10)
+
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            for i in range(1, 31):
+                sampled.info("event %d", i)
+
+        assert [r.getMessage() for r in caplog.records] == [
+            'event 1', 'event 2', 'event 3', 'event 10', 'event 20', 'event 30',
+        ]
+        assert sampled.count == 30
+        assert sampled.suppressed == 24
+
+    def test_suppressed_events_are_not_formatted(self, caplog):
+        """Test arguments of suppressed and disabled events are never formatted."""
+        logger = logging.getLogger('apps.core.tests.lazy')
+        sampled = SampledLogger(logger, first=1, every=0)
+
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            sampled.info("first")
+            sampled.info("row %s", _Unformattable())
+            sampled.debug("row %s", _Unformattable())
+
+        assert [r.getMessage() for r in caplog.records] == ['first']
+
+
+@pytest.mark.unit
+class TestPhaseSummary:
+    """Test cases for PhaseSummary."""
+
+    def test_logs_single_summary_line(self, caplog):
+        """Test counters are reported in one line at the end of a phase."""
+        logger = logging.getLogger('apps.core.tests.summary')
+        summary = PhaseSummary(logger, "Extraction")
+        for category in ['b', 'a', 'b']:
+            summary.add(category)
+
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            summary.log(rows=3)
+
+        assert len(caplog.records) == 1
+        message = caplog.records[0].getMessage()
+        assert message.startswith("Extraction finished in ")
+        assert message.endswith(": rows=3, a=1, b=2")
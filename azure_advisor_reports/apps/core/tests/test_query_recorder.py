@@ -0,0 +1,188 @@
+"""
+Tests for the sampled query recorder.
+"""
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from apps.core.query_recorder import (
+    fingerprint,
+    get_query_report,
+    record_queries,
+)
+from apps.reports.models import Report
+
+
+@pytest.fixture(autouse=True)
+def clear_stats():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def make_user(role, username):
+    from django.contrib.auth import get_user_model
+    return get_user_model().objects.create_user(
+        username=username, email=f'{username}@example.com', password='testpass123', role=role
+    )
+
+
+def suspects_of(report, origin):
+    return [entry for entry in report['n_plus_one_suspects'] if entry['origin'] == origin]
+
+
+@pytest.mark.unit
+class TestFingerprint:
+    """Test SQL normalization."""
+
+    def test_literals_and_placeholders(self):
+        """Test the same statement with other values has one fingerprint."""
+        first = fingerprint("SELECT * FROM reports WHERE id = 'a1' AND score > 10")
+        second = fingerprint('SELECT *  FROM reports\n WHERE id = %s AND score > 3.5')
+
+        assert first == second
+        assert first[1] == 'SELECT * FROM reports WHERE id = ? AND score > ?'
+
+    def test_lists_collapse(self):
+        """Test IN lists and multi-row VALUES of any length are one fingerprint."""
+        assert fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s)')[0] == \
+            fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s, %s, %s)')[0]
+        assert fingerprint('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)')[1] == \
+            'INSERT INTO t (a, b) VALUES (...)'
+
+    def test_identifiers_are_kept(self):
+        """Test digits inside identifiers are not literals."""
+        assert 'idx_rec_2' in fingerprint('SELECT 1 FROM t INDEXED BY idx_rec_2')[1]
+
+
+@pytest.mark.django_db
+class TestRecordQueries:
+    """Test recording of a unit of work."""
+
+    def test_n_plus_one_is_flagged(self, settings):
+        """Test a fingerprint repeated within one unit is an N+1 suspect."""
+        settings.QUERY_RECORDER_N_PLUS_ONE_THRESHOLD = 5
+
+        with record_queries('loop', sample_rate=1) as recorder:
+            for _ in range(6):
+                Report.objects.filter(status='pending').exists()
+            Report.objects.count()
+
+        assert recorder is not None
+        report = get_query_report()
+        suspects = suspects_of(report, 'loop')
+        assert len(suspects) == 1
+        assert suspects[0]['max_repeats'] == 6
+        assert report['sampled_units'] == 1
+        assert report['sampled_queries'] == 7
+        assert sorted(entry['calls'] for entry in report['top_queries']) == [1, 6]
+
+    def test_not_sampled(self):
+        """Test units outside the sample record nothing."""
+        with record_queries('skipped', sample_rate=0) as recorder:
+            Report.objects.count()
+
+        assert recorder is None
+        assert get_query_report()['sampled_units'] == 0
+
+    def test_nested_units_are_recorded_once(self):
+        """Test a nested unit (eager task in a request) belongs to the outer one."""
+        with record_queries('outer', sample_rate=1):
+            with record_queries('inner', sample_rate=1) as inner:
+                Report.objects.count()
+
+        report = get_query_report()
+        assert inner is None
+        assert report['sampled_units'] == 1
+        assert report['top_queries'][0]['origins'] == {'outer': 1}
+
+    def test_slow_queries(self, settings):
+        """Test queries above the threshold are kept individually."""
+        settings.QUERY_RECORDER_SLOW_MS = 0
+
+        with record_queries('slow', sample_rate=1):
+            Report.objects.count()
+
+        slow = get_query_report()['slow_queries']
+        assert len(slow) == 1
+        assert slow[0]['origin'] == 'slow'
+        assert 'COUNT(*)' in slow[0]['sql']
+
+
+@pytest.mark.django_db
+class TestOrigins:
+    """Test requests and tasks are recorded under their view or task name."""
+
+    def test_request_origin(self, settings):
+        """Test a sampled request is attributed to its view."""
+        settings.QUERY_RECORDER_SAMPLE_RATE = 1
+        client = APIClient()
+        client.force_authenticate(user=make_user('analyst', 'analyst'))
+
+        response = client.get('/api/v1/reports/')
+
+        assert response.status_code == 200
+        origins = {
+            origin
+            for entry in get_query_report(limit=200)['top_queries']
+            for origin in entry['origins']
+        }
+        assert origins == {'GET reports:report-list'}
+
+    @pytest.mark.celery
+    def test_task_origin(self, settings):
+        """Test a sampled task is attributed to its name."""
+        from apps.reports.tasks import cleanup_old_csv_files
+
+        settings.QUERY_RECORDER_SAMPLE_RATE = 1
+        cleanup_old_csv_files.apply().get()
+
+        origins = {
+            origin
+            for entry in get_query_report(limit=200)['top_queries']
+            for origin in entry['origins']
+        }
+        assert origins == {cleanup_old_csv_files.name}
+
+
+@pytest.mark.django_db
+class TestQueryStatisticsAccess:
+    """Test the monitoring endpoint and the management command."""
+
+    def test_endpoint_requires_admin(self):
+        """Test only admins see the recorded SQL."""
+        client = APIClient()
+        client.force_authenticate(user=make_user('analyst', 'analyst'))
+
+        assert client.get('/health/monitoring/queries/').status_code == 403
+
+    def test_endpoint(self):
+        """Test admins get the aggregated report."""
+        with record_queries('loop', sample_rate=1):
+            Report.objects.count()
+        client = APIClient()
+        client.force_authenticate(user=make_user('admin', 'admin'))
+
+        response = client.get('/health/monitoring/queries/?limit=5')
+
+        assert response.status_code == 200
+        assert response.data['sampled_units'] == 1
+        assert response.data['top_queries'][0]['origins'] == {'loop': 1}
+
+    def test_command(self):
+        """Test analyze_database prints and resets the statistics."""
+        with record_queries('loop', sample_rate=1):
+            Report.objects.count()
+
+        out = StringIO()
+        call_command('analyze_database', '--json', stdout=out)
+        assert json.loads(out.getvalue())['sampled_units'] == 1
+
+        call_command('analyze_database', stdout=StringIO())
+        call_command('analyze_database', '--reset', stdout=StringIO())
+        assert get_query_report()['sampled_units'] == 0
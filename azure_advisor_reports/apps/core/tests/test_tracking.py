@@ -0,0 +1,114 @@
+"""
+Tests for the in-memory field change tracking.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.clients.models import Client
+from apps.core.tracking import collect_changes
+
+
+@pytest.fixture
+def client_obj(db):
+    return Client.objects.create(
+        company_name='Tracked Corp',
+        contact_email='tracked@example.com',
+        status='active',
+        azure_subscription_ids=['sub-1'],
+    )
+
+
+@pytest.mark.django_db
+class TestTrackedFieldsMixin:
+    """Test snapshots and diffs of tracked fields."""
+
+    def test_loaded_instance_has_no_changes(self, client_obj):
+        """Test an instance loaded from the database starts clean."""
+        assert Client.objects.get(pk=client_obj.pk).get_tracked_changes() == {}
+
+    def test_changes_since_load(self, client_obj):
+        """Test only modified tracked fields are reported, with old and new values."""
+        client = Client.objects.get(pk=client_obj.pk)
+        client.status = 'suspended'
+        client.contract_start_date = date(2026, 1, 1)
+        client.notes = 'Not tracked'
+        client.azure_subscription_ids.append('sub-2')
+
+        assert client.get_tracked_changes() == {
+            'status': ('active', 'suspended'),
+            'contract_start_date': (None, date(2026, 1, 1)),
+            'azure_subscription_ids': (['sub-1'], ['sub-1', 'sub-2']),
+        }
+
+    def test_save_resets_snapshot(self, client_obj):
+        """Test a save makes the saved values the new originals."""
+        client_obj.status = 'inactive'
+        client_obj.save()
+
+        assert client_obj.get_tracked_changes() == {}
+
+    def test_update_fields(self, client_obj):
+        """Test a partial save only resets the saved fields."""
+        client_obj.status = 'inactive'
+        client_obj.company_name = 'Renamed'
+        client_obj.save(update_fields=['status'])
+
+        assert client_obj.get_tracked_changes() == {'company_name': ('Tracked Corp', 'Renamed')}
+
+    def test_deferred_fields_are_not_loaded(self, client_obj):
+        """Test the snapshot never loads deferred fields."""
+        client = Client.objects.only('id', 'status').get(pk=client_obj.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            client.status = 'inactive'
+            changes = client.get_tracked_changes()
+
+        assert changes == {'status': ('active', 'inactive')}
+        assert len(queries) == 0
+
+
+@pytest.mark.django_db
+class TestCollectChanges:
+    """Test saves are collected with their diff and without extra reads."""
+
+    def test_collects_saves(self, client_obj):
+        """Test creations and updates with changes are collected, no-op saves are not."""
+        with collect_changes() as changes:
+            client = Client.objects.get(pk=client_obj.pk)
+            client.save()
+            client.status = 'inactive'
+            with CaptureQueriesContext(connection) as queries:
+                client.save(update_fields=['status'])
+            Client.objects.create(company_name='New Corp', contact_email='new@example.com')
+
+        assert [q['sql'].split()[0] for q in queries] == ['UPDATE']
+        assert [(change.instance.company_name, change.created) for change in changes] == [
+            ('Tracked Corp', False),
+            ('New Corp', True),
+        ]
+        assert changes[0].as_dict()['fields'] == {'status': ['active', 'inactive']}
+
+    def test_nothing_collected_outside(self, client_obj):
+        """Test saves outside collect_changes are not recorded."""
+        client_obj.status = 'inactive'
+        client_obj.save()
+
+        with collect_changes() as changes:
+            pass
+
+        assert changes == []
+
+    def test_receiver_only_connected_to_tracked_models(self, client_obj):
+        """Test saves of untracked models never reach the change collector."""
+        with patch('apps.core.signals.record_tracked_save') as record:
+            Group.objects.create(name='Untracked')
+            assert not record.called
+
+            client_obj.save()
+            assert record.call_count == 1
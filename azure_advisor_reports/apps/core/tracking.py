@@ -0,0 +1,144 @@
+"""
+In-memory field change tracking.
+
+Models listing ``TRACKED_FIELDS`` snapshot those values when they are loaded
+from the database (``from_db``) and after every save, so what changed is
+known from the instance alone: no SELECT of the old row, no cached copy.
+
+    >>> client = Client.objects.get(pk=client_id)
+    >>> client.status = 'inactive'
+    >>> client.get_tracked_changes()
+    {'status': ('active', 'inactive')}
+
+Saves of tracked models inside ``collect_changes()`` are recorded with their
+diff; the activity tracking middleware (apps/analytics/middleware.py) wraps
+each request in it and stores the changes with the activity it logs.
+"""
+
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+_collected: ContextVar[Optional[List['TrackedChange']]] = ContextVar('tracked_changes', default=None)
+
+
+class TrackedFieldsMixin:
+    """
+    Model mixin exposing the changes of TRACKED_FIELDS since load or last save.
+
+    Deferred fields are not snapshotted and never reported. New instances
+    have no snapshot; their first save is reported as a creation.
+    """
+
+    TRACKED_FIELDS: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_tracked_fields()
+        return instance
+
+    def snapshot_tracked_fields(self, fields=None):
+        """Record the current values of the tracked fields (or only of ``fields``)."""
+        originals = getattr(self, '_tracked_originals', None)
+        if originals is None or fields is None:
+            originals = {}
+        for name in self.TRACKED_FIELDS:
+            if fields is not None and name not in fields:
+                continue
+            attname = self._meta.get_field(name).attname
+            if attname in self.__dict__:
+                value = self.__dict__[attname]
+                # Only containers (JSON fields) can change in place
+                originals[name] = copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+        self._tracked_originals = originals
+
+    def get_tracked_changes(self, fields=None) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Return the tracked fields whose value differs from the snapshot.
+
+        Args:
+            fields: Only consider these fields (e.g. the update_fields of a save)
+
+        Returns:
+            dict: field name -> (old value, new value)
+        """
+        originals = getattr(self, '_tracked_originals', None)
+        if not originals:
+            return {}
+
+        changes = {}
+        for name, old in originals.items():
+            if fields is not None and name not in fields:
+                continue
+            new = self.__dict__.get(self._meta.get_field(name).attname)
+            if new != old:
+                changes[name] = (old, new)
+        return changes
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save receivers ran inside super().save() against the previous snapshot
+        update_fields = kwargs.get('update_fields')
+        self.snapshot_tracked_fields(fields=set(update_fields) if update_fields is not None else None)
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self.snapshot_tracked_fields(fields=set(fields) if fields is not None else None)
+
+
+class TrackedChange:
+    """One save of a tracked model, with its diff."""
+
+    __slots__ = ('instance', 'created', 'changes')
+
+    def __init__(self, instance, created: bool, changes: Dict[str, Tuple[Any, Any]]):
+        self.instance = instance
+        self.created = created
+        self.changes = changes
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, for UserActivity.metadata."""
+        encoder = DjangoJSONEncoder()
+
+        def encode(value):
+            if value is None or isinstance(value, (str, int, float, bool, list, dict)):
+                return value
+            return encoder.default(value)
+
+        return {
+            'model': self.instance._meta.label,
+            'id': str(self.instance.pk),
+            'created': self.created,
+            'fields': {name: [encode(old), encode(new)] for name, (old, new) in self.changes.items()},
+        }
+
+
+def record_tracked_save(instance, created: bool, update_fields=None) -> None:
+    """Add a save to the changes being collected, if any (see apps/core/signals.py)."""
+    collected = _collected.get()
+    if collected is None:
+        return
+
+    changes = {} if created else instance.get_tracked_changes(fields=update_fields)
+    if created or changes:
+        collected.append(TrackedChange(instance, created, changes))
+
+
+@contextmanager
+def collect_changes():
+    """
+    Collect the saves of tracked models made in the block.
+
+    Yields:
+        list: TrackedChange entries, in save order
+    """
+    changes = []
+    token = _collected.set(changes)
+    try:
+        yield changes
+    finally:
+        _collected.reset(token)
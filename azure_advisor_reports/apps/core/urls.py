@@ -8,4 +8,5 @@ from . import views
 urlpatterns = [
     path('', views.health_check, name='health_check'),
     path('monitoring/', views.monitoring_dashboard, name='monitoring_dashboard'),
+    path('monitoring/queries/', views.query_statistics, name='query_statistics'),
 ]
\ No newline at end of file
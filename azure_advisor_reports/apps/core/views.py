@@ -13,6 +13,9 @@ from django.db import connection
 from django.core.cache import cache
 from django.conf import settings
 
+from apps.authentication.permissions import IsAdmin
+from .query_recorder import get_query_report
+
 logger = logging.getLogger(__name__)
 
 
@@ -252,4 +255,25 @@ def monitoring_dashboard(request):
                 'detail': str(e)
             },
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def query_statistics(request):
+    """
+    Sampled query statistics (see apps/core/query_recorder.py).
+
+    GET /health/monitoring/queries/?limit=20
+
+    Returns:
+    - Top query fingerprints by total time, with the views/tasks running them
+    - N+1 suspects: fingerprints repeated within one request or task
+    - The slowest recent queries
+    """
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), 200))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(get_query_report(limit=limit), status=status.HTTP_200_OK)
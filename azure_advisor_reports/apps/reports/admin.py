@@ -138,6 +138,7 @@ class ReportAdmin(admin.ModelAdmin):
             )
         return count
     recommendation_count.short_description = 'Recommendations'
+    recommendation_count.admin_order_field = 'recommendation_count'
 
     def total_savings_display(self, obj):
         savings = obj.total_potential_savings
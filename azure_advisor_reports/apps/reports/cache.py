@@ -79,7 +79,7 @@ def cache_report_data(report):
     cached_data = {
         'id': str(report.id),
         'analysis_data': report.analysis_data,
-        'recommendations_count': report.recommendations.count(),
+        'recommendations_count': report.recommendation_count,
         'total_potential_savings': float(report.total_potential_savings),
         'status': report.status,
         'report_type': report.report_type,
@@ -0,0 +1,64 @@
+"""
+Stable recommendation fingerprints.
+
+Every monthly report of a client re-imports the same Advisor findings as new
+rows. A fingerprint identifies one finding across reports, so two reports can
+be compared with a join on it (services/report_diff.py) instead of by eye.
+
+It is a SHA-1 of the identifying fields only:
+
+- subscription id,
+- resource: resource group, name and type (CSV exports carry no full
+  resource id, so these stand in for it),
+- recommendation text, as the recommendation type (CSV exports carry no
+  type id either; the text is the Advisor problem statement and stable),
+- category.
+
+Values are compared case-insensitively with whitespace collapsed, so
+reformatting of an export does not change the fingerprint. Savings, impact
+and dates are deliberately excluded: they change from month to month for
+the same finding.
+
+Changing the recipe makes every report look entirely new against older
+ones; migration 0015 keeps a frozen copy for its backfill.
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+FINGERPRINT_FIELDS = (
+    'subscription_id',
+    'resource_group',
+    'resource_name',
+    'resource_type',
+    'recommendation',
+    'category',
+)
+
+_SEPARATOR = '\x1f'
+
+
+def _normalize(value: Optional[str]) -> str:
+    return ' '.join(str(value).split()).casefold() if value else ''
+
+
+def recommendation_fingerprint(**values) -> str:
+    """
+    Fingerprint of one recommendation.
+
+    Args:
+        **values: FINGERPRINT_FIELDS values; missing ones count as empty
+
+    Returns:
+        str: 40 hex characters
+    """
+    key = _SEPARATOR.join(_normalize(values.get(name)) for name in FINGERPRINT_FIELDS)
+    return hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def fingerprint_columns(columns: Dict[str, list]) -> List[str]:
+    """Fingerprints of normalized column arrays (see normalize_batch), one per row."""
+    return [
+        recommendation_fingerprint(**dict(zip(FINGERPRINT_FIELDS, values)))
+        for values in zip(*(columns[name] for name in FINGERPRINT_FIELDS))
+    ]
@@ -228,17 +228,17 @@ class BaseReportGenerator(ABC):
 
     def get_top_recommendations(self, limit=10):
         """
-        Get top N recommendations by potential savings and impact.
+        Get top N recommendations by priority (impact, then savings and score impact).
 
         Args:
             limit: Maximum number of recommendations to return
 
         Returns:
-            QuerySet: Top recommendations ordered by savings and impact
+            QuerySet: Top recommendations, read in idx_rec_report_priority order
         """
         return self.recommendations.filter(
             Q(business_impact='high') | Q(potential_savings__gt=0)
-        ).order_by('-business_impact', '-potential_savings')[:limit]
+        ).order_by('-priority_score', '-potential_savings')[:limit]
 
     def get_impact_count(self, impact_level):
         """
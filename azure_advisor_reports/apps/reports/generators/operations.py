@@ -40,17 +40,17 @@ class OperationsReportGenerator(BaseReportGenerator):
         # Reliability recommendations
         reliability_recs = self.recommendations.filter(
             category='reliability'
-        ).order_by('-business_impact', '-advisor_score_impact')
+        ).order_by('-priority_score', '-potential_savings')
 
         # Operational excellence
         opex_recs = self.recommendations.filter(
             category='operational_excellence'
-        ).order_by('-business_impact', '-advisor_score_impact')
+        ).order_by('-priority_score', '-potential_savings')
 
         # Performance recommendations
         performance_recs = self.recommendations.filter(
             category='performance'
-        ).order_by('-business_impact', '-advisor_score_impact')
+        ).order_by('-priority_score', '-potential_savings')
 
         # High priority operations items
         high_priority = ops_recs.filter(
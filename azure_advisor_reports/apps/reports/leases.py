@@ -0,0 +1,197 @@
+"""
+Report generation leases.
+
+Both the Generate endpoint and the automatic HTML dispatch at the end of
+``process_csv_file`` can enqueue ``generate_report`` for the same report, and
+users double-click Generate. Concurrent renders of one report race on the
+same output files and waste Chromium capacity, so generation is guarded by a
+lease per (report, format) held in Redis:
+
+- ``dispatch_report_generation`` takes the leases before enqueueing. If
+  another task already holds them, the request attaches to that task id
+  instead of starting a new task. Format 'both' takes the 'html' and 'pdf'
+  leases, so it also deduplicates against single-format requests.
+- ``generate_report`` re-checks the leases with its own task id, so tasks
+  enqueued directly are deduplicated as well, and releases them when done.
+- A lease whose task already finished (its result is in a ready state, e.g.
+  the worker was killed by the time limit) is stale and taken over. Leases
+  of workers that died without a result expire after
+  ``REPORT_GENERATION_LEASE_TTL`` seconds.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from celery import states
+from celery.result import AsyncResult
+from celery.utils import uuid
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Must outlive the generate_report hard time limit (960s)
+LEASE_TTL = getattr(settings, 'REPORT_GENERATION_LEASE_TTL', 60 * 20)
+
+REPORT_FORMATS = ('html', 'pdf')
+
+
+# ============================================================================
+# Leases
+# ============================================================================
+
+def get_generation_lease_key(report_id, file_format):
+    """Get cache key for the generation lease of one report format."""
+    return f"report_generation_lease:{report_id}:{file_format}"
+
+
+def expand_formats(format_type) -> Tuple[str, ...]:
+    """Map a requested format ('html', 'pdf' or 'both') to leased formats."""
+    if format_type == 'both':
+        return REPORT_FORMATS
+    return (format_type,)
+
+
+def collapse_formats(formats: Iterable[str]) -> str:
+    """Inverse of ``expand_formats``."""
+    formats = set(formats)
+    if formats == set(REPORT_FORMATS):
+        return 'both'
+    return formats.pop()
+
+
+def is_lease_stale(lease) -> bool:
+    """
+    Check whether a lease outlived its task.
+
+    The lease is stale if it is older than the TTL, or if the result backend
+    already reports the task as finished.
+    """
+    if time.time() - lease.get('acquired_at', 0) > LEASE_TTL:
+        return True
+    try:
+        return AsyncResult(lease['task_id']).state in states.READY_STATES
+    except Exception as e:
+        logger.warning("Could not check state of task %s: %s", lease.get('task_id'), e)
+        return False
+
+
+def acquire_generation_lease(report_id, format_type, task_id) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Take the leases for ``format_type`` on behalf of ``task_id``.
+
+    Leases already held by ``task_id`` are re-acquired, so a redelivered or
+    retried task keeps its own leases. Stale leases are taken over.
+
+    Returns:
+        tuple: (formats acquired, {format: task id} of leases held by other tasks)
+    """
+    acquired = []
+    in_flight = {}
+
+    for file_format in expand_formats(format_type):
+        key = get_generation_lease_key(report_id, file_format)
+        lease = {'task_id': task_id, 'acquired_at': time.time()}
+
+        current = cache.get(key)
+        if current is not None:
+            if current['task_id'] == task_id:
+                cache.set(key, lease, LEASE_TTL)
+                acquired.append(file_format)
+                continue
+            if not is_lease_stale(current):
+                in_flight[file_format] = current['task_id']
+                continue
+            logger.warning(
+                "Recovering stale %s generation lease for report %s held by task %s",
+                file_format, report_id, current['task_id'],
+            )
+            cache.delete(key)
+
+        if cache.add(key, lease, LEASE_TTL):
+            acquired.append(file_format)
+        else:
+            # Lost the race to a concurrent request
+            current = cache.get(key)
+            if current is not None:
+                in_flight[file_format] = current['task_id']
+
+    return acquired, in_flight
+
+
+def release_generation_lease(report_id, format_type, task_id):
+    """Release the leases for ``format_type`` if they are held by ``task_id``."""
+    for file_format in expand_formats(format_type):
+        key = get_generation_lease_key(report_id, file_format)
+        current = cache.get(key)
+        if current is not None and current['task_id'] == task_id:
+            cache.delete(key)
+
+
+def get_generation_task_ids(report_id) -> Dict[str, str]:
+    """Return {format: task id} for generation tasks currently in flight."""
+    keys = {get_generation_lease_key(report_id, f): f for f in REPORT_FORMATS}
+    leases = cache.get_many(list(keys))
+    return {
+        keys[key]: lease['task_id']
+        for key, lease in leases.items()
+        if not is_lease_stale(lease)
+    }
+
+
+# ============================================================================
+# Dispatch
+# ============================================================================
+
+def dispatch_report_generation(report_id, format_type='both'):
+    """
+    Enqueue ``generate_report`` unless the same work is already in flight.
+
+    Only formats that are not already being generated are enqueued. If all
+    requested formats are in flight, nothing is enqueued and the id of the
+    task already generating them is returned.
+
+    Returns:
+        dict: task_id, deduplicated flag and {format: task id} of attached tasks
+    """
+    from apps.reports.tasks import generate_report
+
+    task_id = uuid()
+    acquired, in_flight = acquire_generation_lease(report_id, format_type, task_id)
+
+    if not acquired:
+        existing_task_id = next(iter(in_flight.values()))
+        logger.info(
+            "Report generation for %s (%s) already in flight as task %s",
+            report_id, format_type, existing_task_id,
+        )
+        return {'task_id': existing_task_id, 'deduplicated': True, 'attached': in_flight}
+
+    try:
+        generate_report.apply_async(
+            args=[str(report_id)],
+            kwargs={'format_type': collapse_formats(acquired)},
+            task_id=task_id,
+        )
+    except Exception:
+        release_generation_lease(report_id, collapse_formats(acquired), task_id)
+        raise
+
+    return {'task_id': task_id, 'deduplicated': False, 'attached': in_flight}
+
+
+def recover_stale_generation(report) -> bool:
+    """
+    Reset a report left in 'generating' by a worker that died.
+
+    Returns:
+        bool: True if the report status was reset
+    """
+    if report.status != 'generating' or get_generation_task_ids(report.id):
+        return False
+
+    logger.warning("Report %s stuck in 'generating' without a live task, resetting", report.id)
+    report.status = 'completed'
+    report.save(update_fields=['status'])
+    return True
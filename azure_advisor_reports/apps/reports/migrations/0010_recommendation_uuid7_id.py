@@ -0,0 +1,25 @@
+# Generated manually: time-ordered UUIDv7 keys for new recommendations
+
+import apps.core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Switch the default of Recommendation.id to UUIDv7.
+
+    The default is applied in Python, so no SQL runs and existing rows keep
+    their version 4 ids (see apps/core/ids.py).
+    """
+
+    dependencies = [
+        ('reports', '0009_populate_savings_plan_flags'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recommendation',
+            name='id',
+            field=models.UUIDField(default=apps.core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Denormalized recommendation summary on reports, with backfill for existing reports
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+CATEGORIES = ['cost', 'security', 'reliability', 'operational_excellence', 'performance']
+IMPACTS = ['high', 'medium', 'low']
+
+
+def backfill_report_summaries(apps, schema_editor):
+    """
+    Compute the summary of every report that has recommendations.
+
+    One grouped query over the recommendations table, then bulk updates;
+    reports without recommendations keep the zero defaults.
+    """
+    Report = apps.get_model('reports', 'Report')
+    Recommendation = apps.get_model('reports', 'Recommendation')
+
+    aggregates = {
+        'count': Count('id'),
+        'total': Sum('potential_savings'),
+        'reservation': Sum(
+            'potential_savings',
+            filter=Q(is_reservation_recommendation=True) | Q(is_savings_plan=True)
+        ),
+    }
+    for category in CATEGORIES:
+        aggregates[f'category_{category}'] = Count('id', filter=Q(category=category))
+    for impact in IMPACTS:
+        aggregates[f'impact_{impact}'] = Count('id', filter=Q(business_impact=impact))
+
+    now = timezone.now()
+    rows = Recommendation.objects.order_by().values('report_id').annotate(**aggregates)
+    reports = []
+    for row in rows.iterator():
+        reports.append(Report(
+            id=row['report_id'],
+            recommendation_count=row['count'],
+            total_potential_savings=row['total'] or 0,
+            reservation_savings=row['reservation'] or 0,
+            category_distribution={c: row[f'category_{c}'] for c in CATEGORIES},
+            impact_distribution={i: row[f'impact_{i}'] for i in IMPACTS},
+            recommendations_ingested_at=now,
+        ))
+        if len(reports) >= 1000:
+            _write(Report, reports)
+            reports = []
+    _write(Report, reports)
+
+
+def _write(Report, reports):
+    Report.objects.bulk_update(reports, [
+        'recommendation_count',
+        'total_potential_savings',
+        'reservation_savings',
+        'category_distribution',
+        'impact_distribution',
+        'recommendations_ingested_at',
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0010_recommendation_uuid7_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='recommendation_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='total_potential_savings',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='reservation_savings',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Potential savings of reservation and savings plan recommendations', max_digits=15),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='category_distribution',
+            field=models.JSONField(blank=True, default=dict, help_text='Number of recommendations by category'),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='impact_distribution',
+            field=models.JSONField(blank=True, default=dict, help_text='Number of recommendations by business impact'),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='recommendations_ingested_at',
+            field=models.DateTimeField(blank=True, help_text='When the recommendations (and this summary) were last written', null=True),
+        ),
+        migrations.RunPython(backfill_report_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+"""
+Composite, partial and covering indexes for the recommendation query shapes.
+
+The report generators, the recommendations API and the report summary all
+filter the recommendations of one report, then by category, business impact,
+commitment category/term or reservation flag, and order by potential savings
+or advisor score. The new indexes lead with report so those queries read only
+the rows of one report, in the order they are returned.
+
+The (report, category) index existed twice (0001 and 0002); both copies are
+replaced by idx_rec_report_cat_score, of which it is a prefix.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0011_report_summary_columns'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='recommendation',
+            name='recommendat_report__662bd5_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='recommendation',
+            name='idx_rec_report_cat',
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(
+                fields=['report', 'category', '-advisor_score_impact'],
+                name='idx_rec_report_cat_score',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(
+                fields=['report', 'business_impact', '-potential_savings'],
+                name='idx_rec_report_impact',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(
+                fields=['report', 'commitment_category', 'commitment_term_years'],
+                name='idx_rec_report_commit',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(
+                fields=['report', '-potential_savings'],
+                name='idx_rec_report_savings',
+                include=['category', 'business_impact', 'is_reservation_recommendation', 'is_savings_plan'],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(
+                fields=['report', '-potential_savings'],
+                name='idx_rec_report_reserv',
+                condition=models.Q(is_reservation_recommendation=True),
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Reports being deleted in the background (see apps/reports/services/deletion.py)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0012_recommendation_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='report',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending Upload'), ('uploaded', 'CSV Uploaded'), ('processing', 'Processing CSV'), ('generating', 'Generating Report'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled'), ('deleting', 'Deleting')], default='pending', help_text='Current processing status', max_length=20),
+        ),
+    ]
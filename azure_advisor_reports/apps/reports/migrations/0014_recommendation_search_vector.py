@@ -0,0 +1,69 @@
+"""
+Full-text search vector for recommendations (see apps/reports/services/search.py).
+
+The backfill and the GIN index are PostgreSQL only; elsewhere the column
+stays NULL. The migration is not atomic: existing rows are filled with one
+UPDATE per report, each committed on its own, and the index is then built
+CONCURRENTLY, once, instead of being maintained row by row during the
+backfill. The expression below must match search_vector_expression().
+"""
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+BACKFILL_SQL = r"""
+UPDATE recommendations SET search_vector =
+    setweight(to_tsvector('english', coalesce(recommendation, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(potential_benefits, '')), 'B')
+    || setweight(to_tsvector('english',
+        coalesce(regexp_replace(resource_type, '[/._-]+', ' ', 'g'), '') || ' ' ||
+        coalesce(regexp_replace(resource_name, '[/._-]+', ' ', 'g'), '')
+    ), 'C')
+WHERE report_id = %s AND search_vector IS NULL
+"""
+
+
+def backfill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    Report = apps.get_model('reports', 'Report')
+    for report_id in list(Report.objects.values_list('id', flat=True)):
+        schema_editor.execute(BACKFILL_SQL, params=[report_id])
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rec_search '
+        'ON recommendations USING gin (search_vector)'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_rec_search')
+
+
+class Migration(migrations.Migration):
+
+    # Autocommit: one transaction per report, and CREATE INDEX CONCURRENTLY
+    atomic = False
+
+    dependencies = [
+        ('reports', '0013_report_deleting_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendation',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,77 @@
+"""
+Recommendation fingerprints for report-to-report diffs.
+
+The migration is not atomic: existing rows are fingerprinted one report at
+a time, each report committed on its own, before the (report, fingerprint)
+index is built. _fingerprint is a frozen copy of
+apps/reports/fingerprints.py: the recipe must not change under this
+migration.
+"""
+
+import hashlib
+
+from django.db import migrations, models, transaction
+
+FINGERPRINT_FIELDS = (
+    'subscription_id',
+    'resource_group',
+    'resource_name',
+    'resource_type',
+    'recommendation',
+    'category',
+)
+
+BATCH_SIZE = 1000
+
+
+def _fingerprint(values):
+    key = '\x1f'.join(
+        ' '.join(str(value).split()).casefold() if value else ''
+        for value in values
+    )
+    return hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def fingerprint_recommendations(apps, schema_editor):
+    Report = apps.get_model('reports', 'Report')
+    Recommendation = apps.get_model('reports', 'Recommendation')
+
+    for report_id in list(Report.objects.values_list('id', flat=True)):
+        pending = Recommendation.objects.filter(report_id=report_id, fingerprint__isnull=True)
+        with transaction.atomic(using=schema_editor.connection.alias):
+            while True:
+                # Fingerprinted rows leave the filter, so each pass takes the next batch
+                batch = [
+                    Recommendation(id=values[0], fingerprint=_fingerprint(values[1:]))
+                    for values in pending.values_list('id', *FINGERPRINT_FIELDS)[:BATCH_SIZE]
+                ]
+                if not batch:
+                    break
+                Recommendation.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    # One transaction per report instead of one for the whole table
+    atomic = False
+
+    dependencies = [
+        ('reports', '0014_recommendation_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendation',
+            name='fingerprint',
+            field=models.CharField(editable=False, help_text='Identifies the same finding across reports (see apps/reports/fingerprints.py)', max_length=40, null=True),
+        ),
+        migrations.RunPython(fingerprint_recommendations, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(
+                fields=['report', 'fingerprint'],
+                name='idx_rec_report_fp',
+                condition=models.Q(fingerprint__isnull=False),
+            ),
+        ),
+    ]
@@ -0,0 +1,71 @@
+"""
+Numeric priority score for top-N recommendation queries.
+
+The migration is not atomic: existing rows are scored one report at a
+time, in primary key batches, each report committed on its own, before the
+(report, -priority_score, -potential_savings) index is built. _priority is
+a frozen copy of apps/reports/priority.py.
+"""
+
+import math
+
+from django.db import migrations, models, transaction
+
+IMPACT_WEIGHTS = {'high': 3, 'medium': 2, 'low': 1}
+LOG_SAVINGS_CEILING = math.log10(1 + 1_000_000)
+SCORE_CEILING = 100
+
+BATCH_SIZE = 1000
+
+
+def _priority(impact, savings, score_impact):
+    savings_share = min(math.log10(1 + max(float(savings or 0), 0)) / LOG_SAVINGS_CEILING, 1)
+    score_share = min(max(float(score_impact or 0), 0) / SCORE_CEILING, 1)
+    return round(IMPACT_WEIGHTS.get(impact, 0) + 0.70 * savings_share + 0.29 * score_share, 6)
+
+
+def score_recommendations(apps, schema_editor):
+    Report = apps.get_model('reports', 'Report')
+    Recommendation = apps.get_model('reports', 'Recommendation')
+
+    for report_id in list(Report.objects.values_list('id', flat=True)):
+        rows = Recommendation.objects.filter(report_id=report_id).order_by('id')
+        last_id = None
+        with transaction.atomic(using=schema_editor.connection.alias):
+            while True:
+                page = rows if last_id is None else rows.filter(id__gt=last_id)
+                values = list(page.values_list('id', 'business_impact', 'potential_savings',
+                                               'advisor_score_impact')[:BATCH_SIZE])
+                if not values:
+                    break
+                Recommendation.objects.bulk_update(
+                    [Recommendation(id=row[0], priority_score=_priority(*row[1:])) for row in values],
+                    ['priority_score'],
+                )
+                last_id = values[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    # One transaction per report instead of one for the whole table
+    atomic = False
+
+    dependencies = [
+        ('reports', '0015_recommendation_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendation',
+            name='priority_score',
+            field=models.FloatField(default=0, editable=False, help_text='Impact, savings and advisor score impact as one number, for top-N lists (see apps/reports/priority.py)'),
+        ),
+        migrations.RunPython(score_recommendations, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(
+                fields=['report', '-priority_score', '-potential_savings'],
+                name='idx_rec_report_priority',
+            ),
+        ),
+    ]
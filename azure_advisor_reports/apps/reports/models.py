@@ -3,15 +3,20 @@ Report models for Azure Advisor report generation and management.
 """
 
 import uuid
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from apps.clients.models import Client
+from apps.core.ids import uuid7
+from apps.core.tracking import TrackedFieldsMixin
+from apps.reports.fingerprints import FINGERPRINT_FIELDS, recommendation_fingerprint
+from apps.reports.priority import recommendation_priority
 
 
-class Report(models.Model):
+class Report(TrackedFieldsMixin, models.Model):
     """
     Report represents an Azure Advisor report generated for a client.
 
@@ -38,6 +43,7 @@ class Report(models.Model):
         ('completed', 'Completed'),
         ('failed', 'Failed'),
         ('cancelled', 'Cancelled'),
+        ('deleting', 'Deleting'),
     ]
 
     DATA_SOURCE_CHOICES = [
@@ -45,6 +51,9 @@ class Report(models.Model):
         ('azure_api', 'Azure API'),
     ]
 
+    # Changes of these fields are recorded with the user activity (apps/core/tracking.py)
+    TRACKED_FIELDS = ('title', 'status', 'report_type', 'client')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     # Relationships
@@ -127,6 +136,31 @@ class Report(models.Model):
         help_text="Processed analytics and metrics from CSV"
     )
 
+    # Recommendation summary, written with the recommendations (see refresh_summary)
+    recommendation_count = models.IntegerField(default=0)
+    total_potential_savings = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    reservation_savings = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        help_text="Potential savings of reservation and savings plan recommendations"
+    )
+    category_distribution = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Number of recommendations by category"
+    )
+    impact_distribution = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Number of recommendations by business impact"
+    )
+    recommendations_ingested_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the recommendations (and this summary) were last written"
+    )
+
     # Error handling
     error_message = models.TextField(
         blank=True,
@@ -213,17 +247,81 @@ class Report(models.Model):
             return self.processing_completed_at - self.processing_started_at
         return None
 
-    @property
-    def recommendation_count(self):
-        """Get total number of recommendations for this report."""
-        return self.recommendations.count()
+    SUMMARY_FIELDS = [
+        'recommendation_count',
+        'total_potential_savings',
+        'reservation_savings',
+        'category_distribution',
+        'impact_distribution',
+        'recommendations_ingested_at',
+    ]
 
-    @property
-    def total_potential_savings(self):
-        """Calculate total potential savings from all recommendations."""
-        return self.recommendations.aggregate(
-            total=models.Sum('potential_savings')
-        )['total'] or 0
+    @staticmethod
+    def summary_aggregates():
+        """
+        Aggregate expressions of the summary columns over a Recommendation queryset.
+
+        Used by refresh_summary and by the backfill migration (grouped by report).
+        """
+        aggregates = {
+            'count': models.Count('id'),
+            'total': models.Sum('potential_savings'),
+            'reservation': models.Sum(
+                'potential_savings',
+                filter=models.Q(is_reservation_recommendation=True) | models.Q(is_savings_plan=True)
+            ),
+        }
+        for category, _ in Recommendation.CATEGORY_CHOICES:
+            aggregates[f'category_{category}'] = models.Count('id', filter=models.Q(category=category))
+        for impact, _ in Recommendation.IMPACT_CHOICES:
+            aggregates[f'impact_{impact}'] = models.Count('id', filter=models.Q(business_impact=impact))
+        return aggregates
+
+    @staticmethod
+    def summary_values(aggregated):
+        """Summary column values from the result of summary_aggregates()."""
+        return {
+            'recommendation_count': aggregated['count'],
+            'total_potential_savings': aggregated['total'] or 0,
+            'reservation_savings': aggregated['reservation'] or 0,
+            'category_distribution': {
+                category: aggregated[f'category_{category}']
+                for category, _ in Recommendation.CATEGORY_CHOICES
+            },
+            'impact_distribution': {
+                impact: aggregated[f'impact_{impact}']
+                for impact, _ in Recommendation.IMPACT_CHOICES
+            },
+        }
+
+    def refresh_summary(self, save=True):
+        """
+        Recompute the summary columns from the recommendations (one query).
+
+        Call it in the transaction that inserts or deletes recommendations, so
+        readers never see rows and summary disagree.
+
+        Args:
+            save (bool): Write the summary columns to the database
+        """
+        aggregated = self.recommendations.aggregate(**self.summary_aggregates())
+        for field, value in self.summary_values(aggregated).items():
+            setattr(self, field, value)
+        self.recommendations_ingested_at = timezone.now()
+        if save:
+            self.save(update_fields=self.SUMMARY_FIELDS)
+
+    def delete_recommendations(self):
+        """Delete all recommendations of the report and reset the summary."""
+        deleted, _ = self.recommendations.all().delete()
+        self.recommendation_count = 0
+        self.total_potential_savings = 0
+        self.reservation_savings = 0
+        self.category_distribution = {}
+        self.impact_distribution = {}
+        self.recommendations_ingested_at = timezone.now()
+        self.save(update_fields=self.SUMMARY_FIELDS)
+        return deleted
 
     def start_processing(self):
         """Mark report as started processing."""
@@ -250,6 +348,13 @@ class Report(models.Model):
         return self.status == 'failed' and self.retry_count < 5
 
 
+class RecommendationManager(models.Manager):
+    """Leaves the (large) search_vector out of ordinary reads."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
+
+
 class Recommendation(models.Model):
     """
     Individual Azure Advisor recommendation from CSV data.
@@ -268,7 +373,8 @@ class Recommendation(models.Model):
         ('low', 'Low'),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Time-ordered keys keep bulk inserts at the end of the primary key index
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
 
     # Relationship to report
     report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name='recommendations')
@@ -371,13 +477,72 @@ class Recommendation(models.Model):
         help_text="Granular categorization for multi-dimensional analysis"
     )
 
+    # Weighted full-text document of recommendation, potential_benefits,
+    # resource_type and resource_name (services/search.py), filled by one
+    # UPDATE per ingest batch. GIN index idx_rec_search: PostgreSQL only,
+    # created by migration 0014.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    fingerprint = models.CharField(
+        max_length=40,
+        null=True,
+        editable=False,
+        help_text="Identifies the same finding across reports (see apps/reports/fingerprints.py)"
+    )
+
+    priority_score = models.FloatField(
+        default=0,
+        editable=False,
+        help_text="Impact, savings and advisor score impact as one number, for top-N lists (see apps/reports/priority.py)"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = RecommendationManager()
+
     class Meta:
         db_table = 'recommendations'
         ordering = ['-potential_savings', '-advisor_score_impact']
         indexes = [
-            models.Index(fields=['report', 'category']),
+            # Composite indexes led by report, matching the generator and API
+            # query shapes (filters of one report, ordered by savings/score)
+            models.Index(
+                fields=['report', 'category', '-advisor_score_impact'],
+                name='idx_rec_report_cat_score',
+            ),
+            models.Index(
+                fields=['report', 'business_impact', '-potential_savings'],
+                name='idx_rec_report_impact',
+            ),
+            models.Index(
+                fields=['report', 'commitment_category', 'commitment_term_years'],
+                name='idx_rec_report_commit',
+            ),
+            # Top-N lists of a report (generators, statistics, API)
+            models.Index(
+                fields=['report', '-priority_score', '-potential_savings'],
+                name='idx_rec_report_priority',
+            ),
+            # Covering (PostgreSQL INCLUDE) for the default per-report listing
+            # and the summary aggregates of Report.refresh_summary
+            models.Index(
+                fields=['report', '-potential_savings'],
+                name='idx_rec_report_savings',
+                include=['category', 'business_impact', 'is_reservation_recommendation', 'is_savings_plan'],
+            ),
+            # Partial: reservations are a small share of the rows
+            models.Index(
+                fields=['report', '-potential_savings'],
+                name='idx_rec_report_reserv',
+                condition=models.Q(is_reservation_recommendation=True),
+            ),
+            # Partial: report-to-report diffs join on (report, fingerprint),
+            # and rows without a fingerprint never match
+            models.Index(
+                fields=['report', 'fingerprint'],
+                name='idx_rec_report_fp',
+                condition=models.Q(fingerprint__isnull=False),
+            ),
             models.Index(fields=['business_impact']),
             models.Index(fields=['potential_savings']),
             models.Index(fields=['subscription_id']),
@@ -387,6 +552,16 @@ class Recommendation(models.Model):
     def __str__(self):
         return f"{self.get_category_display()} - {self.resource_name or 'General'} (${self.potential_savings})"
 
+    def save(self, *args, **kwargs):
+        """Fingerprint and score recommendations saved one by one (bulk ingest does it per batch)."""
+        self.fingerprint = recommendation_fingerprint(
+            **{name: getattr(self, name) for name in FINGERPRINT_FIELDS}
+        )
+        self.priority_score = recommendation_priority(
+            self.business_impact, self.potential_savings, self.advisor_score_impact
+        )
+        super().save(*args, **kwargs)
+
     @property
     def monthly_savings(self):
         """Calculate monthly potential savings."""
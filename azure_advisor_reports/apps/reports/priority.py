@@ -0,0 +1,64 @@
+"""
+Numeric recommendation priority.
+
+Ordering by ``-business_impact`` sorts the labels as strings ('medium' >
+'low' > 'high'), so top-N lists put medium impact first. The priority score
+is a number stored with each recommendation (indexed with its report), so
+top-N queries are an index scan in the right order:
+
+    score = impact weight (high 3, medium 2, low 1)
+          + 0.70 * savings share   (log scale, full at SAVINGS_CEILING a year)
+          + 0.29 * score share     (advisor score impact, full at SCORE_CEILING)
+
+The shares add up to less than 1, so a higher impact always ranks first;
+within an impact level, savings weigh more than advisor score impact.
+
+``priority_scores`` computes a whole normalized batch at once (see
+normalize_batch); ``recommendation_priority`` a single recommendation.
+"""
+
+import math
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+IMPACT_WEIGHTS = {
+    'high': 3,
+    'medium': 2,
+    'low': 1,
+}
+
+SAVINGS_CEILING = 1_000_000
+SCORE_CEILING = 100
+SAVINGS_SHARE = 0.70
+SCORE_SHARE = 0.29
+
+_LOG_SAVINGS_CEILING = math.log10(1 + SAVINGS_CEILING)
+
+
+def priority_scores(impacts: Sequence[str], savings: Sequence, score_impacts: Sequence) -> List[float]:
+    """
+    Priority scores of a batch of recommendations.
+
+    Args:
+        impacts: Business impact labels
+        savings: Potential annual savings
+        score_impacts: Advisor score impacts
+
+    Returns:
+        List[float]: One score per recommendation
+    """
+    weights = pd.Series(impacts, dtype=object).map(IMPACT_WEIGHTS).fillna(0).to_numpy(dtype=float)
+    savings = np.clip(np.asarray(savings, dtype=float), 0, None)
+    score_impacts = np.clip(np.asarray(score_impacts, dtype=float), 0, None)
+
+    savings_share = np.minimum(np.log10(1 + savings) / _LOG_SAVINGS_CEILING, 1)
+    score_share = np.minimum(score_impacts / SCORE_CEILING, 1)
+
+    return (weights + SAVINGS_SHARE * savings_share + SCORE_SHARE * score_share).round(6).tolist()
+
+
+def recommendation_priority(impact: str, savings, score_impact) -> float:
+    """Priority score of one recommendation."""
+    return priority_scores([impact], [savings or 0], [score_impact or 0])[0]
@@ -68,10 +68,14 @@ class RecommendationSerializer(serializers.ModelSerializer):
             'commitment_term_years',
             'total_commitment_savings',
             'is_long_term_commitment',
+            'fingerprint',
+            'priority_score',
             'created_at',
         ]
         read_only_fields = [
             'id',
+            'fingerprint',
+            'priority_score',
             'created_at',
             'monthly_savings',
             'total_commitment_savings',
@@ -96,6 +100,29 @@ class RecommendationListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class RecommendationSearchResultSerializer(RecommendationListSerializer):
+    """Search match with its report, client and relevance."""
+
+    report_title = serializers.CharField(source='report.title', read_only=True)
+    report_type = serializers.CharField(source='report.report_type', read_only=True)
+    report_created_at = serializers.DateTimeField(source='report.created_at', read_only=True)
+    client_id = serializers.UUIDField(source='report.client_id', read_only=True)
+    client_name = serializers.CharField(source='report.client.company_name', read_only=True)
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(RecommendationListSerializer.Meta):
+        fields = RecommendationListSerializer.Meta.fields + [
+            'resource_type',
+            'report',
+            'report_title',
+            'report_type',
+            'report_created_at',
+            'client_id',
+            'client_name',
+            'rank',
+        ]
+
+
 class ReportSerializer(serializers.ModelSerializer):
     """Serializer for Report model with full details."""
 
@@ -481,7 +508,11 @@ class ReportCreateSerializer(serializers.Serializer):
         - data_source: 'csv' or 'azure_api' (default: 'csv')
         - csv_file: CSV file (required if data_source='csv')
         - azure_subscription: Azure subscription ID (required if data_source='azure_api')
+        - azure_subscriptions: Further subscription IDs fetched into the same
+          report (optional, only for azure_api; fetched concurrently)
         - filters: Azure API filters (optional, only for azure_api)
+        - sync_mode: 'full' or 'delta' (default: 'full', only for azure_api);
+          delta reports are snapshots of the delta-synced subscription state
     """
 
     client_id = serializers.UUIDField(required=True)
@@ -511,12 +542,26 @@ class ReportCreateSerializer(serializers.Serializer):
         help_text="Azure subscription for API-based reports"
     )
 
+    azure_subscriptions = serializers.PrimaryKeyRelatedField(
+        read_only=True,  # Temporarily set to read_only, overridden in __init__
+        many=True,
+        required=False,
+        help_text="Additional Azure subscriptions consolidated into the report"
+    )
+
     filters = serializers.JSONField(
         required=False,
         allow_null=True,
         help_text="Filters for Azure API queries (category, impact, resource_group)"
     )
 
+    sync_mode = serializers.ChoiceField(
+        choices=[('full', 'Full'), ('delta', 'Delta')],
+        default='full',
+        required=False,
+        help_text="Azure API sync mode: 'full' refetches everything, 'delta' snapshots the synced state"
+    )
+
     def __init__(self, *args, **kwargs):
         """Initialize with AzureSubscription queryset."""
         super().__init__(*args, **kwargs)
@@ -529,6 +574,12 @@ class ReportCreateSerializer(serializers.Serializer):
             allow_null=True,
             help_text="Azure subscription for API-based reports"
         )
+        self.fields['azure_subscriptions'] = serializers.PrimaryKeyRelatedField(
+            queryset=AzureSubscription.objects.filter(is_active=True),
+            many=True,
+            required=False,
+            help_text="Additional Azure subscriptions consolidated into the report"
+        )
 
     def validate_client_id(self, value):
         """Validate that the client exists."""
@@ -602,11 +653,12 @@ class ReportCreateSerializer(serializers.Serializer):
         1. If data_source='csv': csv_file required, azure_subscription forbidden
         2. If data_source='azure_api': azure_subscription required, csv_file forbidden
         3. Azure subscription must be active
-        4. Filters only allowed for azure_api data source
+        4. Filters and additional subscriptions only allowed for azure_api data source
         """
         data_source = data.get('data_source', 'csv')
         csv_file = data.get('csv_file')
         azure_subscription = data.get('azure_subscription')
+        azure_subscriptions = data.get('azure_subscriptions')
         filters = data.get('filters')
 
         if data_source == 'csv':
@@ -623,6 +675,14 @@ class ReportCreateSerializer(serializers.Serializer):
                 raise serializers.ValidationError({
                     'filters': 'Filters are only applicable for Azure API data source.'
                 })
+            if azure_subscriptions:
+                raise serializers.ValidationError({
+                    'azure_subscriptions': 'Cannot specify Azure subscriptions when using CSV data source.'
+                })
+            if data.get('sync_mode', 'full') != 'full':
+                raise serializers.ValidationError({
+                    'sync_mode': 'Sync mode is only applicable for Azure API data source.'
+                })
 
         elif data_source == 'azure_api':
             # Azure API data source validation
@@ -669,6 +729,10 @@ class ReportCreateSerializer(serializers.Serializer):
         # Extract optional fields
         filters = validated_data.get('filters')
         data_source = validated_data.get('data_source', 'csv')
+        extra_subscriptions = [
+            subscription for subscription in validated_data.get('azure_subscriptions', [])
+            if subscription != validated_data.get('azure_subscription')
+        ]
 
         # Create report based on data source
         report = Report(
@@ -688,12 +752,19 @@ class ReportCreateSerializer(serializers.Serializer):
             report.azure_subscription = validated_data['azure_subscription']
             report.status = 'pending'
 
-            # Store filters in api_sync_metadata
-            if filters:
+            # Store filters, sync mode and subscriptions of a consolidated report in api_sync_metadata
+            sync_mode = validated_data.get('sync_mode', 'full')
+            if filters or extra_subscriptions or sync_mode != 'full':
                 report.api_sync_metadata = {
-                    'filters': filters,
+                    'filters': filters or {},
+                    'sync_mode': sync_mode,
                     'requested_at': timezone.now().isoformat(),
                 }
+            if extra_subscriptions:
+                report.api_sync_metadata['subscription_ids'] = [
+                    str(subscription.id)
+                    for subscription in [report.azure_subscription, *extra_subscriptions]
+                ]
 
         report.save()
 
@@ -2,16 +2,24 @@
 Services package for reports app.
 """
 
+from .bulk_loader import load_recommendations
 from .csv_processor import (
     AzureAdvisorCSVProcessor,
     CSVProcessingError,
     process_csv_file,
 )
+from .normalization import build_recommendations, normalize_batch
 from .reservation_analyzer import ReservationAnalyzer
+from .search import search_recommendations, update_search_vectors
 
 __all__ = [
     'AzureAdvisorCSVProcessor',
     'CSVProcessingError',
     'process_csv_file',
+    'load_recommendations',
+    'build_recommendations',
+    'normalize_batch',
     'ReservationAnalyzer',
+    'search_recommendations',
+    'update_search_vectors',
 ]
@@ -0,0 +1,147 @@
+"""
+Bulk loader for Recommendation rows.
+
+On PostgreSQL the normalized column arrays (see normalization.py) are
+streamed into the recommendations table with COPY ... FROM STDIN, in chunks
+of COPY_CHUNK_ROWS rows, without building model instances. Other databases
+(the SQLite test database) fall back to bulk_create.
+
+Fields the column arrays do not provide get their model default, so the
+loader keeps working when fields are added to Recommendation. The search
+vector of the loaded rows is computed afterwards in one UPDATE (search.py).
+"""
+
+import io
+import json
+import logging
+from itertools import islice, repeat
+from typing import Callable, Dict, Iterator, List
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.reports.models import Recommendation
+from .normalization import build_recommendations
+from .search import update_search_vectors
+
+logger = logging.getLogger(__name__)
+
+COPY_CHUNK_ROWS = 10000
+BULK_CREATE_BATCH_SIZE = 1000
+
+COPY_NULL = r'\N'
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+# ============================================================================
+# COPY text format
+# ============================================================================
+
+def _escape(value: str) -> str:
+    return value.translate(_COPY_ESCAPES)
+
+
+def _copy_converter(field) -> Callable:
+    """Function formatting a field value for COPY text format."""
+    internal_type = field.get_internal_type()
+
+    if internal_type == 'BooleanField':
+        return lambda value: COPY_NULL if value is None else ('t' if value else 'f')
+    if internal_type == 'JSONField':
+        return lambda value: COPY_NULL if value is None else _escape(json.dumps(value))
+    if internal_type in ('DateField', 'DateTimeField'):
+        return lambda value: COPY_NULL if value is None else value.isoformat()
+    return lambda value: COPY_NULL if value is None else _escape(str(value))
+
+
+def _field_values(field, report, columns: Dict[str, list], now) -> Iterator:
+    """Values of one field for every row: from the columns, else the model default."""
+    if field.attname in columns:
+        return iter(columns[field.attname])
+    if field.name == 'report':
+        return repeat(report.pk)
+    if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+        return repeat(now)
+    if callable(field.default):
+        return iter(field.default, None)  # A fresh default (e.g. uuid4) per row
+    return repeat(field.get_default())
+
+
+def copy_lines(report, columns: Dict[str, list]) -> Iterator[str]:
+    """
+    Rows of the column arrays as COPY text-format lines.
+
+    Args:
+        report: Report the recommendations belong to
+        columns: Output of normalize_batch()
+
+    Yields:
+        str: One tab-separated, newline-terminated line per recommendation,
+        in the order of Recommendation._meta.concrete_fields
+    """
+    rows = len(next(iter(columns.values()), []))
+    fields = Recommendation._meta.concrete_fields
+    now = timezone.now()
+
+    sources = [_field_values(field, report, columns, now) for field in fields]
+    converters = [_copy_converter(field) for field in fields]
+
+    for values in islice(zip(*sources), rows):
+        yield '\t'.join(convert(value) for convert, value in zip(converters, values)) + '\n'
+
+
+def _copy(report, columns: Dict[str, list]) -> int:
+    quote = connection.ops.quote_name
+    sql = 'COPY {} ({}) FROM STDIN'.format(
+        quote(Recommendation._meta.db_table),
+        ', '.join(quote(field.column) for field in Recommendation._meta.concrete_fields),
+    )
+
+    loaded = 0
+    lines = copy_lines(report, columns)
+    with transaction.atomic(), connection.cursor() as cursor:
+        raw_cursor = cursor.cursor
+        while True:
+            chunk = list(islice(lines, COPY_CHUNK_ROWS))
+            if not chunk:
+                break
+            if hasattr(raw_cursor, 'copy_expert'):  # psycopg2
+                raw_cursor.copy_expert(sql, io.StringIO(''.join(chunk)))
+            else:  # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    copy.write(''.join(chunk))
+            loaded += len(chunk)
+    return loaded
+
+
+# ============================================================================
+# Loader
+# ============================================================================
+
+def use_copy() -> bool:
+    """COPY needs PostgreSQL; RECOMMENDATION_COPY_ENABLED can turn it off."""
+    return connection.vendor == 'postgresql' and getattr(settings, 'RECOMMENDATION_COPY_ENABLED', True)
+
+
+def load_recommendations(report, columns: Dict[str, list]) -> int:
+    """
+    Insert normalized recommendations of a report.
+
+    Args:
+        report: Report the recommendations belong to
+        columns: Output of normalize_batch()
+
+    Returns:
+        int: Number of rows inserted
+    """
+    if use_copy():
+        loaded = _copy(report, columns)
+        logger.debug("COPY loaded %d recommendations for report %s", loaded, report.pk)
+    else:
+        recommendations: List[Recommendation] = build_recommendations(report, columns)
+        Recommendation.objects.bulk_create(recommendations, batch_size=BULK_CREATE_BATCH_SIZE)
+        loaded = len(recommendations)
+
+    update_search_vectors(report.pk)
+    return loaded
@@ -4,6 +4,7 @@ CSV Processing Service for Azure Advisor Reports.
 This service handles parsing, validation, and processing of Azure Advisor CSV exports.
 """
 
+import heapq
 import logging
 import pandas as pd
 import os
@@ -12,7 +13,8 @@ from decimal import Decimal, InvalidOperation
 from datetime import datetime
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from .reservation_analyzer import ReservationAnalyzer
+from apps.core.logging_utils import PhaseSummary, SampledLogger
+from .normalization import csv_batch, normalize_batch, rows_from_columns
 
 logger = logging.getLogger(__name__)
 
@@ -56,31 +58,6 @@ class AzureAdvisorCSVProcessor:
         'Description',
     ]
 
-    # Category mapping (Azure Advisor categories to internal categories)
-    CATEGORY_MAPPING = {
-        'Cost': 'cost',
-        'cost': 'cost',
-        'Security': 'security',
-        'security': 'security',
-        'Reliability': 'reliability',
-        'reliability': 'reliability',
-        'High Availability': 'reliability',
-        'Operational Excellence': 'operational_excellence',
-        'operational excellence': 'operational_excellence',
-        'Performance': 'performance',
-        'performance': 'performance',
-    }
-
-    # Impact mapping
-    IMPACT_MAPPING = {
-        'High': 'high',
-        'high': 'high',
-        'Medium': 'medium',
-        'medium': 'medium',
-        'Low': 'low',
-        'low': 'low',
-    }
-
     def __init__(self, file_path: str):
         """
         Initialize CSV processor with file path.
@@ -96,6 +73,10 @@ class AzureAdvisorCSVProcessor:
         self.df: Optional[pd.DataFrame] = None
         self.statistics: Dict = {}
         self.errors: List[str] = []
+        # Insert-ready column arrays from the normalization stage
+        self.columns: Dict[str, list] = {}
+        # Per-row warnings are sampled so a malformed column cannot flood the logs
+        self._row_log = SampledLogger(logger)
 
     def _validate_file_path(self, file_path: str) -> str:
         """
@@ -398,7 +379,7 @@ class AzureAdvisorCSVProcessor:
         if value[0] in self.FORMULA_PREFIXES:
             # Prepend single quote to prevent formula execution
             sanitized = "'" + value
-            logger.debug(f"CSV Injection prevented: Sanitized '{value[:50]}...' -> '{sanitized[:50]}...'")
+            logger.debug("CSV Injection prevented: Sanitized '%s...' -> '%s...'", value[:50], sanitized[:50])
             return sanitized
 
         return value
@@ -453,112 +434,33 @@ class AzureAdvisorCSVProcessor:
 
             return Decimal(str(value))
         except (InvalidOperation, ValueError):
-            logger.warning(f"Failed to parse decimal value: {value}, using default: {default}")
+            self._row_log.warning("Failed to parse decimal value: %s, using default: %s", value, default)
             return Decimal(default)
 
     def extract_recommendations(self) -> List[Dict]:
         """
         Extract and format recommendations from the DataFrame.
 
+        The whole DataFrame goes through the shared normalization stage at once;
+        the insert-ready column arrays are kept in self.columns for bulk insert.
+
         Returns:
             List[Dict]: List of recommendation dictionaries
         """
         if self.df is None:
             raise CSVProcessingError("CSV not loaded")
 
-        recommendations = []
-
-        for idx, row in self.df.iterrows():
-            try:
-                # Map category
-                raw_category = row.get('Category', '')
-                category = self.CATEGORY_MAPPING.get(raw_category, 'operational_excellence')
-
-                # Map impact
-                raw_impact = row.get('Business Impact', row.get('Impact', 'medium'))
-                business_impact = self.IMPACT_MAPPING.get(raw_impact, 'medium')
-
-                # Parse potential savings
-                raw_savings = row.get('Potential Annual Cost Savings', 0)
-                potential_savings = self.parse_decimal(raw_savings, 0)
-
-                # Parse advisor score impact
-                raw_score = row.get('Advisor Score Impact', 0)
-                advisor_score_impact = self.parse_decimal(raw_score, 0)
-
-                # Parse retirement date
-                retirement_date = None
-                raw_date = row.get('Retirement Date', '')
-                if raw_date and not pd.isna(raw_date):
-                    try:
-                        retirement_date = pd.to_datetime(raw_date).date()
-                    except Exception:
-                        logger.warning(f"Failed to parse retirement date: {raw_date}")
-
-                # Extract base recommendation data
-                recommendation_text = row.get('Recommendation', row.get('Description', ''))
-                potential_benefits_text = row.get('Potential Benefits', '')
-
-                recommendation_data = {
-                    'category': category,
-                    'business_impact': business_impact,
-                    'recommendation': recommendation_text,
-                    'subscription_id': row.get('Subscription ID', ''),
-                    'subscription_name': row.get('Subscription Name', ''),
-                    'resource_group': row.get('Resource Group', ''),
-                    'resource_name': row.get('Resource Name', row.get('Impacted Resource', '')),
-                    'resource_type': row.get('Resource Type', ''),
-                    'potential_savings': potential_savings,
-                    'currency': row.get('Currency', 'USD'),
-                    'potential_benefits': potential_benefits_text,
-                    'retirement_date': retirement_date,
-                    'retiring_feature': row.get('Retiring Feature', ''),
-                    'advisor_score_impact': advisor_score_impact,
-                    'csv_row_number': idx + 2,  # +2 because: 0-indexed + 1 for header row
-                }
-
-                # Analyze for Saving Plans & Reserved Instances (v2.0 - Enhanced Multi-Dimensional)
-                try:
-                    reservation_analysis = ReservationAnalyzer.analyze_recommendation(
-                        recommendation_text,
-                        potential_benefits_text
-                    )
-                    recommendation_data['is_reservation_recommendation'] = reservation_analysis['is_reservation']
-                    recommendation_data['reservation_type'] = reservation_analysis['reservation_type']
-                    recommendation_data['commitment_term_years'] = reservation_analysis['commitment_term_years']
-
-                    # NEW FIELDS - Enhanced categorization
-                    recommendation_data['is_savings_plan'] = reservation_analysis['is_savings_plan']
-                    recommendation_data['commitment_category'] = reservation_analysis['commitment_category']
-
-                    # Log successful categorization for monitoring
-                    if reservation_analysis['is_reservation']:
-                        logger.info(
-                            f"Row {idx + 2}: Categorized as '{reservation_analysis['commitment_category']}' - "
-                            f"{recommendation_text[:80]}"
-                        )
-
-                except Exception as e:
-                    logger.error(
-                        f"⚠️ FAILED to analyze reservation for row {idx + 2}: {str(e)}\n"
-                        f"Recommendation: {recommendation_text[:100]}\n"
-                        f"Benefits: {potential_benefits_text[:100]}",
-                        exc_info=True
-                    )
-                    recommendation_data['is_reservation_recommendation'] = False
-                    recommendation_data['reservation_type'] = None
-                    recommendation_data['commitment_term_years'] = None
-                    recommendation_data['is_savings_plan'] = False
-                    recommendation_data['commitment_category'] = 'uncategorized'
+        summary = PhaseSummary(logger, "Recommendation extraction")
 
-                recommendations.append(recommendation_data)
+        self.columns = normalize_batch(csv_batch(self.df), source='csv')
+        recommendations = rows_from_columns(self.columns)
 
-            except Exception as e:
-                logger.error(f"Error processing row {idx}: {str(e)}")
-                self.errors.append(f"Row {idx + 2}: {str(e)}")
-                continue
+        # Count categorization for the phase summary
+        for rec in recommendations:
+            if rec['is_reservation_recommendation']:
+                summary.add(rec['commitment_category'])
 
-        logger.info(f"Extracted {len(recommendations)} recommendations")
+        summary.log(rows=len(self.df), recommendations=len(recommendations))
         return recommendations
 
     def calculate_statistics(self, recommendations: List[Dict]) -> Dict:
@@ -606,13 +508,12 @@ class AzureAdvisorCSVProcessor:
         # Estimate working hours (rough estimate: 1 hour per recommendation)
         estimated_hours = len(recommendations)
 
-        # Get top 10 recommendations by potential savings
-        sorted_recs = sorted(
+        # Top 10 by priority score (computed in normalize_batch), without sorting every row
+        top_recs = heapq.nlargest(
+            10,
             recommendations,
-            key=lambda x: float(x['potential_savings']),
-            reverse=True
+            key=lambda x: (x['priority_score'], x['potential_savings'])
         )
-        top_recs = sorted_recs[:10]
 
         top_recommendations = [
             {
@@ -620,6 +521,7 @@ class AzureAdvisorCSVProcessor:
                 'recommendation': rec['recommendation'][:100] + '...' if len(rec['recommendation']) > 100 else rec['recommendation'],
                 'potential_savings': float(rec['potential_savings']),
                 'business_impact': rec['business_impact'],
+                'priority_score': rec['priority_score'],
             }
             for rec in top_recs
         ]
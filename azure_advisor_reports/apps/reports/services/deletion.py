@@ -0,0 +1,166 @@
+"""
+Chunked, asynchronous deletion of reports.
+
+Deleting a report through the ORM collector loads every recommendation into
+memory, sends their signals and deletes them in one transaction that holds
+locks for as long as it runs. Reports are deleted in steps instead:
+
+1. ``schedule_report_deletion`` marks the reports as 'deleting' with one
+   UPDATE (the API and analytics hide them from then on) and enqueues
+   ``purge_report``.
+2. ``purge_report`` (tasks.py) checks the report is still marked, with a
+   conditional UPDATE, and deletes the recommendations with raw
+   ``DELETE ... LIMIT`` batches of REPORT_DELETE_BATCH_SIZE rows, each in its
+   own short transaction with a pause in between, and re-queues itself after
+   REPORT_DELETE_BATCHES_PER_RUN batches so a worker is never held for long.
+3. Once no recommendation is left, the report row is deleted (the collector
+   only has the few shares and activities left) and ``delete_report_files``
+   removes its CSV/HTML/PDF files from storage.
+
+Every step is idempotent: a purge that dies is picked up again by
+``resume_stalled_deletions`` (run by the daily cleanup) and continues where
+the previous one stopped.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Iterable, List
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.reports.models import Recommendation, Report
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DELETE_BATCH_SIZE = 5000
+DEFAULT_DELETE_BATCHES_PER_RUN = 20
+DEFAULT_DELETE_BATCH_PAUSE = 0.05  # seconds
+DEFAULT_DELETE_STALL_TIMEOUT = 60 * 60  # 1 hour
+
+DELETING = 'deleting'
+
+# A running task saves its final status over the 'deleting' mark, which would
+# bring back a half-purged report, so reports in these states are not deleted
+BUSY_STATUSES = ('processing', 'generating')
+
+
+def get_batch_size() -> int:
+    return max(1, getattr(settings, 'REPORT_DELETE_BATCH_SIZE', DEFAULT_DELETE_BATCH_SIZE))
+
+
+# ============================================================================
+# Steps
+# ============================================================================
+
+def mark_reports_deleting(report_ids: Iterable) -> int:
+    """
+    Mark reports as being deleted, except those still busy (BUSY_STATUSES).
+
+    Returns:
+        int: Number of reports newly marked
+    """
+    return (
+        Report.objects
+        .filter(pk__in=list(report_ids))
+        .exclude(status__in=(DELETING, *BUSY_STATUSES))
+        .update(status=DELETING, updated_at=timezone.now())
+    )
+
+
+def delete_recommendation_batch(report_id, batch_size: int = None) -> int:
+    """
+    Delete up to batch_size recommendations of a report with one raw statement.
+
+    Returns:
+        int: Number of rows deleted; 0 once the report has none left
+    """
+    batch_size = batch_size or get_batch_size()
+    quote = connection.ops.quote_name
+    table = quote(Recommendation._meta.db_table)
+    pk = quote(Recommendation._meta.pk.column)
+    report_column = quote(Recommendation._meta.get_field('report').column)
+    report_value = Report._meta.pk.get_db_prep_value(report_id, connection)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE {pk} IN '
+            f'(SELECT {pk} FROM {table} WHERE {report_column} = %s LIMIT %s)',
+            [report_value, batch_size],
+        )
+        return cursor.rowcount
+
+
+def delete_report_row(report_id) -> List[str]:
+    """
+    Delete a report whose recommendations are gone.
+
+    Returns:
+        list: Storage names of the report files, to delete afterwards
+    """
+    report = Report.objects.filter(pk=report_id).first()
+    if report is None:
+        return []
+
+    file_names = [f.name for f in (report.csv_file, report.html_file, report.pdf_file) if f]
+    report.delete()
+    return file_names
+
+
+# ============================================================================
+# Scheduling
+# ============================================================================
+
+def schedule_report_deletion(report_ids: Iterable) -> int:
+    """
+    Mark reports as deleting and enqueue their purge.
+
+    Args:
+        report_ids: Primary keys of the reports to delete
+
+    Returns:
+        int: Number of reports newly marked; purges of the others (already
+        deleting or still busy) are no-ops
+    """
+    from apps.reports.tasks import purge_report
+
+    report_ids = [str(report_id) for report_id in report_ids]
+    if not report_ids:
+        return 0
+
+    marked = mark_reports_deleting(report_ids)
+    if not marked:
+        return 0
+    for report_id in report_ids:
+        purge_report.delay(report_id)
+
+    logger.info("Scheduled deletion of %d reports", marked)
+    return marked
+
+
+def resume_stalled_deletions(now=None) -> int:
+    """
+    Re-enqueue purges of reports left in 'deleting' (e.g. the worker died).
+
+    A running purge touches updated_at on every run, so only reports idle
+    for REPORT_DELETE_STALL_TIMEOUT seconds are picked up.
+
+    Returns:
+        int: Number of purges re-enqueued
+    """
+    from apps.reports.tasks import purge_report
+
+    now = now or timezone.now()
+    timeout = getattr(settings, 'REPORT_DELETE_STALL_TIMEOUT', DEFAULT_DELETE_STALL_TIMEOUT)
+    stalled = list(
+        Report.objects
+        .filter(status=DELETING, updated_at__lt=now - timedelta(seconds=timeout))
+        .values_list('pk', flat=True)
+    )
+    for report_id in stalled:
+        purge_report.delay(str(report_id))
+
+    if stalled:
+        logger.warning("Resumed %d stalled report deletions", len(stalled))
+    return len(stalled)
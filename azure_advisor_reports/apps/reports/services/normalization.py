@@ -0,0 +1,263 @@
+"""
+Columnar normalization stage shared by CSV and Azure API ingest.
+
+Each source is first adapted to a DataFrame with the canonical columns in
+BATCH_COLUMNS (csv_batch / api_batch). normalize_batch() then maps categories
+and impacts, parses amounts and dates, truncates text to the model limits,
+classifies reservations and computes fingerprints and priority scores for
+the whole batch at once. The result is a dict of insert-ready column arrays,
+turned into Recommendation rows by build_recommendations().
+"""
+
+import logging
+from decimal import Decimal
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from apps.reports.fingerprints import fingerprint_columns
+from apps.reports.models import Recommendation
+from apps.reports.priority import priority_scores
+from .reservation_analyzer import ReservationAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Mappings
+# ============================================================================
+
+# Labels are matched case-insensitively and ignoring spaces/underscores, so
+# 'High Availability', 'HighAvailability' and 'COST' all resolve
+CATEGORY_MAPPING = {
+    'cost': 'cost',
+    'security': 'security',
+    'reliability': 'reliability',
+    'highavailability': 'reliability',
+    'operationalexcellence': 'operational_excellence',
+    'performance': 'performance',
+}
+
+IMPACT_MAPPING = {
+    'high': 'high',
+    'medium': 'medium',
+    'low': 'low',
+}
+
+# Fallbacks for unknown or missing labels, per source
+SOURCE_DEFAULTS = {
+    'csv': {'category': 'operational_excellence', 'business_impact': 'medium'},
+    'azure_api': {'category': 'cost', 'business_impact': 'low'},
+}
+
+DEFAULT_CURRENCY = 'USD'
+
+# Model max_length of each text column
+TEXT_LIMITS = {
+    'recommendation': 5000,
+    'subscription_id': 255,
+    'subscription_name': 255,
+    'resource_group': 255,
+    'resource_name': 255,
+    'resource_type': 255,
+    'potential_benefits': 5000,
+    'retiring_feature': 255,
+}
+
+BATCH_COLUMNS = [
+    'category',
+    'business_impact',
+    *TEXT_LIMITS,
+    'potential_savings',
+    'currency',
+    'retirement_date',
+    'advisor_score_impact',
+    'csv_row_number',
+]
+
+
+# ============================================================================
+# Source adapters
+# ============================================================================
+
+def csv_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adapt a cleaned Azure Advisor CSV export to the canonical batch columns.
+
+    Args:
+        df: DataFrame after AzureAdvisorCSVProcessor.clean_data()
+
+    Returns:
+        pd.DataFrame: Batch with BATCH_COLUMNS, indexed like df
+    """
+    def column(*names):
+        for name in names:
+            if name in df.columns:
+                return df[name]
+        return None
+
+    return pd.DataFrame({
+        'category': column('Category'),
+        'business_impact': column('Business Impact', 'Impact'),
+        'recommendation': column('Recommendation', 'Description'),
+        'subscription_id': column('Subscription ID'),
+        'subscription_name': column('Subscription Name'),
+        'resource_group': column('Resource Group'),
+        'resource_name': column('Resource Name', 'Impacted Resource'),
+        'resource_type': column('Resource Type'),
+        'potential_benefits': column('Potential Benefits'),
+        'retiring_feature': column('Retiring Feature'),
+        'potential_savings': column('Potential Annual Cost Savings'),
+        'currency': column('Currency'),
+        'retirement_date': column('Retirement Date'),
+        'advisor_score_impact': column('Advisor Score Impact'),
+        'csv_row_number': df.index + 2,  # +2 because: 0-indexed + 1 for header row
+    }, index=df.index, columns=BATCH_COLUMNS)
+
+
+def api_batch(recommendations: List[dict]) -> pd.DataFrame:
+    """
+    Adapt a page of AzureAdvisorService recommendations to the batch columns.
+
+    Subscription info is taken from the MultiSubscriptionFetcher tags when
+    present, else from the recommendation's extended properties.
+
+    Args:
+        recommendations: Recommendation dicts from AzureAdvisorService
+
+    Returns:
+        pd.DataFrame: Batch with BATCH_COLUMNS
+    """
+    def extended(rec, key):
+        metadata = rec.get('metadata') or {}
+        return (metadata.get('extended_properties') or {}).get(key, '')
+
+    return pd.DataFrame({
+        'category': [rec.get('category') for rec in recommendations],
+        'business_impact': [rec.get('impact') for rec in recommendations],
+        'recommendation': [
+            rec.get('recommendation') or rec.get('description') or 'No description available'
+            for rec in recommendations
+        ],
+        'subscription_id': [
+            rec.get('subscription_id') or extended(rec, 'subscriptionId') for rec in recommendations
+        ],
+        'subscription_name': [
+            rec.get('subscription_name') or extended(rec, 'subscriptionName') for rec in recommendations
+        ],
+        'resource_group': [rec.get('resource_group') for rec in recommendations],
+        'resource_name': [rec.get('impacted_resource') for rec in recommendations],
+        'resource_type': [rec.get('resource_type') for rec in recommendations],
+        'potential_benefits': [rec.get('description') for rec in recommendations],
+        'potential_savings': [rec.get('potential_savings') for rec in recommendations],
+        'currency': [rec.get('currency') for rec in recommendations],
+    }, columns=BATCH_COLUMNS, dtype=object)
+
+
+# ============================================================================
+# Normalization
+# ============================================================================
+
+def _text(series: pd.Series) -> pd.Series:
+    """Missing values as '', everything else as stripped str."""
+    return series.fillna('').astype(str).str.strip()
+
+
+def _map_labels(series: pd.Series, mapping: Dict[str, str], default: str) -> List[str]:
+    keys = _text(series).str.lower().str.replace(r'[\s_]', '', regex=True)
+    return keys.map(mapping).fillna(default).tolist()
+
+
+def _parse_decimals(series: pd.Series, name: str) -> List[Decimal]:
+    """Parse amounts like '$1,234.50' to Decimal; unparseable values become 0."""
+    cleaned = _text(series).str.replace(r'[$€£,\s]', '', regex=True)
+    numbers = pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float)
+    valid = np.isfinite(numbers)
+
+    invalid = int((~valid & (cleaned != '').to_numpy()).sum())
+    if invalid:
+        logger.warning("%d unparseable %s values replaced with 0", invalid, name)
+
+    return [Decimal(value) if ok else Decimal(0) for value, ok in zip(cleaned, valid)]
+
+
+def _parse_dates(series: pd.Series) -> list:
+    text = _text(series)
+    dates = pd.to_datetime(text.where(text != ''), errors='coerce', format='mixed', utc=True)
+
+    invalid = int((dates.isna() & (text != '')).sum())
+    if invalid:
+        logger.warning("%d unparseable retirement dates ignored", invalid)
+
+    return [None if pd.isna(value) else value.date() for value in dates]
+
+
+def normalize_batch(batch: pd.DataFrame, source: str) -> Dict[str, list]:
+    """
+    Normalize a batch of recommendations from either source.
+
+    Args:
+        batch: DataFrame with BATCH_COLUMNS (see csv_batch / api_batch)
+        source: 'csv' or 'azure_api', selects the fallback category and impact
+
+    Returns:
+        Dict[str, list]: Column arrays keyed by Recommendation field name,
+        all of len(batch)
+    """
+    defaults = SOURCE_DEFAULTS[source]
+    batch = batch.reindex(columns=BATCH_COLUMNS)
+
+    columns = {
+        'category': _map_labels(batch['category'], CATEGORY_MAPPING, defaults['category']),
+        'business_impact': _map_labels(batch['business_impact'], IMPACT_MAPPING, defaults['business_impact']),
+    }
+
+    texts = {name: _text(batch[name]) for name in TEXT_LIMITS}
+    for name, limit in TEXT_LIMITS.items():
+        columns[name] = texts[name].str.slice(0, limit).tolist()
+
+    currency = _text(batch['currency'])
+    columns['currency'] = currency.where(currency != '', DEFAULT_CURRENCY).str.slice(0, 3).tolist()
+    columns['potential_savings'] = _parse_decimals(batch['potential_savings'], 'potential_savings')
+    columns['advisor_score_impact'] = _parse_decimals(batch['advisor_score_impact'], 'advisor_score_impact')
+    columns['retirement_date'] = _parse_dates(batch['retirement_date'])
+    columns['csv_row_number'] = [None if pd.isna(value) else int(value) for value in batch['csv_row_number']]
+
+    # Classified on the full texts, not the truncated ones
+    analyses = ReservationAnalyzer.analyze_batch(
+        texts['recommendation'].tolist(),
+        texts['potential_benefits'].tolist(),
+    )
+    columns['is_reservation_recommendation'] = [a['is_reservation'] for a in analyses]
+    columns['reservation_type'] = [a['reservation_type'] for a in analyses]
+    columns['commitment_term_years'] = [a['commitment_term_years'] for a in analyses]
+    columns['is_savings_plan'] = [a['is_savings_plan'] for a in analyses]
+    columns['commitment_category'] = [a['commitment_category'] for a in analyses]
+
+    columns['fingerprint'] = fingerprint_columns(columns)
+    columns['priority_score'] = priority_scores(
+        columns['business_impact'], columns['potential_savings'], columns['advisor_score_impact']
+    )
+
+    return columns
+
+
+def rows_from_columns(columns: Dict[str, list]) -> List[Dict]:
+    """Transpose column arrays to one dict per recommendation."""
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def build_recommendations(report, columns: Dict[str, list]) -> List[Recommendation]:
+    """
+    Build unsaved Recommendation instances for bulk_create.
+
+    Args:
+        report: Report the recommendations belong to
+        columns: Output of normalize_batch()
+
+    Returns:
+        List[Recommendation]: One instance per row
+    """
+    return [Recommendation(report=report, **row) for row in rows_from_columns(columns)]
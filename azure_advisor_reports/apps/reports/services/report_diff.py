@@ -0,0 +1,112 @@
+"""
+Report-to-report diff on recommendation fingerprints.
+
+Compares two reports of a client as set operations in the database, each
+an (anti-)semi-join on the (report, fingerprint) index:
+
+- new: fingerprints of the current report absent from the base report,
+- resolved: fingerprints of the base report absent from the current one,
+- unchanged: fingerprints present in both.
+
+The counts and savings of all three sets take two aggregate queries, one
+per report, whatever the report sizes; the listed rows are limited.
+Recommendations without a fingerprint never match, so they count as new or
+resolved.
+"""
+
+import logging
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+
+from apps.reports.models import Recommendation, Report
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROW_LIMIT = 100
+
+
+def _in_report(report, using: Optional[str]):
+    return Recommendation.objects.using(using).filter(report=report, fingerprint=OuterRef('fingerprint'))
+
+
+def _totals(recommendations, matched: Exists) -> Dict[str, Any]:
+    zero = Decimal('0')
+    totals = recommendations.annotate(matched=matched).aggregate(
+        total=Count('id'),
+        matched_count=Count('id', filter=Q(matched=True)),
+        savings=Sum('potential_savings'),
+        matched_savings=Sum('potential_savings', filter=Q(matched=True)),
+    )
+    savings = totals['savings'] or zero
+    matched_savings = totals['matched_savings'] or zero
+    return {
+        'count': totals['total'],
+        'matched_count': totals['matched_count'],
+        'unmatched_count': totals['total'] - totals['matched_count'],
+        'savings': savings,
+        'matched_savings': matched_savings,
+        'unmatched_savings': savings - matched_savings,
+    }
+
+
+def previous_report(report: Report, using: Optional[str] = None) -> Optional[Report]:
+    """The latest completed report of the same client created before ``report``."""
+    return (
+        Report.objects.using(using)
+        .filter(client_id=report.client_id, status='completed', created_at__lt=report.created_at)
+        .exclude(pk=report.pk)
+        .order_by('-created_at')
+        .first()
+    )
+
+
+def diff_reports(base: Report, current: Report, limit: int = DEFAULT_ROW_LIMIT,
+                 using: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compare the recommendations of two reports.
+
+    Args:
+        base: Earlier report
+        current: Later report
+        limit: Rows listed per set, by potential savings
+        using: Database alias to read from
+
+    Returns:
+        dict: 'summary' with counts, savings and deltas, and the 'new',
+        'resolved' and 'unchanged' Recommendation lists
+    """
+    base_rows = Recommendation.objects.using(using).filter(report=base)
+    current_rows = Recommendation.objects.using(using).filter(report=current)
+    in_base = Exists(_in_report(base, using))
+    in_current = Exists(_in_report(current, using))
+
+    current_totals = _totals(current_rows, in_base)
+    base_totals = _totals(base_rows, in_current)
+
+    summary = {
+        'new_count': current_totals['unmatched_count'],
+        'resolved_count': base_totals['unmatched_count'],
+        'unchanged_count': current_totals['matched_count'],
+        'new_savings': current_totals['unmatched_savings'],
+        'resolved_savings': base_totals['unmatched_savings'],
+        # Savings of the same findings may move between runs
+        'unchanged_savings_delta': current_totals['matched_savings'] - base_totals['matched_savings'],
+        'base_total_savings': base_totals['savings'],
+        'current_total_savings': current_totals['savings'],
+        'savings_delta': current_totals['savings'] - base_totals['savings'],
+    }
+
+    logger.debug(
+        "Diff of report %s against %s: %d new, %d resolved, %d unchanged",
+        current.pk, base.pk, summary['new_count'], summary['resolved_count'], summary['unchanged_count'],
+    )
+
+    order = ('-potential_savings', 'id')
+    return {
+        'summary': summary,
+        'new': list(current_rows.filter(~in_base).order_by(*order)[:limit]),
+        'resolved': list(base_rows.filter(~in_current).order_by(*order)[:limit]),
+        'unchanged': list(current_rows.filter(in_base).order_by(*order)[:limit]),
+    }
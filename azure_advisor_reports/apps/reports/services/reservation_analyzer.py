@@ -15,7 +15,7 @@ This service analyzes recommendation text to:
 
 import re
 import logging
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -126,13 +126,13 @@ class ReservationAnalyzer:
         # Check for reservation keywords
         for keyword in ReservationAnalyzer.RESERVATION_KEYWORDS:
             if keyword in full_text:
-                logger.info(f"✓ DETECTED RESERVATION: keyword '{keyword}' in: {recommendation_text[:100]}")
+                logger.debug("Detected reservation: keyword '%s' in: %s", keyword, recommendation_text[:100])
                 return True
 
         # Log when we DON'T detect a reservation (for debugging)
         # Only log if the text contains cost-related terms to reduce noise
         if any(term in full_text for term in ['cost', 'saving', 'price', 'purchase', 'buy']):
-            logger.debug(f"✗ NOT DETECTED as reservation (cost-related): {recommendation_text[:100]}")
+            logger.debug("Not detected as reservation (cost-related): %s", recommendation_text[:100])
 
         return False
 
@@ -158,7 +158,7 @@ class ReservationAnalyzer:
         for reservation_type, patterns in ReservationAnalyzer.TYPE_PATTERNS.items():
             for pattern in patterns:
                 if re.search(pattern, full_text, re.IGNORECASE):
-                    logger.debug(f"Matched reservation type: {reservation_type} with pattern: {pattern}")
+                    logger.debug("Matched reservation type: %s with pattern: %s", reservation_type, pattern)
                     return reservation_type
 
         # If we know it's a reservation but can't classify it specifically
@@ -242,7 +242,7 @@ class ReservationAnalyzer:
         # Check for Savings Plan specific keywords
         for keyword in cls.SAVINGS_PLAN_KEYWORDS:
             if keyword in full_text:
-                logger.debug(f"Identified as Savings Plan: keyword '{keyword}'")
+                logger.debug("Identified as Savings Plan: keyword '%s'", keyword)
                 return True
 
         return False
@@ -274,7 +274,7 @@ class ReservationAnalyzer:
         # Check for traditional reservation keywords
         for keyword in cls.TRADITIONAL_RESERVATION_KEYWORDS:
             if keyword in full_text:
-                logger.debug(f"Identified as traditional reservation: keyword '{keyword}'")
+                logger.debug("Identified as traditional reservation: keyword '%s'", keyword)
                 return True
 
         return False
@@ -302,7 +302,7 @@ class ReservationAnalyzer:
         # Check for combined commitment patterns
         for pattern in cls.COMBINED_COMMITMENT_PATTERNS:
             if re.search(pattern, full_text, re.IGNORECASE):
-                logger.debug(f"Identified as combined commitment: pattern '{pattern}'")
+                logger.debug("Identified as combined commitment: pattern '%s'", pattern)
                 return True
 
         # Alternative detection: has both SP and Reservation keywords
@@ -421,17 +421,61 @@ class ReservationAnalyzer:
                 result['commitment_term_years']
             )
 
-        logger.info(
-            f"Enhanced reservation analysis: "
-            f"is_reservation={result['is_reservation']}, "
-            f"type={result['reservation_type']}, "
-            f"term={result['commitment_term_years']} years, "
-            f"is_savings_plan={result['is_savings_plan']}, "
-            f"category={result['commitment_category']}"
+        logger.debug(
+            "Enhanced reservation analysis: is_reservation=%s, type=%s, term=%s years, "
+            "is_savings_plan=%s, category=%s",
+            result['is_reservation'], result['reservation_type'], result['commitment_term_years'],
+            result['is_savings_plan'], result['commitment_category'],
         )
 
         return result
 
+    @classmethod
+    def analyze_batch(
+        cls,
+        recommendation_texts: List[str],
+        potential_benefits: List[str]
+    ) -> List[Dict[str, any]]:
+        """
+        Analyze a batch of recommendations, classifying each distinct text once.
+
+        Advisor exports repeat the same recommendation text for every impacted
+        resource, so the keyword scans run per distinct (text, benefits) pair
+        and the result is shared by all rows that carry it.
+
+        Args:
+            recommendation_texts: Recommendation descriptions, one per row
+            potential_benefits: Benefits texts aligned with recommendation_texts
+
+        Returns:
+            list: One analysis dict per row (see analyze_recommendation); rows
+            whose analysis failed get the uncategorized result
+        """
+        analyses = {}
+        results = []
+
+        for pair in zip(recommendation_texts, potential_benefits):
+            if pair not in analyses:
+                try:
+                    analyses[pair] = cls.analyze_recommendation(*pair)
+                except Exception as e:
+                    logger.error(
+                        "FAILED to analyze reservation: %s\nRecommendation: %s\nBenefits: %s",
+                        e, pair[0][:100], pair[1][:100],
+                        exc_info=True
+                    )
+                    analyses[pair] = {
+                        'is_reservation': False,
+                        'reservation_type': None,
+                        'commitment_term_years': None,
+                        'is_savings_plan': False,
+                        'commitment_category': 'uncategorized',
+                    }
+            results.append(analyses[pair])
+
+        logger.debug("Batch reservation analysis: %d rows, %d distinct", len(results), len(analyses))
+        return results
+
     @staticmethod
     def calculate_total_commitment_savings(
         annual_savings: float,
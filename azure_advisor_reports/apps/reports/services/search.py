@@ -0,0 +1,101 @@
+"""
+Full-text search across recommendations.
+
+Recommendation.search_vector holds a weighted tsvector of the
+recommendation text (A), its potential benefits (B) and the resource type
+and name (C). It is filled set-based, with one UPDATE per ingest batch
+(``update_search_vectors``, called by the bulk loader), not by a per-row
+trigger, so COPY loads stay as fast as before. Migration 0014 adds the GIN
+index idx_rec_search and backfills existing rows.
+
+Resource types and names ('Microsoft.Compute/virtualMachines',
+'vm-prod-01') are split on '/', '.', '_' and '-' first, so their parts are
+searchable words.
+
+Other databases (the SQLite test database) have no tsvector: the vector
+stays NULL and ``search_recommendations`` falls back to matching every
+search term as a substring.
+"""
+
+import logging
+from functools import reduce
+from operator import and_, or_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, connections
+from django.db.models import F, FloatField, Func, Q, QuerySet, Value
+
+from apps.reports.models import Recommendation
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONFIG = 'english'
+SEARCH_FIELDS = ('recommendation', 'potential_benefits', 'resource_type', 'resource_name')
+
+_SEPARATORS = r'[/._-]+'
+
+
+def _words(field_name: str) -> Func:
+    return Func(F(field_name), Value(_SEPARATORS), Value(' '), Value('g'), function='regexp_replace')
+
+
+def search_vector_expression() -> SearchVector:
+    """Expression computing Recommendation.search_vector from the row."""
+    return (
+        SearchVector('recommendation', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('potential_benefits', weight='B', config=SEARCH_CONFIG)
+        + SearchVector(_words('resource_type'), _words('resource_name'), weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(report_id) -> int:
+    """
+    Compute the search vector of the recommendations of a report that have none.
+
+    Args:
+        report_id: Report whose recommendations were just loaded
+
+    Returns:
+        int: Number of rows updated (always 0 outside PostgreSQL)
+    """
+    if connection.vendor != 'postgresql':
+        return 0
+
+    updated = Recommendation.objects.filter(
+        report_id=report_id,
+        search_vector__isnull=True,
+    ).update(search_vector=search_vector_expression())
+    logger.debug("Indexed %d recommendations of report %s for search", updated, report_id)
+    return updated
+
+
+def search_recommendations(queryset: QuerySet, text: str) -> QuerySet:
+    """
+    Filter recommendations by a search text and order them by relevance.
+
+    On PostgreSQL ``text`` uses web search syntax ("quoted phrases", or,
+    -excluded) against the GIN-indexed vector. Elsewhere every word must
+    appear in one of SEARCH_FIELDS.
+
+    Args:
+        queryset: Recommendations to search
+        text: Search text
+
+    Returns:
+        QuerySet: Matches annotated with ``rank``, best first, then by potential savings
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query),
+        ).order_by('-rank', '-potential_savings')
+
+    terms = text.split()
+    if terms:
+        queryset = queryset.filter(reduce(and_, (
+            reduce(or_, (Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS))
+            for term in terms
+        )))
+    return queryset.annotate(
+        rank=Value(0.0, output_field=FloatField()),
+    ).order_by('-potential_savings')
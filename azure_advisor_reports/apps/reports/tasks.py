@@ -5,14 +5,35 @@ Celery tasks for asynchronous report processing.
 import logging
 import tempfile
 import os
+import time
 from celery import shared_task
 from celery.exceptions import Ignore, SoftTimeLimitExceeded
+from django.conf import settings
 from django.utils import timezone
-from django.db import transaction
+from django.db import DatabaseError, transaction
 from django.core.files.storage import default_storage
 
-from apps.reports.models import Report, Recommendation
+from apps.core.db_routing import pin_primary_reads
+from apps.reports.leases import (
+    acquire_generation_lease,
+    collapse_formats,
+    dispatch_report_generation,
+    get_generation_task_ids,
+    release_generation_lease,
+)
+from apps.reports.models import Report
 from apps.reports.services.csv_processor import AzureAdvisorCSVProcessor, CSVProcessingError
+from apps.reports.services.bulk_loader import load_recommendations
+from apps.reports.services.deletion import (
+    DEFAULT_DELETE_BATCH_PAUSE,
+    DEFAULT_DELETE_BATCHES_PER_RUN,
+    DELETING,
+    delete_recommendation_batch,
+    delete_report_row,
+    get_batch_size,
+    resume_stalled_deletions,
+    schedule_report_deletion,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -83,57 +104,32 @@ def process_csv_file(self, report_id):
 
         # Save recommendations to database
         with transaction.atomic():
-            # Create recommendation instances
-            recommendation_instances = []
-            for rec_data in recommendations_data:
-                recommendation = Recommendation(
-                    report=report,
-                    category=rec_data['category'],
-                    business_impact=rec_data['business_impact'],
-                    recommendation=rec_data['recommendation'][:5000] if rec_data['recommendation'] else '',
-                    subscription_id=str(rec_data.get('subscription_id', ''))[:255],
-                    subscription_name=str(rec_data.get('subscription_name', ''))[:255],
-                    resource_group=str(rec_data.get('resource_group', ''))[:255],
-                    resource_name=str(rec_data.get('resource_name', ''))[:255],
-                    resource_type=str(rec_data.get('resource_type', ''))[:255],
-                    potential_savings=rec_data.get('potential_savings', 0),
-                    currency=str(rec_data.get('currency', 'USD'))[:3],
-                    potential_benefits=str(rec_data.get('potential_benefits', ''))[:5000],
-                    retirement_date=rec_data.get('retirement_date'),
-                    retiring_feature=str(rec_data.get('retiring_feature', ''))[:255],
-                    advisor_score_impact=rec_data.get('advisor_score_impact', 0),
-                    csv_row_number=rec_data.get('csv_row_number'),
-                    # Reservation fields (v2.0 - Enhanced Multi-Dimensional Analysis)
-                    is_reservation_recommendation=rec_data.get('is_reservation_recommendation', False),
-                    reservation_type=rec_data.get('reservation_type'),
-                    commitment_term_years=rec_data.get('commitment_term_years'),
-                    # NEW FIELDS - Savings Plan categorization
-                    is_savings_plan=rec_data.get('is_savings_plan', False),
-                    commitment_category=rec_data.get('commitment_category', 'uncategorized'),
-                )
-                recommendation_instances.append(recommendation)
-
-            # Bulk create recommendations
-            if recommendation_instances:
-                Recommendation.objects.bulk_create(recommendation_instances, batch_size=1000)
-                logger.info(f"Created {len(recommendation_instances)} recommendations for report {report_id}")
-
-            # Update report with statistics and mark as completed
+            # Insert the normalized column arrays (COPY on PostgreSQL)
+            created = load_recommendations(report, processor.columns)
+            if created:
+                logger.info(f"Created {created} recommendations for report {report_id}")
+
+            # Update report with statistics and summary and mark as completed
+            report.refresh_summary(save=False)
             report.analysis_data = statistics
             report.status = 'completed'
             report.processing_completed_at = timezone.now()
             report.error_message = ''
             report.save(update_fields=[
-                'analysis_data', 'status', 'processing_completed_at', 'error_message'
+                'analysis_data', 'status', 'processing_completed_at', 'error_message',
+                *Report.SUMMARY_FIELDS,
             ])
 
+        # Until the replica has the new rows, the user reads from the primary
+        pin_primary_reads(report.created_by_id)
+
         logger.info(f"CSV processing completed successfully for report {report_id}")
 
         # Automatically trigger HTML report generation only (PDF on-demand for better performance)
         try:
             logger.info(f"Triggering automatic HTML report generation for {report_id}")
-            generate_report.delay(str(report_id), format_type='html')
-            logger.info(f"HTML report generation task dispatched for {report_id}")
+            dispatch = dispatch_report_generation(report_id, format_type='html')
+            logger.info(f"HTML report generation task {dispatch['task_id']} dispatched for {report_id}")
         except Exception as e:
             logger.error(f"Failed to trigger HTML report generation for {report_id}: {str(e)}", exc_info=True)
             # Don't fail the CSV processing task if report generation fails to dispatch
@@ -213,24 +209,114 @@ def cleanup_old_csv_files():
     """
     Periodic task to cleanup old CSV files and failed reports.
 
-    This task should be scheduled to run daily via Celery Beat.
+    This task should be scheduled to run daily via Celery Beat. Reports are
+    only marked here; purge_report deletes them in bounded batches.
     """
     from datetime import timedelta
     from django.utils import timezone
 
     # Delete failed reports older than 7 days
     cutoff_date = timezone.now() - timedelta(days=7)
-    old_failed_reports = Report.objects.filter(
-        status='failed',
-        created_at__lt=cutoff_date
+    old_failed_report_ids = list(
+        Report.objects.filter(
+            status='failed',
+            created_at__lt=cutoff_date
+        ).values_list('id', flat=True)
     )
 
-    count = old_failed_reports.count()
+    count = schedule_report_deletion(old_failed_report_ids)
     if count > 0:
-        old_failed_reports.delete()
-        logger.info(f"Cleaned up {count} old failed reports")
+        logger.info(f"Scheduled cleanup of {count} old failed reports")
+
+    # Deletions whose purge task died
+    resumed = resume_stalled_deletions()
 
-    return {'deleted_reports': count}
+    return {'deleted_reports': count, 'resumed_deletions': resumed}
+
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=60, acks_late=True)
+def purge_report(self, report_id):
+    """
+    Delete a report and its recommendations in bounded batches.
+
+    Runs up to REPORT_DELETE_BATCHES_PER_RUN raw delete batches, then
+    re-queues itself until no recommendation is left; then deletes the
+    report row and hands its files to delete_report_files. Safe to run again
+    at any point (see apps.reports.services.deletion).
+
+    Args:
+        report_id: UUID of the Report instance
+
+    Returns:
+        dict: 'deleted', 'in_progress' (re-queued), 'missing' or 'skipped'
+        (the report is not marked as deleting)
+    """
+    report_id = str(report_id)
+
+    # Conditional, so only reports scheduled for deletion are purged; the new
+    # updated_at tells resume_stalled_deletions this purge is alive
+    if not Report.objects.filter(id=report_id, status=DELETING).update(updated_at=timezone.now()):
+        if not Report.objects.filter(id=report_id).exists():
+            return {'status': 'missing', 'report_id': report_id}
+        logger.warning(f"Report {report_id} is not marked as deleting, purge skipped")
+        return {'status': 'skipped', 'report_id': report_id}
+
+    batch_size = get_batch_size()
+    max_batches = getattr(settings, 'REPORT_DELETE_BATCHES_PER_RUN', DEFAULT_DELETE_BATCHES_PER_RUN)
+    pause = getattr(settings, 'REPORT_DELETE_BATCH_PAUSE', DEFAULT_DELETE_BATCH_PAUSE)
+
+    deleted = 0
+    try:
+        for _ in range(max_batches):
+            count = delete_recommendation_batch(report_id, batch_size)
+            deleted += count
+            if count < batch_size:
+                break
+            time.sleep(pause)
+        else:
+            # More rows left: continue in a new task so the worker is released
+            purge_report.apply_async(args=(report_id,), countdown=1)
+            logger.info(f"Deleted {deleted} recommendations of report {report_id}, continuing")
+            return {'status': 'in_progress', 'report_id': report_id, 'deleted_recommendations': deleted}
+
+        file_names = delete_report_row(report_id)
+    except DatabaseError as e:
+        logger.warning(f"Deleting report {report_id} failed, retrying: {e}")
+        raise self.retry(exc=e)
+
+    if file_names:
+        delete_report_files.delay(file_names)
+
+    logger.info(f"Deleted report {report_id} ({deleted} recommendations in the last run)")
+    return {'status': 'deleted', 'report_id': report_id, 'deleted_recommendations': deleted}
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=300)
+def delete_report_files(self, file_names):
+    """
+    Remove the files of a deleted report from storage.
+
+    Missing files count as deleted, so the task can be retried safely;
+    files that failed are retried on their own.
+
+    Args:
+        file_names: Storage names of the files
+
+    Returns:
+        dict: Number of files deleted
+    """
+    failed = []
+    for name in file_names:
+        try:
+            default_storage.delete(name)
+        except Exception as e:
+            logger.warning(f"Failed to delete report file {name}: {e}")
+            failed.append(name)
+
+    if failed:
+        raise self.retry(args=(failed,))
+
+    return {'deleted_files': len(file_names)}
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60, soft_time_limit=900, time_limit=960)
@@ -238,6 +324,10 @@ def generate_report(self, report_id, report_type=None, format_type='both'):
     """
     Generate HTML and/or PDF report files asynchronously.
 
+    Each format is guarded by a generation lease (see apps.reports.leases):
+    formats already being generated by another task are skipped, and the
+    task returns 'duplicate' if nothing is left to do.
+
     Args:
         report_id: UUID of the Report instance
         report_type: Type of report to generate (optional, uses report.report_type if not provided)
@@ -248,24 +338,39 @@ def generate_report(self, report_id, report_type=None, format_type='both'):
     """
     logger.info(f"Starting report generation task for report {report_id}")
 
+    task_id = self.request.id
+    leased_format = None
+    release_lease = True
+
     try:
         # Get report instance
         report = Report.objects.get(id=report_id)
 
-        # Validate report state
-        if report.status != 'completed':
-            error_msg = f'Report must be completed before generation. Current status: {report.status}'
+        # Validate format type
+        if format_type not in ['html', 'pdf', 'both']:
+            error_msg = f'Invalid format type: {format_type}'
             logger.error(error_msg)
             return {'status': 'error', 'error': error_msg}
 
-        if report.recommendations.count() == 0:
-            error_msg = 'Report has no recommendations to include'
+        # Take the generation leases; skip formats another task is rendering
+        acquired, in_flight = acquire_generation_lease(report_id, format_type, task_id)
+        if not acquired:
+            logger.info(f"Report generation for {report_id} ({format_type}) already in flight: {in_flight}")
+            return {
+                'status': 'duplicate',
+                'report_id': str(report_id),
+                'task_id': next(iter(in_flight.values())),
+            }
+        leased_format = format_type = collapse_formats(acquired)
+
+        # Validate report state ('generating' is left by a concurrent or interrupted run we now hold the lease for)
+        if report.status not in ('completed', 'generating'):
+            error_msg = f'Report must be completed before generation. Current status: {report.status}'
             logger.error(error_msg)
             return {'status': 'error', 'error': error_msg}
 
-        # Validate format type
-        if format_type not in ['html', 'pdf', 'both']:
-            error_msg = f'Invalid format type: {format_type}'
+        if report.recommendation_count == 0:
+            error_msg = 'Report has no recommendations to include'
             logger.error(error_msg)
             return {'status': 'error', 'error': error_msg}
 
@@ -281,6 +386,7 @@ def generate_report(self, report_id, report_type=None, format_type='both'):
 
         files_generated = []
         file_paths = {}
+        update_fields = ['status', 'updated_at']
 
         # Generate HTML
         if format_type in ['html', 'both']:
@@ -289,6 +395,7 @@ def generate_report(self, report_id, report_type=None, format_type='both'):
             report.html_file = html_path
             files_generated.append('HTML')
             file_paths['html'] = str(html_path) if html_path else None
+            update_fields.append('html_file')
             logger.info(f"HTML report generated successfully: {html_path}")
 
         # Generate PDF
@@ -298,11 +405,14 @@ def generate_report(self, report_id, report_type=None, format_type='both'):
             report.pdf_file = pdf_path
             files_generated.append('PDF')
             file_paths['pdf'] = str(pdf_path) if pdf_path else None
+            update_fields.append('pdf_file')
             logger.info(f"PDF report generated successfully: {pdf_path}")
 
-        # Update report status back to completed
-        report.status = 'completed'
-        report.save(update_fields=['html_file', 'pdf_file', 'status', 'updated_at'])
+        # Update report status back to completed unless another format is still rendering
+        release_generation_lease(report_id, leased_format, task_id)
+        leased_format = None
+        report.status = 'generating' if get_generation_task_ids(report_id) else 'completed'
+        report.save(update_fields=update_fields)
 
         logger.info(f"Report generation completed for {report_id}: {', '.join(files_generated)}")
 
@@ -331,12 +441,17 @@ def generate_report(self, report_id, report_type=None, format_type='both'):
         except:
             pass
 
-        # Retry on errors
+        # Retry on errors, keeping the leases so duplicates keep attaching to this task
         if self.request.retries < 3:
+            release_lease = False
             raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
 
         return {'status': 'error', 'error': error_msg, 'report_id': str(report_id)}
 
+    finally:
+        if leased_format and release_lease:
+            release_generation_lease(report_id, leased_format, task_id)
+
 
 @shared_task
 def retry_failed_report(report_id):
@@ -0,0 +1,99 @@
+"""
+Test suite for the Recommendation bulk loader.
+
+Tests cover the COPY text format (field order, escaping, NULLs, defaults)
+and the bulk_create fallback used on databases without COPY.
+"""
+
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from django.test import override_settings
+
+from apps.reports.models import Recommendation
+from apps.reports.services import bulk_loader
+from apps.reports.services.bulk_loader import copy_lines, load_recommendations, use_copy
+from apps.reports.services.normalization import csv_batch, normalize_batch
+
+
+@pytest.fixture
+def columns():
+    frame = pd.DataFrame({
+        'Category': ['Cost', 'Security'],
+        'Business Impact': ['High', 'Low'],
+        'Recommendation': ['Line one\nline two\twith tab', 'Back\\slash'],
+        'Potential Annual Cost Savings': ['$1,234.50', ''],
+        'Retirement Date': ['2025-03-31', ''],
+    })
+    return normalize_batch(csv_batch(frame), source='csv')
+
+
+def _rows(report, columns):
+    """COPY lines split into {column: value} dicts."""
+    names = [field.column for field in Recommendation._meta.concrete_fields]
+    return [dict(zip(names, line[:-1].split('\t'))) for line in copy_lines(report, columns)]
+
+
+@pytest.mark.django_db
+class TestCopyLines:
+    """Test the COPY text format."""
+
+    def test_one_line_per_row_in_field_order(self, test_report, columns):
+        """Test every concrete field is written, in model order."""
+        lines = list(copy_lines(test_report, columns))
+
+        assert len(lines) == 2
+        assert all(line.endswith('\n') for line in lines)
+        assert all(line.count('\t') == len(Recommendation._meta.concrete_fields) - 1 for line in lines)
+
+    def test_values(self, test_report, columns):
+        """Test escaping, NULLs, booleans, dates and decimals."""
+        first, second = _rows(test_report, columns)
+
+        assert first['recommendation'] == 'Line one\\nline two\\twith tab'
+        assert second['recommendation'] == 'Back\\\\slash'
+        assert first['category'] == 'cost'
+        assert first['potential_savings'] == '1234.50'
+        assert first['retirement_date'] == '2025-03-31'
+        assert second['retirement_date'] == r'\N'
+        assert first['is_reservation_recommendation'] == 'f'
+
+    def test_defaults(self, test_report, columns):
+        """Test fields missing from the columns get the report and model defaults."""
+        first, second = _rows(test_report, columns)
+
+        assert first['report_id'] == second['report_id'] == str(test_report.pk)
+        assert first['id'] != second['id']
+        uuid.UUID(first['id'])
+        assert first['created_at'] == second['created_at']
+
+    def test_empty_columns(self, test_report):
+        """Test an empty batch yields no lines."""
+        assert list(copy_lines(test_report, {})) == []
+
+
+@pytest.mark.django_db
+class TestLoadRecommendations:
+    """Test the loader entry point."""
+
+    def test_sqlite_falls_back_to_bulk_create(self, test_report, columns):
+        """Test rows are inserted through bulk_create without COPY."""
+        assert not use_copy()
+
+        with patch.object(bulk_loader, '_copy') as mock_copy:
+            loaded = load_recommendations(test_report, columns)
+
+        mock_copy.assert_not_called()
+        assert loaded == 2
+        recommendations = test_report.recommendations.order_by('csv_row_number')
+        assert recommendations[0].potential_savings == Decimal('1234.50')
+        assert recommendations[1].recommendation == 'Back\\slash'
+
+    @override_settings(RECOMMENDATION_COPY_ENABLED=False)
+    def test_copy_can_be_disabled(self):
+        """Test the setting turns COPY off on PostgreSQL."""
+        with patch.object(bulk_loader.connection, 'vendor', 'postgresql'):
+            assert not use_copy()
@@ -132,7 +132,7 @@ class TestReportCaching:
         report.id = report_id
         report.analysis_data = {'total': 100, 'categories': {}}
         report.recommendations = Mock()
-        report.recommendations.count = Mock(return_value=50)
+        report.recommendation_count = 50
         report.total_potential_savings = 1000.50
         report.status = 'completed'
         report.report_type = 'detailed'
@@ -386,7 +386,7 @@ class TestCacheTTL:
         report.id = uuid.uuid4()
         report.analysis_data = {}
         report.recommendations = Mock()
-        report.recommendations.count = Mock(return_value=0)
+        report.recommendation_count = 0
         report.total_potential_savings = 0
         report.status = 'completed'
         report.report_type = 'detailed'
@@ -453,7 +453,7 @@ class TestCacheInvalidation:
         report.id = report_id
         report.analysis_data = {}
         report.recommendations = Mock()
-        report.recommendations.count = Mock(return_value=0)
+        report.recommendation_count = 0
         report.total_potential_savings = 0
         report.status = 'completed'
         report.report_type = 'detailed'
@@ -0,0 +1,204 @@
+"""
+Test suite for chunked asynchronous report deletion.
+
+Tests cover the raw batch deletes, the self re-queuing purge task, file
+removal, the API destroy endpoint and the retention cleanup.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from apps.analytics.services import AnalyticsService
+from apps.reports import tasks
+from apps.reports.models import Recommendation, Report
+from apps.reports.services.deletion import (
+    delete_recommendation_batch,
+    mark_reports_deleting,
+    resume_stalled_deletions,
+)
+
+
+@pytest.fixture
+def report_with_rows(test_report):
+    Recommendation.objects.bulk_create([
+        Recommendation(
+            report=test_report,
+            category='cost',
+            business_impact='low',
+            recommendation=f'Recommendation {i}',
+        )
+        for i in range(25)
+    ])
+    test_report.refresh_summary()
+    return test_report
+
+
+@pytest.mark.django_db
+class TestDeleteRecommendationBatch:
+    """Test raw batch deletes."""
+
+    def test_deletes_at_most_one_batch(self, report_with_rows, test_client, test_user):
+        """Test a batch is bounded and only touches the given report."""
+        other = Report.objects.create(client=test_client, created_by=test_user, report_type='cost')
+        Recommendation.objects.create(report=other, category='cost', business_impact='low', recommendation='x')
+
+        assert delete_recommendation_batch(report_with_rows.id, 10) == 10
+        assert delete_recommendation_batch(report_with_rows.id, 10) == 10
+        assert delete_recommendation_batch(report_with_rows.id, 10) == 5
+        assert delete_recommendation_batch(report_with_rows.id, 10) == 0
+        assert other.recommendations.count() == 1
+
+    def test_mark_reports_deleting(self, test_report):
+        """Test marking is a single idempotent update."""
+        assert mark_reports_deleting([test_report.id]) == 1
+        assert mark_reports_deleting([test_report.id]) == 0
+
+        test_report.refresh_from_db()
+        assert test_report.status == 'deleting'
+
+
+@pytest.mark.celery
+@pytest.mark.django_db
+class TestPurgeReport:
+    """Test the purge task."""
+
+    @pytest.fixture(autouse=True)
+    def small_batches(self, settings):
+        settings.REPORT_DELETE_BATCH_SIZE = 10
+        settings.REPORT_DELETE_BATCHES_PER_RUN = 2
+        settings.REPORT_DELETE_BATCH_PAUSE = 0
+
+    def test_purge_requeues_until_done(self, report_with_rows):
+        """Test runs are bounded and the task continues in new runs."""
+        report_id = str(report_with_rows.id)
+        mark_reports_deleting([report_id])
+
+        with patch.object(tasks.purge_report, 'apply_async') as mock_requeue:
+            result = tasks.purge_report.apply(args=(report_id,)).get()
+
+        assert result == {'status': 'in_progress', 'report_id': report_id, 'deleted_recommendations': 20}
+        mock_requeue.assert_called_once_with(args=(report_id,), countdown=1)
+        assert Report.objects.get(id=report_id).status == 'deleting'
+
+        result = tasks.purge_report.apply(args=(report_id,)).get()
+
+        assert result['status'] == 'deleted'
+        assert not Report.objects.filter(id=report_id).exists()
+        assert not Recommendation.objects.filter(report_id=report_id).exists()
+
+    def test_purge_is_idempotent(self, test_report):
+        """Test a purge of an already deleted report is a no-op."""
+        report_id = str(test_report.id)
+        mark_reports_deleting([report_id])
+
+        assert tasks.purge_report.apply(args=(report_id,)).get()['status'] == 'deleted'
+        assert tasks.purge_report.apply(args=(report_id,)).get()['status'] == 'missing'
+
+    def test_unmarked_report_is_kept(self, report_with_rows):
+        """Test a purge leaves a report that is not marked as deleting alone."""
+        report_id = str(report_with_rows.id)
+
+        assert tasks.purge_report.apply(args=(report_id,)).get()['status'] == 'skipped'
+        assert Report.objects.get(id=report_id).status == report_with_rows.status
+        assert Recommendation.objects.filter(report_id=report_id).count() == 25
+
+    def test_files_are_removed(self, test_report):
+        """Test the report files are handed to delete_report_files."""
+        test_report.html_file.save('purge-test.html', ContentFile(b'<html></html>'), save=True)
+        name = test_report.html_file.name
+        mark_reports_deleting([test_report.id])
+
+        with patch.object(tasks.delete_report_files, 'delay') as mock_delete_files:
+            tasks.purge_report.apply(args=(str(test_report.id),)).get()
+
+        mock_delete_files.assert_called_once_with([name])
+        tasks.delete_report_files.apply(args=([name],)).get()
+        assert not test_report.html_file.storage.exists(name)
+
+    def test_file_failures_are_retried(self):
+        """Test only the files that failed are retried."""
+        with patch.object(tasks.default_storage, 'delete', side_effect=[None, OSError('busy')]), \
+                patch.object(tasks.delete_report_files, 'retry', side_effect=RuntimeError) as mock_retry:
+            with pytest.raises(RuntimeError):
+                tasks.delete_report_files.apply(args=(['a.html', 'b.pdf'],), throw=True)
+
+        mock_retry.assert_called_once_with(args=(['b.pdf'],))
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestReportDestroy:
+    """Test the DELETE endpoint returns before the rows are deleted."""
+
+    def test_destroy_hides_report_immediately(self, authenticated_api_client, report_with_rows):
+        """Test the report is marked, hidden and its purge enqueued."""
+        report_id = report_with_rows.id
+
+        with patch.object(tasks.purge_report, 'delay') as mock_purge:
+            response = authenticated_api_client.delete(f'/api/v1/reports/{report_id}/')
+
+        assert response.status_code == 204
+        mock_purge.assert_called_once_with(str(report_id))
+        assert Report.objects.get(id=report_id).status == 'deleting'
+        assert Recommendation.objects.filter(report_id=report_id).count() == 25
+        assert authenticated_api_client.get(f'/api/v1/reports/{report_id}/').status_code == 404
+
+    @pytest.mark.parametrize('busy_status', ['processing', 'generating'])
+    def test_destroy_refuses_busy_report(self, authenticated_api_client, report_with_rows, busy_status):
+        """Test a report still being processed is not marked, so its task cannot bring it back."""
+        Report.objects.filter(id=report_with_rows.id).update(status=busy_status)
+
+        with patch.object(tasks.purge_report, 'delay') as mock_purge:
+            response = authenticated_api_client.delete(f'/api/v1/reports/{report_with_rows.id}/')
+
+        assert response.status_code == 409
+        mock_purge.assert_not_called()
+        assert Report.objects.get(id=report_with_rows.id).status == busy_status
+        assert mark_reports_deleting([report_with_rows.id]) == 0
+
+    def test_deleting_report_leaves_statistics(self, authenticated_api_client, report_with_rows):
+        """Test a report being purged no longer counts in analytics or history."""
+        mark_reports_deleting([report_with_rows.id])
+        cache.clear()
+
+        response = authenticated_api_client.get('/api/v1/reports/history/statistics/')
+
+        assert response.data['total_reports'] == 0
+        assert AnalyticsService.get_dashboard_metrics()['total_reports'] == 0
+        assert AnalyticsService.get_category_distribution()['total'] == 0
+
+
+@pytest.mark.celery
+@pytest.mark.django_db
+class TestCleanup:
+    """Test the retention cleanup."""
+
+    def test_cleanup_schedules_old_failed_reports(self, test_client, test_user):
+        """Test old failed reports are scheduled, not deleted inline."""
+        old = Report.objects.create(client=test_client, created_by=test_user, report_type='cost', status='failed')
+        recent = Report.objects.create(client=test_client, created_by=test_user, report_type='cost', status='failed')
+        Report.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=8))
+
+        with patch.object(tasks.purge_report, 'delay') as mock_purge:
+            result = tasks.cleanup_old_csv_files()
+
+        assert result == {'deleted_reports': 1, 'resumed_deletions': 0}
+        mock_purge.assert_called_once_with(str(old.id))
+        assert Report.objects.get(id=old.id).status == 'deleting'
+        assert Report.objects.get(id=recent.id).status == 'failed'
+
+    def test_stalled_deletions_are_resumed(self, test_report):
+        """Test deletions idle for longer than the timeout are re-enqueued."""
+        Report.objects.filter(id=test_report.id).update(
+            status='deleting', updated_at=timezone.now() - timedelta(hours=2)
+        )
+
+        with patch.object(tasks.purge_report, 'delay') as mock_purge:
+            assert resume_stalled_deletions() == 1
+
+        mock_purge.assert_called_once_with(str(test_report.id))
@@ -0,0 +1,159 @@
+"""
+Tests for report generation leases.
+
+Tests deduplication of generate_report dispatches, stale lease recovery and
+lease handling inside the generate_report task.
+"""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from celery import states
+from django.core.cache import cache
+
+from apps.reports.leases import (
+    acquire_generation_lease,
+    dispatch_report_generation,
+    get_generation_lease_key,
+    get_generation_task_ids,
+    recover_stale_generation,
+)
+from apps.reports.tasks import generate_report
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def mock_apply_async():
+    with patch.object(generate_report, 'apply_async') as mock:
+        yield mock
+
+
+@pytest.mark.django_db
+class TestDispatchReportGeneration:
+    """Test dispatch_report_generation deduplication."""
+
+    def test_duplicate_request_attaches_to_in_flight_task(self, test_report_completed, mock_apply_async):
+        """Test a second request returns the first task id without enqueueing."""
+        first = dispatch_report_generation(test_report_completed.id, 'pdf')
+        second = dispatch_report_generation(test_report_completed.id, 'pdf')
+
+        assert first['deduplicated'] is False
+        assert second['deduplicated'] is True
+        assert second['task_id'] == first['task_id']
+        mock_apply_async.assert_called_once()
+
+    def test_single_format_attaches_to_both(self, test_report_completed, mock_apply_async):
+        """Test an 'html' request attaches to an in-flight 'both' task."""
+        first = dispatch_report_generation(test_report_completed.id, 'both')
+        second = dispatch_report_generation(test_report_completed.id, 'html')
+
+        assert second == {'task_id': first['task_id'], 'deduplicated': True, 'attached': {'html': first['task_id']}}
+
+    def test_both_enqueues_only_missing_format(self, test_report_completed, mock_apply_async):
+        """Test 'both' while 'html' is in flight only enqueues the PDF."""
+        first = dispatch_report_generation(test_report_completed.id, 'html')
+        second = dispatch_report_generation(test_report_completed.id, 'both')
+
+        assert second['deduplicated'] is False
+        assert second['attached'] == {'html': first['task_id']}
+        assert mock_apply_async.call_args.kwargs['kwargs'] == {'format_type': 'pdf'}
+        assert get_generation_task_ids(test_report_completed.id) == {
+            'html': first['task_id'],
+            'pdf': second['task_id'],
+        }
+
+    def test_lease_released_when_enqueue_fails(self, test_report_completed, mock_apply_async):
+        """Test a broker error does not leave the lease behind."""
+        mock_apply_async.side_effect = ConnectionError("broker down")
+
+        with pytest.raises(ConnectionError):
+            dispatch_report_generation(test_report_completed.id, 'pdf')
+
+        assert get_generation_task_ids(test_report_completed.id) == {}
+
+
+@pytest.mark.django_db
+class TestStaleLeaseRecovery:
+    """Test recovery of leases left behind by dead workers."""
+
+    def test_finished_task_lease_is_taken_over(self, test_report_completed):
+        """Test a lease whose task already finished is reacquired."""
+        acquire_generation_lease(test_report_completed.id, 'pdf', 'dead-task')
+
+        with patch('apps.reports.leases.AsyncResult') as mock_result:
+            mock_result.return_value.state = states.FAILURE
+            acquired, in_flight = acquire_generation_lease(test_report_completed.id, 'pdf', 'new-task')
+
+        assert acquired == ['pdf']
+        assert in_flight == {}
+
+    def test_expired_lease_is_taken_over(self, test_report_completed):
+        """Test a lease older than the TTL is reacquired."""
+        cache.set(
+            get_generation_lease_key(test_report_completed.id, 'pdf'),
+            {'task_id': 'dead-task', 'acquired_at': time.time() - 86400},
+        )
+
+        acquired, _ = acquire_generation_lease(test_report_completed.id, 'pdf', 'new-task')
+
+        assert acquired == ['pdf']
+
+    def test_stuck_generating_status_is_reset(self, test_report_completed):
+        """Test a report stuck in 'generating' without a live task is reset."""
+        test_report_completed.status = 'generating'
+        test_report_completed.save(update_fields=['status'])
+
+        assert recover_stale_generation(test_report_completed) is True
+        test_report_completed.refresh_from_db()
+        assert test_report_completed.status == 'completed'
+
+    def test_generating_status_kept_while_task_in_flight(self, test_report_completed):
+        """Test a report with a live generation task is left alone."""
+        acquire_generation_lease(test_report_completed.id, 'html', 'live-task')
+        test_report_completed.status = 'generating'
+
+        assert recover_stale_generation(test_report_completed) is False
+
+
+@pytest.mark.django_db
+@pytest.mark.celery
+class TestGenerateReportTaskLeases:
+    """Test lease handling inside the generate_report task."""
+
+    def test_task_skips_report_leased_by_another_task(self, test_report_completed):
+        """Test a directly enqueued duplicate does not render."""
+        acquire_generation_lease(test_report_completed.id, 'html', 'other-task')
+
+        with patch('apps.reports.generators.get_generator_for_report') as mock_get_generator:
+            result = generate_report.apply(
+                args=[str(test_report_completed.id)], kwargs={'format_type': 'html'}, task_id='dup-task'
+            ).get()
+
+        assert result['status'] == 'duplicate'
+        assert result['task_id'] == 'other-task'
+        mock_get_generator.assert_not_called()
+
+    def test_task_releases_lease_after_generation(self, test_report_completed, test_recommendations):
+        """Test leases are released and the report completed after rendering."""
+        test_recommendations[0].report = test_report_completed
+        test_recommendations[0].save()
+        test_report_completed.refresh_summary()
+        generator = Mock()
+        generator.generate_html.return_value = 'reports/html/test.html'
+
+        with patch('apps.reports.generators.get_generator_for_report', return_value=generator):
+            dispatch = dispatch_report_generation(test_report_completed.id, 'html')
+
+        test_report_completed.refresh_from_db()
+        assert dispatch['deduplicated'] is False
+        assert test_report_completed.status == 'completed'
+        assert test_report_completed.html_file.name == 'reports/html/test.html'
+        assert get_generation_task_ids(test_report_completed.id) == {}
+        generator.generate_html.assert_called_once()
@@ -1030,6 +1030,7 @@ class TestRecommendationModel:
                 resource_name=f"resource-{i}"
             )
 
+        report.refresh_summary()
         assert report.recommendation_count == 5
 
     def test_total_potential_savings_property(self):
@@ -1063,6 +1064,7 @@ class TestRecommendationModel:
                 potential_savings=saving
             )
 
+        report.refresh_summary()
         total = report.total_potential_savings
         assert total == sum(savings)
 
@@ -0,0 +1,142 @@
+"""
+Test suite for the columnar normalization stage.
+
+Tests cover the CSV and Azure API adapters, label mapping, amount and date
+parsing, truncation and batch reservation analysis.
+"""
+
+import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from apps.reports.models import Recommendation
+from apps.reports.services.normalization import (
+    api_batch,
+    build_recommendations,
+    csv_batch,
+    normalize_batch,
+)
+from apps.reports.services.reservation_analyzer import ReservationAnalyzer
+
+
+@pytest.fixture
+def csv_frame():
+    return pd.DataFrame({
+        'Category': ['Cost', 'COST', 'High Availability', 'Unknown'],
+        'Business Impact': ['High', 'low', '', 'Critical'],
+        'Recommendation': [
+            'Consider virtual machine reserved instance to save over your on-demand costs',
+            'Consider virtual machine reserved instance to save over your on-demand costs',
+            'Enable zone redundancy',
+            'x' * 6000,
+        ],
+        'Potential Benefits': ['', '', 'Resiliency', ''],
+        'Potential Annual Cost Savings': ['$1,234.50', '€ 99', '', 'n/a'],
+        'Retirement Date': ['2025-03-31', '', 'not a date', ''],
+        'Currency': ['EUR', '', 'USD', 'USD'],
+    })
+
+
+@pytest.mark.unit
+class TestNormalizeCSVBatch:
+    """Test normalization of CSV exports."""
+
+    def test_labels_are_mapped(self, csv_frame):
+        """Test categories and impacts are case-insensitive with CSV fallbacks."""
+        columns = normalize_batch(csv_batch(csv_frame), source='csv')
+
+        assert columns['category'] == ['cost', 'cost', 'reliability', 'operational_excellence']
+        assert columns['business_impact'] == ['high', 'low', 'medium', 'medium']
+
+    def test_values_are_parsed(self, csv_frame):
+        """Test amounts, dates, currency and row numbers."""
+        columns = normalize_batch(csv_batch(csv_frame), source='csv')
+
+        assert columns['potential_savings'] == [Decimal('1234.50'), Decimal('99'), Decimal('0'), Decimal('0')]
+        assert columns['advisor_score_impact'] == [Decimal('0')] * 4
+        assert columns['retirement_date'] == [datetime.date(2025, 3, 31), None, None, None]
+        assert columns['currency'] == ['EUR', 'USD', 'USD', 'USD']
+        assert columns['csv_row_number'] == [2, 3, 4, 5]
+
+    def test_text_is_truncated(self, csv_frame):
+        """Test text columns fit the model limits."""
+        columns = normalize_batch(csv_batch(csv_frame), source='csv')
+
+        assert len(columns['recommendation'][3]) == 5000
+        assert columns['resource_name'] == [''] * 4
+
+    def test_reservations_are_classified_once(self, csv_frame):
+        """Test identical recommendation texts are analyzed once."""
+        with patch.object(
+            ReservationAnalyzer, 'analyze_recommendation', wraps=ReservationAnalyzer.analyze_recommendation
+        ) as mock_analyze:
+            columns = normalize_batch(csv_batch(csv_frame), source='csv')
+
+        assert mock_analyze.call_count == 3
+        assert columns['is_reservation_recommendation'] == [True, True, False, False]
+        assert columns['reservation_type'][:2] == ['reserved_instance'] * 2
+        assert columns['commitment_category'][2] == 'uncategorized'
+
+
+@pytest.mark.unit
+class TestNormalizeAPIBatch:
+    """Test normalization of Azure Advisor API pages."""
+
+    def test_api_page(self):
+        """Test API labels, fallbacks and subscription metadata."""
+        page = [
+            {
+                'category': 'HighAvailability',
+                'impact': 'Medium',
+                'impacted_resource': 'vm-1',
+                'recommendation': '',
+                'description': 'Use availability zones',
+                'potential_savings': 1200.5,
+                'currency': None,
+                'metadata': {'extended_properties': {'subscriptionId': 'sub-1'}},
+            },
+            {
+                'category': 'Unknown',
+                'impact': None,
+                'subscription_id': 'sub-2',
+                'subscription_name': 'Second',
+                'metadata': {},
+            },
+        ]
+
+        columns = normalize_batch(api_batch(page), source='azure_api')
+
+        assert columns['category'] == ['reliability', 'cost']
+        assert columns['business_impact'] == ['medium', 'low']
+        assert columns['recommendation'] == ['Use availability zones', 'No description available']
+        assert columns['subscription_id'] == ['sub-1', 'sub-2']
+        assert columns['subscription_name'] == ['', 'Second']
+        assert columns['potential_savings'] == [Decimal('1200.5'), Decimal('0')]
+        assert columns['currency'] == ['USD', 'USD']
+        assert columns['csv_row_number'] == [None, None]
+
+    def test_empty_page(self):
+        """Test an empty page yields empty columns."""
+        columns = normalize_batch(api_batch([]), source='azure_api')
+
+        assert columns['category'] == []
+        assert columns['is_savings_plan'] == []
+
+
+@pytest.mark.django_db
+class TestBuildRecommendations:
+    """Test insert-ready rows."""
+
+    def test_bulk_create(self, test_report, csv_frame):
+        """Test the column arrays can be bulk inserted as-is."""
+        columns = normalize_batch(csv_batch(csv_frame), source='csv')
+
+        Recommendation.objects.bulk_create(build_recommendations(test_report, columns))
+
+        recommendations = test_report.recommendations.order_by('csv_row_number')
+        assert recommendations.count() == 4
+        assert recommendations[0].potential_savings == Decimal('1234.50')
+        assert recommendations[0].commitment_term_years == columns['commitment_term_years'][0]
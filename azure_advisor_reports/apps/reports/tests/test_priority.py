@@ -0,0 +1,131 @@
+"""
+Test suite for the recommendation priority score.
+
+Tests cover the score formula, scoring during ingest and on save, and the
+top-N lists of the generators, the CSV statistics and the API.
+"""
+
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from apps.reports.generators.detailed import DetailedReportGenerator
+from apps.reports.models import Recommendation
+from apps.reports.priority import priority_scores, recommendation_priority
+from apps.reports.services.bulk_loader import load_recommendations
+from apps.reports.services.csv_processor import AzureAdvisorCSVProcessor
+from apps.reports.services.normalization import csv_batch, normalize_batch
+
+
+def add(report, impact, savings, score_impact=0, name=''):
+    return Recommendation.objects.create(
+        report=report,
+        category='cost',
+        business_impact=impact,
+        recommendation=f'{impact} {savings}',
+        resource_name=name,
+        potential_savings=Decimal(savings),
+        advisor_score_impact=Decimal(score_impact),
+    )
+
+
+@pytest.mark.unit
+class TestPriorityScore:
+    """Test the score formula."""
+
+    def test_impact_ranks_first(self):
+        """Test a higher impact outranks any savings and score impact of a lower one."""
+        assert recommendation_priority('high', 0, 0) > recommendation_priority('medium', Decimal('10000000'), 999)
+        assert recommendation_priority('medium', 0, 0) > recommendation_priority('low', Decimal('10000000'), 999)
+
+    def test_savings_then_score_within_impact(self):
+        """Test savings and advisor score impact order recommendations of one impact."""
+        assert recommendation_priority('medium', 5000, 0) > recommendation_priority('medium', 500, 0)
+        assert recommendation_priority('medium', 500, 10) > recommendation_priority('medium', 500, 0)
+
+    def test_batch_matches_single(self):
+        """Test the vectorized and single scores agree, including bad values."""
+        impacts = ['high', 'low', 'unknown', 'medium']
+        savings = [Decimal('1234.5'), Decimal('-10'), Decimal('99'), Decimal('0')]
+        score_impacts = [Decimal('5'), Decimal('0'), Decimal('0'), Decimal('150')]
+
+        assert priority_scores(impacts, savings, score_impacts) == [
+            recommendation_priority(*values) for values in zip(impacts, savings, score_impacts)
+        ]
+        assert priority_scores(impacts, savings, score_impacts)[1] == 1.0
+
+
+@pytest.mark.django_db
+class TestPriorityOnIngest:
+    """Test the score is stored with every recommendation."""
+
+    def test_bulk_ingest(self, test_report):
+        """Test normalized batches carry scores into the table."""
+        columns = normalize_batch(csv_batch(pd.DataFrame({
+            'Category': ['Cost', 'Cost'],
+            'Business Impact': ['Low', 'High'],
+            'Recommendation': ['a', 'b'],
+            'Potential Annual Cost Savings': ['$5,000', ''],
+        })), source='csv')
+
+        load_recommendations(test_report, columns)
+
+        stored = dict(test_report.recommendations.values_list('recommendation', 'priority_score'))
+        assert stored == {'a': columns['priority_score'][0], 'b': 3.0}
+
+    def test_single_save(self, test_report):
+        """Test the score follows the values on every save."""
+        recommendation = add(test_report, 'low', 100)
+        recommendation.business_impact = 'high'
+        recommendation.save()
+
+        recommendation.refresh_from_db()
+        assert recommendation.priority_score == recommendation_priority('high', Decimal('100'), 0)
+
+
+@pytest.mark.django_db
+class TestTopRecommendations:
+    """Test top-N lists use the priority order."""
+
+    def test_generator_puts_high_impact_first(self, test_report):
+        """Test impact is not sorted as text ('medium' > 'low' > 'high')."""
+        add(test_report, 'medium', 900, name='medium')
+        add(test_report, 'high', 100, name='high')
+        add(test_report, 'low', 5000, name='low')
+        add(test_report, 'high', 300, name='high-more')
+
+        generator = DetailedReportGenerator(test_report)
+
+        assert [r.resource_name for r in generator.get_top_recommendations(limit=3)] == [
+            'high-more', 'high', 'medium',
+        ]
+
+    def test_csv_statistics(self, tmp_path):
+        """Test the CSV statistics pick their top 10 by priority."""
+        rows = ['Category,Business Impact,Recommendation,Potential Annual Cost Savings']
+        rows += [f'Cost,Low,Low {i},{1000 + i}' for i in range(12)]
+        rows += ['Security,High,Enable MFA,']
+        path = tmp_path / 'advisor.csv'
+        path.write_text('\n'.join(rows) + '\n', encoding='utf-8')
+
+        _, statistics = AzureAdvisorCSVProcessor(str(path)).process()
+
+        top = statistics['top_recommendations']
+        assert len(top) == 10
+        assert top[0]['recommendation'] == 'Enable MFA'
+        assert top[1]['recommendation'] == 'Low 11'
+        assert top == sorted(top, key=lambda rec: rec['priority_score'], reverse=True)
+
+    @pytest.mark.api
+    def test_report_recommendations_top(self, authenticated_api_client, test_report):
+        """Test ?top= returns the highest-priority recommendations."""
+        add(test_report, 'low', 5000, name='low')
+        add(test_report, 'high', 10, name='high')
+        add(test_report, 'medium', 10, name='medium')
+
+        response = authenticated_api_client.get(f'/api/v1/reports/{test_report.id}/recommendations/', {'top': 2})
+
+        assert response.status_code == 200
+        assert response.data['count'] == 2
+        assert [r['resource_name'] for r in response.data['data']] == ['high', 'medium']
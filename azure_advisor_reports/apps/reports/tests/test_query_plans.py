@@ -0,0 +1,164 @@
+"""
+Test suite for the recommendation indexes.
+
+Seeds QUERY_PLAN_ROWS recommendations (spread over 100 reports) with a
+single INSERT ... SELECT per report, refreshes the planner statistics, and
+checks that the generator, API and summary query shapes use the intended
+index (EXPLAIN output of SQLite or PostgreSQL).
+
+The seed is committed and takes a while, so the module only runs when
+QUERY_PLAN_ROWS is set, e.g. QUERY_PLAN_ROWS=1000000 against PostgreSQL.
+"""
+
+import os
+
+import pytest
+from django.db import connection
+from django.db.models import Exists, OuterRef
+
+from apps.reports.models import Recommendation, Report
+
+QUERY_PLAN_ROWS = int(os.environ.get('QUERY_PLAN_ROWS') or 0)
+QUERY_PLAN_REPORTS = 100
+
+pytestmark = pytest.mark.skipif(not QUERY_PLAN_ROWS, reason='QUERY_PLAN_ROWS is not set')
+
+SEED_SQL = """
+WITH RECURSIVE seq(n) AS (
+    SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %(rows)s
+)
+INSERT INTO recommendations (
+    id, report_id, category, business_impact, recommendation,
+    subscription_id, subscription_name, resource_group, resource_name, resource_type,
+    potential_savings, currency, potential_benefits, retiring_feature, advisor_score_impact,
+    is_reservation_recommendation, commitment_term_years, is_savings_plan, commitment_category,
+    priority_score, created_at
+)
+SELECT
+    {id_expression}, %(report)s,
+    CASE n %% 5 WHEN 0 THEN 'cost' WHEN 1 THEN 'security' WHEN 2 THEN 'reliability'
+        WHEN 3 THEN 'operational_excellence' ELSE 'performance' END,
+    CASE n %% 3 WHEN 0 THEN 'high' WHEN 1 THEN 'medium' ELSE 'low' END,
+    'Recommendation', '', '', '', '', '',
+    n %% 5000, 'USD', '', '', n %% 100,
+    n %% 20 = 0, CASE WHEN n %% 20 = 0 THEN 1 + 2 * (n %% 40 / 20) END, n %% 20 = 10,
+    CASE WHEN n %% 20 = 0 THEN 'pure_reservation_' || (1 + 2 * (n %% 40 / 20)) || 'y'
+        WHEN n %% 20 = 10 THEN 'pure_savings_plan' ELSE 'uncategorized' END,
+    CASE n %% 3 WHEN 0 THEN 3 WHEN 1 THEN 2 ELSE 1 END + (n %% 5000) / 10000.0,
+    CURRENT_TIMESTAMP
+FROM seq
+"""
+
+
+@pytest.fixture(scope='module')
+def seeded_reports(django_db_setup, django_db_blocker):
+    """QUERY_PLAN_ROWS recommendations, committed once for the module."""
+    from apps.authentication.models import User
+    from apps.clients.models import Client
+
+    with django_db_blocker.unblock():
+        user = User.objects.create_user(username='planner', email='planner@example.com', password='x')
+        client = Client.objects.create(company_name='Planner Corp', contact_email='planner@example.com')
+        reports = [
+            Report.objects.create(client=client, created_by=user, report_type='detailed')
+            for _ in range(QUERY_PLAN_REPORTS)
+        ]
+
+        if connection.vendor == 'postgresql':
+            id_expression = 'md5(%(report)s::text || n::text)::uuid'
+        else:
+            id_expression = 'lower(hex(randomblob(16)))'
+        sql = SEED_SQL.format(id_expression=id_expression)
+        rows = max(1, QUERY_PLAN_ROWS // QUERY_PLAN_REPORTS)
+
+        with connection.cursor() as cursor:
+            for report in reports:
+                report_id = Report._meta.pk.get_db_prep_value(report.pk, connection)
+                cursor.execute(sql, {'rows': rows, 'report': report_id})
+            cursor.execute('ANALYZE')
+
+        yield reports
+
+        Recommendation.objects.filter(report__in=reports).delete()
+        Report.objects.filter(pk__in=[report.pk for report in reports]).delete()
+        client.delete()
+        user.delete()
+
+
+def plan(queryset):
+    return queryset.explain()
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+@pytest.mark.django_db
+class TestRecommendationQueryPlans:
+    """Test the generator, API and summary queries use the report-led indexes."""
+
+    def test_commitment_category_and_term(self, seeded_reports):
+        """Test pure reservation filters of the generators (1y/3y split)."""
+        queryset = Recommendation.objects.filter(
+            report=seeded_reports[0],
+            commitment_category='pure_reservation_1y',
+            commitment_term_years=1,
+        )
+
+        assert 'idx_rec_report_commit' in plan(queryset)
+
+    def test_reservations_by_savings(self, seeded_reports):
+        """Test the reservation analysis reads the partial index."""
+        queryset = Recommendation.objects.filter(
+            report=seeded_reports[0], is_reservation_recommendation=True
+        ).order_by('-potential_savings')
+
+        assert 'idx_rec_report_reserv' in plan(queryset)
+
+    def test_impact_by_savings(self, seeded_reports):
+        """Test quick wins (impact filter, savings order)."""
+        queryset = Recommendation.objects.filter(
+            report=seeded_reports[0], business_impact='high'
+        ).order_by('-potential_savings')[:10]
+
+        assert 'idx_rec_report_impact' in plan(queryset)
+
+    def test_category_by_score(self, seeded_reports):
+        """Test the security and operations generators."""
+        queryset = Recommendation.objects.filter(
+            report=seeded_reports[0], category='security'
+        ).order_by('-advisor_score_impact')
+
+        assert 'idx_rec_report_cat_score' in plan(queryset)
+
+    def test_default_listing(self, seeded_reports):
+        """Test the recommendations of a report in default order (API, top savings)."""
+        queryset = Recommendation.objects.filter(report=seeded_reports[0]).order_by('-potential_savings')[:50]
+
+        assert 'idx_rec_report_savings' in plan(queryset)
+
+    def test_summary_aggregate(self, seeded_reports):
+        """Test the Report.refresh_summary aggregate reads one report through an index."""
+        queryset = (
+            Recommendation.objects.filter(report=seeded_reports[0])
+            .order_by()
+            .values('report')
+            .annotate(**Report.summary_aggregates())
+        )
+
+        assert 'idx_rec_report_savings' in plan(queryset)
+
+    def test_diff_anti_join(self, seeded_reports):
+        """Test the report diff probes the other report through the fingerprint index."""
+        base, current = seeded_reports[0], seeded_reports[1]
+        queryset = Recommendation.objects.filter(report=current).filter(
+            ~Exists(Recommendation.objects.filter(report=base, fingerprint=OuterRef('fingerprint')))
+        )
+
+        assert 'idx_rec_report_fp' in plan(queryset)
+
+    def test_top_by_priority(self, seeded_reports):
+        """Test the top-N lists of the generators read the priority index in order."""
+        queryset = Recommendation.objects.filter(
+            report=seeded_reports[0]
+        ).order_by('-priority_score', '-potential_savings')[:10]
+
+        assert 'idx_rec_report_priority' in plan(queryset)
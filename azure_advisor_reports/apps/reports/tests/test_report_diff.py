@@ -0,0 +1,223 @@
+"""
+Test suite for recommendation fingerprints and report-to-report diffs.
+
+Tests cover the fingerprint recipe, fingerprinting during ingest and on
+save, the diff service and the diff endpoint.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+from django.utils import timezone
+
+from apps.reports.fingerprints import recommendation_fingerprint
+from apps.reports.models import Recommendation, Report
+from apps.reports.services.bulk_loader import load_recommendations
+from apps.reports.services.normalization import csv_batch, normalize_batch
+from apps.reports.services.report_diff import diff_reports, previous_report
+
+
+def make_report(client, user, days_ago, status='completed'):
+    report = Report.objects.create(client=client, created_by=user, report_type='cost', status=status)
+    Report.objects.filter(pk=report.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+    report.refresh_from_db()
+    return report
+
+
+def add(report, resource_name, savings, recommendation='Right-size underutilized virtual machines'):
+    return Recommendation.objects.create(
+        report=report,
+        category='cost',
+        business_impact='medium',
+        recommendation=recommendation,
+        subscription_id='sub-1',
+        resource_group='rg-prod',
+        resource_name=resource_name,
+        resource_type='Microsoft.Compute/virtualMachines',
+        potential_savings=Decimal(savings),
+    )
+
+
+@pytest.fixture
+def reports(test_client, test_user):
+    """Two monthly reports: vm-2 resolved, vm-3 new, vm-1 unchanged with lower savings."""
+    base = make_report(test_client, test_user, days_ago=30)
+    current = make_report(test_client, test_user, days_ago=1)
+    add(base, 'vm-1', 1000)
+    add(base, 'vm-2', 400)
+    add(current, 'VM-1 ', 900)
+    add(current, 'vm-3', 250)
+    return base, current
+
+
+@pytest.mark.unit
+class TestFingerprint:
+    """Test the fingerprint recipe."""
+
+    def test_ignores_case_and_whitespace(self):
+        """Test reformatted exports keep their fingerprints."""
+        assert recommendation_fingerprint(resource_name='vm-1', recommendation='Shut  down idle VMs') == \
+            recommendation_fingerprint(resource_name=' VM-1', recommendation='shut down idle vms')
+
+    def test_identity_fields_only(self):
+        """Test each identifying field matters and missing ones count as empty."""
+        fingerprint = recommendation_fingerprint(subscription_id='sub-1', category='cost')
+
+        assert len(fingerprint) == 40
+        assert fingerprint == recommendation_fingerprint(subscription_id='sub-1', category='cost', resource_name=None)
+        assert fingerprint != recommendation_fingerprint(subscription_id='sub-2', category='cost')
+        assert fingerprint != recommendation_fingerprint(subscription_id='sub-1', category='security')
+
+
+@pytest.mark.django_db
+class TestFingerprintOnIngest:
+    """Test fingerprints are stored with every recommendation."""
+
+    def test_bulk_ingest(self, test_report):
+        """Test normalized batches carry fingerprints into the table."""
+        columns = normalize_batch(csv_batch(pd.DataFrame({
+            'Category': ['Cost', 'Cost'],
+            'Recommendation': ['Buy reserved instances', 'Buy reserved instances'],
+            'Resource Name': ['vm-1', 'vm-2'],
+        })), source='csv')
+
+        load_recommendations(test_report, columns)
+
+        stored = set(test_report.recommendations.values_list('fingerprint', flat=True))
+        assert stored == set(columns['fingerprint'])
+        assert len(stored) == 2
+
+    def test_single_save(self, test_report):
+        """Test recommendations created one by one are fingerprinted too."""
+        recommendation = add(test_report, 'vm-1', 10)
+
+        assert recommendation.fingerprint == recommendation_fingerprint(
+            subscription_id='sub-1',
+            resource_group='rg-prod',
+            resource_name='vm-1',
+            resource_type='Microsoft.Compute/virtualMachines',
+            recommendation='Right-size underutilized virtual machines',
+            category='cost',
+        )
+
+    def test_resave_follows_identity_fields(self, test_report):
+        """Test an edited recommendation is fingerprinted again on save."""
+        recommendation = add(test_report, 'vm-1', 10)
+        recommendation.resource_name = 'vm-2'
+        recommendation.save()
+
+        recommendation.refresh_from_db()
+        assert recommendation.fingerprint == add(test_report, 'vm-2', 20).fingerprint
+
+
+@pytest.mark.django_db
+class TestDiffReports:
+    """Test the diff service."""
+
+    def test_sets_and_savings(self, reports):
+        """Test new, resolved and unchanged sets with their savings."""
+        base, current = reports
+
+        diff = diff_reports(base, current)
+
+        assert [r.resource_name for r in diff['new']] == ['vm-3']
+        assert [r.resource_name for r in diff['resolved']] == ['vm-2']
+        assert [r.resource_name for r in diff['unchanged']] == ['VM-1 ']
+        assert diff['summary'] == {
+            'new_count': 1,
+            'resolved_count': 1,
+            'unchanged_count': 1,
+            'new_savings': Decimal('250'),
+            'resolved_savings': Decimal('400'),
+            'unchanged_savings_delta': Decimal('-100'),
+            'base_total_savings': Decimal('1400'),
+            'current_total_savings': Decimal('1150'),
+            'savings_delta': Decimal('-250'),
+        }
+
+    def test_fixed_number_of_queries(self, reports, django_assert_num_queries):
+        """Test the diff is set-based: two aggregates and three bounded listings."""
+        base, current = reports
+
+        with django_assert_num_queries(5):
+            diff_reports(base, current, limit=1)
+
+    def test_empty_base(self, reports, test_client, test_user):
+        """Test everything is new against an empty report."""
+        _, current = reports
+        empty = make_report(test_client, test_user, days_ago=60)
+
+        summary = diff_reports(empty, current)['summary']
+
+        assert summary['new_count'] == 2
+        assert summary['resolved_count'] == 0
+        assert summary['base_total_savings'] == Decimal('0')
+
+    def test_previous_report(self, reports, test_client, test_user):
+        """Test the default base is the latest earlier completed report."""
+        base, current = reports
+        make_report(test_client, test_user, days_ago=10, status='failed')
+
+        assert previous_report(current) == base
+        assert previous_report(base) is None
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestDiffEndpoint:
+    """Test GET /api/v1/reports/{id}/diff/."""
+
+    def test_default_base(self, authenticated_api_client, reports):
+        """Test the previous report is used when no base is given."""
+        base, current = reports
+
+        response = authenticated_api_client.get(f'/api/v1/reports/{current.id}/diff/')
+
+        assert response.status_code == 200
+        data = response.data['data']
+        assert data['base_report']['id'] == str(base.id)
+        assert data['summary']['savings_delta'] == -250.0
+        assert data['summary']['new_count'] == 1
+        assert [r['resource_name'] for r in data['resolved']] == ['vm-2']
+
+    def test_explicit_base_and_limit(self, authenticated_api_client, reports):
+        """Test comparing against a chosen report, with bounded lists."""
+        base, current = reports
+
+        response = authenticated_api_client.get(
+            f'/api/v1/reports/{base.id}/diff/', {'base': str(current.id), 'limit': 0}
+        )
+
+        assert response.status_code == 200
+        data = response.data['data']
+        assert data['summary']['new_count'] == 1
+        assert data['summary']['resolved_count'] == 1
+        assert data['new'] == []
+
+    def test_no_previous_report(self, authenticated_api_client, reports):
+        """Test the oldest report has nothing to compare with."""
+        base, _ = reports
+
+        response = authenticated_api_client.get(f'/api/v1/reports/{base.id}/diff/')
+
+        assert response.status_code == 400
+
+    def test_base_of_another_client(self, authenticated_api_client, reports, test_user):
+        """Test reports of different clients cannot be compared."""
+        from apps.clients.models import Client
+        _, current = reports
+        other = make_report(Client.objects.create(company_name='Other Corp'), test_user, days_ago=5)
+
+        response = authenticated_api_client.get(f'/api/v1/reports/{current.id}/diff/', {'base': str(other.id)})
+
+        assert response.status_code == 400
+
+    def test_unknown_base(self, authenticated_api_client, reports):
+        """Test a missing or malformed base is not found."""
+        _, current = reports
+
+        for base_id in ('not-a-uuid', '00000000-0000-0000-0000-000000000000'):
+            response = authenticated_api_client.get(f'/api/v1/reports/{current.id}/diff/', {'base': base_id})
+            assert response.status_code == 404
@@ -0,0 +1,148 @@
+"""
+Test suite for the denormalized recommendation summary of reports.
+
+Tests cover refresh_summary, delete_recommendations, the backfill migration
+and the read paths that use the stored columns.
+"""
+
+import importlib
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.reports.cache import cache_report_data
+from apps.reports.models import Recommendation, Report
+from apps.reports.services.bulk_loader import load_recommendations
+
+backfill_migration = importlib.import_module('apps.reports.migrations.0011_report_summary_columns')
+
+
+@pytest.fixture
+def mixed_recommendations(test_report):
+    rows = [
+        ('cost', 'high', Decimal('1000.00'), True, False),
+        ('cost', 'medium', Decimal('250.50'), False, True),
+        ('cost', 'low', Decimal('100.00'), False, False),
+        ('security', 'high', Decimal('0'), False, False),
+    ]
+    Recommendation.objects.bulk_create([
+        Recommendation(
+            report=test_report,
+            category=category,
+            business_impact=impact,
+            recommendation=f'Recommendation {i}',
+            potential_savings=savings,
+            is_reservation_recommendation=reservation,
+            is_savings_plan=savings_plan,
+        )
+        for i, (category, impact, savings, reservation, savings_plan) in enumerate(rows)
+    ])
+    return test_report
+
+
+def assert_mixed_summary(report):
+    assert report.recommendation_count == 4
+    assert report.total_potential_savings == Decimal('1350.50')
+    assert report.reservation_savings == Decimal('1250.50')
+    assert report.category_distribution == {
+        'cost': 3, 'security': 1, 'reliability': 0, 'operational_excellence': 0, 'performance': 0,
+    }
+    assert report.impact_distribution == {'high': 2, 'medium': 1, 'low': 1}
+    assert report.recommendations_ingested_at is not None
+
+
+@pytest.mark.django_db
+class TestRefreshSummary:
+    """Test the summary columns are computed and stored."""
+
+    def test_new_report_is_empty(self, test_report):
+        """Test reports start with a zero summary."""
+        assert test_report.recommendation_count == 0
+        assert test_report.total_potential_savings == 0
+        assert test_report.category_distribution == {}
+
+    def test_refresh_summary(self, mixed_recommendations):
+        """Test counts, distributions and savings are stored with one aggregate query."""
+        report = mixed_recommendations
+
+        with CaptureQueriesContext(connection) as queries:
+            report.refresh_summary()
+
+        assert len([q for q in queries if q['sql'].startswith('SELECT')]) == 1
+        report.refresh_from_db()
+        assert_mixed_summary(report)
+
+    def test_delete_recommendations(self, mixed_recommendations):
+        """Test deleting the rows resets the summary."""
+        report = mixed_recommendations
+        report.refresh_summary()
+
+        assert report.delete_recommendations() == 4
+
+        report.refresh_from_db()
+        assert report.recommendations.count() == 0
+        assert report.recommendation_count == 0
+        assert report.total_potential_savings == 0
+        assert report.impact_distribution == {}
+
+    def test_backfill_migration(self, mixed_recommendations, test_client, test_user):
+        """Test existing reports get their summary from the migration."""
+        empty = Report.objects.create(client=test_client, created_by=test_user, report_type='cost')
+
+        backfill_migration.backfill_report_summaries(apps, None)
+
+        mixed_recommendations.refresh_from_db()
+        empty.refresh_from_db()
+        assert_mixed_summary(mixed_recommendations)
+        assert empty.recommendation_count == 0
+
+
+@pytest.mark.django_db
+class TestSummaryReads:
+    """Test read paths use the stored columns."""
+
+    def test_cache_report_data_does_not_query_recommendations(self, mixed_recommendations):
+        """Test cached report data comes from the report row."""
+        report = mixed_recommendations
+        report.refresh_summary()
+
+        with CaptureQueriesContext(connection) as queries:
+            data = cache_report_data(report)
+
+        assert not any(Recommendation._meta.db_table in q['sql'] for q in queries)
+        assert data['recommendations_count'] == 4
+        assert data['total_potential_savings'] == 1350.50
+
+    def test_generate_report_requires_summary_count(self, test_report):
+        """Test generation is refused when the summary has no recommendations."""
+        from apps.reports.tasks import generate_report
+
+        test_report.status = 'completed'
+        test_report.save()
+
+        with patch('apps.reports.generators.get_generator_for_report') as mock_generator:
+            result = generate_report.apply(args=(str(test_report.id), 'html')).get()
+
+        assert result['status'] == 'error'
+        mock_generator.assert_not_called()
+
+    def test_loader_and_refresh_in_one_transaction(self, test_report):
+        """Test the summary written at ingest matches the inserted rows."""
+        columns = {
+            'category': ['cost', 'performance'],
+            'business_impact': ['low', 'low'],
+            'recommendation': ['a', 'b'],
+            'potential_savings': [Decimal('5.00'), Decimal('7.25')],
+        }
+
+        load_recommendations(test_report, columns)
+        test_report.refresh_summary()
+
+        test_report.refresh_from_db()
+        assert test_report.recommendation_count == 2
+        assert test_report.total_potential_savings == Decimal('12.25')
+        assert test_report.category_distribution['performance'] == 1
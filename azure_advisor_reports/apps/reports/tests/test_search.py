@@ -0,0 +1,158 @@
+"""
+Test suite for full-text search across recommendations.
+
+The test database is SQLite, so these tests cover the substring fallback of
+search_recommendations and the search endpoint's filters and pagination;
+the tsvector ranking and its GIN index need PostgreSQL.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.reports.models import Recommendation, Report
+from apps.reports.services.search import search_recommendations, update_search_vectors
+
+SEARCH_URL = '/api/v1/reports/recommendations/search/'
+
+
+def make_recommendation(report, recommendation, savings=0, **kwargs):
+    kwargs.setdefault('category', 'cost')
+    kwargs.setdefault('business_impact', 'medium')
+    return Recommendation.objects.create(
+        report=report,
+        recommendation=recommendation,
+        potential_savings=Decimal(savings),
+        **kwargs
+    )
+
+
+@pytest.fixture
+def other_report(test_user):
+    from apps.clients.models import Client
+    client = Client.objects.create(company_name='Other Corp', industry='Retail')
+    return Report.objects.create(client=client, created_by=test_user, report_type='cost', status='completed')
+
+
+@pytest.fixture
+def recommendations(test_report, other_report):
+    return {
+        'vm': make_recommendation(
+            test_report, 'Buy reserved instances for virtual machines', 900,
+            resource_type='Microsoft.Compute/virtualMachines', resource_name='vm-prod-01',
+        ),
+        'sql': make_recommendation(
+            test_report, 'Right-size underutilized databases', 300,
+            resource_type='Microsoft.Sql/servers', resource_name='sql-prod',
+            potential_benefits='Reduce virtual core costs',
+        ),
+        'security': make_recommendation(
+            other_report, 'Enable MFA on privileged accounts',
+            category='security', resource_name='tenant',
+        ),
+        'other_vm': make_recommendation(
+            other_report, 'Shut down idle virtual machines', 500,
+            resource_type='Microsoft.Compute/virtualMachines',
+        ),
+    }
+
+
+@pytest.mark.django_db
+class TestSearchRecommendations:
+    """Test the search service outside PostgreSQL."""
+
+    def test_every_term_must_match_a_field(self, recommendations):
+        """Test terms may match different fields but must all match."""
+        results = list(search_recommendations(Recommendation.objects.all(), 'virtual prod'))
+
+        assert results == [recommendations['vm'], recommendations['sql']]
+
+    def test_ordered_by_savings_with_rank(self, recommendations):
+        """Test fallback matches carry a rank and come by potential savings."""
+        results = list(search_recommendations(Recommendation.objects.all(), 'virtual'))
+
+        assert [r.id for r in results] == [
+            recommendations['vm'].id, recommendations['other_vm'].id, recommendations['sql'].id,
+        ]
+        assert all(r.rank == 0.0 for r in results)
+
+    def test_no_vectors_outside_postgresql(self, recommendations, test_report):
+        """Test vector computation is skipped on other databases."""
+        assert update_search_vectors(test_report.id) == 0
+
+    def test_search_vector_is_deferred(self, recommendations):
+        """Test ordinary reads leave the vector column out."""
+        recommendation = Recommendation.objects.get(pk=recommendations['vm'].pk)
+
+        assert 'search_vector' in recommendation.get_deferred_fields()
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestSearchEndpoint:
+    """Test GET /api/v1/reports/recommendations/search/."""
+
+    def test_requires_authentication(self, api_client):
+        """Test anonymous users cannot search."""
+        assert api_client.get(SEARCH_URL, {'q': 'virtual'}).status_code == 401
+
+    def test_requires_query(self, authenticated_api_client):
+        """Test a missing search text is rejected."""
+        response = authenticated_api_client.get(SEARCH_URL)
+
+        assert response.status_code == 400
+        assert response.data['status'] == 'error'
+
+    def test_results_across_reports(self, authenticated_api_client, recommendations, test_report):
+        """Test matches of all reports are returned, paginated, with their report and client."""
+        response = authenticated_api_client.get(SEARCH_URL, {'q': 'virtual machines'})
+
+        assert response.status_code == 200
+        assert response.data['count'] == 2
+        first = response.data['results'][0]
+        assert first['id'] == str(recommendations['vm'].id)
+        assert first['report'] == test_report.id
+        assert first['report_title'] == 'Test Detailed Report'
+        assert first['client_name'] == 'Test Company Inc.'
+        assert first['rank'] == 0.0
+
+    def test_client_and_category_filters(self, authenticated_api_client, recommendations, other_report):
+        """Test results can be narrowed to a client and a category."""
+        response = authenticated_api_client.get(SEARCH_URL, {'q': 'virtual', 'client': str(other_report.client_id)})
+        assert [r['id'] for r in response.data['results']] == [str(recommendations['other_vm'].id)]
+
+        response = authenticated_api_client.get(SEARCH_URL, {'q': 'accounts', 'category': 'cost'})
+        assert response.data['count'] == 0
+
+    def test_date_filters(self, authenticated_api_client, recommendations, other_report):
+        """Test results are limited to reports created in the date range."""
+        Report.objects.filter(pk=other_report.pk).update(created_at=timezone.now() - timedelta(days=30))
+        since = (timezone.now() - timedelta(days=7)).date().isoformat()
+
+        response = authenticated_api_client.get(SEARCH_URL, {'q': 'virtual', 'date_from': since})
+        assert response.data['count'] == 2
+
+        response = authenticated_api_client.get(SEARCH_URL, {'q': 'virtual', 'date_to': since})
+        assert [r['id'] for r in response.data['results']] == [str(recommendations['other_vm'].id)]
+
+    def test_invalid_date(self, authenticated_api_client):
+        """Test malformed dates are rejected."""
+        response = authenticated_api_client.get(SEARCH_URL, {'q': 'virtual', 'date_from': '2024-13-45'})
+
+        assert response.status_code == 400
+
+    def test_invalid_client(self, authenticated_api_client):
+        """Test a malformed client ID is rejected."""
+        response = authenticated_api_client.get(SEARCH_URL, {'q': 'virtual', 'client': 'not-a-uuid'})
+
+        assert response.status_code == 400
+
+    def test_reports_being_deleted_are_hidden(self, authenticated_api_client, recommendations, other_report):
+        """Test recommendations of reports being deleted are not found."""
+        Report.objects.filter(pk=other_report.pk).update(status='deleting')
+
+        response = authenticated_api_client.get(SEARCH_URL, {'q': 'virtual'})
+
+        assert response.data['count'] == 2
@@ -210,6 +210,7 @@ class TestReportSerializer:
 
     def test_serializer_calculated_fields(self, test_report, test_recommendations_bulk):
         """Test calculated fields like recommendation_count and total_potential_savings."""
+        test_report.refresh_summary()
         serializer = ReportSerializer(test_report)
         data = serializer.data
 
@@ -660,6 +661,7 @@ class TestSerializerPerformance:
             recommendations.append(rec)
 
         Recommendation.objects.bulk_create(recommendations)
+        test_report.refresh_summary()
 
         # Serialize report with all recommendations
         serializer = ReportSerializer(test_report)
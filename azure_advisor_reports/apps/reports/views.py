@@ -4,15 +4,21 @@ Views for reports app.
 
 import logging
 import os
+import uuid
+from decimal import Decimal
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.generics import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.db import transaction
 
+from apps.core.db_routing import choose_read_alias, pin_primary_reads
+
 from .models import Report, Recommendation, ReportTemplate, ReportShare
 from .serializers import (
     ReportSerializer,
@@ -21,11 +27,17 @@ from .serializers import (
     ReportCreateSerializer,
     RecommendationSerializer,
     RecommendationListSerializer,
+    RecommendationSearchResultSerializer,
     ReportTemplateSerializer,
     ReportShareSerializer,
 )
-from .services.csv_processor import process_csv_file, CSVProcessingError
-from .tasks import process_csv_file as process_csv_task, generate_report as generate_report_task
+from .services.bulk_loader import load_recommendations
+from .services.deletion import BUSY_STATUSES, schedule_report_deletion
+from .services.report_diff import DEFAULT_ROW_LIMIT, diff_reports, previous_report
+from .services.search import search_recommendations, update_search_vectors
+from .services.csv_processor import AzureAdvisorCSVProcessor, CSVProcessingError
+from .tasks import process_csv_file as process_csv_task
+from .leases import dispatch_report_generation, get_generation_task_ids, recover_stale_generation
 from .generators import get_generator_for_report
 from django.http import FileResponse, HttpResponse
 from celery.result import AsyncResult
@@ -64,6 +76,9 @@ class ReportViewSet(viewsets.ModelViewSet):
         """Filter queryset based on user permissions."""
         queryset = super().get_queryset()
 
+        # Reports being deleted in the background are already gone for the API
+        queryset = queryset.exclude(status='deleting')
+
         # Add any role-based filtering here if needed
         # For now, return all reports
 
@@ -89,6 +104,7 @@ class ReportViewSet(viewsets.ModelViewSet):
                 "report_type": "detailed",
                 "data_source": "azure_api",
                 "azure_subscription": "uuid",
+                "azure_subscriptions": ["uuid", ...],  # optional, consolidated report
                 "filters": {
                     "category": "Cost",
                     "impact": "High"
@@ -131,8 +147,14 @@ class ReportViewSet(viewsets.ModelViewSet):
                 f"(subscription: {report.azure_subscription.name})"
             )
             try:
-                from apps.azure_integration.tasks import fetch_azure_recommendations
-                fetch_azure_recommendations.delay(str(report.id))
+                from apps.azure_integration.tasks import (
+                    fetch_azure_recommendations,
+                    fetch_multi_subscription_recommendations,
+                )
+                if (report.api_sync_metadata or {}).get('subscription_ids'):
+                    fetch_multi_subscription_recommendations.delay(str(report.id))
+                else:
+                    fetch_azure_recommendations.delay(str(report.id))
             except Exception as e:
                 logger.error(
                     f"Failed to trigger Azure fetch task for report {report.id}: {str(e)}"
@@ -152,6 +174,27 @@ class ReportViewSet(viewsets.ModelViewSet):
             headers=headers
         )
 
+    def destroy(self, request, *args, **kwargs):
+        """
+        Delete a report.
+
+        The report is marked as deleting and hidden at once; its
+        recommendations, row and files are removed in the background in
+        bounded batches (see services/deletion.py). A report that is still
+        being processed or generated cannot be deleted yet (409).
+        """
+        report = self.get_object()
+        if report.status in BUSY_STATUSES or not schedule_report_deletion([report.pk]):
+            return Response(
+                {
+                    'status': 'error',
+                    'message': 'Report is still being processed; delete it once it has finished',
+                },
+                status=status.HTTP_409_CONFLICT
+            )
+        logger.info(f"Report {report.id} scheduled for deletion")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @action(detail=False, methods=['post'], url_path='upload')
     def upload_csv(self, request):
         """
@@ -278,29 +321,19 @@ class ReportViewSet(viewsets.ModelViewSet):
             logger.info(f"Starting CSV processing for report {report.id}")
 
             # Process the CSV file
-            recommendations_data, statistics = process_csv_file(csv_file_path)
+            processor = AzureAdvisorCSVProcessor(csv_file_path)
+            recommendations_data, statistics = processor.process()
 
             # Save recommendations to database
             with transaction.atomic():
                 # Delete existing recommendations if any
                 report.recommendations.all().delete()
 
-                # Create new recommendations
-                recommendations = []
-                for rec_data in recommendations_data:
-                    # Ensure reservation fields are always present
-                    rec_data.setdefault('is_reservation_recommendation', False)
-                    rec_data.setdefault('reservation_type', None)
-                    rec_data.setdefault('commitment_term_years', None)
-
-                    recommendations.append(Recommendation(
-                        report=report,
-                        **rec_data
-                    ))
-
-                Recommendation.objects.bulk_create(recommendations, batch_size=500)
+                # Insert the normalized column arrays (COPY on PostgreSQL)
+                load_recommendations(report, processor.columns)
 
-                # Update report with statistics
+                # Update report with statistics and summary
+                report.refresh_summary(save=False)
                 report.analysis_data = statistics
                 report.status = 'completed'
                 report.processing_completed_at = timezone.now()
@@ -309,9 +342,13 @@ class ReportViewSet(viewsets.ModelViewSet):
                     'analysis_data',
                     'status',
                     'processing_completed_at',
-                    'error_message'
+                    'error_message',
+                    *Report.SUMMARY_FIELDS,
                 ])
 
+            # The replica may not have the new rows yet; the user reads from the primary for a while
+            pin_primary_reads(report.created_by_id)
+
             logger.info(
                 f"CSV processing completed for report {report.id} - "
                 f"{len(recommendations_data)} recommendations created"
@@ -451,6 +488,7 @@ class ReportViewSet(viewsets.ModelViewSet):
         - category: Filter by category
         - business_impact: Filter by impact level
         - min_savings: Minimum potential savings
+        - top: Only the N highest-priority recommendations
 
         Response:
         {
@@ -486,6 +524,13 @@ class ReportViewSet(viewsets.ModelViewSet):
                 logger.warning(f"Invalid min_savings value: {min_savings}")
                 pass
 
+        top = request.query_params.get('top')
+        if top:
+            try:
+                recommendations = recommendations.order_by('-priority_score', '-potential_savings')[:max(int(top), 0)]
+            except ValueError:
+                logger.warning(f"Invalid top value: {top}")
+
         # Serialize
         serializer = RecommendationListSerializer(recommendations, many=True)
 
@@ -503,6 +548,113 @@ class ReportViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
 
+    @action(detail=True, methods=['get'], url_path='diff')
+    def diff(self, request, pk=None):
+        """
+        Compare a report with an earlier report of the same client.
+
+        GET /api/v1/reports/{id}/diff/?base={report-id}
+
+        Query params:
+        - base: Report to compare with (default: the client's previous completed report)
+        - limit: Recommendations listed per set (default: 100, max: 1000)
+
+        Response:
+        {
+            "status": "success",
+            "data": {
+                "base_report": {...},
+                "report": {...},
+                "summary": {
+                    "new_count": 12,
+                    "resolved_count": 30,
+                    "unchanged_count": 410,
+                    "new_savings": 5400.0,
+                    "resolved_savings": 12800.0,
+                    "unchanged_savings_delta": -150.0,
+                    "base_total_savings": 98000.0,
+                    "current_total_savings": 90450.0,
+                    "savings_delta": -7550.0
+                },
+                "new": [...],
+                "resolved": [...],
+                "unchanged": [...]
+            }
+        }
+        """
+        # Without the viewset's recommendations prefetch: the diff runs in the database
+        reports = self.get_queryset().prefetch_related(None).using(choose_read_alias(request.user))
+        report = get_object_or_404(reports, pk=pk)
+        self.check_object_permissions(request, report)
+
+        try:
+            limit = max(0, min(int(request.query_params.get('limit', DEFAULT_ROW_LIMIT)), 1000))
+        except ValueError:
+            limit = DEFAULT_ROW_LIMIT
+
+        base_id = request.query_params.get('base')
+        if base_id:
+            try:
+                base = reports.filter(pk=uuid.UUID(base_id)).first()
+            except ValueError:
+                base = None
+            if base is None:
+                return Response(
+                    {
+                        'status': 'error',
+                        'message': f'Base report {base_id} not found',
+                    },
+                    status=status.HTTP_404_NOT_FOUND
+                )
+        else:
+            base = previous_report(report, using=reports.db)
+            if base is None:
+                return Response(
+                    {
+                        'status': 'error',
+                        'message': 'No earlier completed report of this client to compare with',
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        if base.pk == report.pk or base.client_id != report.client_id:
+            return Response(
+                {
+                    'status': 'error',
+                    'message': 'Base report must be another report of the same client',
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        diff = diff_reports(base, report, limit=limit, using=reports.db)
+
+        def describe(value):
+            return {
+                'id': str(value.id),
+                'title': value.title,
+                'report_type': value.report_type,
+                'status': value.status,
+                'created_at': value.created_at,
+            }
+
+        return Response(
+            {
+                'status': 'success',
+                'data': {
+                    'base_report': describe(base),
+                    'report': describe(report),
+                    'summary': {
+                        key: float(value) if isinstance(value, Decimal) else value
+                        for key, value in diff['summary'].items()
+                    },
+                    'new': RecommendationListSerializer(diff['new'], many=True).data,
+                    'resolved': RecommendationListSerializer(diff['resolved'], many=True).data,
+                    'unchanged': RecommendationListSerializer(diff['unchanged'], many=True).data,
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+
     @action(detail=True, methods=['post'], url_path='generate')
     def generate_report(self, request, pk=None):
         """
@@ -523,6 +675,7 @@ class ReportViewSet(viewsets.ModelViewSet):
             "data": {
                 "report_id": "uuid",
                 "task_id": "celery-task-id",
+                "deduplicated": false,  # true if attached to an in-flight task
                 "status_url": "/api/v1/reports/{id}/status/"
             }
         }
@@ -541,8 +694,15 @@ class ReportViewSet(viewsets.ModelViewSet):
         """
         report = self.get_object()
 
-        # Validate report state
-        if report.status != 'completed':
+        # A report left in 'generating' by a dead worker can be generated again
+        recover_stale_generation(report)
+
+        # Get parameters
+        format_type = request.data.get('format', 'both')
+        async_mode = request.data.get('async', True)
+
+        # Validate report state ('generating' requests attach to the in-flight task)
+        if report.status != 'completed' and not (report.status == 'generating' and async_mode):
             return Response(
                 {
                     'status': 'error',
@@ -551,7 +711,7 @@ class ReportViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if report.recommendations.count() == 0:
+        if report.recommendation_count == 0:
             return Response(
                 {
                     'status': 'error',
@@ -560,10 +720,6 @@ class ReportViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get parameters
-        format_type = request.data.get('format', 'both')
-        async_mode = request.data.get('async', True)
-
         if format_type not in ['html', 'pdf', 'both']:
             return Response(
                 {
@@ -578,18 +734,23 @@ class ReportViewSet(viewsets.ModelViewSet):
             if async_mode:
                 logger.info(f"Starting async report generation for {report.id} (format: {format_type})")
 
-                # Trigger Celery task
-                task = generate_report_task.delay(str(report.id), format_type=format_type)
+                # Trigger Celery task, or attach to the one already generating this report
+                dispatch = dispatch_report_generation(report.id, format_type=format_type)
+                task_id = dispatch['task_id']
 
                 return Response(
                     {
                         'status': 'success',
-                        'message': 'Report generation started',
+                        'message': (
+                            'Report generation already in progress'
+                            if dispatch['deduplicated'] else 'Report generation started'
+                        ),
                         'data': {
                             'report_id': str(report.id),
-                            'task_id': task.id,
+                            'task_id': task_id,
+                            'deduplicated': dispatch['deduplicated'],
                             'status_url': request.build_absolute_uri(
-                                f'/api/v1/reports/{report.id}/status/?task_id={task.id}'
+                                f'/api/v1/reports/{report.id}/status/?task_id={task_id}'
                             )
                         }
                     },
@@ -665,14 +826,21 @@ class ReportViewSet(viewsets.ModelViewSet):
                 "report_status": "completed",
                 "task_id": "celery-task-id",
                 "task_state": "SUCCESS",
-                "task_result": {...}
+                "task_result": {...},
+                "generation_tasks": {"html": "celery-task-id"}  # in-flight generation, if any
             }
         }
+
+        Without task_id, the in-flight generation task shared by all
+        requesters of this report is reported.
         """
         report = self.get_object()
 
-        # Get task_id from query params
+        # Get task_id from query params, defaulting to the shared generation task
+        generation_tasks = get_generation_task_ids(report.id)
         task_id = request.query_params.get('task_id')
+        if not task_id and generation_tasks:
+            task_id = next(iter(generation_tasks.values()))
 
         response_data = {
             'report_id': str(report.id),
@@ -713,6 +881,9 @@ class ReportViewSet(viewsets.ModelViewSet):
                 logger.error(f"Error getting task status for {task_id}: {str(e)}")
                 response_data['task_error'] = f'Could not retrieve task status: {str(e)}'
 
+        if generation_tasks:
+            response_data['generation_tasks'] = generation_tasks
+
         # Add download URLs if files are ready
         if report.html_file:
             response_data['html_url'] = request.build_absolute_uri(
@@ -930,7 +1101,8 @@ class ReportViewSet(viewsets.ModelViewSet):
         from datetime import datetime, timedelta
         from django.utils import timezone
 
-        queryset = self.filter_queryset(self.get_queryset())
+        # Read-only aggregates over every report: served by the read replica
+        queryset = self.filter_queryset(self.get_queryset()).using(choose_read_alias(request.user))
 
         # Get current month start and end
         now = timezone.now()
@@ -1069,7 +1241,7 @@ class ReportViewSet(viewsets.ModelViewSet):
         from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
         from datetime import datetime, timedelta
 
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = self.filter_queryset(self.get_queryset()).using(choose_read_alias(request.user))
         granularity = request.query_params.get('granularity', 'day')
 
         # Select truncation function based on granularity
@@ -1168,7 +1340,11 @@ class ReportViewSet(viewsets.ModelViewSet):
         import csv
         from io import StringIO
 
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .select_related('client', 'created_by')
+            .using(choose_read_alias(request.user))
+        )
 
         # Create CSV
         output = StringIO()
@@ -1278,8 +1454,12 @@ class ReportViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            # Create the recommendations
-            created_recommendations = serializer.save()
+            # Create the recommendations and update the report summary
+            with transaction.atomic():
+                created_recommendations = serializer.save()
+                update_search_vectors(report.id)
+                report.refresh_summary()
+            pin_primary_reads(request.user)
 
             logger.info(
                 f"Added {len(created_recommendations)} manual recommendations to report {report.id} "
@@ -1287,7 +1467,7 @@ class ReportViewSet(viewsets.ModelViewSet):
             )
 
             # Get updated totals
-            total_recommendations = report.recommendations.count()
+            total_recommendations = report.recommendation_count
             total_savings = report.total_potential_savings
 
             return Response(
@@ -1329,12 +1509,12 @@ class RecommendationViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['report', 'category', 'business_impact']
     search_fields = ['recommendation', 'resource_name', 'resource_type']
-    ordering_fields = ['potential_savings', 'advisor_score_impact', 'created_at']
+    ordering_fields = ['priority_score', 'potential_savings', 'advisor_score_impact', 'created_at']
     ordering = ['-potential_savings']
 
     def get_queryset(self):
         """Filter queryset based on user permissions."""
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().exclude(report__status='deleting')
 
         # Filter by report if specified
         report_id = self.request.query_params.get('report_id')
@@ -1343,6 +1523,83 @@ class RecommendationViewSet(viewsets.ReadOnlyModelViewSet):
 
         return queryset
 
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """
+        Full-text search across the recommendations of all reports.
+
+        GET /api/v1/reports/recommendations/search/?q=reserved+instances
+
+        Query params:
+        - q: Search text (required; "quoted phrase", or, -excluded)
+        - client: Filter by client ID
+        - category: Filter by category
+        - date_from: Reports created on or after (YYYY-MM-DD)
+        - date_to: Reports created on or before (YYYY-MM-DD)
+
+        Returns paginated matches, most relevant first, each with its
+        report, client and rank.
+        """
+        params = request.query_params
+        text = params.get('q', '').strip()
+        if not text:
+            return Response(
+                {
+                    'status': 'error',
+                    'message': 'Query parameter "q" is required',
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.get_queryset()
+
+        if params.get('client'):
+            try:
+                client_id = uuid.UUID(params['client'])
+            except ValueError:
+                return Response(
+                    {
+                        'status': 'error',
+                        'message': 'Invalid client. Use a client ID',
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = queryset.filter(report__client_id=client_id)
+        if params.get('category'):
+            queryset = queryset.filter(category=params['category'])
+
+        date_filters = (
+            ('date_from', 'report__created_at__date__gte'),
+            ('date_to', 'report__created_at__date__lte'),
+        )
+        for param, lookup in date_filters:
+            if not params.get(param):
+                continue
+            try:
+                value = parse_date(params[param])
+            except ValueError:
+                value = None
+            if value is None:
+                return Response(
+                    {
+                        'status': 'error',
+                        'message': f'Invalid {param}. Use YYYY-MM-DD',
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = queryset.filter(**{lookup: value})
+
+        # Read-only: served by the read replica
+        queryset = search_recommendations(queryset.using(choose_read_alias(request.user)), text)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = RecommendationSearchResultSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = RecommendationSearchResultSerializer(queryset, many=True)
+        return Response(serializer.data)
+
 
 class ReportTemplateViewSet(viewsets.ModelViewSet):
     """
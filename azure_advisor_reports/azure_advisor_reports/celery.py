@@ -1,22 +1,29 @@
 """
 Celery configuration for azure_advisor_reports project.
 
-Production Configuration:
-- Uses gevent pool for better concurrency with I/O-bound tasks
-- 4 concurrent greenlets per worker (configurable via worker_concurrency)
-- Auto-scaling: 2-5 worker replicas in Azure Container Apps
-- Effective concurrency: 8-20 tasks simultaneously (2-5 workers × 4 greenlets)
+Worker Topology:
+- CPU-bound queues (priority, reports) run on a prefork pool: pandas CSV
+  parsing, Playwright and WeasyPrint block the gevent hub and would stall
+  every other greenlet on the worker.
+- I/O-bound queues (azure_api, default) run on a gevent pool.
+- A worker started with a gevent/eventlet pool that consumes a CPU-bound
+  queue refuses to start (see check_worker_topology).
+
+    celery -A azure_advisor_reports worker -P prefork -Q priority,reports -c 2 -n cpu@%h
+    celery -A azure_advisor_reports worker -P gevent -Q azure_api,default -c 50 -n io@%h
 
 Windows Development Notes:
 - On Windows, use 'solo' pool: celery -A azure_advisor_reports worker -l info -P solo
 - Or use gevent pool: celery -A azure_advisor_reports worker -l info -P gevent
 - Default pool (prefork) doesn't work on Windows
+- The gevent pool is I/O only: add -Q azure_api,default when using it
 """
 
 import os
 import sys
 from celery import Celery
-from celery.signals import worker_process_init
+from celery.exceptions import ImproperlyConfigured
+from celery.signals import worker_init, worker_process_init
 from kombu import Exchange, Queue
 
 # Set the default Django settings module for the 'celery' program.
@@ -41,6 +48,16 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+# Queues by workload type; each group runs on its own worker pool
+CPU_BOUND_QUEUES = ('priority', 'reports')
+IO_BOUND_QUEUES = ('azure_api', 'default')
+GREEN_POOLS = ('gevent', 'eventlet')
+
+# Prefetch per pool: CPU tasks are long and acked late, so each process reserves
+# one task at a time; greenlets prefetch a few so API waits overlap.
+CPU_POOL_PREFETCH_MULTIPLIER = 1
+IO_POOL_PREFETCH_MULTIPLIER = 4
+
 # Configure task queues
 app.conf.task_queues = (
     Queue('default', Exchange('default'), routing_key='default'),
@@ -55,11 +72,17 @@ app.conf.task_routes = {
     'apps.reports.tasks.*': {'queue': 'reports'},
     'apps.reports.tasks.process_csv_file': {'queue': 'priority', 'priority': 9},
     'apps.reports.tasks.generate_report': {'queue': 'reports', 'priority': 8},
+    'apps.reports.tasks.purge_report': {'queue': 'reports', 'priority': 2},
+    'apps.reports.tasks.delete_report_files': {'queue': 'reports', 'priority': 2},
 
     # Azure integration tasks
     'apps.azure_integration.tasks.fetch_azure_recommendations': {'queue': 'azure_api', 'priority': 9},
+    'apps.azure_integration.tasks.fetch_multi_subscription_recommendations': {'queue': 'azure_api', 'priority': 9},
     'apps.azure_integration.tasks.test_azure_connection': {'queue': 'azure_api', 'priority': 7},
     'apps.azure_integration.tasks.sync_azure_statistics': {'queue': 'azure_api', 'priority': 5},
+    'apps.azure_integration.tasks.sync_subscription_state': {'queue': 'azure_api', 'priority': 5},
+    'apps.azure_integration.tasks.schedule_subscription_sync': {'queue': 'azure_api', 'priority': 5},
+    'apps.azure_integration.tasks.record_subscription_sync_wave': {'queue': 'azure_api', 'priority': 5},
     'apps.azure_integration.tasks.generate_azure_report': {'queue': 'reports', 'priority': 8},
 }
 
@@ -86,11 +109,10 @@ app.conf.update(
         'visibility_timeout': 3600,
     },
 
-    # Worker configuration
-    worker_prefetch_multiplier=4,  # Increased for gevent pool (4 concurrent tasks per worker)
+    # Worker configuration (pool and queues are chosen per worker, see module docstring)
+    worker_prefetch_multiplier=IO_POOL_PREFETCH_MULTIPLIER,  # Lowered for CPU pools in configure_worker_pool
     worker_max_tasks_per_child=1000,
-    worker_pool='gevent',  # Use gevent pool for better concurrency with I/O-bound tasks
-    worker_concurrency=4,  # Number of concurrent greenlets per worker
+    worker_pool='prefork',
 
     # Broker settings
     broker_connection_retry_on_startup=True,
@@ -102,7 +124,58 @@ app.conf.update(
     worker_pool_restarts=True,
 )
 
+def is_green_pool(pool_cls):
+    """Return True if ``pool_cls`` (alias, import path or class) is gevent/eventlet."""
+    name = pool_cls if isinstance(pool_cls, str) else pool_cls.__module__
+    return any(green in name.lower() for green in GREEN_POOLS)
+
+
+def check_worker_topology(pool_cls, queues):
+    """
+    Refuse CPU-bound queues on a green pool.
+
+    Raises:
+        ImproperlyConfigured: If a gevent/eventlet worker consumes a CPU-bound queue
+    """
+    cpu_queues = sorted(set(queues) & set(CPU_BOUND_QUEUES))
+    if is_green_pool(pool_cls) and cpu_queues:
+        raise ImproperlyConfigured(
+            f"CPU-bound queues {cpu_queues} cannot run on a gevent/eventlet pool: "
+            f"start this worker with -Q {','.join(IO_BOUND_QUEUES)} and run "
+            f"{','.join(CPU_BOUND_QUEUES)} on a prefork worker"
+        )
+
+
 # Signal handlers
+@worker_init.connect
+def configure_worker_pool(sender=None, **kwargs):
+    """
+    Validate the worker's pool against its queues and tune prefetch for it.
+
+    Runs once in the main worker process, after queue selection (-Q) and
+    before the consumer is created.
+    """
+    import logging
+
+    logger = logging.getLogger('celery.worker')
+    queues = list(sender.app.amqp.queues.consume_from)
+
+    try:
+        check_worker_topology(sender.pool_cls, queues)
+    except ImproperlyConfigured as e:
+        logger.critical("Refusing to start worker: %s", e)
+        # Exceptions from signal handlers are swallowed, SystemExit is not
+        raise SystemExit(str(e))
+
+    if not is_green_pool(sender.pool_cls):
+        sender.prefetch_multiplier = CPU_POOL_PREFETCH_MULTIPLIER
+
+    logger.info(
+        "Worker pool %s consuming %s (concurrency=%s, prefetch_multiplier=%s)",
+        sender.pool_cls, ','.join(queues), sender.concurrency, sender.prefetch_multiplier,
+    )
+
+
 @worker_process_init.connect
 def configure_workers(sender=None, conf=None, **kwargs):
     """
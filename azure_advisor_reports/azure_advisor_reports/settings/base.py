@@ -7,6 +7,7 @@ Environment-specific settings should be in development.py, staging.py, or produc
 
 import os
 from pathlib import Path
+from celery.schedules import crontab
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -50,6 +51,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static file serving
+    'apps.core.query_recorder.QueryRecorderMiddleware',  # Sampled query statistics
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -191,6 +193,85 @@ CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 
+# Azure AD signing key (JWKS) cache - see apps/authentication/jwks.py
+AZURE_AD_JWKS_CACHE_TTL = config('AZURE_AD_JWKS_CACHE_TTL', default=6 * 60 * 60, cast=int)  # 6 hours
+AZURE_AD_JWKS_REFRESH_INTERVAL = config('AZURE_AD_JWKS_REFRESH_INTERVAL', default=60, cast=int)  # Min seconds between forced refreshes
+AZURE_AD_JWKS_MAX_STALE = config('AZURE_AD_JWKS_MAX_STALE', default=24 * 60 * 60, cast=int)  # Serve stale keys if Azure AD is unreachable
+AZURE_AD_JWKS_RETRY_AFTER = config('AZURE_AD_JWKS_RETRY_AFTER', default=60, cast=int)  # Seconds without refresh attempts after a failure
+
+# JWT authentication cache - see apps/authentication/cache.py
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=60, cast=int)  # Seconds an authenticated user stays cached
+
+# Report generation leases - see apps/reports/leases.py
+REPORT_GENERATION_LEASE_TTL = config('REPORT_GENERATION_LEASE_TTL', default=20 * 60, cast=int)  # Must exceed the generate_report time limit
+
+# Report deletion - see apps/reports/services/deletion.py
+REPORT_DELETE_BATCH_SIZE = config('REPORT_DELETE_BATCH_SIZE', default=5000, cast=int)  # Recommendations per DELETE statement
+REPORT_DELETE_BATCHES_PER_RUN = config('REPORT_DELETE_BATCHES_PER_RUN', default=20, cast=int)  # Then the purge task re-queues itself
+REPORT_DELETE_BATCH_PAUSE = config('REPORT_DELETE_BATCH_PAUSE', default=0.05, cast=float)  # Seconds between batches
+REPORT_DELETE_STALL_TIMEOUT = config('REPORT_DELETE_STALL_TIMEOUT', default=60 * 60, cast=int)  # Idle deletions the cleanup resumes
+
+# Read replica for analytics, history and export reads - see apps/core/db_routing.py
+DATABASE_ROUTERS = ['apps.core.db_routing.ReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica'  # Used only if an environment configures it in DATABASES
+DATABASE_REPLICA_ENABLED = config('DATABASE_REPLICA_ENABLED', default=True, cast=bool)
+DATABASE_REPLICA_MAX_LAG = config('DATABASE_REPLICA_MAX_LAG', default=10, cast=float)  # Seconds; a replica further behind is skipped
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = config('DATABASE_REPLICA_LAG_CHECK_INTERVAL', default=5, cast=int)  # Seconds the measured lag is cached
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=30, cast=int)  # Primary reads for a user after their report completes
+
+# Sampled query recording - see apps/core/query_recorder.py
+QUERY_RECORDER_SAMPLE_RATE = config('QUERY_RECORDER_SAMPLE_RATE', default=0.01, cast=float)  # Share of requests and tasks recorded; 0 disables
+QUERY_RECORDER_SLOW_MS = config('QUERY_RECORDER_SLOW_MS', default=500, cast=float)  # Queries at least this slow are kept individually
+QUERY_RECORDER_N_PLUS_ONE_THRESHOLD = config('QUERY_RECORDER_N_PLUS_ONE_THRESHOLD', default=10, cast=int)  # Repeats of one fingerprint per request/task
+QUERY_RECORDER_MAX_FINGERPRINTS = config('QUERY_RECORDER_MAX_FINGERPRINTS', default=500, cast=int)
+QUERY_RECORDER_RETENTION = config('QUERY_RECORDER_RETENTION', default=24 * 60 * 60, cast=int)  # Seconds the aggregate is kept
+
+# Recommendation inserts - see apps/reports/services/bulk_loader.py
+RECOMMENDATION_COPY_ENABLED = config('RECOMMENDATION_COPY_ENABLED', default=True, cast=bool)  # PostgreSQL COPY instead of bulk_create
+
+# Azure Advisor API - see apps/azure_integration/services/
+AZURE_ARM_ENDPOINT = config('AZURE_ARM_ENDPOINT', default='https://management.azure.com')  # Override for sovereign clouds or a local fake
+AZURE_ADVISOR_MAX_CONCURRENT_REQUESTS = config('AZURE_ADVISOR_MAX_CONCURRENT_REQUESTS', default=8, cast=int)  # Per worker process
+AZURE_ADVISOR_STATE_MAX_AGE = config('AZURE_ADVISOR_STATE_MAX_AGE', default=60 * 60, cast=int)  # Delta-sync reports reuse state younger than this
+AZURE_CLIENT_REGISTRY_SIZE = config('AZURE_CLIENT_REGISTRY_SIZE', default=256, cast=int)  # Subscriptions whose SDK clients each worker keeps warm
+
+# Azure API rate limits shared by all workers - see services/rate_limiter.py
+AZURE_RATELIMIT_TENANT_BURST = config('AZURE_RATELIMIT_TENANT_BURST', default=100, cast=int)
+AZURE_RATELIMIT_TENANT_RATE = config('AZURE_RATELIMIT_TENANT_RATE', default=10, cast=float)  # Requests per second
+AZURE_RATELIMIT_SUBSCRIPTION_BURST = config('AZURE_RATELIMIT_SUBSCRIPTION_BURST', default=50, cast=int)
+AZURE_RATELIMIT_SUBSCRIPTION_RATE = config('AZURE_RATELIMIT_SUBSCRIPTION_RATE', default=5, cast=float)  # Requests per second
+AZURE_RATELIMIT_RESERVE = config('AZURE_RATELIMIT_RESERVE', default=10, cast=int)  # ARM reads left untouched per window
+AZURE_RATELIMIT_MAX_WAIT = config('AZURE_RATELIMIT_MAX_WAIT', default=2.0, cast=float)  # Longer waits re-queue the task
+AZURE_THROTTLE_MAX_RESCHEDULES = config('AZURE_THROTTLE_MAX_RESCHEDULES', default=10, cast=int)
+
+# Scheduled sync of all subscriptions - see services/scheduled_sync.py
+AZURE_SYNC_MAX_AGE = config('AZURE_SYNC_MAX_AGE', default=20 * 60 * 60, cast=int)  # Subscriptions synced longer ago are due
+AZURE_SYNC_WAVE_SIZE = config('AZURE_SYNC_WAVE_SIZE', default=20, cast=int)  # Syncs in flight at once
+AZURE_SYNC_TENANT_STAGGER = config('AZURE_SYNC_TENANT_STAGGER', default=5, cast=int)  # Seconds between syncs of one tenant in a wave
+AZURE_SYNC_RUN_TIMEOUT = config('AZURE_SYNC_RUN_TIMEOUT', default=6 * 60 * 60, cast=int)  # Lease of a run that never finishes
+
+# Installed into the DatabaseScheduler when Beat starts
+CELERY_BEAT_SCHEDULE = {
+    'azure-nightly-subscription-sync': {
+        'task': 'apps.azure_integration.tasks.schedule_subscription_sync',
+        'schedule': crontab(
+            hour=config('AZURE_SYNC_SCHEDULE_HOUR', default=2, cast=int),
+            minute=config('AZURE_SYNC_SCHEDULE_MINUTE', default=0, cast=int),
+        ),
+        'kwargs': {'mode': 'state'},
+        'options': {'expires': 60 * 60},
+    },
+}
+
+# Per-module log levels, layered over each environment's LOGGING['loggers'].
+# Request and per-row hot paths default to WARNING; raise to DEBUG to trace them.
+LOG_LEVELS = {
+    'apps.authentication.authentication': config('LOG_LEVEL_AUTHENTICATION', default='WARNING'),
+    'apps.authentication.middleware': config('LOG_LEVEL_AUTH_MIDDLEWARE', default='INFO'),
+    'apps.reports.services.csv_processor': config('LOG_LEVEL_CSV_PROCESSOR', default='INFO'),
+    'apps.reports.services.reservation_analyzer': config('LOG_LEVEL_RESERVATION_ANALYZER', default='WARNING'),
+}
+
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
@@ -6,6 +6,7 @@ Use this for local development only.
 """
 
 from .base import *
+from .base import LOG_LEVELS
 from decouple import config
 
 # ============================================================================
@@ -181,6 +182,8 @@ LOGGING = {
     },
 }
 
+LOGGING['loggers'].update({name: {'level': level} for name, level in LOG_LEVELS.items()})
+
 # ============================================================================
 # DEVELOPMENT TOOLS
 # ============================================================================
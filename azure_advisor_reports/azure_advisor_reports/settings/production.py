@@ -8,6 +8,7 @@ IMPORTANT: All sensitive values must be set via environment variables.
 """
 
 from .base import *
+from .base import LOG_LEVELS
 from decouple import config
 import dj_database_url
 
@@ -153,6 +154,33 @@ if not DATABASES['default'].get('NAME'):
         "DB_NAME/DB_USER/DB_PASSWORD/DB_HOST environment variables."
     )
 
+# Optional read replica (Azure PostgreSQL read replica) for analytics, history
+# and export reads - see apps/core/db_routing.py. Without it everything reads
+# from the primary.
+replica_database_url = os.environ.get('DATABASE_REPLICA_URL')
+replica_host = os.environ.get('DB_REPLICA_HOST')
+
+if replica_database_url:
+    DATABASES['replica'] = dj_database_url.parse(
+        replica_database_url,
+        conn_max_age=600,
+        conn_health_checks=True,
+    )
+    DATABASES['replica'].setdefault('OPTIONS', {})
+    DATABASES['replica']['OPTIONS']['sslmode'] = 'require'
+    DATABASES['replica']['OPTIONS']['connect_timeout'] = 10
+elif replica_host:
+    # Same credentials and database as the primary, different server
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default'].get('PORT', '5432')),
+    }
+
+if 'replica' in DATABASES:
+    # Read-only; a request transaction on it would only hold a snapshot open
+    DATABASES['replica']['ATOMIC_REQUESTS'] = False
+
 # ============================================================================
 # CACHE CONFIGURATION - Azure Redis
 # ============================================================================
@@ -320,6 +348,8 @@ LOGGING = {
     },
 }
 
+LOGGING['loggers'].update({name: {'level': level} for name, level in LOG_LEVELS.items()})
+
 # ============================================================================
 # EMAIL CONFIGURATION (for error notifications)
 # ============================================================================
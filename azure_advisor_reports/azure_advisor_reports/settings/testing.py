@@ -28,9 +28,22 @@ DATABASES = {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
         'ATOMIC_REQUESTS': True,
-    }
+    },
+    # Second alias for the read-replica routing tests: a test mirror of
+    # default, so it sees the same data (apps/core/tests/test_db_routing.py)
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+# Other tests only declare the default database, so reads stay on it
+DATABASE_REPLICA_ENABLED = False
+
+# Deterministic query counts; the recorder tests sample explicitly
+QUERY_RECORDER_SAMPLE_RATE = 0
+
 # ============================================================================
 # CACHE CONFIGURATION - Local Memory Cache for Testing
 # ============================================================================
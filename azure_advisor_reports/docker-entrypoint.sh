@@ -47,18 +47,33 @@ python manage.py collectstatic --no-input --clear
 echo "Setting up cache table..."
 python manage.py createcachetable || true
 
-# Start Celery Worker in background
-echo "Starting Celery worker..."
+# Start Celery workers in background: CPU-bound queues on a prefork pool,
+# I/O-bound queues on a gevent pool (see azure_advisor_reports/celery.py)
+echo "Starting Celery CPU worker..."
 celery -A azure_advisor_reports worker \
     --loglevel=${CELERY_LOG_LEVEL:-info} \
-    --concurrency=${CELERY_CONCURRENCY:-2} \
+    --queues=priority,reports \
+    --hostname=cpu@%h \
+    --pool=prefork \
+    --concurrency=${CELERY_CPU_CONCURRENCY:-2} \
     --max-tasks-per-child=${CELERY_MAX_TASKS_PER_CHILD:-100} \
-    --pool=threads \
     &
 
 # Store Celery PID
 CELERY_PID=$!
 
+echo "Starting Celery I/O worker..."
+celery -A azure_advisor_reports worker \
+    --loglevel=${CELERY_LOG_LEVEL:-info} \
+    --queues=azure_api,default \
+    --hostname=io@%h \
+    --pool=gevent \
+    --concurrency=${CELERY_IO_CONCURRENCY:-50} \
+    &
+
+# Store Celery I/O worker PID
+CELERY_IO_PID=$!
+
 # Start Celery Beat scheduler in background (for periodic tasks)
 echo "Starting Celery beat scheduler..."
 celery -A azure_advisor_reports beat \
@@ -73,9 +88,10 @@ BEAT_PID=$!
 shutdown() {
     echo "Shutting down services..."
     kill -TERM $CELERY_PID 2>/dev/null
+    kill -TERM $CELERY_IO_PID 2>/dev/null
     kill -TERM $BEAT_PID 2>/dev/null
     kill -TERM $GUNICORN_PID 2>/dev/null
-    wait $CELERY_PID $BEAT_PID $GUNICORN_PID
+    wait $CELERY_PID $CELERY_IO_PID $BEAT_PID $GUNICORN_PID
     exit 0
 }
 
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Azure Sync Pipeline Load Benchmark for Azure Advisor Reports
+
+Runs fetch_azure_recommendations end to end against a local fake of the ARM
+Advisor API (apps/azure_integration/tests/fake_advisor.py) for each data
+volume and reports:
+
+- throughput: recommendations per second for the whole task
+- peak memory: Python allocations traced by tracemalloc during the run
+- insert rate: rows per second spent in _save_recommendations_to_db
+
+The run uses a throwaway test database of the selected settings module,
+with tables created from the models (in-memory SQLite with the default
+testing settings; point
+DJANGO_SETTINGS_MODULE at a PostgreSQL configuration for realistic insert
+rates). The shared API rate limits are lifted unless --ratelimit is given,
+so the numbers measure the pipeline rather than the configured quotas.
+
+Usage:
+    python scripts/benchmark_advisor_sync.py [--sizes 1000 10000 100000] [--page-size 1000]
+        [--latency 0.0] [--throttle 3 7] [--retry-after 1] [--ratelimit]
+"""
+
+import argparse
+import os
+import sys
+
+import django
+
+# Setup Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'azure_advisor_reports.settings.testing')
+django.setup()
+
+from unittest.mock import patch
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from apps.azure_integration.services import azure_advisor_service
+from apps.azure_integration.tests.fake_advisor import FakeAdvisorServer, FakeTokenCredential
+from apps.azure_integration.tests.load_harness import make_load_report, run_fetch
+from apps.clients.models import Client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds per page request')
+    parser.add_argument('--throttle', type=int, nargs='*', default=[], help='Request numbers answered with 429')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--ratelimit', action='store_true', help='Keep the configured API rate limits')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    # Tables from the models, like pytest --nomigrations (some migrations are PostgreSQL-only)
+    settings.MIGRATION_MODULES = {app.label: None for app in apps.get_app_configs()}
+    old_name = connection.creation.create_test_db(verbosity=0)
+    server = FakeAdvisorServer({}).start()
+    settings.AZURE_ARM_ENDPOINT = server.url
+    os.environ['REQUESTS_CA_BUNDLE'] = server.ca_bundle
+    if not args.ratelimit:
+        settings.AZURE_RATELIMIT_TENANT_BURST = settings.AZURE_RATELIMIT_SUBSCRIPTION_BURST = 10 ** 6
+        settings.AZURE_RATELIMIT_TENANT_RATE = settings.AZURE_RATELIMIT_SUBSCRIPTION_RATE = 10 ** 6
+
+    try:
+        client = Client.objects.create(company_name='Load Test Corp', contact_email='load@example.com')
+        user = get_user_model().objects.create_user(
+            username='loadtest', email='load@example.com', password='load-test-password'
+        )
+
+        with patch.object(azure_advisor_service, 'ClientSecretCredential', return_value=FakeTokenCredential()):
+            for size in args.sizes:
+                cache.clear()
+                report = make_load_report(
+                    server, client, user, size,
+                    page_size=args.page_size,
+                    latency=args.latency,
+                    throttle_requests=tuple(args.throttle),
+                    retry_after=args.retry_after,
+                )
+                metrics = run_fetch(report, server)
+                print(metrics.format(f'{size // 1000}k' if size >= 1000 else str(size)), flush=True)
+                report.delete()
+    finally:
+        server.stop()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
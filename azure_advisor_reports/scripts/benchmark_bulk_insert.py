@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Recommendation Bulk Insert Benchmark for Azure Advisor Reports
+
+Inserts synthetic normalized recommendations (see
+apps/reports/services/normalization.py) for each data volume and reports
+rows per second of:
+
+- bulk_create: model instances inserted in batches of BULK_CREATE_BATCH_SIZE
+- copy: COPY ... FROM STDIN in chunks of COPY_CHUNK_ROWS (PostgreSQL only)
+
+The run uses a throwaway test database of the selected settings module, with
+tables created from the models. COPY is skipped on other databases; point
+DJANGO_SETTINGS_MODULE at a PostgreSQL configuration to compare both.
+
+Usage:
+    python scripts/benchmark_bulk_insert.py [--sizes 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import django
+
+# Setup Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'azure_advisor_reports.settings.testing')
+django.setup()
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from apps.clients.models import Client
+from apps.reports.models import Report
+from apps.reports.services import bulk_loader
+from apps.reports.services.normalization import api_batch, normalize_batch
+
+
+def make_columns(size):
+    """Normalized column arrays of `size` API-shaped recommendations."""
+    categories = ['Cost', 'Security', 'HighAvailability', 'Performance', 'OperationalExcellence']
+    impacts = ['High', 'Medium', 'Low']
+    records = [
+        {
+            'category': categories[i % len(categories)],
+            'impact': impacts[i % len(impacts)],
+            'impacted_resource': f'vm-{i}',
+            'resource_group': f'rg-{i % 50}',
+            'resource_type': 'Microsoft.Compute/virtualMachines',
+            'recommendation': f'Right-size or shutdown underutilized virtual machine {i}',
+            'potential_benefits': 'Save money',
+            'potential_savings': (i % 1000) * 1.5,
+            'currency': 'USD',
+            'subscription_id': '00000000-0000-0000-0000-000000000000',
+            'subscription_name': 'Benchmark',
+        }
+        for i in range(size)
+    ]
+    return normalize_batch(api_batch(records), source='azure_api')
+
+
+def measure(report, columns, method, repeat):
+    """Best rows per second of `repeat` runs of one insert method."""
+    best = 0.0
+    for _ in range(repeat):
+        report.recommendations.all().delete()
+        started = time.perf_counter()
+        if method == 'copy':
+            loaded = bulk_loader._copy(report, columns)
+        else:
+            with override_settings(RECOMMENDATION_COPY_ENABLED=False):
+                loaded = bulk_loader.load_recommendations(report, columns)
+        best = max(best, loaded / (time.perf_counter() - started))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per method; the best is reported')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    # Tables from the models, like pytest --nomigrations (some migrations are PostgreSQL-only)
+    settings.MIGRATION_MODULES = {app.label: None for app in apps.get_app_configs()}
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        client = Client.objects.create(company_name='Benchmark Corp', contact_email='bench@example.com')
+        user = get_user_model().objects.create_user(
+            username='benchmark', email='bench@example.com', password='benchmark-password'
+        )
+        report = Report.objects.create(client=client, created_by=user, data_source='azure_api')
+
+        copy_available = connection.vendor == 'postgresql'
+        if not copy_available:
+            print(f"COPY skipped: database vendor is {connection.vendor}, not postgresql")
+
+        for size in args.sizes:
+            columns = make_columns(size)
+            label = f'{size // 1000}k' if size >= 1000 else str(size)
+            line = f"{label:<8} bulk_create {measure(report, columns, 'bulk_create', args.repeat):9.0f} rows/s"
+            if copy_available:
+                line += f"  copy {measure(report, columns, 'copy', args.repeat):9.0f} rows/s"
+            print(line, flush=True)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""
+Celery Worker Pool Benchmark for Azure Advisor Reports
+
+Compares throughput of a mixed workload on the two worker topologies:
+
+- single-gevent: every queue on one gevent pool (concurrency 4), the
+  previous default
+- split: CPU tasks on a prefork pool, I/O tasks on a gevent pool, as
+  configured in azure_advisor_reports/celery.py
+
+CPU tasks parse a generated Azure Advisor CSV with pandas (as process_csv_file
+does); I/O tasks wait on a simulated Azure API call. Pools are driven
+directly (gevent.pool.Pool / a process pool), no broker is needed, so the
+numbers isolate pool behaviour from Redis round trips.
+
+Usage:
+    python scripts/benchmark_celery_pools.py [--cpu-tasks 20] [--io-tasks 400] [--io-latency 0.05]
+"""
+
+import sys
+
+# gevent must patch the standard library before anything else is imported
+if '--role' in sys.argv and sys.argv[sys.argv.index('--role') + 1].startswith('gevent'):
+    from gevent import monkey
+    monkey.patch_all()
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def cpu_task(rows):
+    """Parse and aggregate an Advisor-like CSV, like process_csv_file."""
+    import pandas as pd
+
+    lines = ['Category,Business Impact,Recommendation,Potential Annual Cost Savings']
+    for i in range(rows):
+        lines.append(f'Cost,High,Buy reserved instances for vm-{i},{i % 977}.25')
+    df = pd.read_csv(io.StringIO('\n'.join(lines)))
+    df['Recommendation'] = df['Recommendation'].str.strip().str.lower()
+    return int(df.groupby('Category')['Potential Annual Cost Savings'].sum().iloc[0])
+
+
+def io_task(latency):
+    """Wait on a simulated Azure Advisor API call."""
+    time.sleep(latency)
+
+
+def _workload(args):
+    """Interleaved task list: one CPU task every N I/O tasks."""
+    tasks = []
+    every = max(args.io_tasks // max(args.cpu_tasks, 1), 1)
+    cpu_left, io_left = args.cpu_tasks, args.io_tasks
+    while cpu_left or io_left:
+        for _ in range(min(every, io_left)):
+            tasks.append('io')
+            io_left -= 1
+        if cpu_left:
+            tasks.append('cpu')
+            cpu_left -= 1
+    return tasks
+
+
+def run_role(args):
+    """Run this process's share of the workload and print JSON results."""
+    tasks = _workload(args)
+    if args.role == 'gevent-io':
+        tasks = [t for t in tasks if t == 'io']
+    elif args.role == 'prefork-cpu':
+        tasks = [t for t in tasks if t == 'cpu']
+
+    io_latencies = []
+    started = time.perf_counter()
+
+    if args.role.startswith('gevent'):
+        from gevent.pool import Pool
+
+        pool = Pool(args.concurrency)
+
+        def run(kind):
+            if kind == 'cpu':
+                cpu_task(args.cpu_rows)
+            else:
+                io_task(args.io_latency)
+                io_latencies.append(time.perf_counter() - started)
+
+        for kind in tasks:
+            pool.spawn(run, kind)
+        pool.join()
+    else:
+        with ProcessPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(cpu_task, [args.cpu_rows] * len(tasks)))
+
+    print(json.dumps({
+        'tasks': len(tasks),
+        'elapsed': time.perf_counter() - started,
+        'io_latencies': io_latencies,
+    }))
+
+
+def _spawn(args, role, concurrency):
+    cmd = [
+        sys.executable, os.path.abspath(__file__),
+        '--role', role, '--concurrency', str(concurrency),
+        '--cpu-tasks', str(args.cpu_tasks), '--io-tasks', str(args.io_tasks),
+        '--cpu-rows', str(args.cpu_rows), '--io-latency', str(args.io_latency),
+    ]
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+
+
+def _collect(procs):
+    results = []
+    for proc in procs:
+        out, _ = proc.communicate()
+        if proc.returncode:
+            raise SystemExit(f"benchmark worker failed with exit code {proc.returncode}")
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+
+def _report(name, results):
+    tasks = sum(r['tasks'] for r in results)
+    elapsed = max(r['elapsed'] for r in results)
+    latencies = sorted(latency for r in results for latency in r['io_latencies'])
+    p50 = latencies[len(latencies) // 2] if latencies else 0
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    print(
+        f"{name:<14} {tasks:>5} tasks in {elapsed:6.2f}s  "
+        f"{tasks / elapsed:8.1f} tasks/s  I/O completion p50 {p50:5.2f}s p95 {p95:5.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cpu-tasks', type=int, default=20)
+    parser.add_argument('--io-tasks', type=int, default=400)
+    parser.add_argument('--cpu-rows', type=int, default=20000)
+    parser.add_argument('--io-latency', type=float, default=0.05)
+    parser.add_argument('--cpu-concurrency', type=int, default=2)
+    parser.add_argument('--io-concurrency', type=int, default=50)
+    parser.add_argument('--role', help=argparse.SUPPRESS)
+    parser.add_argument('--concurrency', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role:
+        run_role(args)
+        return
+
+    _report('single-gevent', _collect([_spawn(args, 'gevent-all', 4)]))
+    _report('split', _collect([
+        _spawn(args, 'prefork-cpu', args.cpu_concurrency),
+        _spawn(args, 'gevent-io', args.io_concurrency),
+    ]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+Logging Overhead Benchmark for Azure Advisor Reports
+
+Measures the hot paths touched by logging:
+- JWTAuthentication.authenticate() per request (user lookup memoized, so the
+  timing is token decoding plus logging)
+- AzureAdvisorCSVProcessor per 10,000 CSV rows (clean_data + extract_recommendations)
+
+Logging is configured the way production runs it: 'apps' at INFO, overridden
+by settings.LOG_LEVELS, with records written to /dev/null so handler I/O does
+not dominate the numbers.
+
+Usage:
+    python scripts/benchmark_logging.py [--requests 20000] [--rows 10000] [--repeat 3]
+"""
+
+import argparse
+import csv
+import logging.config
+import os
+import sys
+import tempfile
+import time
+
+import django
+
+# Setup Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'azure_advisor_reports.settings.testing')
+django.setup()
+
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+
+from apps.authentication.authentication import JWTAuthentication
+from apps.reports.services.csv_processor import AzureAdvisorCSVProcessor
+
+
+SAMPLE_ROWS = [
+    ('Cost', 'High', 'Buy reserved instances to save money over pay-as-you-go',
+     'Save up to 72% with a 3-year reservation', '1200.50'),
+    ('Cost', 'Medium', 'Consider Compute Savings Plans for flexible workloads',
+     'Save with a 1-year savings plan commitment', '830.00'),
+    ('Security', 'High', 'Enable MFA for accounts with owner permissions',
+     'Protect against account breach', ''),
+    ('Reliability', 'Low', 'Use availability zones for virtual machines',
+     'Improve resiliency', ''),
+    ('Performance', 'Medium', 'Right-size underutilized virtual machines',
+     'Reduce cost and improve efficiency', '310.25'),
+]
+
+
+def configure_logging():
+    """Production-like levels, records discarded after formatting."""
+    loggers = {
+        'apps': {'handlers': ['null'], 'level': 'INFO', 'propagate': False},
+    }
+    loggers.update({name: {'level': level} for name, level in getattr(settings, 'LOG_LEVELS', {}).items()})
+    logging.config.dictConfig({
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {
+            'verbose': {'format': '%(levelname)s %(asctime)s %(name)s %(module)s %(message)s'},
+        },
+        'handlers': {
+            'null': {
+                'class': 'logging.FileHandler',
+                'filename': os.devnull,
+                'formatter': 'verbose',
+            },
+        },
+        'root': {'handlers': ['null'], 'level': 'WARNING'},
+        'loggers': loggers,
+    })
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def benchmark_authentication(requests, repeat):
+    User = get_user_model()
+    user = User(id=1, username='bench@example.com', email='bench@example.com')
+    now = datetime.now(timezone.utc)
+    token = jwt.encode(
+        {'user_id': str(user.id), 'type': 'access', 'exp': now + timedelta(hours=1), 'iat': now},
+        settings.SECRET_KEY,
+        algorithm='HS256',
+    )
+
+    factory = RequestFactory()
+    batch = []
+    for _ in range(requests):
+        request = factory.get('/api/v1/reports/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        request._jwt_authenticated_user = user
+        batch.append(request)
+
+    def run():
+        for request in batch:
+            JWTAuthentication().authenticate(request)
+
+    return best_of(repeat, run) / requests
+
+
+def benchmark_csv(rows, repeat):
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            'Category', 'Business Impact', 'Recommendation',
+            'Potential Benefits', 'Potential Annual Cost Savings', 'Resource Name',
+        ])
+        for i in range(rows):
+            category, impact, text, benefits, savings = SAMPLE_ROWS[i % len(SAMPLE_ROWS)]
+            writer.writerow([category, impact, text, benefits, savings, f'resource-{i}'])
+        path = f.name
+
+    try:
+        processor = AzureAdvisorCSVProcessor(path)
+        processor.read_csv()
+        source = processor.df
+
+        def run():
+            processor.df = source.copy()
+            processor.clean_data()
+            processor.extract_recommendations()
+
+        return best_of(repeat, run) / rows * 10_000
+    finally:
+        os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    configure_logging()
+
+    per_request = benchmark_authentication(args.requests, args.repeat)
+    per_10k_rows = benchmark_csv(args.rows, args.repeat)
+
+    print(f"JWTAuthentication.authenticate: {per_request * 1e6:.1f} us/request")
+    print(f"CSV clean + extract:            {per_10k_rows * 1e3:.1f} ms/10k rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Primary Key Benchmark for Azure Advisor Reports
+
+Bulk inserts Recommendation rows keyed with random version 4 UUIDs, then
+with time-ordered version 7 UUIDs (apps/core/ids.py), and reports for each:
+
+- insert rate: rows per second of bulk_create, in batches like the loaders
+- primary key index size after the inserts
+
+The run uses a throwaway test database of the selected settings module, with
+tables created from the models. Index sizes come from pg_relation_size on
+PostgreSQL and from the dbstat table on SQLite; point DJANGO_SETTINGS_MODULE
+at a PostgreSQL configuration for realistic numbers.
+
+Usage:
+    python scripts/benchmark_uuid_keys.py [--rows 100000] [--batch-size 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+import django
+
+# Setup Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'azure_advisor_reports.settings.testing')
+django.setup()
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from apps.clients.models import Client
+from apps.core.ids import uuid7
+from apps.reports.models import Recommendation, Report
+
+TABLE = Recommendation._meta.db_table
+
+
+def primary_key_index_size():
+    """Bytes used by the primary key index of the recommendations table."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                "SELECT pg_relation_size(indexrelid) FROM pg_index "
+                "WHERE indrelid = %s::regclass AND indisprimary",
+                [TABLE],
+            )
+        else:
+            cursor.execute(
+                "SELECT SUM(pgsize) FROM dbstat WHERE name = %s",
+                [f'sqlite_autoindex_{TABLE}_1'],
+            )
+        return cursor.fetchone()[0] or 0
+
+
+def empty_table():
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'TRUNCATE {connection.ops.quote_name(TABLE)}')
+        else:
+            cursor.execute(f'DELETE FROM {connection.ops.quote_name(TABLE)}')
+            cursor.execute('VACUUM')
+
+
+def run(report, make_key, rows, batch_size):
+    """Insert rows with keys from make_key; returns (rows per second, index bytes)."""
+    empty_table()
+    elapsed = 0.0
+    for start in range(0, rows, batch_size):
+        batch = [
+            Recommendation(
+                id=make_key(),
+                report=report,
+                category='cost',
+                business_impact='medium',
+                recommendation=f'Right-size or shutdown underutilized virtual machine {i}',
+                resource_name=f'vm-{i}',
+            )
+            for i in range(start, min(start + batch_size, rows))
+        ]
+        started = time.perf_counter()
+        Recommendation.objects.bulk_create(batch)
+        elapsed += time.perf_counter() - started
+    return rows / elapsed, primary_key_index_size()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    # Tables from the models, like pytest --nomigrations (some migrations are PostgreSQL-only)
+    settings.MIGRATION_MODULES = {app.label: None for app in apps.get_app_configs()}
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        client = Client.objects.create(company_name='Benchmark Corp', contact_email='bench@example.com')
+        user = get_user_model().objects.create_user(
+            username='benchmark', email='bench@example.com', password='benchmark-password'
+        )
+        report = Report.objects.create(client=client, created_by=user)
+
+        print(f"{args.rows} rows, batches of {args.batch_size}, {connection.vendor}")
+        for label, make_key in (('uuid4', uuid.uuid4), ('uuid7', uuid7)):
+            rate, index_size = run(report, make_key, args.rows, args.batch_size)
+            print(f"{label:<6} insert {rate:9.0f} rows/s  pk index {index_size / 2**20:7.1f} MiB", flush=True)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
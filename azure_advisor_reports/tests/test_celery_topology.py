@@ -0,0 +1,83 @@
+"""
+Test cases for the Celery worker topology
+Tests queue routing and the pool/queue startup check in azure_advisor_reports.celery
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from celery.exceptions import ImproperlyConfigured
+
+from azure_advisor_reports.celery import (
+    CPU_POOL_PREFETCH_MULTIPLIER,
+    IO_POOL_PREFETCH_MULTIPLIER,
+    app,
+    check_worker_topology,
+    configure_worker_pool,
+)
+
+
+def _worker(pool_cls, queues):
+    """Minimal stand-in for the WorkController passed to worker_init."""
+    return SimpleNamespace(
+        app=SimpleNamespace(amqp=SimpleNamespace(queues=SimpleNamespace(consume_from={q: None for q in queues}))),
+        pool_cls=pool_cls,
+        concurrency=4,
+        prefetch_multiplier=IO_POOL_PREFETCH_MULTIPLIER,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.celery
+class TestWorkerTopology:
+    """Tests for pool/queue validation at worker startup"""
+
+    @pytest.mark.parametrize('pool_cls', ['gevent', 'eventlet', 'celery.concurrency.gevent:TaskPool'])
+    def test_green_pool_rejects_cpu_queues(self, pool_cls):
+        """Test gevent/eventlet workers cannot consume CPU-bound queues"""
+        with pytest.raises(ImproperlyConfigured):
+            check_worker_topology(pool_cls, ['azure_api', 'reports'])
+
+    @pytest.mark.parametrize('pool_cls', ['prefork', 'threads', 'solo'])
+    def test_cpu_pools_accept_all_queues(self, pool_cls):
+        """Test non-green pools may consume any queue"""
+        check_worker_topology(pool_cls, ['default', 'reports', 'priority', 'azure_api'])
+
+    def test_green_pool_accepts_io_queues(self):
+        """Test gevent workers may consume I/O-bound queues"""
+        check_worker_topology('gevent', ['azure_api', 'default'])
+
+    def test_worker_refuses_to_start(self):
+        """Test the worker_init handler aborts startup on a bad topology"""
+        with pytest.raises(SystemExit):
+            configure_worker_pool(sender=_worker('gevent', ['priority']))
+
+    def test_cpu_worker_prefetches_one_task(self):
+        """Test prefork workers reserve one task per process"""
+        worker = _worker('prefork', ['priority', 'reports'])
+        configure_worker_pool(sender=worker)
+        assert worker.prefetch_multiplier == CPU_POOL_PREFETCH_MULTIPLIER
+
+    def test_io_worker_keeps_configured_prefetch(self):
+        """Test gevent workers keep the configured prefetch multiplier"""
+        worker = _worker('gevent', ['azure_api', 'default'])
+        configure_worker_pool(sender=worker)
+        assert worker.prefetch_multiplier == IO_POOL_PREFETCH_MULTIPLIER
+
+
+@pytest.mark.unit
+@pytest.mark.celery
+class TestTaskRouting:
+    """Tests that tasks land on the queue of the matching pool"""
+
+    @pytest.mark.parametrize('task_name, queue', [
+        ('apps.reports.tasks.process_csv_file', 'priority'),
+        ('apps.reports.tasks.generate_report', 'reports'),
+        ('apps.azure_integration.tasks.generate_azure_report', 'reports'),
+        ('apps.azure_integration.tasks.fetch_azure_recommendations', 'azure_api'),
+        ('apps.azure_integration.tasks.sync_azure_statistics', 'azure_api'),
+    ])
+    def test_route(self, task_name, queue):
+        """Test task routes"""
+        route = app.amqp.router.route({}, task_name)
+        assert route['queue'].name == queue